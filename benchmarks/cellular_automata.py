@@ -0,0 +1,33 @@
+"""Benchmarks of the CellLab-CTS cellular automaton."""
+import numpy as np
+
+from landlab.ca.celllab_cts import Transition
+from landlab.ca.raster_cts import RasterCTS
+
+from .common import SIZES, make_grid, skip_unless
+
+
+class CellLabCTSRun(object):
+
+    params = (SIZES, )
+    param_names = ('n_nodes', )
+    timeout = 600
+
+    def setup(self, n_nodes):
+        skip_unless(n_nodes <= 10 ** 6)
+        self.grid = make_grid('raster', n_nodes, spacing=1.)
+        states = {0: 'fluid', 1: 'particle'}
+        transitions = [Transition((0, 1, 0), (1, 0, 0), 1.),
+                       Transition((1, 0, 0), (0, 1, 0), 1.)]
+        node_state = np.random.RandomState(0).randint(
+            0, 2, self.grid.number_of_nodes)
+        self.ca = RasterCTS(self.grid, states, transitions, node_state)
+        self.run_to = 0.
+
+    def time_run(self, n_nodes):
+        self.run_to += .1
+        self.ca.run(self.run_to)
+
+    def peakmem_run(self, n_nodes):
+        self.run_to += .1
+        self.ca.run(self.run_to)
@@ -0,0 +1,71 @@
+"""Grids and topography shared by the benchmarks."""
+import numpy as np
+
+from landlab import HexModelGrid, RasterModelGrid, VoronoiDelaunayGrid
+
+
+#: Number of nodes of the benchmark grids.
+SIZES = (10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)
+
+#: Types of grid.
+GRID_TYPES = ('raster', 'hex', 'voronoi')
+
+#: Largest number of nodes for which each type of grid is built.
+MAX_NODES = {'raster': 10 ** 7, 'hex': 10 ** 6, 'voronoi': 10 ** 6}
+
+
+def skip_unless(condition):
+    """Skip a parameter combination (asv skips on NotImplementedError)."""
+    if not condition:
+        raise NotImplementedError()
+
+
+def grid_shape(n_nodes):
+    """Rows and columns of a near-square grid with about *n_nodes* nodes."""
+    n_rows = int(np.sqrt(n_nodes))
+    return n_rows, n_nodes // n_rows
+
+
+def make_grid(grid_type, n_nodes, spacing=10., seed=0):
+    """A grid of about *n_nodes* nodes.
+
+    Parameters
+    ----------
+    grid_type : {'raster', 'hex', 'voronoi'}
+        Type of grid.
+    n_nodes : int
+        Number of nodes.
+    spacing : float, optional
+        Node spacing.
+    seed : int, optional
+        Seed for the random node coordinates of a voronoi grid.
+    """
+    skip_unless(n_nodes <= MAX_NODES[grid_type])
+
+    shape = grid_shape(n_nodes)
+    if grid_type == 'raster':
+        return RasterModelGrid(shape, spacing)
+    elif grid_type == 'hex':
+        return HexModelGrid(shape[0], shape[1], dx=spacing, shape='rect')
+    elif grid_type == 'voronoi':
+        rng = np.random.RandomState(seed)
+        y, x = np.meshgrid(np.arange(shape[0], dtype=float),
+                           np.arange(shape[1], dtype=float), indexing='ij')
+        # Only interior nodes are moved. Jittering the perimeter leaves
+        # fans of links at boundary nodes that the grid can't yet handle.
+        interior = np.zeros(x.shape, dtype=bool)
+        interior[1:-1, 1:-1] = True
+        x[interior] += .8 * rng.rand(interior.sum()) - .4
+        y[interior] += .8 * rng.rand(interior.sum()) - .4
+        return VoronoiDelaunayGrid(spacing * x.ravel(), spacing * y.ravel())
+    else:
+        raise ValueError('unknown grid type: {0}'.format(grid_type))
+
+
+def add_random_topography(grid, seed=0):
+    """Add a gently tilted, rough surface as *topographic__elevation*."""
+    rng = np.random.RandomState(seed)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    z[:] = (1e-3 * grid.x_of_node + 1e-3 * grid.y_of_node +
+            rng.rand(grid.number_of_nodes))
+    return z
@@ -0,0 +1,77 @@
+"""Benchmarks of the soil moisture and ecohydrology components."""
+import numpy as np
+
+from landlab.components import (PrecipitationDistribution,
+                                PotentialEvapotranspiration, Radiation,
+                                SoilMoisture, Vegetation, VegCA)
+from landlab.components.ecohydrology import EcohydrologyDriver
+
+from .common import SIZES, add_random_topography, make_grid, skip_unless
+
+
+def _add_vegetation(grid, seed=0):
+    """Give each cell of *grid* a random plant type."""
+    rng = np.random.RandomState(seed)
+    grid.at_cell['vegetation__plant_functional_type'] = rng.randint(
+        0, 6, grid.number_of_cells)
+    return rng
+
+
+class SoilMoistureUpdate(object):
+
+    params = (SIZES, )
+    param_names = ('n_nodes', )
+    timeout = 600
+
+    def setup(self, n_nodes):
+        skip_unless(n_nodes <= 10 ** 6)
+        self.grid = make_grid('raster', n_nodes)
+        rng = _add_vegetation(self.grid)
+        self.soil_moisture = SoilMoisture(self.grid)
+
+        n_cells = self.grid.number_of_cells
+        at_cell = self.grid.at_cell
+        at_cell['surface__potential_evapotranspiration_rate'] = (
+            6. * rng.rand(n_cells))
+        at_cell['soil_moisture__initial_saturation_fraction'] = rng.rand(
+            n_cells)
+        at_cell['vegetation__live_leaf_area_index'] = 4. * rng.rand(n_cells)
+        at_cell['vegetation__cover_fraction'] = rng.rand(n_cells)
+        at_cell['rainfall__daily_depth'] = np.where(
+            rng.rand(n_cells) < .5, 0., 60. * rng.rand(n_cells))
+
+    def time_update(self, n_nodes):
+        self.soil_moisture.update(0.)
+
+    def peakmem_update(self, n_nodes):
+        self.soil_moisture.update(0.)
+
+
+class Ecohydrology(object):
+
+    """Ten years of storms, plant growth and plant competition."""
+
+    params = (SIZES, )
+    param_names = ('n_nodes', )
+    timeout = 600
+
+    number = 1
+    repeat = 3
+    warmup_time = 0
+
+    def setup(self, n_nodes):
+        skip_unless(n_nodes <= 10 ** 5)
+        self.grid = make_grid('raster', n_nodes)
+        add_random_topography(self.grid)
+        _add_vegetation(self.grid)
+        self.driver = EcohydrologyDriver(
+            self.grid,
+            PrecipitationDistribution(mean_storm_duration=2.,
+                                      mean_interstorm_duration=80.,
+                                      mean_storm_depth=5., random_seed=0),
+            SoilMoisture(self.grid), Vegetation(self.grid),
+            PotentialEvapotranspiration(self.grid),
+            radiation=Radiation(self.grid), vegca=VegCA(self.grid))
+
+    def time_run(self, n_nodes):
+        self.driver.run(10)
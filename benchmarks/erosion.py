@@ -0,0 +1,80 @@
+"""Benchmarks of the erosion and hillslope components."""
+from landlab.components import (FastscapeEroder, FlowAccumulator,
+                                LinearDiffuser, Space)
+
+from .common import (GRID_TYPES, SIZES, add_random_topography, make_grid,
+                     skip_unless)
+
+
+def _route_flow(grid, grid_type):
+    """Add a surface and route flow over it."""
+    add_random_topography(grid)
+    if grid_type == 'raster':
+        flow_director = 'FlowDirectorD8'
+    else:
+        flow_director = 'FlowDirectorSteepest'
+    FlowAccumulator(grid, flow_director=flow_director).run_one_step()
+
+
+class Fastscape(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        skip_unless(n_nodes <= 10 ** 6)
+        self.grid = make_grid(grid_type, n_nodes)
+        _route_flow(self.grid, grid_type)
+        self.eroder = FastscapeEroder(self.grid, K_sp=1e-5, m_sp=.5,
+                                      n_sp=1.)
+
+    def time_run_one_step(self, grid_type, n_nodes):
+        self.eroder.run_one_step(dt=10.)
+
+
+class SpaceEroder(object):
+
+    """Space only runs on raster grids."""
+
+    params = (SIZES, )
+    param_names = ('n_nodes', )
+    timeout = 600
+
+    def setup(self, n_nodes):
+        skip_unless(n_nodes <= 10 ** 6)
+        self.grid = make_grid('raster', n_nodes)
+        _route_flow(self.grid, 'raster')
+        soil = self.grid.add_ones('node', 'soil__depth')
+        self.grid.at_node['topographic__elevation'] += soil
+        self.eroder = Space(self.grid, K_sed=1e-5, K_br=1e-10, F_f=.5,
+                            phi=.1, H_star=1., v_s=.001, m_sp=.5, n_sp=1.,
+                            sp_crit_sed=0., sp_crit_br=0.,
+                            method='simple_stream_power')
+
+    def time_run_one_step(self, n_nodes):
+        self.eroder.run_one_step(dt=10.)
+
+    def peakmem_run_one_step(self, n_nodes):
+        self.eroder.run_one_step(dt=10.)
+
+
+class Diffusion(object):
+
+    """LinearDiffuser takes divergences, which voronoi grids can't yet."""
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        skip_unless(grid_type != 'voronoi')
+        self.grid = make_grid(grid_type, n_nodes)
+        add_random_topography(self.grid)
+        self.diffuser = LinearDiffuser(self.grid, linear_diffusivity=.01)
+
+    def time_run_one_step(self, grid_type, n_nodes):
+        self.diffuser.run_one_step(10.)
+
+    def peakmem_run_one_step(self, grid_type, n_nodes):
+        self.diffuser.run_one_step(10.)
@@ -0,0 +1,166 @@
+"""Benchmarks of reading and writing grids to netCDF, ESRI ASCII, VTK and
+the native landlab format."""
+import os
+import shutil
+import tempfile
+
+from landlab.io import read_esri_ascii, write_esri_ascii
+from landlab.io.native_landlab import load_grid, save_grid
+from landlab.io.vtk import VtkTimeSeriesWriter
+from landlab.io.netcdf import (NetcdfTimeSeriesWriter, read_netcdf,
+                               write_netcdf)
+
+from .common import SIZES, add_random_topography, make_grid, skip_unless
+
+
+class _FileIO(object):
+
+    params = (SIZES, )
+    param_names = ('n_nodes', )
+    timeout = 600
+    max_nodes = 10 ** 7
+
+    def setup(self, n_nodes):
+        skip_unless(n_nodes <= self.max_nodes)
+        self.grid = make_grid('raster', n_nodes)
+        add_random_topography(self.grid)
+        self.tmpdir = tempfile.mkdtemp()
+        self.existing = os.path.join(self.tmpdir, 'existing' + self.suffix)
+        self.write(os.path.join(self.tmpdir, 'existing' + self.suffix))
+        self.path = os.path.join(self.tmpdir, 'new' + self.suffix)
+
+    def teardown(self, n_nodes):
+        shutil.rmtree(self.tmpdir)
+
+    def time_write(self, n_nodes):
+        self.write(self.path)
+
+    def time_read(self, n_nodes):
+        self.read(self.existing)
+
+    def peakmem_read(self, n_nodes):
+        self.read(self.existing)
+
+
+class NetcdfIO(_FileIO):
+
+    suffix = '.nc'
+
+    def write(self, path):
+        write_netcdf(path, self.grid, names='topographic__elevation')
+
+    def read(self, path):
+        read_netcdf(path)
+
+    def time_read_window(self, n_nodes):
+        (n_rows, n_cols) = self.grid.shape
+        read_netcdf(self.existing,
+                    window=((n_rows // 4, n_rows // 2),
+                            (n_cols // 4, n_cols // 2)))
+
+    def time_read_mapped(self, n_nodes):
+        read_netcdf(self.existing, mmap_mode='c')
+
+
+class NetcdfTimeSeries(object):
+
+    """Write 100 time slices of a field, 10 slices at a time."""
+
+    params = (SIZES[:3], )
+    param_names = ('n_nodes', )
+    timeout = 600
+    n_times = 100
+
+    def setup(self, n_nodes):
+        self.grid = make_grid('raster', n_nodes)
+        add_random_topography(self.grid)
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'series.nc')
+
+    def teardown(self, n_nodes):
+        shutil.rmtree(self.tmpdir)
+
+    def time_write_netcdf_append(self, n_nodes):
+        for _ in range(self.n_times):
+            write_netcdf(self.path, self.grid, format='NETCDF4',
+                         names='topographic__elevation', append=True)
+
+    def time_writer(self, n_nodes):
+        with NetcdfTimeSeriesWriter(self.path, self.grid, buffer_size=10,
+                                    names='topographic__elevation') as writer:
+            for _ in range(self.n_times):
+                writer.write()
+
+    def time_writer_compressed(self, n_nodes):
+        with NetcdfTimeSeriesWriter(self.path, self.grid, buffer_size=10,
+                                    names='topographic__elevation',
+                                    zlib=True) as writer:
+            for _ in range(self.n_times):
+                writer.write()
+
+
+class EsriAsciiIO(_FileIO):
+
+    suffix = '.asc'
+    max_nodes = 10 ** 6
+
+    def write(self, path):
+        write_esri_ascii(path, self.grid, names='topographic__elevation',
+                         clobber=True)
+
+    def read(self, path):
+        read_esri_ascii(path)
+
+    def time_read_window(self, n_nodes):
+        (n_rows, n_cols) = self.grid.shape
+        read_esri_ascii(self.existing,
+                        window=((n_rows // 4, n_rows // 2),
+                                (n_cols // 4, n_cols // 2)))
+
+
+class NativeIO(_FileIO):
+
+    suffix = '.grid'
+
+    def write(self, path):
+        save_grid(self.grid, path, clobber=True)
+
+    def read(self, path):
+        load_grid(path)
+
+    def time_rewrite_unchanged(self, n_nodes):
+        save_grid(self.grid, self.existing, clobber=True)
+
+    def time_read_into_memory(self, n_nodes):
+        load_grid(self.existing, mmap_mode=None)
+
+
+class VtkSeries(object):
+
+    """Write 10 frames of a time series for ParaView."""
+
+    params = (SIZES[:3], ('raster', 'hex'), ('ascii', 'raw', 'zlib'))
+    param_names = ('n_nodes', 'grid_type', 'encoding')
+    timeout = 600
+    n_times = 10
+
+    def setup(self, n_nodes, grid_type, encoding):
+        skip_unless(encoding != 'ascii' or n_nodes <= 10 ** 5)
+        self.grid = make_grid(grid_type, n_nodes)
+        add_random_topography(self.grid)
+        self.tmpdir = tempfile.mkdtemp()
+        if encoding == 'ascii':
+            self.kwds = dict(format='ascii')
+        else:
+            self.kwds = dict(format='appended', encoding=encoding)
+
+    def teardown(self, n_nodes, grid_type, encoding):
+        shutil.rmtree(self.tmpdir)
+
+    def time_write(self, n_nodes, grid_type, encoding):
+        series = VtkTimeSeriesWriter(os.path.join(self.tmpdir, 'series'),
+                                     self.grid, **self.kwds)
+        z = self.grid.at_node['topographic__elevation']
+        for _ in range(self.n_times):
+            z += 1.
+            series.write()
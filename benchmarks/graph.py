@@ -0,0 +1,32 @@
+"""Benchmarks of access to graph connectivity and graph fields."""
+import numpy as np
+
+from landlab.field.graph_field import GraphFields
+from landlab.graph import DualUniformRectilinearGraph
+
+
+class GraphAccess(object):
+
+    """Attributes are looked up often, so each is timed on its own."""
+
+    def setup(self):
+        self.graph = DualUniformRectilinearGraph((100, 100))
+        self.fields = GraphFields({'node': self.graph.number_of_nodes})
+        self.z = np.random.rand(self.graph.number_of_nodes)
+        self.fields.add_field('topographic__elevation', self.z.copy(),
+                              at='node')
+
+    def time_nodes_at_link(self):
+        self.graph.nodes_at_link
+
+    def time_node_at_link_head(self):
+        self.graph.node_at_link_head
+
+    def time_number_of_links(self):
+        self.graph.number_of_links
+
+    def time_get_field(self):
+        self.fields.at_node['topographic__elevation']
+
+    def time_set_field(self):
+        self.fields.at_node['topographic__elevation'] = self.z
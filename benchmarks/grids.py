@@ -0,0 +1,165 @@
+"""Benchmarks of grid construction, gradients, mappers and node status."""
+import numpy as np
+
+from landlab import CLOSED_BOUNDARY, CORE_NODE
+
+from .common import (GRID_TYPES, MAX_NODES, SIZES, add_random_topography,
+                     make_grid, skip_unless)
+
+
+class GridConstruction(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        skip_unless(n_nodes <= MAX_NODES[grid_type])
+
+    def time_create_grid(self, grid_type, n_nodes):
+        make_grid(grid_type, n_nodes)
+
+    def peakmem_create_grid(self, grid_type, n_nodes):
+        make_grid(grid_type, n_nodes)
+
+
+class Gradients(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        self.grid = make_grid(grid_type, n_nodes)
+        self.z = add_random_topography(self.grid)
+        self.grad = self.grid.empty(at='link')
+
+    def time_calc_grad_at_link(self, grid_type, n_nodes):
+        self.grid.calc_grad_at_link(self.z, out=self.grad)
+
+    def time_calc_diff_at_link(self, grid_type, n_nodes):
+        self.grid.calc_diff_at_link(self.z, out=self.grad)
+
+    def time_calc_slope_at_node(self, grid_type, n_nodes):
+        self.grid.calc_slope_at_node(self.z)
+
+
+class FluxDivergence(object):
+
+    """Divergence is not timed on voronoi grids.
+
+    Faces and links of voronoi grids don't yet line up (``link_at_face``
+    is not set for every face), so divergences on them are not valid.
+    """
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        skip_unless(grid_type != 'voronoi')
+        self.grid = make_grid(grid_type, n_nodes)
+        z = add_random_topography(self.grid)
+        self.grad = self.grid.calc_grad_at_link(z)
+        self.div = self.grid.empty(at='node')
+
+    def time_calc_flux_div_at_node(self, grid_type, n_nodes):
+        self.grid.calc_flux_div_at_node(self.grad, out=self.div)
+
+
+class Mappers(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        self.grid = make_grid(grid_type, n_nodes)
+        add_random_topography(self.grid)
+        self.grid.add_field('link', 'surface_water__discharge',
+                            np.sin(np.arange(self.grid.number_of_links)))
+        self.at_link = self.grid.empty(at='link')
+        self.at_node = self.grid.empty(at='node')
+        self.at_patch = self.grid.empty(at='patch')
+
+    def time_map_mean_of_link_nodes_to_link(self, grid_type, n_nodes):
+        self.grid.map_mean_of_link_nodes_to_link('topographic__elevation',
+                                                 out=self.at_link)
+
+    def time_map_link_head_node_to_link(self, grid_type, n_nodes):
+        self.grid.map_link_head_node_to_link('topographic__elevation',
+                                             out=self.at_link)
+
+    def time_map_max_of_node_links_to_node(self, grid_type, n_nodes):
+        self.grid.map_max_of_node_links_to_node('surface_water__discharge',
+                                                out=self.at_node)
+
+    def time_map_upwind_node_link_max_to_node(self, grid_type, n_nodes):
+        self.grid.map_upwind_node_link_max_to_node(
+            'surface_water__discharge', out=self.at_node)
+
+    def time_map_mean_of_patch_nodes_to_patch(self, grid_type, n_nodes):
+        self.grid.map_mean_of_patch_nodes_to_patch('topographic__elevation',
+                                                   out=self.at_patch)
+
+
+class NodeStatus(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        self.grid = make_grid(grid_type, n_nodes)
+        self.node = self.grid.core_nodes[len(self.grid.core_nodes) // 2]
+
+    def time_toggle_node_status(self, grid_type, n_nodes):
+        self.grid.status_at_node[self.node] = CLOSED_BOUNDARY
+        self.grid.status_at_node[self.node] = CORE_NODE
+
+    def time_update_all_node_status(self, grid_type, n_nodes):
+        self.grid._update_links_nodes_cells_to_new_BCs()
+
+
+class WatershedBoundary(object):
+
+    params = (SIZES, ('D8', 'D4'))
+    param_names = ('n_nodes', 'adjacency_method')
+    timeout = 600
+
+    def setup(self, n_nodes, adjacency_method):
+        self.grid = make_grid('raster', n_nodes)
+        np.random.seed(1973)
+        self.z = np.random.rand(self.grid.number_of_nodes)
+        self.z[np.random.rand(self.grid.number_of_nodes) < .3] = -9999.
+
+    def time_set_watershed_boundary_condition(self, n_nodes,
+                                              adjacency_method):
+        self.grid.set_watershed_boundary_condition(
+            self.z.copy(), remove_disconnected=True,
+            adjacency_method=adjacency_method)
+
+
+class NodeSpatialIndex(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, n_nodes):
+        self.grid = make_grid(grid_type, n_nodes)
+        self.node = self.grid.core_nodes[len(self.grid.core_nodes) // 2]
+        self.radius = 5. * np.sqrt(self.grid.cell_area_at_node[self.node])
+        self.grid._node_spatial_index
+
+    def time_build_index(self, grid_type, n_nodes):
+        self.grid._node_tree = None
+        self.grid._node_spatial_index
+
+    def time_nodes_within_radius(self, grid_type, n_nodes):
+        self.grid.calc_distances_azimuths_of_nodes_within_radius(
+            self.node, self.radius)
+
+    def time_nearest_nodes(self, grid_type, n_nodes):
+        self.grid.find_nearest_nodes(
+            (self.grid.node_x[self.node], self.grid.node_y[self.node]), k=8)
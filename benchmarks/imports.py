@@ -0,0 +1,20 @@
+"""Benchmarks of importing landlab and its components.
+
+Names in landlab, landlab.components and landlab.plot are loaded when first
+used, so importing a package only pays for what is used from it. Each
+import is timed in a new interpreter.
+"""
+
+
+class Imports(object):
+
+    params = (['import landlab',
+               'import landlab.components',
+               'from landlab import RasterModelGrid',
+               'from landlab.components import FlowAccumulator',
+               'from landlab.components import *',
+               'from landlab import imshow_grid'], )
+    param_names = ('statement', )
+
+    def timeraw_import(self, statement):
+        return statement
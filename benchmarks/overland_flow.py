@@ -0,0 +1,24 @@
+"""Benchmarks of overland flow."""
+from landlab.components import OverlandFlow
+
+from .common import SIZES, add_random_topography, make_grid, skip_unless
+
+
+class DeAlmeidaOverlandFlow(object):
+
+    params = (SIZES, (False, True))
+    param_names = ('n_nodes', 'steep_slopes')
+    timeout = 600
+
+    def setup(self, n_nodes, steep_slopes):
+        skip_unless(n_nodes <= 10 ** 6)
+        self.grid = make_grid('raster', n_nodes)
+        add_random_topography(self.grid)
+        self.grid.add_ones('node', 'surface_water__depth')
+        self.flow = OverlandFlow(self.grid, steep_slopes=steep_slopes)
+
+    def time_run_one_step(self, n_nodes, steep_slopes):
+        self.flow.run_one_step(dt=1.)
+
+    def peakmem_run_one_step(self, n_nodes, steep_slopes):
+        self.flow.run_one_step(dt=1.)
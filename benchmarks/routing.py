@@ -0,0 +1,151 @@
+"""Benchmarks of flow routing, depression finding and sink filling."""
+import numpy as np
+
+from landlab import FIXED_VALUE_BOUNDARY, RasterModelGrid
+from landlab.components import (DepressionFinderAndRouter, FlowAccumulator,
+                                FlowRouter, PriorityFloodDepressionFinder,
+                                SinkFiller)
+
+from .common import (GRID_TYPES, SIZES, add_random_topography, make_grid,
+                     skip_unless)
+
+
+#: Flow directors and the types of grid they work on. On hex and voronoi
+#: grids, flow accumulation can't yet store the many receivers MFD finds.
+DIRECTORS = {
+    'FlowDirectorSteepest': GRID_TYPES,
+    'FlowDirectorD8': ('raster', ),
+    'FlowDirectorMFD': ('raster', ),
+    'FlowDirectorDINF': ('raster', ),
+}
+
+
+class FlowAccumulation(object):
+
+    params = (GRID_TYPES, sorted(DIRECTORS), SIZES)
+    param_names = ('grid_type', 'flow_director', 'n_nodes')
+    timeout = 600
+
+    def setup(self, grid_type, flow_director, n_nodes):
+        skip_unless(grid_type in DIRECTORS[flow_director])
+        skip_unless(flow_director not in ('FlowDirectorMFD',
+                                          'FlowDirectorDINF') or
+                    n_nodes <= 10 ** 6)
+        self.grid = make_grid(grid_type, n_nodes)
+        add_random_topography(self.grid)
+        self.accumulator = FlowAccumulator(self.grid,
+                                           flow_director=flow_director)
+
+    def time_run_one_step(self, grid_type, flow_director, n_nodes):
+        self.accumulator.run_one_step()
+
+    def peakmem_run_one_step(self, grid_type, flow_director, n_nodes):
+        self.accumulator.run_one_step()
+
+
+class DepressionFinding(object):
+
+    params = (GRID_TYPES, SIZES)
+    param_names = ('grid_type', 'n_nodes')
+    timeout = 600
+
+    # map_depressions reroutes the grid in place, after which there are no
+    # depressions left to map. Time one call per sample, each on a grid
+    # that was just routed by setup.
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, grid_type, n_nodes):
+        skip_unless(n_nodes <= 10 ** 5)
+        self.grid = make_grid(grid_type, n_nodes)
+        add_random_topography(self.grid)
+        if grid_type == 'raster':
+            flow_director, routing = 'FlowDirectorD8', 'D8'
+        else:
+            flow_director, routing = 'FlowDirectorSteepest', 'D4'
+        FlowAccumulator(self.grid, flow_director=flow_director).run_one_step()
+        self.finder = DepressionFinderAndRouter(self.grid, routing=routing)
+
+    def time_map_depressions(self, grid_type, n_nodes):
+        self.finder.map_depressions()
+
+    def peakmem_map_depressions(self, grid_type, n_nodes):
+        self.finder.map_depressions()
+
+
+def make_staircase(n_nodes):
+    """A raster of about *n_nodes* nodes that is a row of nested pits.
+
+    Each pit is held in by a higher sill than the pit before it, and the
+    grid drains out past the last, highest sill. Flooding from each pit in
+    turn spills into every lake before it.
+    """
+    n_pits = max(n_nodes // 6 - 1, 1)
+    grid = RasterModelGrid((3, 2 * n_pits + 3), 10.)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    grid.status_at_node[2 * grid.number_of_node_columns - 1] = (
+        FIXED_VALUE_BOUNDARY)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    row = z.reshape(grid.shape)[1]
+    row[1:-1:2] = np.arange(1, n_pits + 2)
+    row[2:-1:2] = 1e-3 * np.arange(1, n_pits + 1)
+    return grid
+
+
+#: Depression finders, and the largest staircase each is timed on.
+#: DepressionFinderAndRouter floods every lake again from each later pit.
+FINDERS = {
+    'DepressionFinderAndRouter': 10 ** 4,
+    'PriorityFloodDepressionFinder': 10 ** 6,
+}
+
+
+class NestedDepressions(object):
+
+    params = (sorted(FINDERS), SIZES)
+    param_names = ('depression_finder', 'n_nodes')
+    timeout = 600
+
+    # As for DepressionFinding, each sample maps a freshly routed grid.
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, depression_finder, n_nodes):
+        skip_unless(n_nodes <= FINDERS[depression_finder])
+        self.grid = make_staircase(n_nodes)
+        FlowRouter(self.grid, method='D8').run_one_step()
+        finder = {'DepressionFinderAndRouter': DepressionFinderAndRouter,
+                  'PriorityFloodDepressionFinder':
+                  PriorityFloodDepressionFinder}[depression_finder]
+        self.finder = finder(self.grid, routing='D8')
+
+    def time_map_depressions(self, depression_finder, n_nodes):
+        self.finder.map_depressions()
+
+
+class SinkFilling(object):
+
+    """SinkFiller only runs on raster grids."""
+
+    params = (('lake_mapper', 'priority_flood'), (False, True), SIZES)
+    param_names = ('method', 'apply_slope', 'n_nodes')
+    timeout = 600
+
+    # Filling changes the surface in place, so each sample fills a fresh
+    # surface made by setup.
+    number = 1
+    repeat = 10
+    warmup_time = 0
+
+    def setup(self, method, apply_slope, n_nodes):
+        skip_unless(n_nodes <= 10 ** 6)
+        skip_unless(method != 'lake_mapper' or n_nodes <= 10 ** 4)
+        self.grid = make_grid('raster', n_nodes)
+        add_random_topography(self.grid)
+        self.filler = SinkFiller(self.grid, method=method,
+                                 apply_slope=apply_slope)
+
+    def time_run_one_step(self, method, apply_slope, n_nodes):
+        self.filler.run_one_step()
@@ -15,32 +15,70 @@ __version__ = '1.0.2'
 
 
 import os
+import sys
+
+from .core.lazy import lazy_import
+
+
 if 'DISPLAY' not in os.environ:
-    try:
-        import matplotlib
-    except ImportError:
-        import warnings
-        warnings.warn('matplotlib not found', ImportWarning)
+    if 'matplotlib' in sys.modules:
+        sys.modules['matplotlib'].use('Agg')
     else:
-        matplotlib.use('Agg')
-
-from .core.model_parameter_dictionary import ModelParameterDictionary
-from .core.model_parameter_dictionary import (MissingKeyError,
-                                              ParameterValueError)
-from .core.model_parameter_loader import load_params
-from .core.model_component import Component
-from .framework.collections import Palette, Arena, NoProvidersError
-from .framework.decorators import Implements, ImplementsOrRaise
-from .framework.framework import Framework
-from .field.scalar_data_fields import FieldError
-from .grid import *
-from .plot import *
-
-from .testing.nosetester import LandlabTester
-test = LandlabTester().test
-bench = LandlabTester().bench
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+
+
+_GRID_NAMES = ('ModelGrid', 'HexModelGrid', 'RadialModelGrid',
+               'RasterModelGrid', 'VoronoiDelaunayGrid', 'BAD_INDEX_VALUE',
+               'CORE_NODE', 'FIXED_VALUE_BOUNDARY', 'FIXED_GRADIENT_BOUNDARY',
+               'LOOPED_BOUNDARY', 'CLOSED_BOUNDARY', 'ACTIVE_LINK',
+               'FIXED_LINK', 'INACTIVE_LINK', 'create_and_initialize_grid')
+_PLOT_NAMES = ('imshow_grid', 'imshow_node_grid', 'imshow_cell_grid',
+               'imshow_grid_at_node', 'analyze_channel_network_and_plot',
+               'imshow', 'channel_profile', 'event_handler')
+
+_ATTRS = {
+    'ModelParameterDictionary': '.core.model_parameter_dictionary',
+    'MissingKeyError': '.core.model_parameter_dictionary',
+    'ParameterValueError': '.core.model_parameter_dictionary',
+    'load_params': '.core.model_parameter_loader',
+    'Component': '.core.model_component',
+    'Palette': '.framework.collections',
+    'Arena': '.framework.collections',
+    'NoProvidersError': '.framework.collections',
+    'Implements': '.framework.decorators',
+    'ImplementsOrRaise': '.framework.decorators',
+    'Framework': '.framework.framework',
+    'FieldError': '.field.scalar_data_fields',
+    'LandlabTester': '.testing.nosetester',
+    'test': lambda load: load('LandlabTester')(sys.modules[__name__]).test,
+    'bench': lambda load: load('LandlabTester')(sys.modules[__name__]).bench,
+}
+_ATTRS.update((name, '.grid') for name in _GRID_NAMES)
+_ATTRS.update((name, '.plot') for name in _PLOT_NAMES)
 
 __all__ = ['ModelParameterDictionary', 'MissingKeyError',
            'ParameterValueError', 'Component', 'Palette', 'Arena',
            'NoProvidersError', 'Implements', 'ImplementsOrRaise',
            'Framework', 'FieldError', 'LandlabTester', 'load_params']
+
+if sys.version_info < (3, 7):
+    from .core.model_parameter_dictionary import ModelParameterDictionary
+    from .core.model_parameter_dictionary import (MissingKeyError,
+                                                  ParameterValueError)
+    from .core.model_parameter_loader import load_params
+    from .core.model_component import Component
+    from .framework.collections import Palette, Arena, NoProvidersError
+    from .framework.decorators import Implements, ImplementsOrRaise
+    from .framework.framework import Framework
+    from .field.scalar_data_fields import FieldError
+    from .grid import *
+    from .plot import *
+
+    from .testing.nosetester import LandlabTester
+    test = LandlabTester().test
+    bench = LandlabTester().bench
+else:
+    __getattr__, __dir__ = lazy_import(
+        __name__, _ATTRS, submodules=('core', 'field', 'framework', 'grid',
+                                      'io', 'layers', 'plot', 'testing',
+                                      'utils'))
@@ -152,6 +152,8 @@ if _CYTEST:
                                    update_link_states_and_transitions_new,
                                    run_cts_new)
 
+from landlab.ca.cfuncs import run_cts_until
+
 _NEVER = 1e50
 
 _DEBUG = False
@@ -555,6 +557,10 @@ class CellLabCTSModel(object):
         else:
             self._use_propswap_or_callback = False
 
+        # Counters of events processed and of events discarded because
+        # they were no longer valid (see run_until)
+        self._event_counts = np.zeros(2, dtype=np.int64)
+
     def set_node_state_grid(self, node_states):
         """Set the grid of node-state codes to node_states.
 
@@ -1739,34 +1745,9 @@ class CellLabCTSModel(object):
                self.bnd_lnk)
 
         elif _RUN_NEW:
-            
-            self.current_time = run_cts_new(run_to, self.current_time,
-                        self.priority_queue,
-                        self.next_update,                  
-                        self.grid.node_at_link_tail,                  
-                        self.grid.node_at_link_head,                  
-                        self.node_state,            
-                        self.next_trn_id,            
-                        self.trn_to,
-                        self.grid.status_at_node,
-                        self.num_node_states,
-                        self.num_node_states_sq,
-                        self.bnd_lnk,
-                        self.link_orientation,
-                        self.link_state,
-                        self.n_trn,
-                        self.trn_id,
-                        self.trn_rate, 
-                        self.grid.links_at_node,
-                        self.grid.active_link_dirs_at_node,
-                        self.trn_propswap,
-                        self.propid,
-                        self.prop_data,
-                        self.prop_reset_value,
-                        self.trn_prop_update_fn,
-                        self,
-                        plot_each_transition,
-                        plotter)         
+
+            self.run_until(run_to, plot_each_transition, plotter)
+
         else:
 
             # Continue until we've run out of either time or events
@@ -1799,6 +1780,106 @@ class CellLabCTSModel(object):
                     print(self.node_state)
                     
     
+    def run_until(self, run_to, plot_each_transition=False, plotter=None):
+        """Run the model forward to a given time with compiled code.
+
+        The whole event loop (popping events off the queue, updating node
+        and link states, and scheduling new events) runs in compiled code.
+        Python is only called for transitions that have a
+        *prop_update_fn*, and to plot after each transition if asked to.
+
+        Parameters
+        ----------
+        run_to : float
+            Time to run to, starting from self.current_time
+        plot_each_transition : bool (optional)
+            Option to display the grid after each transition
+        plotter : CAPlotter object (optional)
+            Needed if caller wants to plot after every transition
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.ca.celllab_cts import Transition
+        >>> from landlab.ca.oriented_raster_cts import OrientedRasterCTS
+        >>> import numpy as np
+        >>> grid = RasterModelGrid((3, 5))
+        >>> nsd = {0 : 'zero', 1 : 'one'}
+        >>> trn_list = []
+        >>> trn_list.append(Transition((0, 1, 0), (1, 0, 0), 1.0))
+        >>> trn_list.append(Transition((1, 0, 0), (0, 1, 0), 2.0))
+        >>> trn_list.append(Transition((0, 1, 1), (1, 0, 1), 3.0))
+        >>> trn_list.append(Transition((0, 1, 1), (1, 1, 1), 4.0))
+        >>> ins = np.arange(15) % 2
+        >>> np.random.seed(0)
+        >>> cts = OrientedRasterCTS(grid, nsd, trn_list, ins)
+        >>> cts.run_until(0.5)
+        >>> cts.current_time
+        0.5
+        >>> cts.number_of_events_processed
+        3
+        >>> cts.number_of_stale_events
+        2
+        >>> cts.event_queue_size
+        4
+        """
+        if plot_each_transition and plotter is not None:
+            plot_with = plotter
+        else:
+            plot_with = None
+        has_callback = np.array([callable(fn)
+                                 for fn in self.trn_prop_update_fn],
+                                dtype=np.int8)
+
+        self.current_time = run_cts_until(
+            run_to, self.current_time,
+            self.priority_queue,
+            self.next_update,
+            self.grid.node_at_link_tail,
+            self.grid.node_at_link_head,
+            self.node_state,
+            self.next_trn_id,
+            self.trn_to,
+            self.grid.status_at_node,
+            self.num_node_states,
+            self.num_node_states_sq,
+            self.bnd_lnk,
+            self.link_orientation,
+            self.link_state,
+            self.n_trn,
+            self.trn_id,
+            self.trn_rate,
+            self.grid.links_at_node,
+            self.grid.active_link_dirs_at_node,
+            self.trn_propswap,
+            has_callback,
+            self.propid,
+            self.prop_data,
+            self.prop_reset_value,
+            self.trn_prop_update_fn,
+            self,
+            plot_with,
+            self._event_counts)
+
+    @property
+    def number_of_events_processed(self):
+        """Number of transition events carried out by run_until."""
+        return int(self._event_counts[0])
+
+    @property
+    def number_of_stale_events(self):
+        """Number of events discarded by run_until.
+
+        An event is stale, and is discarded when it comes off the queue,
+        if its link changed state after the event was scheduled.
+        """
+        return int(self._event_counts[1])
+
+    @property
+    def event_queue_size(self):
+        """Number of events (including stale ones) in the event queue."""
+        return len(self.priority_queue)
+
     def run_new(self, run_to, plot_each_transition=False, plotter=None):
         """Test of new approach using priority queue."""
         
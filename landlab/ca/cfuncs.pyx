@@ -9,7 +9,7 @@ cimport numpy as np
 cimport cython
 from landlab import CORE_NODE
 from _heapq import heappush, heappop
-from libc.stdlib cimport rand
+from libc.stdlib cimport rand, malloc, realloc, free
 from libc.math cimport log
 
 import sys # for debug
@@ -30,24 +30,169 @@ ctypedef np.int8_t DTYPE_INT8_t
 cdef char _DEBUG = 0
 
 
+cdef struct _QueuedEvent:
+    double priority
+    long index
+    long item
+
+
+cdef inline bint _comes_before(_QueuedEvent a, _QueuedEvent b):
+    return a.priority < b.priority or (a.priority == b.priority and
+                                       a.index < b.index)
+
+
 cdef class PriorityQueue:
     """
     Implements a priority queue.
+
+    Items are kept in a binary heap ordered by priority and then by the
+    order in which they were pushed, the same as a heapq list of
+    (priority, index, item) tuples. The heap is stored in a C array so
+    that compiled code (see *run_cts_until*) can use it without creating
+    Python objects.
+
+    The *_queue* attribute gives the heap as a heapq list. Once asked for,
+    the list is the queue (so it can be changed in place) until the queue
+    is next used from compiled code.
     """
-    cdef public object _queue
-    cdef public int _index
+    cdef _QueuedEvent* _heap
+    cdef Py_ssize_t _size
+    cdef Py_ssize_t _capacity
+    cdef object _list
+    cdef public long _index
+
+    def __cinit__(self):
+        self._capacity = 64
+        self._heap = <_QueuedEvent*>malloc(self._capacity *
+                                           sizeof(_QueuedEvent))
+        if self._heap == NULL:
+            raise MemoryError()
+        self._size = 0
+
+    def __dealloc__(self):
+        free(self._heap)
 
     def __init__(self):
-        self._queue = []
+        self._list = []
         self._index = 0
 
+    def __len__(self):
+        if self._list is not None:
+            return len(self._list)
+        else:
+            return self._size
+
+    property _queue:
+        def __get__(self):
+            cdef Py_ssize_t i
+            if self._list is None:
+                self._list = [(self._heap[i].priority, self._heap[i].index,
+                               self._heap[i].item)
+                              for i in range(self._size)]
+                self._size = 0
+            return self._list
+
+        def __set__(self, queue):
+            self._list = queue
+            self._size = 0
+
     def push(self, int item, double priority):
-        heappush(self._queue, (priority, self._index, item))
+        if self._list is not None:
+            heappush(self._list, (priority, self._index, item))
+        else:
+            self._push(item, priority, self._index)
         self._index += 1
 
     def pop(self):
-        assert len(self._queue) > 0, 'Q is empty'
-        return heappop(self._queue)
+        cdef _QueuedEvent event
+        if self._list is not None:
+            assert len(self._list) > 0, 'Q is empty'
+            return heappop(self._list)
+        else:
+            assert self._size > 0, 'Q is empty'
+            event = self._pop()
+            return (event.priority, event.index, event.item)
+
+    cdef void _use_heap(self) except *:
+        """Move the items of the heapq list, if there is one, to the heap.
+
+        The list is already in heap order, so items are copied in order.
+        """
+        cdef Py_ssize_t i
+        cdef object event
+        if self._list is not None:
+            self._size = 0
+            self._reserve(len(self._list))
+            for i in range(len(self._list)):
+                event = self._list[i]
+                self._heap[i].priority = event[0]
+                self._heap[i].index = event[1]
+                self._heap[i].item = event[2]
+            self._size = len(self._list)
+            self._list = None
+
+    cdef void _reserve(self, Py_ssize_t size) except *:
+        cdef _QueuedEvent* heap
+        if size > self._capacity:
+            self._capacity = max(size, 2 * self._capacity)
+            heap = <_QueuedEvent*>realloc(
+                self._heap, self._capacity * sizeof(_QueuedEvent))
+            if heap == NULL:
+                raise MemoryError()
+            self._heap = heap
+
+    cdef void _push(self, long item, double priority, long index) except *:
+        """Push an item onto the heap (as heapq.heappush)."""
+        cdef _QueuedEvent event
+        event.priority = priority
+        event.index = index
+        event.item = item
+        self._reserve(self._size + 1)
+        self._heap[self._size] = event
+        self._size += 1
+        self._sift_down(0, self._size - 1)
+
+    cdef _QueuedEvent _pop(self):
+        """Pop the first item off the heap (as heapq.heappop).
+
+        The heap must not be empty.
+        """
+        cdef _QueuedEvent first
+        cdef _QueuedEvent last = self._heap[self._size - 1]
+        self._size -= 1
+        if self._size > 0:
+            first = self._heap[0]
+            self._heap[0] = last
+            self._sift_up(0)
+            return first
+        return last
+
+    cdef void _sift_down(self, Py_ssize_t start, Py_ssize_t pos):
+        cdef _QueuedEvent new_event = self._heap[pos]
+        cdef Py_ssize_t parent
+        while pos > start:
+            parent = (pos - 1) >> 1
+            if _comes_before(new_event, self._heap[parent]):
+                self._heap[pos] = self._heap[parent]
+                pos = parent
+            else:
+                break
+        self._heap[pos] = new_event
+
+    cdef void _sift_up(self, Py_ssize_t pos):
+        cdef Py_ssize_t start = pos
+        cdef Py_ssize_t child = 2 * pos + 1
+        cdef _QueuedEvent new_event = self._heap[pos]
+        while child < self._size:
+            if (child + 1 < self._size and
+                    not _comes_before(self._heap[child],
+                                      self._heap[child + 1])):
+                child += 1
+            self._heap[pos] = self._heap[child]
+            pos = child
+            child = 2 * pos + 1
+        self._heap[pos] = new_event
+        self._sift_down(start, pos)
 
 
 cdef class Event:
@@ -1444,3 +1589,287 @@ cpdef double run_cts_lean(double run_to, double current_time,
             current_time = run_to
 
     return current_time
+
+
+cdef class _UniformSampler:
+    """
+    Draws uniform random numbers from numpy's global generator in blocks.
+
+    The numbers are the same as if they were drawn one at a time (for
+    example, with np.random.exponential). Calling *sync* leaves the global
+    generator as if only the numbers used so far had been drawn, so that
+    other code (such as a callback) can use it.
+    """
+    cdef object _state
+    cdef double[:] _values
+    cdef Py_ssize_t _used
+
+    def __init__(self, Py_ssize_t size=4096):
+        self._values = np.empty(size)
+        self._used = size
+        self._state = None
+
+    cdef double next(self) except? -1.:
+        if self._used == self._values.shape[0]:
+            self._state = np.random.get_state()
+            self._values = np.random.random_sample(self._values.shape[0])
+            self._used = 0
+        self._used += 1
+        return self._values[self._used - 1]
+
+    cdef void sync(self) except *:
+        if self._state is not None and self._used < self._values.shape[0]:
+            np.random.set_state(self._state)
+            if self._used > 0:
+                np.random.random_sample(self._used)
+        self._state = None
+        self._used = self._values.shape[0]
+
+
+cdef struct _CtsModel:
+    # The arrays that describe the state of a CellLab-CTS model and its
+    # transitions (see celllab_cts.py).
+    DTYPE_t* next_update
+    DTYPE_INT_t* node_at_link_tail
+    DTYPE_INT_t* node_at_link_head
+    DTYPE_INT_t* node_state
+    DTYPE_INT_t* next_trn_id
+    DTYPE_INT_t* trn_to
+    DTYPE_INT8_t* status_at_node
+    DTYPE_INT_t num_node_states
+    DTYPE_INT_t num_node_states_sq
+    DTYPE_INT8_t* bnd_lnk
+    DTYPE_INT8_t* link_orientation
+    DTYPE_INT_t* link_state
+    DTYPE_INT_t* n_trn
+    DTYPE_INT_t* trn_id
+    Py_ssize_t max_trn
+    DTYPE_t* trn_rate
+    DTYPE_INT_t* links_at_node
+    DTYPE_INT8_t* active_link_dirs_at_node
+    Py_ssize_t max_links
+
+
+cdef inline double _exponential(double rate,
+                                _UniformSampler uniform) except? -1.:
+    """Draw from an exponential distribution as np.random.exponential."""
+    return (1.0 / rate) * -log(1.0 - uniform.next())
+
+
+cdef void _schedule_next_event(_CtsModel* m, DTYPE_INT_t link,
+                               DTYPE_INT_t new_link_state,
+                               double current_time,
+                               PriorityQueue priority_queue,
+                               _UniformSampler uniform) except *:
+    """Set a link's new state and schedule its next transition.
+
+    This is *update_link_state_new* and *get_next_event_new* without any
+    Python objects. Transition times are drawn from exponential
+    distributions as np.random.exponential does.
+    """
+    cdef DTYPE_INT_t this_trn_id, trn
+    cdef double next_time, this_next
+    cdef Py_ssize_t i
+
+    if m.bnd_lnk[link]:
+        new_link_state = (
+            m.link_orientation[link] * m.num_node_states_sq +
+            m.node_state[m.node_at_link_tail[link]] * m.num_node_states +
+            m.node_state[m.node_at_link_head[link]])
+
+    m.link_state[link] = new_link_state
+    if m.n_trn[new_link_state] > 0:
+        if m.n_trn[new_link_state] == 1:
+            this_trn_id = m.trn_id[new_link_state * m.max_trn]
+            next_time = _exponential(m.trn_rate[this_trn_id], uniform)
+        else:
+            next_time = _NEVER
+            this_trn_id = -1
+            for i in range(m.n_trn[new_link_state]):
+                trn = m.trn_id[new_link_state * m.max_trn + i]
+                this_next = _exponential(m.trn_rate[trn], uniform)
+                if this_next < next_time:
+                    next_time = this_next
+                    this_trn_id = trn
+        next_time += current_time
+        priority_queue._push(link, next_time, priority_queue._index)
+        priority_queue._index += 1
+        m.next_update[link] = next_time
+        m.next_trn_id[link] = this_trn_id
+    else:
+        m.next_update[link] = _NEVER
+        m.next_trn_id[link] = -1
+
+
+cdef void _update_links_at_node(_CtsModel* m, DTYPE_INT_t node,
+                                DTYPE_INT_t event_link, double event_time,
+                                PriorityQueue priority_queue,
+                                _UniformSampler uniform) except *:
+    """Update the other active links of a node whose state has changed."""
+    cdef Py_ssize_t i
+    cdef DTYPE_INT_t link
+
+    for i in range(m.max_links):
+        link = m.links_at_node[node * m.max_links + i]
+        if (m.active_link_dirs_at_node[node * m.max_links + i] != 0 and
+                link != event_link):
+            _schedule_next_event(
+                m, link,
+                (m.link_orientation[link] * m.num_node_states_sq +
+                 m.node_state[m.node_at_link_tail[link]] *
+                 m.num_node_states +
+                 m.node_state[m.node_at_link_head[link]]),
+                event_time, priority_queue, uniform)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def run_cts_until(double run_to, double current_time,
+                  PriorityQueue priority_queue,
+                  np.ndarray[DTYPE_t, ndim=1, mode='c'] next_update,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] node_at_link_tail,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] node_at_link_head,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] node_state,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] next_trn_id,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] trn_to,
+                  np.ndarray[DTYPE_INT8_t, ndim=1, mode='c'] status_at_node,
+                  DTYPE_INT_t num_node_states,
+                  DTYPE_INT_t num_node_states_sq,
+                  np.ndarray[DTYPE_INT8_t, ndim=1, mode='c'] bnd_lnk,
+                  np.ndarray[DTYPE_INT8_t, ndim=1, mode='c'] link_orientation,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] link_state,
+                  np.ndarray[DTYPE_INT_t, ndim=1, mode='c'] n_trn,
+                  np.ndarray[DTYPE_INT_t, ndim=2, mode='c'] trn_id,
+                  np.ndarray[DTYPE_t, ndim=1, mode='c'] trn_rate,
+                  np.ndarray[DTYPE_INT_t, ndim=2, mode='c'] links_at_node,
+                  np.ndarray[DTYPE_INT8_t, ndim=2, mode='c']
+                      active_link_dirs_at_node,
+                  np.ndarray[DTYPE_INT8_t, ndim=1] trn_propswap,
+                  np.ndarray[DTYPE_INT8_t, ndim=1] trn_has_callback,
+                  np.ndarray[DTYPE_INT_t, ndim=1] propid,
+                  object prop_data,
+                  object prop_reset_value,
+                  object trn_prop_update_fn,
+                  object this_cts_model,
+                  object plotter,
+                  np.ndarray[np.int64_t, ndim=1] event_counts):
+    """Run the model forward to a given time.
+
+    This is the event loop of *run_cts_new* in compiled code: the event
+    queue, transition lookup and link-state updates use no Python
+    objects. Python is called only to run a transition's
+    *prop_update_fn* (if it has one), to reset the properties of
+    boundary nodes, and to plot after each transition if a *plotter* is
+    given. Random numbers are drawn from numpy's global generator, in the
+    same order as *run_cts_new*.
+
+    Parameters
+    ----------
+    run_to : float
+        Time to run to, starting from *current_time*
+    trn_has_callback : array of 1-byte int
+        Flag for each transition: does it have a *prop_update_fn*?
+    plotter : CAPlotter object or None
+        If given, plot the grid after each transition.
+    event_counts : array of int64
+        Counters of events processed (first element) and of events that
+        were no longer valid and so were discarded (second element),
+        incremented in place.
+    (see celllab_cts.py for other parameters)
+
+    Returns
+    -------
+    float
+        The new current time.
+    """
+    cdef _CtsModel m
+    cdef _UniformSampler uniform = _UniformSampler()
+    cdef _QueuedEvent event
+    cdef DTYPE_INT_t tail_node, head_node
+    cdef DTYPE_INT_t old_tail_node_state, old_head_node_state
+    cdef DTYPE_INT_t this_trn_id, this_trn_to
+    cdef DTYPE_INT_t tmp
+
+    m.next_update = &next_update[0]
+    m.node_at_link_tail = &node_at_link_tail[0]
+    m.node_at_link_head = &node_at_link_head[0]
+    m.node_state = &node_state[0]
+    m.next_trn_id = &next_trn_id[0]
+    m.trn_to = &trn_to[0]
+    m.status_at_node = &status_at_node[0]
+    m.num_node_states = num_node_states
+    m.num_node_states_sq = num_node_states_sq
+    m.bnd_lnk = &bnd_lnk[0]
+    m.link_orientation = &link_orientation[0]
+    m.link_state = &link_state[0]
+    m.n_trn = &n_trn[0]
+    m.trn_id = &trn_id[0, 0]
+    m.max_trn = trn_id.shape[1]
+    m.trn_rate = &trn_rate[0]
+    m.links_at_node = &links_at_node[0, 0]
+    m.active_link_dirs_at_node = &active_link_dirs_at_node[0, 0]
+    m.max_links = links_at_node.shape[1]
+
+    priority_queue._use_heap()
+
+    try:
+        while current_time < run_to and priority_queue._size > 0:
+
+            # Is there an event scheduled to occur within this run?
+            if priority_queue._heap[0].priority > run_to:
+                current_time = run_to
+                break
+
+            event = priority_queue._pop()
+            current_time = event.priority
+
+            # Ignore the event if the link has changed state since it was
+            # scheduled
+            if event.priority != next_update[event.item]:
+                event_counts[1] += 1
+                continue
+            event_counts[0] += 1
+
+            tail_node = node_at_link_tail[event.item]
+            head_node = node_at_link_head[event.item]
+            old_tail_node_state = node_state[tail_node]
+            old_head_node_state = node_state[head_node]
+
+            this_trn_id = next_trn_id[event.item]
+            this_trn_to = trn_to[this_trn_id]
+
+            # Update the states of the nodes (as update_node_states) and of
+            # the links attached to them
+            if status_at_node[tail_node] == _CORE:
+                node_state[tail_node] = ((this_trn_to / num_node_states) %
+                                         num_node_states)
+            if status_at_node[head_node] == _CORE:
+                node_state[head_node] = this_trn_to % num_node_states
+            _schedule_next_event(&m, event.item, this_trn_to, event.priority,
+                                 priority_queue, uniform)
+            if node_state[tail_node] != old_tail_node_state:
+                _update_links_at_node(&m, tail_node, event.item,
+                                      event.priority, priority_queue, uniform)
+            if node_state[head_node] != old_head_node_state:
+                _update_links_at_node(&m, head_node, event.item,
+                                      event.priority, priority_queue, uniform)
+
+            if plotter is not None:
+                plotter.update_plot()
+
+            if trn_propswap[this_trn_id]:
+                tmp = propid[tail_node]
+                propid[tail_node] = propid[head_node]
+                propid[head_node] = tmp
+                if status_at_node[tail_node] != _CORE:
+                    prop_data[propid[tail_node]] = prop_reset_value
+                if status_at_node[head_node] != _CORE:
+                    prop_data[propid[head_node]] = prop_reset_value
+                if trn_has_callback[this_trn_id]:
+                    uniform.sync()
+                    trn_prop_update_fn[this_trn_id](
+                        this_cts_model, tail_node, head_node, event.priority)
+    finally:
+        uniform.sync()
+
+    return current_time
@@ -7,7 +7,7 @@ Created on Thu Jul  9 08:20:06 2015
 @author: gtucker
 """
 
-from nose.tools import assert_equal
+from nose.tools import assert_equal, assert_true
 from numpy.testing import assert_array_equal
 from landlab import RasterModelGrid, HexModelGrid
 from landlab.ca.celllab_cts import Transition, Event
@@ -272,6 +272,97 @@ def test_run_oriented_raster():
                        [0, 1, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 0, 1, 0])
 
 
+def _make_checkerboard_cts(**kwds):
+    """Make the OrientedRasterCTS of test_run_oriented_raster."""
+    grid = RasterModelGrid((3, 5))
+    nsd = {0 : 'zero', 1 : 'one'}
+    trn_list = []
+    trn_list.append(Transition((0, 1, 0), (1, 0, 0), 1.0, **kwds))
+    trn_list.append(Transition((1, 0, 0), (0, 1, 0), 2.0))
+    trn_list.append(Transition((0, 1, 1), (1, 0, 1), 3.0, **kwds))
+    trn_list.append(Transition((0, 1, 1), (1, 1, 1), 4.0))
+    ins = np.arange(15) % 2
+    return OrientedRasterCTS(grid, nsd, trn_list, ins)
+
+
+def test_run_until_matches_run_new():
+    """Test that the compiled event loop matches the Python one."""
+    np.random.seed(4)
+    cts1 = _make_checkerboard_cts()
+    cts1.run_new(20.0)
+    state1 = np.random.get_state()
+
+    np.random.seed(4)
+    cts2 = _make_checkerboard_cts()
+    for run_to in np.arange(0.5, 20.5, 0.5):
+        cts2.run_until(run_to)
+
+    assert_array_equal(cts1.node_state, cts2.node_state)
+    assert_array_equal(cts1.link_state, cts2.link_state)
+    assert_array_equal(cts1.next_update, cts2.next_update)
+    assert_equal(cts1.priority_queue._queue, cts2.priority_queue._queue)
+
+    # both used exactly the same random numbers
+    assert_array_equal(state1[1], np.random.get_state()[1])
+    assert_equal(state1[2], np.random.get_state()[2])
+
+
+def test_run_until_counts_events():
+    """Test the counters of processed and stale events."""
+    np.random.seed(0)
+    cts = _make_checkerboard_cts()
+    assert_equal(cts.number_of_events_processed, 0)
+    assert_equal(cts.number_of_stale_events, 0)
+    assert_equal(cts.event_queue_size, len(cts.priority_queue._queue))
+
+    cts.run(10.0)
+    assert_equal(cts.current_time, 10.0)
+    assert_true(cts.number_of_events_processed > 0)
+    assert_true(cts.number_of_stale_events > 0)
+    assert_equal(cts.event_queue_size, len(cts.priority_queue._queue))
+    for (time, _, _) in cts.priority_queue._queue:
+        assert_true(time > 10.0)
+
+
+def test_run_until_calls_prop_update_fn():
+    """Test that callbacks are called only for transitions that have one."""
+    calls = []
+
+    def count_calls(ca, node1, node2, time_now):
+        calls.append((node1, node2, ca.node_state[node1],
+                      ca.node_state[node2]))
+
+    np.random.seed(1)
+    cts = _make_checkerboard_cts(swap_properties=True,
+                                 prop_update_fn=count_calls)
+    cts.run_until(10.0)
+
+    assert_true(len(calls) > 0)
+    assert_true(len(calls) < cts.number_of_events_processed)
+    # both transitions with a callback go to (1, 0), except at boundaries
+    for (tail, head, tail_state, head_state) in calls:
+        if cts.grid.status_at_node[[tail, head]].max() == 0:
+            assert_equal((tail_state, head_state), (1, 0))
+
+
+def test_priority_queue_as_list():
+    """Test that the queue can be read and replaced as a heapq list."""
+    from ..cfuncs import PriorityQueue
+
+    pq = PriorityQueue()
+    for item, priority in enumerate([2.2, 5.5, 0.11, 4.4]):
+        pq.push(item, priority)
+    assert_equal(len(pq), 4)
+    assert_equal(pq._queue[0], (0.11, 2, 2))
+
+    queue = pq._queue
+    heappush(queue, (0.05, pq._index, 9))
+    pq._queue = queue
+    assert_equal(len(pq), 5)
+    assert_equal(pq.pop(), (0.05, 4, 9))
+    assert_equal(pq.pop(), (0.11, 2, 2))
+
+
 def test_grain_hill_model():
     """Run a lattice-grain-based hillslope evolution model."""
     from .grain_hill_as_class import GrainHill
@@ -1,54 +1,140 @@
-from .chi_index import ChiFinder
-from .diffusion import LinearDiffuser
-from .fire_generator import FireGenerator
-from .detachment_ltd_erosion import DetachmentLtdErosion, DepthSlopeProductErosion
-from .flexure import Flexure
-from .flow_routing import FlowRouter, DepressionFinderAndRouter
-from .nonlinear_diffusion import PerronNLDiffuse
-from .flow_director import FlowDirectorD8
-from .flow_director import FlowDirectorSteepest
-from .flow_director import FlowDirectorMFD
-from .flow_director import FlowDirectorDINF
-from .flow_accum import FlowAccumulator
-from .overland_flow import OverlandFlowBates, OverlandFlow
-from .overland_flow import KinwaveImplicitOverlandFlow
-from .potentiality_flowrouting import PotentialityFlowRouter
-from .pet import PotentialEvapotranspiration
-from .radiation import Radiation
-from .soil_moisture import SoilMoisture
-from .vegetation_dynamics import Vegetation
-from .sink_fill import SinkFiller
-from .steepness_index import SteepnessFinder
-from .stream_power import StreamPowerEroder, FastscapeEroder, StreamPowerSmoothThresholdEroder, SedDepEroder
-from .uniform_precip import PrecipitationDistribution
-from .soil_moisture import SoilInfiltrationGreenAmpt
-from .plant_competition_ca import VegCA
-from .gflex import gFlex
-from .drainage_density import DrainageDensity
-from .weathering import ExponentialWeatherer
-from .depth_dependent_diffusion import DepthDependentDiffuser
-from .cubic_nonlinear_hillslope_flux import CubicNonLinearDiffuser
-from .depth_dependent_cubic_soil_creep import DepthDependentCubicDiffuser
-from .erosion_deposition import ErosionDeposition
-from .space import Space
-from .landslides import LandslideProbability
-
-COMPONENTS = [ChiFinder, LinearDiffuser,
-              Flexure, FlowRouter, DepressionFinderAndRouter,
-              PerronNLDiffuse, OverlandFlowBates, OverlandFlow,
-              KinwaveImplicitOverlandFlow,
-              PotentialEvapotranspiration, PotentialityFlowRouter,
-              Radiation, SinkFiller, 
-              StreamPowerEroder, StreamPowerSmoothThresholdEroder,
-              FastscapeEroder, SedDepEroder,
-              PrecipitationDistribution,
-              SteepnessFinder, DetachmentLtdErosion, gFlex,
-              SoilInfiltrationGreenAmpt, FireGenerator,
-              SoilMoisture, Vegetation, VegCA, DrainageDensity,
-              ExponentialWeatherer, DepthDependentDiffuser,
-              CubicNonLinearDiffuser, DepthSlopeProductErosion,
-              FlowDirectorD8, FlowDirectorSteepest, FlowDirectorMFD,
-              FlowDirectorDINF, FlowAccumulator, Space, ErosionDeposition,
-              LandslideProbability, DepthDependentCubicDiffuser]
-
-__all__ = [cls.__name__ for cls in COMPONENTS]
+import sys
+
+from ..core.lazy import lazy_import
+
+
+_COMPONENT_MODULES = {
+    'ChiFinder': '.chi_index',
+    'LinearDiffuser': '.diffusion',
+    'FireGenerator': '.fire_generator',
+    'DetachmentLtdErosion': '.detachment_ltd_erosion',
+    'DepthSlopeProductErosion': '.detachment_ltd_erosion',
+    'Flexure': '.flexure',
+    'FlowRouter': '.flow_routing',
+    'DepressionFinderAndRouter': '.flow_routing',
+    'PriorityFloodDepressionFinder': '.flow_routing',
+    'PerronNLDiffuse': '.nonlinear_diffusion',
+    'FlowDirectorD8': '.flow_director',
+    'FlowDirectorSteepest': '.flow_director',
+    'FlowDirectorMFD': '.flow_director',
+    'FlowDirectorDINF': '.flow_director',
+    'FlowAccumulator': '.flow_accum',
+    'OverlandFlowBates': '.overland_flow',
+    'OverlandFlow': '.overland_flow',
+    'KinwaveImplicitOverlandFlow': '.overland_flow',
+    'PotentialityFlowRouter': '.potentiality_flowrouting',
+    'PotentialEvapotranspiration': '.pet',
+    'Radiation': '.radiation',
+    'SoilMoisture': '.soil_moisture',
+    'Vegetation': '.vegetation_dynamics',
+    'SinkFiller': '.sink_fill',
+    'SteepnessFinder': '.steepness_index',
+    'StreamPowerEroder': '.stream_power',
+    'FastscapeEroder': '.stream_power',
+    'StreamPowerSmoothThresholdEroder': '.stream_power',
+    'SedDepEroder': '.stream_power',
+    'PrecipitationDistribution': '.uniform_precip',
+    'SoilInfiltrationGreenAmpt': '.soil_moisture',
+    'VegCA': '.plant_competition_ca',
+    'gFlex': '.gflex',
+    'DrainageDensity': '.drainage_density',
+    'ExponentialWeatherer': '.weathering',
+    'DepthDependentDiffuser': '.depth_dependent_diffusion',
+    'CubicNonLinearDiffuser': '.cubic_nonlinear_hillslope_flux',
+    'DepthDependentCubicDiffuser': '.depth_dependent_cubic_soil_creep',
+    'ErosionDeposition': '.erosion_deposition',
+    'Space': '.space',
+    'LandslideProbability': '.landslides',
+}
+
+__all__ = ['ChiFinder', 'LinearDiffuser', 'Flexure', 'FlowRouter',
+           'DepressionFinderAndRouter', 'PriorityFloodDepressionFinder',
+           'PerronNLDiffuse', 'OverlandFlowBates', 'OverlandFlow',
+           'KinwaveImplicitOverlandFlow', 'PotentialEvapotranspiration',
+           'PotentialityFlowRouter', 'Radiation', 'SinkFiller',
+           'StreamPowerEroder', 'StreamPowerSmoothThresholdEroder',
+           'FastscapeEroder', 'SedDepEroder', 'PrecipitationDistribution',
+           'SteepnessFinder', 'DetachmentLtdErosion', 'gFlex',
+           'SoilInfiltrationGreenAmpt', 'FireGenerator', 'SoilMoisture',
+           'Vegetation', 'VegCA', 'DrainageDensity', 'ExponentialWeatherer',
+           'DepthDependentDiffuser', 'CubicNonLinearDiffuser',
+           'DepthSlopeProductErosion', 'FlowDirectorD8',
+           'FlowDirectorSteepest', 'FlowDirectorMFD', 'FlowDirectorDINF',
+           'FlowAccumulator', 'Space', 'ErosionDeposition',
+           'LandslideProbability', 'DepthDependentCubicDiffuser']
+
+_SUBMODULES = (
+    'chi_index', 'cubic_nonlinear_hillslope_flux',
+    'depth_dependent_cubic_soil_creep', 'depth_dependent_diffusion',
+    'detachment_ltd_erosion', 'diff_2d', 'diffusion', 'discharge_diffuser',
+    'drainage_density', 'ecohydrology', 'erosion_deposition', 'fire_generator',
+    'flexure', 'flow_accum', 'flow_director', 'flow_routing', 'fracture_grid',
+    'gflex', 'landslides', 'nonlinear_diffusion', 'overland_flow', 'pet',
+    'plant_competition_ca', 'potentiality_flowrouting', 'radiation',
+    'sink_fill', 'soil_moisture', 'space', 'steepness_index', 'stream_power',
+    'uniform_precip', 'vegetation_dynamics', 'weathering')
+
+
+def _all_components(load):
+    return [load(name) for name in __all__]
+
+
+if sys.version_info < (3, 7):
+    from .chi_index import ChiFinder
+    from .diffusion import LinearDiffuser
+    from .fire_generator import FireGenerator
+    from .detachment_ltd_erosion import DetachmentLtdErosion, DepthSlopeProductErosion
+    from .flexure import Flexure
+    from .flow_routing import (FlowRouter, DepressionFinderAndRouter,
+                               PriorityFloodDepressionFinder)
+    from .nonlinear_diffusion import PerronNLDiffuse
+    from .flow_director import FlowDirectorD8
+    from .flow_director import FlowDirectorSteepest
+    from .flow_director import FlowDirectorMFD
+    from .flow_director import FlowDirectorDINF
+    from .flow_accum import FlowAccumulator
+    from .overland_flow import OverlandFlowBates, OverlandFlow
+    from .overland_flow import KinwaveImplicitOverlandFlow
+    from .potentiality_flowrouting import PotentialityFlowRouter
+    from .pet import PotentialEvapotranspiration
+    from .radiation import Radiation
+    from .soil_moisture import SoilMoisture
+    from .vegetation_dynamics import Vegetation
+    from .sink_fill import SinkFiller
+    from .steepness_index import SteepnessFinder
+    from .stream_power import StreamPowerEroder, FastscapeEroder, StreamPowerSmoothThresholdEroder, SedDepEroder
+    from .uniform_precip import PrecipitationDistribution
+    from .soil_moisture import SoilInfiltrationGreenAmpt
+    from .plant_competition_ca import VegCA
+    from .gflex import gFlex
+    from .drainage_density import DrainageDensity
+    from .weathering import ExponentialWeatherer
+    from .depth_dependent_diffusion import DepthDependentDiffuser
+    from .cubic_nonlinear_hillslope_flux import CubicNonLinearDiffuser
+    from .depth_dependent_cubic_soil_creep import DepthDependentCubicDiffuser
+    from .erosion_deposition import ErosionDeposition
+    from .space import Space
+    from .landslides import LandslideProbability
+
+    COMPONENTS = [ChiFinder, LinearDiffuser,
+                  Flexure, FlowRouter, DepressionFinderAndRouter,
+                  PriorityFloodDepressionFinder,
+                  PerronNLDiffuse, OverlandFlowBates, OverlandFlow,
+                  KinwaveImplicitOverlandFlow,
+                  PotentialEvapotranspiration, PotentialityFlowRouter,
+                  Radiation, SinkFiller,
+                  StreamPowerEroder, StreamPowerSmoothThresholdEroder,
+                  FastscapeEroder, SedDepEroder,
+                  PrecipitationDistribution,
+                  SteepnessFinder, DetachmentLtdErosion, gFlex,
+                  SoilInfiltrationGreenAmpt, FireGenerator,
+                  SoilMoisture, Vegetation, VegCA, DrainageDensity,
+                  ExponentialWeatherer, DepthDependentDiffuser,
+                  CubicNonLinearDiffuser, DepthSlopeProductErosion,
+                  FlowDirectorD8, FlowDirectorSteepest, FlowDirectorMFD,
+                  FlowDirectorDINF, FlowAccumulator, Space, ErosionDeposition,
+                  LandslideProbability, DepthDependentCubicDiffuser]
+else:
+    __getattr__, __dir__ = lazy_import(
+        __name__, dict(_COMPONENT_MODULES, COMPONENTS=_all_components),
+        submodules=_SUBMODULES)
@@ -0,0 +1,4 @@
+from .ecohydrology_driver import EcohydrologyDriver
+
+
+__all__ = ['EcohydrologyDriver', ]
@@ -0,0 +1,345 @@
+"""Drive the ecohydrology components through many years of storms.
+
+Coupled runs of :class:`~landlab.components.Radiation`,
+:class:`~landlab.components.PotentialEvapotranspiration`,
+:class:`~landlab.components.SoilMoisture`,
+:class:`~landlab.components.Vegetation` and
+:class:`~landlab.components.VegCA` are usually driven by a hand-written
+loop over storms that draws a storm, fills the input fields, calls
+each component and accumulates water stress for the cellular automaton.
+:class:`EcohydrologyDriver` runs that same loop but draws the storms of
+a year at once, looks up radiation and potential evapotranspiration
+from tables built once for every day of the year, and keeps its working
+arrays between storms.
+"""
+import numpy as np
+
+
+_DAYS_PER_YEAR = 365
+_N_PLANT_TYPES = 6
+
+
+class EcohydrologyDriver(object):
+
+    """Run SoilMoisture, Vegetation and VegCA for many years of storms.
+
+    Each iteration draws a storm and the inter-storm period that follows
+    it, sets the daily rainfall and the potential evapotranspiration for
+    the day of the year of the storm, then updates soil moisture and
+    vegetation. Water stress is accumulated over the year and, once a
+    year, passed to the cellular automaton of plant competition.
+
+    Potential evapotranspiration and, if a radiation component is given,
+    the ratio of incident radiation to that of a flat surface only
+    depend on the day of the year. They are calculated by the
+    components once for each of the 365 days when the driver is created.
+
+    Construction::
+
+        EcohydrologyDriver(grid, precip, soil_moisture, vegetation, pet,
+                           radiation=None, vegca=None, precip_wet=None,
+                           wet_season=None, growing_season_length=270.,
+                           output_interval=1,
+                           output_fields=(
+                               'vegetation__plant_functional_type', ),
+                           current_time=0.)
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A grid.
+    precip : PrecipitationDistribution
+        Storm generator (for the dry season, if *precip_wet* is given).
+    soil_moisture : SoilMoisture
+        Soil moisture component.
+    vegetation : Vegetation
+        Vegetation dynamics component.
+    pet : PotentialEvapotranspiration or sequence
+        Potential evapotranspiration component, or one for each plant
+        functional type (grass, shrub, tree, bare, shrub seedling, tree
+        seedling). Use *None* for a type that does not transpire.
+    radiation : Radiation, optional
+        If given, potential evapotranspiration is scaled by the ratio of
+        incident shortwave radiation to that of a flat surface.
+    vegca : VegCA, optional
+        Plant competition component, updated once a year.
+    precip_wet : PrecipitationDistribution, optional
+        Storm generator for the wet season.
+    wet_season : tuple of int, optional
+        First and last day of the year of the wet season.
+    growing_season_length : float, optional
+        Length of the growing season (days), used to normalize the
+        cumulative water stress.
+    output_interval : int, optional
+        Number of years between saved outputs.
+    output_fields : sequence of str, optional
+        Names of the cell fields to save.
+    current_time : float, optional
+        Starting time (years).
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import (PrecipitationDistribution,
+    ...                                 PotentialEvapotranspiration,
+    ...                                 SoilMoisture, Vegetation, VegCA)
+    >>> from landlab.components.ecohydrology import EcohydrologyDriver
+
+    >>> grid = RasterModelGrid((6, 7), spacing=10.)
+    >>> np.random.seed(0)
+    >>> grid.at_cell['vegetation__plant_functional_type'] = (
+    ...     np.random.randint(0, 6, grid.number_of_cells))
+    >>> precip = PrecipitationDistribution(mean_storm_duration=2.,
+    ...     mean_interstorm_duration=100., mean_storm_depth=10.)
+    >>> driver = EcohydrologyDriver(
+    ...     grid, precip, SoilMoisture(grid), Vegetation(grid),
+    ...     PotentialEvapotranspiration(grid), vegca=VegCA(grid),
+    ...     output_interval=2)
+
+    Run for four years, saving the plant types every two years.
+
+    >>> driver.run(4)
+    >>> driver.current_time >= 4.
+    True
+    >>> driver.output_time.shape
+    (2,)
+    >>> driver.output['vegetation__plant_functional_type'].shape
+    (2, 20)
+    """
+
+    def __init__(self, grid, precip, soil_moisture, vegetation, pet,
+                 radiation=None, vegca=None, precip_wet=None,
+                 wet_season=None, growing_season_length=270.,
+                 output_interval=1,
+                 output_fields=('vegetation__plant_functional_type', ),
+                 current_time=0.):
+        if (precip_wet is None) != (wet_season is None):
+            raise ValueError(
+                'precip_wet and wet_season must be given together')
+        if output_interval < 1:
+            raise ValueError('output_interval must be at least one year')
+
+        self._grid = grid
+        self._precip = precip
+        self._precip_wet = precip_wet
+        self._wet_season = wet_season
+        self._sm = soil_moisture
+        self._veg = vegetation
+        self._vegca = vegca
+        self._growing_season_length = growing_season_length
+        self._output_interval = int(output_interval)
+        self._output_fields = tuple(output_fields)
+        self._current_time = current_time
+        self._year_start = current_time
+        self._years = 0
+
+        self.output = {}
+        self.output_time = np.empty(0)
+
+        self._calc_daily_tables(pet, radiation)
+
+        at_cell = grid.at_cell
+        for name in ('rainfall__daily_depth',
+                     'surface__potential_evapotranspiration_rate',
+                     'surface__potential_evapotranspiration_30day_mean',
+                     'vegetation__cumulative_water_stress'):
+            if name not in at_cell:
+                grid.add_zeros('cell', name)
+        self._vegtype = at_cell['vegetation__plant_functional_type']
+        self._rain = at_cell['rainfall__daily_depth']
+        self._pet_at_cell = at_cell[
+            'surface__potential_evapotranspiration_rate']
+        self._pet30_at_cell = at_cell[
+            'surface__potential_evapotranspiration_30day_mean']
+        self._water_stress = at_cell['vegetation__water_stress']
+        self._cumulative_water_stress = at_cell[
+            'vegetation__cumulative_water_stress']
+
+        self._water_stress_sum = np.zeros(grid.number_of_cells)
+        self._work = np.empty(grid.number_of_cells)
+        self._pet_threshold_switch = 0
+
+    @property
+    def grid(self):
+        """The grid the components run on."""
+        return self._grid
+
+    @property
+    def current_time(self):
+        """Current model time (years)."""
+        return self._current_time
+
+    @property
+    def pet_by_day(self):
+        """Potential evapotranspiration for each day and plant type.
+
+        Array of shape ``(365, 6)``.
+        """
+        return self._pet_by_day
+
+    @property
+    def pet_30day_mean_by_day(self):
+        """30-day mean potential evapotranspiration for each day and type.
+
+        Array of shape ``(365, 6)``.
+        """
+        return self._pet30_by_day
+
+    def _calc_daily_tables(self, pet, radiation):
+        """Tabulate radiation and PET for each day of the year."""
+        try:
+            pet = list(pet)
+        except TypeError:
+            pet = [pet] * _N_PLANT_TYPES
+        if len(pet) != _N_PLANT_TYPES:
+            raise ValueError(
+                'need one PET component for each of the {n} plant '
+                'functional types'.format(n=_N_PLANT_TYPES))
+
+        self._pet_by_day = np.zeros((_DAYS_PER_YEAR, _N_PLANT_TYPES))
+        if radiation is None:
+            self._radf_by_day = None
+        else:
+            self._radf_by_day = np.empty((_DAYS_PER_YEAR,
+                                          self._grid.number_of_cells))
+
+        for day in range(_DAYS_PER_YEAR):
+            if radiation is not None:
+                radiation.update(float(day) / _DAYS_PER_YEAR)
+                self._radf_by_day[day] = self._grid.at_cell[
+                    'radiation__ratio_to_flat_surface']
+            values = {}
+            for plant_type, component in enumerate(pet):
+                if component is None:
+                    continue
+                if id(component) not in values:
+                    component.update(float(day) / _DAYS_PER_YEAR)
+                    values[id(component)] = component.pet_value
+                self._pet_by_day[day, plant_type] = values[id(component)]
+
+        self._pet30_by_day = np.empty_like(self._pet_by_day)
+        self._pet30_by_day[0] = self._pet_by_day[0]
+        for day in range(1, _DAYS_PER_YEAR):
+            self._pet30_by_day[day] = np.mean(
+                self._pet_by_day[max(day - 30, 0):day], axis=0)
+
+        # The growing season starts when the 30-day mean PET of grass
+        # begins to rise.
+        self._growing_by_day = np.zeros(_DAYS_PER_YEAR, dtype=int)
+        self._growing_by_day[:-1] = (
+            self._pet30_by_day[1:, 0] > self._pet30_by_day[:-1, 0])
+
+    def _storm_generator(self, julian):
+        """The storm generator for a day of the year."""
+        if self._wet_season is not None:
+            first, last = self._wet_season
+            if first <= julian <= last:
+                return self._precip_wet
+        return self._precip
+
+    def draw_storms_for_year(self):
+        """Draw the storms from now to the end of the current model year.
+
+        The year ends with the first storm whose inter-storm period
+        takes the time past one year since the last cellular automaton
+        update (or the start of the run).
+
+        Returns
+        -------
+        tuple of ndarray
+            Storm depth (mm), storm duration (hours), inter-storm duration
+            (hours) and the day of the year of each storm.
+        """
+        depth, duration, interstorm, day = [], [], [], []
+        current_time = self._current_time
+        while True:
+            julian = int(np.floor((current_time - np.floor(current_time)) *
+                                  365.))
+            precip = self._storm_generator(julian)
+            precip.update()
+            depth.append(precip.storm_depth)
+            duration.append(precip.storm_duration)
+            interstorm.append(precip.interstorm_duration)
+            day.append(julian)
+            current_time += (precip.interstorm_duration +
+                             precip.storm_duration) / (24. * 365.25)
+            if current_time - self._year_start >= 1.:
+                break
+        return (np.array(depth), np.array(duration), np.array(interstorm),
+                np.array(day, dtype=int))
+
+    def _run_storm(self, depth, duration, interstorm, julian):
+        """Update soil moisture and vegetation for one storm."""
+        np.take(self._pet_by_day[julian], self._vegtype,
+                out=self._pet_at_cell)
+        np.take(self._pet30_by_day[julian], self._vegtype,
+                out=self._pet30_at_cell)
+        if self._radf_by_day is not None:
+            self._pet_at_cell *= self._radf_by_day[julian]
+            self._pet30_at_cell *= self._radf_by_day[julian]
+        self._rain.fill(depth)
+
+        self._current_time = self._sm.update(self._current_time,
+                                             Tr=duration, Tb=interstorm)
+
+        if julian != _DAYS_PER_YEAR - 1:
+            self._pet_threshold_switch = self._growing_by_day[julian]
+        self._veg.update(PETthreshold_switch=self._pet_threshold_switch,
+                         Tb=interstorm, Tr=duration)
+
+        np.multiply(self._water_stress, interstorm, out=self._work)
+        self._work /= 24.
+        self._water_stress_sum += self._work
+
+    def run_one_year(self):
+        """Run the storms of one year and then the plant competition."""
+        for storm in zip(*self.draw_storms_for_year()):
+            self._run_storm(*storm)
+
+        np.divide(self._water_stress_sum, self._growing_season_length,
+                  out=self._cumulative_water_stress)
+        if self._vegca is not None:
+            self._vegca.update()
+        self._water_stress_sum.fill(0.)
+        self._year_start = self._current_time
+        self._years += 1
+
+    def run(self, n_years):
+        """Run for a number of years, saving output every interval.
+
+        Saved fields are stored in :attr:`output`, a dict that maps field
+        names to arrays of shape ``(n_outputs, n_cells)``, with the time
+        of each output in :attr:`output_time`. Outputs of each call are
+        appended to those of earlier calls.
+
+        Parameters
+        ----------
+        n_years : int
+            Number of years to run.
+        """
+        n_outputs = (
+            (self._years + n_years) // self._output_interval -
+            self._years // self._output_interval)
+        at_cell = self._grid.at_cell
+        output = dict(
+            (name, np.empty((n_outputs, ) + at_cell[name].shape,
+                            dtype=at_cell[name].dtype))
+            for name in self._output_fields)
+        output_time = np.empty(n_outputs)
+
+        n_saved = 0
+        for _ in range(n_years):
+            self.run_one_year()
+            if self._years % self._output_interval == 0:
+                for name in self._output_fields:
+                    output[name][n_saved] = at_cell[name]
+                output_time[n_saved] = self._current_time
+                n_saved += 1
+
+        for name in self._output_fields:
+            if name in self.output:
+                output[name] = np.concatenate((self.output[name],
+                                               output[name]))
+        self.output = output
+        self.output_time = np.concatenate((self.output_time, output_time))
@@ -0,0 +1,170 @@
+"""
+Unit tests for landlab.components.ecohydrology.ecohydrology_driver
+"""
+from nose.tools import assert_equal, assert_raises, assert_true
+from numpy.testing import assert_array_equal
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import (PrecipitationDistribution,
+                                PotentialEvapotranspiration, Radiation,
+                                SoilMoisture, Vegetation, VegCA)
+from landlab.components.ecohydrology import EcohydrologyDriver
+
+
+_WET_SEASON = (190, 250)
+
+
+def _setup_components():
+    grid = RasterModelGrid((8, 9), spacing=10.)
+    np.random.seed(1)
+    grid.at_node['topographic__elevation'] = (
+        0.5 * grid.node_x + 2. * np.random.rand(grid.number_of_nodes))
+    grid.at_cell['vegetation__plant_functional_type'] = np.random.randint(
+        0, 6, grid.number_of_cells)
+
+    precip_dry = PrecipitationDistribution(
+        mean_storm_duration=2., mean_interstorm_duration=160.,
+        mean_storm_depth=3., random_seed=2)
+    precip_wet = PrecipitationDistribution(
+        mean_storm_duration=1.5, mean_interstorm_duration=40.,
+        mean_storm_depth=10., random_seed=3)
+    components = {
+        'precip': precip_dry,
+        'precip_wet': precip_wet,
+        'radiation': Radiation(grid),
+        'pet': [
+            PotentialEvapotranspiration(grid, MeanTmaxF=5., delta_d=7.),
+            PotentialEvapotranspiration(grid, MeanTmaxF=6., delta_d=6.),
+            PotentialEvapotranspiration(grid, MeanTmaxF=4., delta_d=8.),
+        ],
+        'soil_moisture': SoilMoisture(grid),
+        'vegetation': Vegetation(grid),
+        'vegca': VegCA(grid),
+    }
+    return grid, components
+
+
+def _run_by_hand(grid, n_years, precip, precip_wet, radiation, pet,
+                 soil_moisture, vegetation, vegca):
+    """Couple the components with a storm-by-storm loop."""
+    PET_ = np.zeros([365, 6])
+    EP30 = np.zeros([365, 6])
+    Rad_Factor = np.empty([365, grid.number_of_cells])
+    for i in range(0, 365):
+        radiation.update(float(i) / 365.)
+        for component in pet:
+            component.update(float(i) / 365.)
+        PET_[i] = [pet[0]._PET_value, pet[1]._PET_value, pet[2]._PET_value,
+                   0., pet[1]._PET_value, pet[2]._PET_value]
+        Rad_Factor[i] = grid.at_cell['radiation__ratio_to_flat_surface']
+        if i == 0:
+            EP30[0] = PET_[0]
+        elif i < 30:
+            EP30[i] = np.mean(PET_[:i], axis=0)
+        else:
+            EP30[i] = np.mean(PET_[i - 30:i], axis=0)
+
+    current_time = 0.
+    time_check = 0.
+    yrs = 0
+    WS = 0.
+    PET_threshold = 0
+    while yrs < n_years:
+        Julian = int(np.floor((current_time - np.floor(current_time)) * 365.))
+        if Julian < _WET_SEASON[0] or Julian > _WET_SEASON[1]:
+            PD = precip
+        else:
+            PD = precip_wet
+        PD.update()
+        Tr = PD.storm_duration
+        Tb = PD.interstorm_duration
+
+        VegType = grid.at_cell['vegetation__plant_functional_type']
+        grid.at_cell['surface__potential_evapotranspiration_rate'] = (
+            np.choose(VegType, PET_[Julian]) * Rad_Factor[Julian])
+        grid.at_cell['surface__potential_evapotranspiration_30day_mean'] = (
+            np.choose(VegType, EP30[Julian]) * Rad_Factor[Julian])
+        grid.at_cell['rainfall__daily_depth'] = (
+            PD.storm_depth * np.ones(grid.number_of_cells))
+
+        current_time = soil_moisture.update(current_time, Tr=Tr, Tb=Tb)
+
+        if Julian != 364:
+            if EP30[Julian + 1, 0] > EP30[Julian, 0]:
+                PET_threshold = 1
+            else:
+                PET_threshold = 0
+        vegetation.update(PETthreshold_switch=PET_threshold, Tb=Tb, Tr=Tr)
+
+        WS += grid.at_cell['vegetation__water_stress'] * Tb / 24.
+
+        if current_time - time_check >= 1.:
+            grid.at_cell['vegetation__cumulative_water_stress'] = WS / 270.
+            vegca.update()
+            time_check = current_time
+            WS = 0.
+            yrs += 1
+
+    return current_time
+
+
+def test_driver_matches_hand_written_loop():
+    grid, components = _setup_components()
+    time_by_hand = _run_by_hand(grid, 3, **components)
+    expected = dict((name, grid.at_cell[name].copy())
+                    for name in grid.at_cell)
+
+    grid, components = _setup_components()
+    driver = EcohydrologyDriver(
+        grid, components['precip'], components['soil_moisture'],
+        components['vegetation'],
+        [components['pet'][0], components['pet'][1], components['pet'][2],
+         None, components['pet'][1], components['pet'][2]],
+        radiation=components['radiation'], vegca=components['vegca'],
+        precip_wet=components['precip_wet'], wet_season=_WET_SEASON)
+    driver.run(3)
+
+    assert_equal(driver.current_time, time_by_hand)
+    for name in expected:
+        assert_array_equal(grid.at_cell[name], expected[name],
+                           err_msg=name)
+
+
+def test_driver_output_interval():
+    grid, components = _setup_components()
+    driver = EcohydrologyDriver(
+        grid, components['precip'], components['soil_moisture'],
+        components['vegetation'], components['pet'][0],
+        vegca=components['vegca'], output_interval=2,
+        output_fields=('vegetation__plant_functional_type',
+                       'vegetation__live_leaf_area_index'))
+
+    driver.run(5)
+    assert_equal(driver.output_time.shape, (2, ))
+    assert_true(np.all(np.diff(driver.output_time) >= 2.))
+    assert_equal(driver.output['vegetation__live_leaf_area_index'].shape,
+                 (2, grid.number_of_cells))
+    assert_equal(driver.output['vegetation__plant_functional_type'].dtype,
+                 grid.at_cell['vegetation__plant_functional_type'].dtype)
+
+    driver.run(3)
+    assert_equal(driver.output_time.shape, (4, ))
+    assert_equal(driver.output['vegetation__live_leaf_area_index'].shape,
+                 (4, grid.number_of_cells))
+    assert_array_equal(driver.output['vegetation__plant_functional_type'][-1],
+                       grid.at_cell['vegetation__plant_functional_type'])
+    assert_true(driver.current_time >= 8.)
+
+
+def test_driver_bad_arguments():
+    grid, components = _setup_components()
+    args = (grid, components['precip'], components['soil_moisture'],
+            components['vegetation'])
+    assert_raises(ValueError, EcohydrologyDriver, *args,
+                  pet=components['pet'])
+    assert_raises(ValueError, EcohydrologyDriver, *args,
+                  pet=components['pet'][0],
+                  precip_wet=components['precip_wet'])
+    assert_raises(ValueError, EcohydrologyDriver, *args,
+                  pet=components['pet'][0], output_interval=0)
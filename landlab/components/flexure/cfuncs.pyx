@@ -1,11 +1,13 @@
-from multiprocessing import Pool
+from multiprocessing import Pool, RawArray
 
 import numpy as np
 cimport numpy as np
 cimport cython
 
 from libc.math cimport fabs
-from libc.stdlib cimport abs
+from libc.stdlib cimport abs, labs
+
+from landlab.utils.shared_memory import copy_to_shared_memory
 
 
 _RHO_MANTLE = 3300.
@@ -35,17 +37,33 @@ def subside_parallel_row(np.ndarray[DTYPE_t, ndim=1] w,
         w[j] += - c * r[abs(j - i)]
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _subside_rows(double[:, :] w, const double[:, :] load,
+                        const double[:, :] r, double inv_c,
+                        long start, long stop) nogil:
+  """Add deflections due to all loads to rows *start* to *stop* of *w*."""
+  cdef long nrows = load.shape[0]
+  cdef long ncols = load.shape[1]
+  cdef long i, j, k, m
+  cdef double c
+
+  for i in range(nrows):
+    for k in range(ncols):
+      if fabs(load[i, k]) > 1e-6:
+        c = load[i, k] * inv_c
+        for j in range(start, stop):
+          for m in range(ncols):
+            w[j, m] += - c * r[labs(j - i), labs(m - k)]
+
+
 def subside_grid(np.ndarray[DTYPE_t, ndim=2] w,
                  np.ndarray[DTYPE_t, ndim=2] load,
                  np.ndarray[DTYPE_t, ndim=2] r,
                  DTYPE_t alpha, DTYPE_t gamma_mantle):
-  cdef int nrows = w.shape[0]
-  cdef int i
-  cdef int j
+  cdef double inv_c = 1. / (2. * np.pi * gamma_mantle * alpha ** 2.)
 
-  for i in range(nrows):
-    for j in range(nrows):
-      subside_parallel_row(w[j], load[i], r[abs(j - i)], alpha, gamma_mantle)
+  _subside_rows(w, load, r, inv_c, 0, w.shape[0])
 
 
 def subside_grid_strip(np.ndarray[DTYPE_t, ndim=2] load,
@@ -65,7 +83,7 @@ def subside_grid_strip(np.ndarray[DTYPE_t, ndim=2] load,
 
 
 def tile_grid_into_strips(grid, n_strips):
-    rows_per_strip = grid.shape[0] // n_strips
+    rows_per_strip = max(grid.shape[0] // n_strips, 1)
 
     starts = np.arange(0, grid.shape[0], rows_per_strip)
     stops = starts + rows_per_strip
@@ -78,20 +96,57 @@ def _subside_grid_strip_helper(args):
   return subside_grid_strip(*args)
 
 
+_shared = {}
+
+
+def _init_shared_grid(w, load, r, shape, alpha, gamma_mantle):
+    """Set up a worker process with views of the shared arrays."""
+    _shared.update(
+        w=np.frombuffer(w).reshape(shape),
+        load=np.frombuffer(load).reshape(shape),
+        r=np.frombuffer(r).reshape(shape),
+        inv_c=1. / (2. * np.pi * gamma_mantle * alpha ** 2.))
+
+
+def _subside_shared_strip(strip_range):
+    cdef double[:, :] w = _shared['w']
+    cdef const double[:, :] load = _shared['load']
+    cdef const double[:, :] r = _shared['r']
+    cdef double inv_c = _shared['inv_c']
+    cdef long start = strip_range[0]
+    cdef long stop = strip_range[1]
+
+    with nogil:
+      _subside_rows(w, load, r, inv_c, start, stop)
+
+
 def subside_grid_in_parallel(np.ndarray[DTYPE_t, ndim=2] w,
                              np.ndarray[DTYPE_t, ndim=2] load,
                              np.ndarray[DTYPE_t, ndim=2] r,
                              DTYPE_t alpha, DTYPE_t gamma_mantle, n_procs):
+    """Add deflections due to a grid of loads, using *n_procs* processes.
+
+    The loads, the kei function grid and the deflections are copied once
+    into shared memory. Rows of deflections are split into strips that
+    are mapped over the pool of processes; each process adds the
+    deflections of its strips directly into the shared deflections, and
+    these are added to *w* at the end.
+    """
     if n_procs == 1:
         return subside_grid(w, load, r, alpha, gamma_mantle)
 
-    strips = tile_grid_into_strips(w, n_procs)
-
-    args = [(load, r, alpha, gamma_mantle, strip) for strip in strips]
-
-    pool = Pool(processes=n_procs)
-
-    results = pool.map(_subside_grid_strip_helper, args)
-    for dz, strip in results:
-        start, stop = strip
-        w[start:stop] += dz
+    shape = (w.shape[0], w.shape[1])
+    shared_w = RawArray('d', w.size)
+    strips = list(tile_grid_into_strips(w, 4 * n_procs))
+
+    pool = Pool(processes=n_procs, initializer=_init_shared_grid,
+                initargs=(shared_w, copy_to_shared_memory(load),
+                          copy_to_shared_memory(r), shape, alpha,
+                          gamma_mantle))
+    try:
+        pool.map(_subside_shared_strip, strips, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    w += np.frombuffer(shared_w).reshape(shape)
@@ -73,7 +73,7 @@ class Flexure(Component):
     Construction::
 
         Flexure(grid, eet=65e3, youngs=7e10, method='airy', rho_mantle=3300.,
-                gravity=9.80665)
+                gravity=9.80665, padding='zeros')
 
     Parameters
     ----------
@@ -83,12 +83,20 @@ class Flexure(Component):
         Effective elastic thickness (m).
     youngs : float, optional
         Young's modulus.
-    method : {'airy', 'flexure'}, optional
-        Method to use to calculate deflections.
+    method : {'airy', 'flexure', 'flexure_fft'}, optional
+        Method to use to calculate deflections. 'flexure_fft' gives the
+        same deflections as 'flexure' but calculates them as a convolution
+        using fast Fourier transforms, which is much faster for large
+        grids.
     rho_mantle : float, optional
         Density of the mantle (kg / m^3).
     gravity : float, optional
         Acceleration due to gravity (m / s^2).
+    padding : {'zeros', 'reflect', 'periodic'}, optional
+        How loads beyond the edges of the grid are treated by the
+        'flexure_fft' method. With 'zeros' there are no loads beyond the
+        grid (as with 'flexure'), with 'reflect' loads are mirrored about
+        the grid's edges, and with 'periodic' the grid wraps around.
 
     Examples
     --------
@@ -132,6 +140,22 @@ class Flexure(Component):
     >>> flex.update()
     >>> np.all(grid.at_node['lithosphere_surface__elevation_increment'] == 0.)
     False
+
+    Deflections calculated with fast Fourier transforms are the same as
+    those from adding up the deflections due to each load.
+
+    >>> grid = RasterModelGrid((20, 30), spacing=(1.e4, 1.e4))
+    >>> flex = Flexure(grid, method='flexure')
+    >>> load = grid.at_node['lithosphere__overlying_pressure_increment']
+    >>> load[::7] = 1e7
+    >>> flex.update()
+    >>> dz = grid.at_node['lithosphere_surface__elevation_increment'].copy()
+
+    >>> flex = Flexure(grid, method='flexure_fft')
+    >>> flex.update()
+    >>> np.allclose(grid.at_node['lithosphere_surface__elevation_increment'],
+    ...             dz)
+    True
     """
 
     _name = 'Flexure'
@@ -164,7 +188,7 @@ class Flexure(Component):
 
     @use_file_name_or_kwds
     def __init__(self, grid, eet=65e3, youngs=7e10, method='airy',
-                 rho_mantle=3300., gravity=9.80665, **kwds):
+                 rho_mantle=3300., gravity=9.80665, padding='zeros', **kwds):
         """Initialize the flexure component.
 
         Parameters
@@ -175,21 +199,27 @@ class Flexure(Component):
             Effective elastic thickness (m).
         youngs : float, optional
             Young's modulus.
-        method : {'airy', 'flexure'}, optional
+        method : {'airy', 'flexure', 'flexure_fft'}, optional
             Method to use to calculate deflections.
         rho_mantle : float, optional
             Density of the mantle (kg / m^3).
         gravity : float, optional
             Acceleration due to gravity (m / s^2).
+        padding : {'zeros', 'reflect', 'periodic'}, optional
+            How loads beyond the grid edges are treated by 'flexure_fft'.
         """
-        if method not in ('airy', 'flexure'):
+        if method not in ('airy', 'flexure', 'flexure_fft'):
             raise ValueError(
                 '{method}: method not understood'.format(method=method))
+        if padding not in ('zeros', 'reflect', 'periodic'):
+            raise ValueError(
+                '{padding}: padding not understood'.format(padding=padding))
 
         self._grid = grid
 
         self._youngs = youngs
         self._method = method
+        self._padding = padding
         self._rho_mantle = rho_mantle
         self._gravity = gravity
         self.eet = eet
@@ -221,6 +251,7 @@ class Flexure(Component):
         self._r = self._create_kei_func_grid(self._grid.shape,
                                              (self.grid.dy, self.grid.dx),
                                              self.alpha)
+        self._kernel_spectrum = None
 
     @property
     def youngs(self):
@@ -247,6 +278,11 @@ class Flexure(Component):
         """Name of method used to calculate deflections."""
         return self._method
 
+    @property
+    def padding(self):
+        """How loads beyond the grid edges are treated by 'flexure_fft'."""
+        return self._padding
+
     @property
     def alpha(self):
         """Flexure parameter (m)."""
@@ -262,6 +298,66 @@ class Flexure(Component):
 
         return kei(np.sqrt(dx ** 2 + dy ** 2) / alpha)
 
+    def _pad_loads(self, load):
+        """Pad a grid of loads as set by the *padding* keyword."""
+        if self._padding == 'reflect':
+            pad_width = ((load.shape[0] - 1, ), (load.shape[1] - 1, ))
+            return np.pad(load, pad_width, mode='reflect')
+        else:
+            return load
+
+    def _fft_shape(self, shape):
+        """Shape of the circular convolution for a grid of loads.
+
+        Unless *padding* is 'periodic', the convolution is long enough
+        that no load (including those of the padding) wraps around onto a
+        node of the grid.
+        """
+        if self._padding == 'periodic':
+            return shape
+        elif self._padding == 'reflect':
+            return (4 * shape[0] - 3, 4 * shape[1] - 3)
+        else:
+            return (2 * shape[0] - 1, 2 * shape[1] - 1)
+
+    def _create_kernel_spectrum(self, shape):
+        """Fourier transform of the kei function for a grid of loads.
+
+        The kei function grid, which depends only on the offset between a
+        load and a node, is mirrored into an array of positive and
+        negative offsets, wrapped around as for a circular convolution.
+        """
+        fft_shape = self._fft_shape(shape)
+        rows = np.arange(fft_shape[0])
+        cols = np.arange(fft_shape[1])
+        rows = np.minimum(rows, fft_shape[0] - rows)
+        cols = np.minimum(cols, fft_shape[1] - cols)
+
+        r = self._create_kei_func_grid((rows.max() + 1, cols.max() + 1),
+                                       (self.grid.dy, self.grid.dx),
+                                       self.alpha)
+        return np.fft.rfft2(r[rows][:, cols])
+
+    def _subside_loads_by_fft(self, load, w):
+        """Add deflections due to a grid of loads using FFTs.
+
+        The spectrum of the kei function is cached and used again until
+        the elastic thickness changes.
+        """
+        padded = self._pad_loads(load)
+        if self._kernel_spectrum is None:
+            self._kernel_spectrum = self._create_kernel_spectrum(load.shape)
+        fft_shape = self._fft_shape(load.shape)
+
+        dz = np.fft.irfft2(np.fft.rfft2(padded, s=fft_shape) *
+                           self._kernel_spectrum, s=fft_shape)
+
+        start = ((padded.shape[0] - load.shape[0]) // 2,
+                 (padded.shape[1] - load.shape[1]) // 2)
+        dz = dz[start[0]:start[0] + load.shape[0],
+                start[1]:start[1] + load.shape[1]]
+        w -= dz / (2. * np.pi * self.gamma_mantle * self.alpha ** 2.)
+
     def update(self, n_procs=1):
         """Update fields with current loading conditions.
 
@@ -308,8 +404,12 @@ class Flexure(Component):
         w = deflection.reshape(self._grid.shape)
         load = loads.reshape(self._grid.shape)
 
-        subside_grid_in_parallel(w, load * self._grid.dx * self._grid.dy,
-                                 self._r, self.alpha, self.gamma_mantle,
-                                 n_procs)
+        if self._method == 'flexure_fft':
+            self._subside_loads_by_fft(load * self._grid.dx * self._grid.dy,
+                                       w)
+        else:
+            subside_grid_in_parallel(w, load * self._grid.dx * self._grid.dy,
+                                     self._r, self.alpha, self.gamma_mantle,
+                                     n_procs)
 
         return deflection
@@ -2,7 +2,9 @@
 
 import numpy as np
 import scipy.special
-from multiprocessing import Pool
+from multiprocessing import Pool, RawArray, Value
+
+from landlab.utils.shared_memory import copy_to_shared_memory
 
 _POISSON = .25
 
@@ -188,58 +190,156 @@ def subside_point_loads(loads, locs, coords, params=None, deflection=None,
         - *eet*: Effective elastic thickness
         - *youngs*: Young's modulus
         - *gamma_mantle*: Specific weight of the mantle
-    out : ndarray, optional
-        Array to put deflections into.
+    deflection : ndarray, optional
+        Array to add deflections to.
+    n_procs : int, optional
+        Number of processes to divide the loads among.
 
     Returns
     -------
     out : ndarray
         Array of deflections.
+
+    Examples
+    --------
+    >>> from landlab.components.flexure import subside_point_loads
+
+    >>> x = np.arange(0, 10000, 1000.)
+    >>> y = np.arange(0, 5000, 1000.)
+    >>> (x, y) = np.meshgrid(x, y)
+    >>> x.shape = (x.size, )
+    >>> y.shape = (y.size, )
+    >>> loads = np.zeros(x.size)
+    >>> loads[[12, 17]] = 1e9
+    >>> dz = subside_point_loads(loads, (x, y), (x, y),
+    ...                          params=dict(eet=65000., youngs=7e10))
+    >>> import six
+    >>> six.print_(round(dz.min(), 9), round(dz.max(), 9))
+    1.047e-06 1.051e-06
     """
     params = params or dict(eet=6500., youngs=7.e10)
     eet, youngs = params['eet'], params['youngs']
     gamma_mantle = params.get('gamma_mantle', 33000.)
 
     if deflection is None:
-        deflection = np.empty(coords[0].size, dtype=np.float)
+        deflection = np.zeros(coords[0].size, dtype=np.float)
 
     assert(len(coords) in [1, 2])
     assert(len(locs) == len(coords))
     assert(loads.size == locs[0].size)
 
+    index = np.flatnonzero(loads)
+    loads = loads.flat[index]
+    locs = [dim.flat[index] for dim in locs]
+    coords = [np.ravel(dim) for dim in coords]
+    alpha = get_flexure_parameter(eet, youngs, len(locs),
+                                  gamma_mantle=gamma_mantle)
+
     if n_procs > 1:
-        _subside_in_parallel(deflection, loads, locs, coords, eet, youngs,
-                             gamma_mantle, n_procs=n_procs)
+        dz = _subside_in_parallel(loads, locs, coords, alpha, gamma_mantle,
+                                  n_procs=n_procs)
     else:
-        for index in loads.nonzero()[0]:
-            loc = [dim.flat[index] for dim in locs]
-            deflection += subside_point_load(loads.flat[index], loc,
-                                             coords, eet, youngs,
-                                             gamma_mantle)
+        dz = np.zeros(coords[0].size, dtype=np.float)
+        for block in _split_into_blocks(loads.size, coords[0].size):
+            _subside_block(dz, loads[block], [dim[block] for dim in locs],
+                           coords, alpha, gamma_mantle)
+
+    try:
+        deflection += dz
+    except ValueError:
+        dz.shape = deflection.shape
+        deflection += dz
+
     return deflection
 
 
-def _subside_point_load_helper(args):
-    return subside_point_load(*args)
+_MAX_BLOCK_VALUES = 2 ** 20
 
 
-def _subside_in_parallel(dz, loads, locs, coords, eet, youngs, gamma_mantle,
+def _split_into_blocks(n_loads, n_points, n_blocks=1):
+    """Split loads into blocks whose deflection arrays fit in memory.
+
+    There are at least *n_blocks* blocks (if there are that many loads),
+    and the arrays of each block hold no more than about *_MAX_BLOCK_VALUES*
+    deflections.
+    """
+    block_size = _MAX_BLOCK_VALUES // max(n_points, 1)
+    block_size = max(min(block_size, -(-n_loads // n_blocks)), 1)
+    return [slice(start, start + block_size)
+            for start in range(0, n_loads, block_size)]
+
+
+def _subside_block(dz, loads, locs, coords, alpha, gamma_mantle):
+    """Add the deflections due to a block of point loads to *dz*."""
+    if len(locs) == 2:
+        dz += _calculate_deflections(loads, locs, coords, alpha,
+                                     gamma_mantle=gamma_mantle)
+    else:
+        r = np.abs(coords[0][:, np.newaxis] - locs[0]) / alpha
+        c = loads / (2. * alpha * gamma_mantle)
+        dz += np.dot(np.exp(-r) * (np.cos(r) + np.sin(r)), c)
+
+
+_worker = {}
+
+
+def _init_subside_worker(loads, locs, coords, partial_sums, next_slot,
+                         alpha, gamma_mantle):
+    """Set up a worker process with views of the shared arrays.
+
+    Each worker claims its own row of *partial_sums* to add the
+    deflections of its blocks of loads to.
+    """
+    with next_slot.get_lock():
+        slot = next_slot.value
+        next_slot.value += 1
+
+    n_points = len(coords[0])
+    _worker.update(
+        loads=np.frombuffer(loads),
+        locs=[np.frombuffer(dim) for dim in locs],
+        coords=[np.frombuffer(dim) for dim in coords],
+        dz=np.frombuffer(partial_sums).reshape((-1, n_points))[slot],
+        alpha=alpha, gamma_mantle=gamma_mantle)
+
+
+def _subside_block_in_worker(block):
+    _subside_block(_worker['dz'], _worker['loads'][block],
+                   [dim[block] for dim in _worker['locs']],
+                   _worker['coords'], _worker['alpha'],
+                   _worker['gamma_mantle'])
+
+
+def _subside_in_parallel(loads, locs, coords, alpha, gamma_mantle,
                          n_procs=4):
-    args = []
-    for index in loads.nonzero()[0]:
-        loc = (locs[0].flat[index], locs[1].flat[index])
-        args.append((loads.flat[index], loc, coords, eet, youngs,
-                     gamma_mantle))
-
-    pool = Pool(processes=n_procs)
-
-    results = pool.map(_subside_point_load_helper, args)
-    for result in results:
-        try:
-            dz += result
-        except ValueError:
-            result.shape = dz.shape
-            dz += result
+    """Calculate deflections due to point loads with worker processes.
+
+    Loads are split into blocks that are mapped over a pool of *n_procs*
+    processes. Loads, their locations, and the coordinates of the points
+    are copied once into shared memory rather than sent with each block.
+    Each process adds the deflections of its blocks to its own partial sum
+    (also in shared memory), and the partial sums are added together at
+    the end.
+    """
+    n_points = coords[0].size
+    partial_sums = RawArray('d', n_procs * n_points)
+    next_slot = Value('i', 0)
+
+    blocks = _split_into_blocks(loads.size, n_points, n_blocks=4 * n_procs)
+
+    pool = Pool(processes=n_procs, initializer=_init_subside_worker,
+                initargs=(copy_to_shared_memory(loads),
+                          [copy_to_shared_memory(dim) for dim in locs],
+                          [copy_to_shared_memory(dim) for dim in coords],
+                          partial_sums, next_slot, alpha, gamma_mantle))
+    try:
+        pool.map(_subside_block_in_worker, blocks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    return np.frombuffer(partial_sums).reshape((n_procs, n_points)).sum(
+        axis=0)
 
 
 if __name__ == '__main__':
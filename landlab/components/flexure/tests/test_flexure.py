@@ -3,6 +3,7 @@
 Unit tests for landlab.components.flexure.flexure
 """
 from nose.tools import assert_equal, assert_true, assert_raises, with_setup
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 try:
     from nose.tools import assert_is_instance
 except ImportError:
@@ -11,6 +12,8 @@ import numpy as np
 
 from landlab import RasterModelGrid
 from landlab.components.flexure.flexure import Flexure
+from landlab.components.flexure import (subside_point_load,
+                                        subside_point_loads)
 
 
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e3, 10e3), (0., 0.))
@@ -87,3 +90,124 @@ def test_field_initialized_to_zero():
     for name in flex.grid['node']:
         field = flex.grid['node'][name]
         assert_true(np.all(field == 0.))
+
+
+def test_update_in_parallel():
+    grid = RasterModelGrid((15, 12), spacing=10e3)
+    flex = Flexure(grid, method='flexure')
+    load = grid.at_node['lithosphere__overlying_pressure_increment']
+    load[:] = np.random.RandomState(1).rand(grid.number_of_nodes) * 1e7
+    load[::3] = 0.
+    dz = grid.at_node['lithosphere_surface__elevation_increment']
+
+    flex.update()
+    expected = dz.copy()
+    assert_true(np.all(expected > 0.))
+
+    for n_procs in (2, 3):
+        flex.update(n_procs=n_procs)
+        assert_array_equal(dz, expected)
+
+
+def _add_point_loads_one_at_a_time(loads, locs, coords, params):
+    dz = np.zeros(coords[0].size)
+    for index in np.flatnonzero(loads):
+        loc = [dim[index] for dim in locs]
+        dz += subside_point_load(loads[index], loc, coords, params=params)
+    return dz
+
+
+def test_subside_point_loads():
+    params = dict(eet=6500., youngs=7e10)
+    x, y = np.meshgrid(np.arange(12.) * 1e3, np.arange(9.) * 1e3)
+    x.shape = (x.size, )
+    y.shape = (y.size, )
+    loads = np.random.RandomState(2).rand(x.size) * 1e9
+    loads[::2] = 0.
+    expected = _add_point_loads_one_at_a_time(loads, (x, y), (x, y), params)
+
+    for n_procs in (1, 2):
+        dz = subside_point_loads(loads, (x, y), (x, y), params=params,
+                                 n_procs=n_procs)
+        assert_array_almost_equal(dz / expected, 1.)
+
+
+def test_subside_point_loads_1d():
+    params = dict(eet=6500., youngs=7e10)
+    x = np.arange(50.) * 1e3
+    loads = np.random.RandomState(3).rand(x.size) * 1e9
+    expected = _add_point_loads_one_at_a_time(loads, (x, ), (x, ), params)
+
+    for n_procs in (1, 2):
+        dz = subside_point_loads(loads, (x, ), (x, ), params=params,
+                                 n_procs=n_procs)
+        assert_array_almost_equal(dz / expected, 1.)
+
+
+def test_subside_point_loads_adds_to_deflection():
+    x = np.arange(10.) * 1e3
+    loads = np.zeros(x.size)
+    loads[4] = 1e9
+    deflection = np.ones(x.size)
+    dz = subside_point_loads(loads, (x, ), (x, ), deflection=deflection)
+    assert_true(dz is deflection)
+    assert_array_almost_equal(
+        dz - 1., subside_point_load(1e9, (x[4], ), (x, )))
+
+
+def _deflect(shape, loads, **kwds):
+    grid = RasterModelGrid(shape, spacing=(10e3, 20e3))
+    flex = Flexure(grid, **kwds)
+    grid.at_node['lithosphere__overlying_pressure_increment'][:] = loads
+    flex.update()
+    return (grid.at_node['lithosphere_surface__elevation_increment'].reshape(
+        shape), flex)
+
+
+def test_fft_matches_flexure():
+    shape = (15, 22)
+    loads = np.random.RandomState(4).rand(shape[0] * shape[1]) * 1e7
+    expected, _ = _deflect(shape, loads, method='flexure')
+    actual, flex = _deflect(shape, loads, method='flexure_fft')
+    assert_equal(flex.padding, 'zeros')
+    assert_array_almost_equal(actual / expected, 1.)
+
+
+def test_fft_reflect_padding():
+    shape = (9, 12)
+    loads = np.random.RandomState(5).rand(shape[0] * shape[1]) * 1e7
+    mirrored = np.pad(loads.reshape(shape), ((8, ), (11, )), mode='reflect')
+    expected, _ = _deflect(mirrored.shape, mirrored.flat, method='flexure')
+    actual, _ = _deflect(shape, loads, method='flexure_fft',
+                         padding='reflect')
+    assert_array_almost_equal(actual / expected[8:17, 11:23], 1.)
+
+
+def test_fft_periodic_padding():
+    shape = (10, 16)
+    loads = np.full(shape[0] * shape[1], 1e6)
+    dz, _ = _deflect(shape, loads, method='flexure_fft', padding='periodic')
+    assert_array_almost_equal(dz / dz[0, 0], 1.)
+
+    loads = np.zeros(shape)
+    loads[0, 0] = 1e6
+    dz, _ = _deflect(shape, loads.flat, method='flexure_fft',
+                     padding='periodic')
+    assert_array_almost_equal(dz[1], dz[-1])
+    assert_array_almost_equal(dz[:, 1], dz[:, -1])
+
+
+def test_fft_after_changing_eet():
+    shape = (10, 12)
+    loads = np.random.RandomState(6).rand(shape[0] * shape[1]) * 1e7
+    dz, flex = _deflect(shape, loads, method='flexure_fft')
+    flex.eet = 20e3
+    flex.update()
+    expected, _ = _deflect(shape, loads, method='flexure', eet=20e3)
+    assert_array_almost_equal(dz / expected, 1.)
+
+
+def test_bad_padding():
+    grid = RasterModelGrid((5, 5), spacing=10e3)
+    assert_raises(ValueError, Flexure, grid, method='flexure_fft',
+                  padding='edge')
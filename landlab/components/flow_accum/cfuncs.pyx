@@ -11,21 +11,263 @@ ctypedef np.int_t DTYPE_INT_t
 cpdef _add_to_stack(DTYPE_INT_t l, DTYPE_INT_t j,
                     np.ndarray[DTYPE_INT_t, ndim=1] s,
                     np.ndarray[DTYPE_INT_t, ndim=1] delta,
-                    np.ndarray[DTYPE_INT_t, ndim=1] donors):
+                    np.ndarray[DTYPE_INT_t, ndim=1] donors,
+                    np.ndarray[DTYPE_INT_t, ndim=1] to_visit):
 
     """
     Adds node l to the stack and increments the current index (j).
+
+    The nodes upstream of l are added with an explicit, depth-first walk
+    rather than by recursion so that long drainages cannot exceed the
+    recursion limit. The resulting order is the same as that of Braun &
+    Willett's recursive add_to_stack.
+
+    to_visit is a work array as long as s. Callers that add many nodes
+    allocate it once and pass it to every call.
+    """
+    return _add_to_stack_iterative(l, j, s, delta, donors, to_visit)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef DTYPE_INT_t _add_to_stack_iterative(
+        DTYPE_INT_t l, DTYPE_INT_t j,
+        np.ndarray[DTYPE_INT_t, ndim=1] s,
+        np.ndarray[DTYPE_INT_t, ndim=1] delta,
+        np.ndarray[DTYPE_INT_t, ndim=1] donors,
+        np.ndarray[DTYPE_INT_t, ndim=1] to_visit):
+
+    """
+    Adds node l, and all nodes upstream of it, to the stack.
+
+    to_visit is a work array, at least as long as the number of nodes
+    upstream of l, that holds the nodes still to be added. Donors are pushed
+    in reverse order so that they are popped (and so added to the stack) in
+    the same order in which the recursive algorithm visits them.
+    """
+    cdef DTYPE_INT_t m, n, node
+    cdef DTYPE_INT_t top = 0
+
+    to_visit[0] = l
+    top = 1
+    while top > 0:
+        top -= 1
+        node = to_visit[top]
+        s[j] = node
+        j += 1
+        for n in range(delta[node + 1] - 1, delta[node] - 1, -1):
+            m = donors[n]
+            if m != node:
+                to_visit[top] = m
+                top += 1
+
+    return j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _make_ordered_node_array(np.ndarray[DTYPE_INT_t, ndim=1] baselevel_nodes,
+                               np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                               np.ndarray[DTYPE_INT_t, ndim=1] donors,
+                               np.ndarray[DTYPE_INT_t, ndim=1] s):
+
     """
-    cdef int m, n, delta_l, delta_lplus1
+    Builds the downstream-to-upstream stack, s, from every base-level node.
 
-    s[j] = l
-    j += 1
-    delta_l = delta[l]
-    delta_lplus1 = delta[l+1]
+    Parameters
+    ----------
+    baselevel_nodes : ndarray of int
+        Nodes that are their own receivers.
+    delta : ndarray of int
+        Index into donors where each node's list of donors begins.
+    donors : ndarray of int
+        Donors of each node.
+    s : ndarray of int
+        The stack. Modified in place.
 
-    for n in range(delta_l, delta_lplus1):
-        m = donors[n]
-        if m != l:
-            j = _add_to_stack(m, j, s, delta, donors)
+    Returns
+    -------
+    int
+        Number of nodes added to the stack.
+    """
+    cdef DTYPE_INT_t j = 0
+    cdef DTYPE_INT_t k
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] to_visit = np.empty(len(s),
+                                                             dtype=DTYPE)
+
+    for k in range(len(baselevel_nodes)):
+        j = _add_to_stack_iterative(baselevel_nodes[k], j, s, delta, donors,
+                                    to_visit)
 
     return j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _make_delta_and_donors(np.ndarray[DTYPE_INT_t, ndim=1] r,
+                             np.ndarray[DTYPE_INT_t, ndim=1] delta,
+                             np.ndarray[DTYPE_INT_t, ndim=1] donors):
+
+    """
+    Builds the delta and donors arrays of Braun & Willett (2012).
+
+    Parameters
+    ----------
+    r : ndarray of int
+        Receiver IDs for each node.
+    delta : ndarray of int, length (number of nodes + 1)
+        Index into donors where each node's list of donors begins. Modified
+        in place.
+    donors : ndarray of int
+        Donors of each node, ordered by node ID for each receiver. Modified
+        in place.
+    """
+    cdef DTYPE_INT_t n_nodes = len(r)
+    cdef DTYPE_INT_t i, ri
+
+    # count the number of donors of each node, offset by one so that a
+    # cumulative sum gives the starting index of each donor list.
+    for i in range(n_nodes + 1):
+        delta[i] = 0
+    for i in range(n_nodes):
+        delta[r[i] + 1] += 1
+    for i in range(n_nodes):
+        delta[i + 1] += delta[i]
+
+    # fill the donor lists, temporarily advancing each node's start index
+    # and then shifting it back.
+    for i in range(n_nodes):
+        ri = r[i]
+        donors[delta[ri]] = i
+        delta[ri] += 1
+    for i in range(n_nodes, 0, -1):
+        delta[i] = delta[i - 1]
+    delta[0] = 0
+
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _accumulate_bw(DTYPE_INT_t np,
+                     np.ndarray[DTYPE_INT_t, ndim=1] s,
+                     np.ndarray[DTYPE_INT_t, ndim=1] r,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                     np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+
+    """
+    Accumulates drainage area and discharge for route-to-one flow.
+
+    Parameters
+    ----------
+    np : int
+        Number of nodes.
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs.
+    r : ndarray of int
+        Receiver IDs for each node.
+    drainage_area : ndarray of float
+        Drainage area at each node. Modified in place.
+    discharge : ndarray of float
+        Discharge at each node. Modified in place.
+    """
+    cdef int donor, recvr, i
+
+    # Iterate backward through the list, which means we work from upstream to
+    # downstream.
+    for i in range(np - 1, -1, -1):
+        donor = s[i]
+        recvr = r[donor]
+        if donor != recvr:
+            drainage_area[recvr] += drainage_area[donor]
+            discharge[recvr] += discharge[donor]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _accumulate_to_n(DTYPE_INT_t np, DTYPE_INT_t q,
+                       np.ndarray[DTYPE_INT_t, ndim=1] s,
+                       np.ndarray[DTYPE_INT_t, ndim=2] r,
+                       np.ndarray[DTYPE_FLOAT_t, ndim=2] p,
+                       np.ndarray[DTYPE_FLOAT_t, ndim=1] drainage_area,
+                       np.ndarray[DTYPE_FLOAT_t, ndim=1] discharge):
+
+    """
+    Accumulates drainage area and discharge for route-to-multiple flow.
+
+    Parameters
+    ----------
+    np : int
+        Number of nodes.
+    q : int
+        Maximum number of receivers at any node.
+    s : ndarray of int
+        Ordered (downstream to upstream) array of node IDs.
+    r : ndarray of int, shape (np, q)
+        Receiver IDs for each node.
+    p : ndarray of float, shape (np, q)
+        Proportion of flow going from each node to each of its receivers.
+    drainage_area : ndarray of float
+        Drainage area at each node. Modified in place.
+    discharge : ndarray of float
+        Discharge at each node. Modified in place.
+    """
+    cdef int donor, recvr, i, v
+    cdef double proportion
+
+    # Iterate backward through the list, which means we work from upstream to
+    # downstream.
+    for i in range(np - 1, -1, -1):
+        donor = s[i]
+        for v in range(q):
+            proportion = p[donor, v]
+            if proportion > 0.:
+                recvr = r[donor, v]
+                if donor != recvr:
+                    drainage_area[recvr] += proportion * drainage_area[donor]
+                    discharge[recvr] += proportion * discharge[donor]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cpdef _find_roots(np.ndarray[DTYPE_INT_t, ndim=1] nodes,
+                  np.ndarray[DTYPE_INT_t, ndim=1] r,
+                  np.ndarray[DTYPE_INT_t, ndim=1] root_of,
+                  np.ndarray[DTYPE_INT_t, ndim=1] roots):
+
+    """
+    Finds the base-level node that each of a set of nodes drains to.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes whose roots are to be found.
+    r : ndarray of int
+        Receiver IDs for each node.
+    root_of : ndarray of int
+        Work array, one per node, that must be -1 everywhere on input. Roots
+        of the nodes visited are recorded here so that each downstream path
+        is walked only once.
+    roots : ndarray of int
+        Root of each of the nodes. Modified in place.
+    """
+    cdef DTYPE_INT_t k, node, root
+
+    for k in range(len(nodes)):
+        node = nodes[k]
+        while root_of[node] < 0 and r[node] != node:
+            node = r[node]
+        if root_of[node] < 0:
+            root = node
+        else:
+            root = root_of[node]
+
+        node = nodes[k]
+        while root_of[node] < 0 and r[node] != node:
+            root_of[node] = root
+            node = r[node]
+        root_of[node] = root
+
+        roots[k] = root
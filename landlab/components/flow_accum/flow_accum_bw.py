@@ -26,7 +26,8 @@ Created: GT Nov 2013
 """
 import numpy
 from six.moves import range
-from .cfuncs import _add_to_stack
+from .cfuncs import (_add_to_stack, _accumulate_bw, _make_delta_and_donors,
+                     _make_ordered_node_array)
 
 class _DrainageStack():
 
@@ -51,6 +52,7 @@ class _DrainageStack():
         self.s = numpy.zeros(len(D), dtype=int)
         self.delta = delta
         self.D = D
+        self._to_visit = numpy.empty(len(D), dtype=int)
 
     def add_to_stack(self, l):
 
@@ -70,7 +72,8 @@ class _DrainageStack():
         array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
         """
         # we invoke cython here to attempt to suppress Python's RecursionLimit
-        self.j = _add_to_stack(l, self.j, self.s, self.delta, self.D)
+        self.j = _add_to_stack(l, self.j, self.s, self.delta, self.D,
+                               self._to_visit)
 
 
 def _make_number_of_donors_array(r):
@@ -210,7 +213,45 @@ def _make_array_of_donors(r, delta):
     #return D
 
 
-def make_ordered_node_array(receiver_nodes):
+def _make_delta_and_donors_arrays(r):
+
+    """Delta and donor arrays.
+
+    Creates and returns both the "delta" array and the array of donors in a
+    single compiled pass over the receivers. This is equivalent to calling
+    _make_number_of_donors_array, _make_delta_array and
+    _make_array_of_donors in turn.
+
+    Parameters
+    ----------
+    r : ndarray
+        ID of receiver for each node.
+
+    Returns
+    -------
+    tuple of ndarray of int
+        Delta array and array of donors.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_bw import(
+    ... _make_delta_and_donors_arrays)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> delta, D = _make_delta_and_donors_arrays(r)
+    >>> delta
+    array([ 0,  0,  2,  2,  2,  6,  7,  9, 10, 10, 10])
+    >>> D
+    array([0, 2, 1, 4, 5, 7, 6, 3, 8, 9])
+    """
+    r = numpy.asarray(r, dtype=int)
+    delta = numpy.empty(len(r) + 1, dtype=int)
+    D = numpy.empty(len(r), dtype=int)
+    _make_delta_and_donors(r, delta, D)
+    return delta, D
+
+
+def make_ordered_node_array(receiver_nodes, delta=None, D=None):
 
     """Create an array of node IDs that is arranged in order from.
 
@@ -220,6 +261,18 @@ def make_ordered_node_array(receiver_nodes):
     The lack of a leading underscore is meant to signal that this operation
     could be useful outside of this module!
 
+    The stack is built without recursion, so its construction is O(N) and is
+    not limited by the length of the longest drainage.
+
+    Parameters
+    ----------
+    receiver_nodes : ndarray of int
+        ID of receiver for each node.
+    delta : ndarray of int, optional
+        Delta array, if already calculated.
+    D : ndarray of int, optional
+        Array of donors, if already calculated.
+
     Examples
     --------
     >>> import numpy as np
@@ -229,17 +282,17 @@ def make_ordered_node_array(receiver_nodes):
     >>> s
     array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
     """
+    receiver_nodes = numpy.asarray(receiver_nodes, dtype=int)
+    if delta is None or D is None:
+        delta, D = _make_delta_and_donors_arrays(receiver_nodes)
     node_id = numpy.arange(receiver_nodes.size)
     baselevel_nodes = numpy.where(node_id==receiver_nodes)[0]
-    nd = _make_number_of_donors_array(receiver_nodes)
-    delta = _make_delta_array(nd)
-    D = _make_array_of_donors(receiver_nodes, delta)
-    dstack = _DrainageStack(delta, D)
-    add_it = dstack.add_to_stack
-    for k in baselevel_nodes:
-        add_it(k) #don't think this is a bottleneck, so no C++
 
-    return dstack.s
+    s = numpy.zeros(receiver_nodes.size, dtype=int)
+    _make_ordered_node_array(baselevel_nodes, numpy.asarray(delta, dtype=int),
+                             numpy.asarray(D, dtype=int), s)
+
+    return s
 
 
 def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
@@ -307,16 +360,47 @@ def find_drainage_area_and_discharge(s, r, node_cell_area=1.0, runoff=1.0,
         discharge[boundary_nodes] = 0
 
     # Iterate backward through the list, which means we work from upstream to
-    # downstream.
-    for i in range(np-1, -1, -1):
+    # downstream. The compiled kernel needs float arrays; anything else (e.g.
+    # integer cell areas and runoff) goes through the pure-Python loop.
+    if (drainage_area.dtype == numpy.float64 and
+            discharge.dtype == numpy.float64):
+        _accumulate_bw(np, numpy.asarray(s, dtype=int),
+                       numpy.asarray(r, dtype=int), drainage_area, discharge)
+    else:
+        _accumulate_drainage_area_and_discharge(s, r, drainage_area,
+                                                discharge)
+
+    return drainage_area, discharge
+
+
+def _accumulate_drainage_area_and_discharge(s, r, drainage_area, discharge):
+
+    """Accumulate drainage area and discharge in pure Python.
+
+    This is the reference implementation of the compiled kernel used by
+    find_drainage_area_and_discharge(). The drainage_area and discharge
+    arrays are modified in place.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_bw import(
+    ... _accumulate_drainage_area_and_discharge)
+    >>> r = np.array([2, 5, 2, 7, 5, 5, 6, 5, 7, 8])-1
+    >>> s = np.array([4, 1, 0, 2, 5, 6, 3, 8, 7, 9])
+    >>> a = np.ones(10)
+    >>> q = np.ones(10)
+    >>> _accumulate_drainage_area_and_discharge(s, r, a, q)
+    >>> a
+    array([  1.,   3.,   1.,   1.,  10.,   4.,   3.,   2.,   1.,   1.])
+    """
+    for i in range(len(s)-1, -1, -1):
         donor = s[i]
         recvr = r[donor]
         if donor != recvr:
             drainage_area[recvr] += drainage_area[donor]
             discharge[recvr] += discharge[donor]
 
-    return drainage_area, discharge
-
 
 def flow_accumulation(receiver_nodes, node_cell_area=1.0,
                       runoff_rate=1.0, boundary_nodes=None):
@@ -48,6 +48,7 @@ Created: KRB Oct 2016 (modified from flow_accumu_bw)
 """
 import numpy
 from six.moves import range
+from .cfuncs import _accumulate_to_n
 
 class _DrainageStack_to_n():
 
@@ -549,8 +550,65 @@ def find_drainage_area_and_discharge_to_n(s, r, p, node_cell_area=1.0,
         discharge[boundary_nodes] = 0
 
     # Iterate backward through the list, which means we work from upstream to
-    # downstream.
-    for i in range(np-1, -1, -1):
+    # downstream. The compiled kernel needs float arrays; anything else goes
+    # through the pure-Python loop.
+    if (drainage_area.dtype == numpy.float64 and
+            discharge.dtype == numpy.float64):
+        _accumulate_to_n(np, q, numpy.asarray(s, dtype=int),
+                         numpy.asarray(r, dtype=int),
+                         numpy.asarray(p, dtype=float),
+                         drainage_area, discharge)
+    else:
+        _accumulate_drainage_area_and_discharge_to_n(s, r, p, drainage_area,
+                                                     discharge)
+
+    return drainage_area, discharge
+
+
+def _accumulate_drainage_area_and_discharge_to_n(s, r, p, drainage_area,
+                                                 discharge):
+
+    """Accumulate route-to-multiple drainage area and discharge in Python.
+
+    This is the reference implementation of the compiled kernel used by
+    find_drainage_area_and_discharge_to_n(). The drainage_area and discharge
+    arrays are modified in place.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.flow_accum.flow_accum_to_n import(
+    ... _accumulate_drainage_area_and_discharge_to_n)
+    >>> r = np.array([[ 1,  2],
+    ...               [ 4,  5],
+    ...               [ 1,  5],
+    ...               [ 6,  2],
+    ...               [ 4, -1],
+    ...               [ 4, -1],
+    ...               [ 5,  7],
+    ...               [ 4,  5],
+    ...               [ 6,  7],
+    ...               [ 7,  8]])
+    >>> p = np.array([[ 0.6,   0.4 ],
+    ...               [ 0.85,  0.15],
+    ...               [ 0.65,  0.35],
+    ...               [ 0.9,   0.1 ],
+    ...               [ 1.,    0.  ],
+    ...               [ 1.,    0.  ],
+    ...               [ 0.75,  0.25],
+    ...               [ 0.55,  0.45],
+    ...               [ 0.8,   0.2 ],
+    ...               [ 0.95,  0.05]])
+    >>> s = np.array([4, 5, 1, 7, 2, 6, 0, 8, 3, 9])
+    >>> a = np.ones(10)
+    >>> q = np.ones(10)
+    >>> _accumulate_drainage_area_and_discharge_to_n(s, r, p, a, q)
+    >>> a
+    array([  1.    ,   2.575 ,   1.5   ,   1.    ,  10.    ,   5.2465,
+             2.74  ,   2.845 ,   1.05  ,   1.    ])
+    """
+    q = r.shape[1]
+    for i in range(len(s)-1, -1, -1):
         donor = s[i]
         for v in range(q):
             recvr = r[donor, v]
@@ -560,27 +618,6 @@ def find_drainage_area_and_discharge_to_n(s, r, p, node_cell_area=1.0,
                     drainage_area[recvr] += proportion*drainage_area[donor]
                     discharge[recvr] += proportion*discharge[donor]
 
-#        donors = s[i]
-#        #print donors
-#        recvrs = r[donors, :].flatten()
-#
-#        if (set(donors)-set(recvrs[recvrs!=-1]))==set(donors):
-#            recvrs = r[donors, :].flatten()
-#
-#            unique_recvrs=numpy.unique(recvrs)
-#
-#            proportions = p[donors, :].flatten()
-#
-#            new_da=proportions*numpy.repeat(drainage_area[donors], q)
-#            new_di=proportions*numpy.repeat(discharge[donors], q)
-#
-#            for u_r in unique_recvrs:
-#                ur_ind=np.where(recvrs==u_r)
-#
-#                drainage_area[u_r] += numpy.sum(new_da[ur_ind])
-#                discharge[u_r] += numpy.sum(new_di[ur_ind])
-
-    return drainage_area, discharge
 
 
 def flow_accumulation_to_n(receiver_nodes,
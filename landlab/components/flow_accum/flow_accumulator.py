@@ -20,6 +20,9 @@ from landlab.utils.decorators import use_field_name_or_array
 
 from landlab.components.flow_accum import flow_accum_bw
 from landlab.components.flow_accum import flow_accum_to_n
+from landlab.components.flow_accum.cfuncs import (_accumulate_bw,
+                                                  _find_roots,
+                                                  _make_ordered_node_array)
 
 from landlab import BAD_INDEX_VALUE
 import six
@@ -128,10 +131,21 @@ class FlowAccumulator(Component):
         the time of initialization, runoff_rate will *overwrite* the field.
         If neither are set, defaults to spatially constant unit input.
     depression_finder : string, class, instance of class, optional
-         A string of class name (e.g., 'DepressionFinderAndRouter'), an
+         A string of class name (e.g., 'DepressionFinderAndRouter' or
+         'PriorityFloodDepressionFinder'), an
          uninstantiated DepressionFinder class, or an instance of a
          DepressionFinder class.
          This sets the method for depression finding.
+    incremental : bool, optional
+        If True, after the first step only the drainage basins in which
+        receivers (or runoff) have changed since the previous step have their
+        part of the stack rebuilt and their flow reaccumulated. Results are
+        identical to a full recompute. Only used for route-to-one flow
+        directors without a depression finder; otherwise ignored.
+    check_incremental : bool, optional
+        Debugging switch. If True, every incremental update is checked
+        against a full recompute and a RuntimeError is raised if they
+        differ.
     **kwargs : any additional parameters to pass to a FlowDirector instance
         (e.g., partion_method for FlowDirectorMFD)
 
@@ -522,6 +536,22 @@ class FlowAccumulator(Component):
     array([8])
     >>> fa.depression_finder.lake_areas  # the area of each lake in lake_codes
     array([ 2.25])
+
+    In long runs, usually only a few receivers change from one step to the
+    next. With ``incremental=True`` the stack and drainage area are then
+    rebuilt only for the basins that contain a changed receiver.
+
+    >>> mg = RasterModelGrid((5, 5), spacing=(1, 1))
+    >>> z = mg.add_field('topographic__elevation',
+    ...                  mg.node_x + 2. * mg.node_y, at='node')
+    >>> fa = FlowAccumulator(mg, incremental=True, check_incremental=True)
+    >>> fa.run_one_step()
+    >>> mg.at_node['drainage_area'][5:10]
+    array([ 0.,  3.,  3.,  3.,  0.])
+    >>> z[8] = 0.5
+    >>> fa.run_one_step()
+    >>> mg.at_node['drainage_area'][5:10]
+    array([ 0.,  3.,  3.,  6.,  0.])
     """
 
     _name = 'FlowAccumulator'
@@ -592,6 +622,8 @@ class FlowAccumulator(Component):
                  flow_director='FlowDirectorSteepest',
                  runoff_rate=None,
                  depression_finder=None,
+                 incremental=False,
+                 check_incremental=False,
                  **kwargs):
         """
         Initialize the FlowAccumulator component.
@@ -686,6 +718,10 @@ class FlowAccumulator(Component):
 
         self.nodes_not_in_stack = True
 
+        self._incremental = incremental
+        self._check_incremental = check_incremental
+        self._stack_state = None
+
     @property
     def node_drainage_area(self):
         """Return the drainage area."""
@@ -826,7 +862,8 @@ class FlowAccumulator(Component):
 
     def _add_depression_finder(self,depression_finder):
         """Test and add the depression finder component."""
-        PERMITTED_DEPRESSION_FINDERS = ['DepressionFinderAndRouter']
+        PERMITTED_DEPRESSION_FINDERS = ['DepressionFinderAndRouter',
+                                        'PriorityFloodDepressionFinder']
 
         # now do a similar thing for the depression finder.
         self.depression_finder_provided = depression_finder
@@ -843,8 +880,10 @@ class FlowAccumulator(Component):
             # depression finder is provided as a string.
             if isinstance(self.depression_finder_provided, six.string_types):
 
-                from landlab.components import DepressionFinderAndRouter
-                DEPRESSION_METHODS = {'DepressionFinderAndRouter': DepressionFinderAndRouter
+                from landlab.components import (DepressionFinderAndRouter,
+                                                PriorityFloodDepressionFinder)
+                DEPRESSION_METHODS = {'DepressionFinderAndRouter': DepressionFinderAndRouter,
+                                      'PriorityFloodDepressionFinder': PriorityFloodDepressionFinder
                                     }
 
                 try:
@@ -917,22 +956,28 @@ class FlowAccumulator(Component):
                 r = self._grid['node']['flow__receiver_node']
     
                 # step 2. Stack, D, delta construction
-                nd = flow_accum_bw._make_number_of_donors_array(r)
-                delta = flow_accum_bw._make_delta_array(nd)
-                D = flow_accum_bw._make_array_of_donors(r, delta)
-                s = flow_accum_bw.make_ordered_node_array(r)
-    
+                delta, D = flow_accum_bw._make_delta_and_donors_arrays(r)
+                if self._incremental and self._stack_state is not None:
+                    # steps 2 and 4 for only the basins that have changed.
+                    s, a, q = self._update_stack_and_accumulate(r, delta, D)
+                else:
+                    s = flow_accum_bw.make_ordered_node_array(r, delta=delta,
+                                                              D=D)
+
+                    # step 4. Accumulate (to one or to N depending on direction method. )
+                    a, q = flow_accum_bw.find_drainage_area_and_discharge(s,
+                                                                          r,
+                                                                          self.node_cell_area,
+                                                                          self._grid.at_node['water__unit_flux_in'])
+                    if self._incremental:
+                        self._save_stack_state(r, s, a, q)
+
                 # put theese in grid so that depression finder can use it.
                 # store the generated data in the grid
                 self._grid['node']['flow__data_structure_delta'][:] = delta[1:]
                 self._grid['link']['flow__data_structure_D'][:len(D)] = D
                 self._grid['node']['flow__upstream_node_order'][:] = s
 
-                # step 4. Accumulate (to one or to N depending on direction method. )
-                a, q = flow_accum_bw.find_drainage_area_and_discharge(s,
-                                                                      r,
-                                                                      self.node_cell_area,
-                                                                      self._grid.at_node['water__unit_flux_in'])
                 self._grid['node']['drainage_area'][:] = a
                 self._grid['node']['surface_water__discharge'][:] = q
 
@@ -978,6 +1023,107 @@ class FlowAccumulator(Component):
 
         return (a, q)
 
+    def _save_stack_state(self, r, s, a, q):
+        """Store the stack, split by basin, for later incremental updates."""
+        starts = np.flatnonzero(r[s] == s)
+        sizes = np.diff(np.append(starts, s.size))
+        roots = s[starts]
+
+        basin_root = np.empty_like(r)
+        basin_root[s] = np.repeat(roots, sizes)
+
+        self._stack_state = {
+            'receivers': r.copy(),
+            'runoff': self._grid.at_node['water__unit_flux_in'].copy(),
+            'stack': s.copy(),
+            'roots': roots,
+            'starts': starts,
+            'sizes': sizes,
+            'basin_root': basin_root,
+            'drainage_area': np.array(a, dtype=float),
+            'discharge': np.array(q, dtype=float),
+        }
+
+    def _update_stack_and_accumulate(self, r, delta, D):
+        """Rebuild the stack and accumulate flow only where it has changed.
+
+        A basin (all nodes that drain to the same base-level node) is rebuilt
+        if it contains, either before or after this step, a node whose
+        receiver or runoff rate has changed. The stack of every other basin
+        is unchanged, and so is copied from the previous step along with its
+        drainage areas and discharges. Basins are independent of one another
+        and their stacks are built in the same way as for a full recompute,
+        so the results are identical to it.
+        """
+        state = self._stack_state
+        runoff = self._grid.at_node['water__unit_flux_in']
+
+        changed = np.flatnonzero((r != state['receivers']) |
+                                 (runoff != state['runoff']))
+        if changed.size == 0:
+            return (state['stack'].copy(), state['drainage_area'].copy(),
+                    state['discharge'].copy())
+
+        now_root = r[changed] == changed
+        roots = np.union1d(np.setdiff1d(state['roots'], changed[~now_root]),
+                           changed[now_root])
+
+        new_roots = np.empty_like(changed)
+        _find_roots(changed, r, np.full(r.size, -1, dtype=int), new_roots)
+        affected = np.intersect1d(
+            np.union1d(state['basin_root'][changed], new_roots), roots)
+
+        # stack, drainage area and discharge of the changed basins.
+        s_affected = np.empty(r.size, dtype=int)
+        n_affected = _make_ordered_node_array(affected, delta, D, s_affected)
+        s_affected = s_affected[:n_affected]
+        starts_affected = np.flatnonzero(r[s_affected] == s_affected)
+        sizes_affected = np.diff(np.append(starts_affected, n_affected))
+
+        a = state['drainage_area']
+        q = state['discharge']
+        a[s_affected] = self.node_cell_area[s_affected]
+        q[s_affected] = self.node_cell_area[s_affected] * runoff[s_affected]
+        _accumulate_bw(n_affected, s_affected, r, a, q)
+
+        # splice the rebuilt basins into the old stack, ordered by root.
+        is_affected = np.in1d(roots, affected)
+        old_index = np.searchsorted(state['roots'], roots)
+        old_index[is_affected] = 0
+        new_index = np.searchsorted(affected, roots)
+        new_index[~is_affected] = 0
+
+        old_stack = state['stack']
+        src_starts = np.where(is_affected,
+                              old_stack.size + starts_affected[new_index],
+                              state['starts'][old_index])
+        sizes = np.where(is_affected, sizes_affected[new_index],
+                         state['sizes'][old_index])
+        starts = np.cumsum(sizes) - sizes
+        s = np.concatenate((old_stack, s_affected))[
+            np.repeat(src_starts - starts, sizes) + np.arange(sizes.sum())]
+
+        state['basin_root'][s_affected] = np.repeat(affected, sizes_affected)
+        state['receivers'][:] = r
+        state['runoff'][:] = runoff
+        state['stack'] = s
+        state['roots'] = roots
+        state['starts'] = starts
+        state['sizes'] = sizes
+
+        if self._check_incremental:
+            s_full = flow_accum_bw.make_ordered_node_array(r, delta=delta,
+                                                           D=D)
+            a_full, q_full = flow_accum_bw.find_drainage_area_and_discharge(
+                s_full, r, self.node_cell_area, runoff)
+            if not (np.array_equal(s, s_full) and
+                    np.array_equal(a, a_full) and
+                    np.array_equal(q, q_full)):
+                raise RuntimeError('incremental flow accumulation does not '
+                                   'match a full recompute')
+
+        return s, a.copy(), q.copy()
+
     def run_one_step(self):
         """
         Accumulate flow and save to the model grid.
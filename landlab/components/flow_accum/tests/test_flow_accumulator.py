@@ -276,3 +276,111 @@ def test_accumulated_area_closes():
         drained_area = np.sum(drainage_area[mg.boundary_nodes])
         core_area = np.sum(mg.cell_area_at_node[mg.core_nodes])
         assert_equal(drained_area, core_area)
+
+
+def test_compiled_accumulation_matches_python():
+    """Check the compiled accumulation kernels against the Python loops."""
+    from landlab.components.flow_accum.flow_accum_bw import (
+        _accumulate_drainage_area_and_discharge)
+    from landlab.components.flow_accum.flow_accum_to_n import (
+        _accumulate_drainage_area_and_discharge_to_n,
+        find_drainage_area_and_discharge_to_n)
+    from landlab.components.flow_accum import (
+        find_drainage_area_and_discharge)
+
+    for fd in ['D4', 'D8', 'MFD', 'DINF']:
+        mg = RasterModelGrid((20, 30), spacing=(1, 1))
+        np.random.seed(42)
+        z = mg.add_field('topographic__elevation',
+                         mg.node_x + mg.node_y + np.random.rand(600),
+                         at='node')
+        runoff = np.random.rand(600)
+        fa = FlowAccumulator(mg, flow_director=fd)
+        fa.run_one_step()
+        s = mg.at_node['flow__upstream_node_order']
+        area = mg.cell_area_at_node
+
+        a_ref = area.copy()
+        q_ref = area * runoff
+        if fa.flow_director.to_n_receivers == 'one':
+            r = mg.at_node['flow__receiver_node']
+            a, q = find_drainage_area_and_discharge(s, r, area, runoff)
+            _accumulate_drainage_area_and_discharge(s, r, a_ref, q_ref)
+        else:
+            r = mg.at_node['flow__receiver_nodes']
+            p = mg.at_node['flow__receiver_proportions']
+            a, q = find_drainage_area_and_discharge_to_n(s, r, p, area,
+                                                         runoff)
+            _accumulate_drainage_area_and_discharge_to_n(s, r, p, a_ref,
+                                                         q_ref)
+        assert_array_equal(a, a_ref)
+        assert_array_equal(q, q_ref)
+
+
+def test_delta_and_donors_in_one_pass():
+    """Check the one-pass delta and donor arrays against the originals."""
+    from landlab.components.flow_accum import flow_accum_bw
+
+    np.random.seed(7)
+    mg = RasterModelGrid((25, 40), spacing=(1, 1))
+    mg.add_field('topographic__elevation',
+                 mg.node_x + mg.node_y + np.random.rand(1000), at='node')
+    fa = FlowAccumulator(mg, flow_director='D8')
+    fa.run_one_step()
+    r = mg.at_node['flow__receiver_node']
+
+    nd = flow_accum_bw._make_number_of_donors_array(r)
+    delta = flow_accum_bw._make_delta_array(nd)
+    D = flow_accum_bw._make_array_of_donors(r, delta)
+
+    delta_1, D_1 = flow_accum_bw._make_delta_and_donors_arrays(r)
+    assert_array_equal(delta_1, delta)
+    assert_array_equal(D_1, D)
+
+    ds = flow_accum_bw._DrainageStack(delta, D)
+    for k in np.where(r == np.arange(r.size))[0]:
+        ds.add_to_stack(k)
+    assert_array_equal(flow_accum_bw.make_ordered_node_array(r), ds.s)
+
+
+def test_stack_for_long_single_drainage():
+    """Check the stack is built without recursion for a long drainage."""
+    from landlab.components.flow_accum import make_ordered_node_array
+
+    n_nodes = 1000000
+    r = np.arange(n_nodes) - 1
+    r[0] = 0
+    s = make_ordered_node_array(r)
+    assert_array_equal(s, np.arange(n_nodes))
+
+
+def test_incremental_matches_full_recompute():
+    """Check incremental accumulation against a full recompute."""
+    np.random.seed(11)
+    for fd in ['D4', 'D8']:
+        mg0 = RasterModelGrid((30, 40), spacing=(1, 1))
+        z0 = mg0.add_field('topographic__elevation',
+                           mg0.node_x + mg0.node_y + np.random.rand(1200),
+                           at='node')
+        mg1 = RasterModelGrid((30, 40), spacing=(1, 1))
+        z1 = mg1.add_field('topographic__elevation', z0.copy(), at='node')
+
+        fa0 = FlowAccumulator(mg0, flow_director=fd)
+        fa1 = FlowAccumulator(mg1, flow_director=fd, incremental=True,
+                              check_incremental=True)
+        for _ in range(20):
+            dz = np.zeros(1200)
+            changed = np.random.randint(0, 1200, size=10)
+            dz[changed] = np.random.rand(10) - 0.5
+            z0 += dz
+            z1 += dz
+            mg0.at_node['water__unit_flux_in'][changed[0]] += 1.
+            mg1.at_node['water__unit_flux_in'][changed[0]] += 1.
+
+            fa0.run_one_step()
+            fa1.run_one_step()
+
+            for name in ('drainage_area', 'surface_water__discharge',
+                         'flow__upstream_node_order',
+                         'flow__data_structure_delta'):
+                assert_array_equal(mg0.at_node[name], mg1.at_node[name])
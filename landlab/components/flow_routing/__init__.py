@@ -1,8 +1,10 @@
 from .route_flow_dn import FlowRouter
 from .lake_mapper import DepressionFinderAndRouter
+from .priority_flood_mapper import PriorityFloodDepressionFinder
 from ..flow_director import flow_direction_DN
 from ..flow_director.flow_direction_DN import(grid_flow_directions,
                                               flow_directions)
 
-__all__ = ['FlowRouter', 'DepressionFinderAndRouter', 'grid_flow_directions',
+__all__ = ['FlowRouter', 'DepressionFinderAndRouter',
+           'PriorityFloodDepressionFinder', 'grid_flow_directions',
            'flow_directions', 'flow_direction_DN']
@@ -0,0 +1,656 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+from libc.math cimport nextafter, INFINITY
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+DTYPE_INT8 = np.int8
+ctypedef np.int8_t DTYPE_INT8_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _comes_before(DTYPE_INT_t a, DTYPE_INT_t b,
+                               DTYPE_FLOAT_t [:] key,
+                               DTYPE_INT_t [:] rank):
+    """Order heap entries by key, then by the order they were pushed."""
+    return key[a] < key[b] or (key[a] == key[b] and rank[a] < rank[b])
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _heap_push(DTYPE_INT_t node, DTYPE_INT_t [:] heap,
+                     DTYPE_INT_t size, DTYPE_FLOAT_t [:] key,
+                     DTYPE_INT_t [:] rank):
+    """Add node to a binary heap that holds size nodes."""
+    cdef DTYPE_INT_t child = size
+    cdef DTYPE_INT_t parent
+
+    heap[child] = node
+    while child > 0:
+        parent = (child - 1) // 2
+        if _comes_before(heap[child], heap[parent], key, rank):
+            heap[child], heap[parent] = heap[parent], heap[child]
+            child = parent
+        else:
+            break
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef DTYPE_INT_t _heap_pop(DTYPE_INT_t [:] heap, DTYPE_INT_t size,
+                           DTYPE_FLOAT_t [:] key, DTYPE_INT_t [:] rank):
+    """Remove and return the top node of a binary heap of size nodes."""
+    cdef DTYPE_INT_t top = heap[0]
+    cdef DTYPE_INT_t parent = 0
+    cdef DTYPE_INT_t child, smallest
+
+    size -= 1
+    heap[0] = heap[size]
+    while True:
+        smallest = parent
+        child = 2 * parent + 1
+        if child < size and _comes_before(heap[child], heap[smallest],
+                                          key, rank):
+            smallest = child
+        child += 1
+        if child < size and _comes_before(heap[child], heap[smallest],
+                                          key, rank):
+            smallest = child
+        if smallest == parent:
+            break
+        heap[parent], heap[smallest] = heap[smallest], heap[parent]
+        parent = smallest
+
+    return top
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _priority_flood(const DTYPE_FLOAT_t [:] elev,
+                    const DTYPE_INT_t [:, :] nbrs,
+                    const DTYPE_INT_t [:] seeds,
+                    DTYPE_FLOAT_t epsilon,
+                    DTYPE_FLOAT_t [:] fill,
+                    DTYPE_INT_t [:] parent,
+                    DTYPE_INT_t [:] order):
+    """Fill depressions by flooding inward from the seeds in order of height.
+
+    This is the Priority-Flood algorithm of Barnes et al. (2014), including
+    their use of a plain queue for nodes inside depressions, so that it runs
+    in O(N log N) time over the whole grid at once.
+
+    Parameters
+    ----------
+    elev : ndarray of float
+        Elevation at each node.
+    nbrs : ndarray of int, shape (n_nodes, n_neighbors)
+        Neighbors through which each node can be flooded, -1 for none.
+    seeds : ndarray of int
+        Nodes that water can drain out of (open boundaries).
+    epsilon : float
+        If zero, depressions are filled flat. Otherwise, each node inside a
+        depression is filled at least epsilon (or, if that is too small to
+        make a difference, the next representable value) above the node it
+        was flooded from, so that the filled surface always drains.
+    fill : ndarray of float
+        Elevation of the filled surface at each node. Modified in place.
+    parent : ndarray of int
+        The node from which each node was flooded, itself for seeds and -1 for
+        nodes that were not reached. Modified in place.
+    order : ndarray of int
+        Nodes in the order in which they were reached. Modified in place.
+
+    Returns
+    -------
+    int
+        Number of nodes reached.
+    """
+    cdef DTYPE_INT_t n_nodes = elev.shape[0]
+    cdef DTYPE_INT_t n_nbrs = nbrs.shape[1]
+    cdef DTYPE_INT_t [:] heap = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t [:] rank = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t [:] pit = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t heap_size = 0
+    cdef DTYPE_INT_t pit_start = 0
+    cdef DTYPE_INT_t pit_end = 0
+    cdef DTYPE_INT_t n_reached = 0
+    cdef DTYPE_INT_t n_pushed = 0
+    cdef DTYPE_INT_t i, k, node, nbr
+    cdef DTYPE_FLOAT_t level
+
+    for i in range(n_nodes):
+        parent[i] = -1
+        fill[i] = elev[i]
+
+    for i in range(seeds.shape[0]):
+        node = seeds[i]
+        if parent[node] == -1:
+            parent[node] = node
+            order[n_reached] = node
+            n_reached += 1
+            rank[node] = n_pushed
+            n_pushed += 1
+            _heap_push(node, heap, heap_size, fill, rank)
+            heap_size += 1
+
+    while heap_size > 0 or pit_start < pit_end:
+        if pit_start < pit_end and (
+                heap_size == 0 or fill[pit[pit_start]] <= fill[heap[0]]):
+            node = pit[pit_start]
+            pit_start += 1
+        else:
+            node = _heap_pop(heap, heap_size, fill, rank)
+            heap_size -= 1
+
+        for k in range(n_nbrs):
+            nbr = nbrs[node, k]
+            if nbr == -1 or parent[nbr] != -1:
+                continue
+
+            parent[nbr] = node
+            order[n_reached] = nbr
+            n_reached += 1
+
+            if elev[nbr] <= fill[node]:
+                if epsilon > 0.:
+                    level = fill[node] + epsilon
+                    if level == fill[node]:
+                        level = nextafter(fill[node], INFINITY)
+                    fill[nbr] = level if level > elev[nbr] else elev[nbr]
+                else:
+                    fill[nbr] = fill[node]
+                pit[pit_end] = nbr
+                pit_end += 1
+            else:
+                rank[nbr] = n_pushed
+                n_pushed += 1
+                _heap_push(nbr, heap, heap_size, fill, rank)
+                heap_size += 1
+
+    return n_reached
+
+
+cdef enum:
+    # boundary status codes, as in landlab.grid.base
+    _CORE_NODE = 0
+    _CLOSED_BOUNDARY = 4
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef DTYPE_INT_t _find_set(DTYPE_INT_t [:] sets, DTYPE_INT_t i):
+    """Find the representative of i's set, compressing the path to it."""
+    cdef DTYPE_INT_t root = i
+    cdef DTYPE_INT_t next_i
+
+    while sets[root] != root:
+        root = sets[root]
+    while sets[i] != root:
+        next_i = sets[i]
+        sets[i] = root
+        i = next_i
+
+    return root
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _find_pit_clusters(const DTYPE_INT_t [:] pits,
+                       const DTYPE_INT_t [:, :] nbrs,
+                       DTYPE_INT_t [:] first_pit):
+    """Find the lowest-numbered pit in each cluster of adjacent pits.
+
+    Parameters
+    ----------
+    pits : ndarray of int
+        Pit nodes, in increasing order.
+    nbrs : ndarray of int, shape (n_nodes, n_neighbors)
+        Neighbors of each node, -1 for none.
+    first_pit : ndarray of int
+        On entry, -1 at every node that is not a pit. On exit, for each pit,
+        the lowest-numbered pit that it is connected to through other pits.
+    """
+    cdef DTYPE_INT_t n_nbrs = nbrs.shape[1]
+    cdef DTYPE_INT_t i, k, node, nbr, a, b
+
+    for i in range(pits.shape[0]):
+        first_pit[pits[i]] = pits[i]
+
+    for i in range(pits.shape[0]):
+        node = pits[i]
+        for k in range(n_nbrs):
+            nbr = nbrs[node, k]
+            if nbr == -1 or first_pit[nbr] == -1:
+                continue
+            a = _find_set(first_pit, node)
+            b = _find_set(first_pit, nbr)
+            if a < b:
+                first_pit[b] = a
+            elif b < a:
+                first_pit[a] = b
+
+    for i in range(pits.shape[0]):
+        first_pit[pits[i]] = _find_set(first_pit, pits[i])
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _merge_depressions(const DTYPE_FLOAT_t [:] elev,
+                       const DTYPE_INT_t [:, :] nbrs,
+                       const DTYPE_FLOAT_t [:] fill,
+                       const DTYPE_INT_t [:] parent,
+                       const DTYPE_INT_t [:] order,
+                       DTYPE_INT_t n_reached,
+                       const DTYPE_INT_t [:] by_elev,
+                       const DTYPE_INT_t [:] pit_at_node,
+                       DTYPE_INT_t [:] basin,
+                       DTYPE_INT_t [:] basin_parent,
+                       DTYPE_INT_t [:] basin_pit,
+                       DTYPE_INT_t [:] basin_outlet,
+                       DTYPE_INT_t [:] basin_lake):
+    """Split the depressions found by a priority flood into nested basins.
+
+    Nodes are added, lowest first, to the depressions that they are in.
+    A node with no neighbors already added starts a new basin, and a node
+    that joins two or more basins starts a new basin that holds them all.
+    This is the order in which DepressionFinderAndRouter, flooding from
+    each pit in turn, fills and merges its lakes: a basin becomes a lake
+    once all of the pits in it have been flooded, and stays one until it
+    is swallowed up by a larger basin that has become a lake. The lakes
+    that remain are those basins with pits in all of their lowest points
+    that are not inside another such basin.
+
+    Parameters
+    ----------
+    elev, nbrs, fill, parent, order, n_reached :
+        As used by, and returned from, _priority_flood.
+    by_elev : ndarray of int
+        Nodes that are in depressions, lowest (and then lowest-numbered)
+        first.
+    pit_at_node : ndarray of int
+        At the lowest node of each lake, the pit that DepressionFinderAndRouter
+        floods it from. -1 at every other node.
+    basin : ndarray of int
+        The smallest basin that each node is in, or -1 if none. Modified
+        in place.
+    basin_parent : ndarray of int
+        Basin that each basin merges into, or -1 for the whole of a
+        depression. Modified in place.
+    basin_pit : ndarray of int
+        The last pit in each basin to be flooded from, or the number of
+        nodes if the basin has a low point that is not a pit. Modified in
+        place.
+    basin_outlet : ndarray of int
+        Node at which each basin overflows. Modified in place.
+    basin_lake : ndarray of int
+        Basin that is the lake that each basin ends up in, or -1 if it
+        is not in a lake. Modified in place.
+
+    Returns
+    -------
+    int
+        Number of basins.
+    """
+    cdef DTYPE_INT_t n_nodes = elev.shape[0]
+    cdef DTYPE_INT_t n_nbrs = nbrs.shape[1]
+    cdef DTYPE_INT_t [:] sets = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t [:] basin_at_root = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t [:] roots = np.empty(n_nbrs, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t n_basins = 0
+    cdef DTYPE_INT_t i, j, k, node, nbr, root, up, b, n_roots
+    cdef bint is_new
+
+    for i in range(n_nodes):
+        basin[i] = -1
+
+    for i in range(by_elev.shape[0]):
+        node = by_elev[i]
+
+        n_roots = 0
+        for k in range(n_nbrs):
+            nbr = nbrs[node, k]
+            if nbr == -1 or basin[nbr] == -1 or fill[nbr] != fill[node]:
+                continue
+            root = _find_set(sets, nbr)
+            is_new = True
+            for j in range(n_roots):
+                if roots[j] == root:
+                    is_new = False
+            if is_new:
+                roots[n_roots] = root
+                n_roots += 1
+
+        if n_roots == 1:
+            sets[node] = roots[0]
+            b = basin_at_root[roots[0]]
+            # a pit that joins a basin with no pit in it floods that basin.
+            if pit_at_node[node] != -1 and basin_pit[b] == n_nodes:
+                basin_pit[b] = pit_at_node[node]
+        else:
+            b = n_basins
+            n_basins += 1
+            basin_parent[b] = -1
+            basin_outlet[b] = -1
+            if n_roots > 0:
+                basin_pit[b] = -1
+            elif pit_at_node[node] == -1:
+                basin_pit[b] = n_nodes
+            else:
+                basin_pit[b] = pit_at_node[node]
+            for j in range(n_roots):
+                root = roots[j]
+                basin_parent[basin_at_root[root]] = b
+                basin_outlet[basin_at_root[root]] = node
+                if basin_pit[basin_at_root[root]] > basin_pit[b]:
+                    basin_pit[b] = basin_pit[basin_at_root[root]]
+                sets[root] = node
+            sets[node] = node
+            basin_at_root[node] = b
+        basin[node] = b
+
+    # a whole depression overflows at the node it was flooded from.
+    for i in range(n_reached):
+        node = order[i]
+        up = parent[node]
+        if basin[node] == -1 or basin[up] != -1:
+            continue
+        b = basin_at_root[_find_set(sets, node)]
+        if basin_outlet[b] == -1:
+            basin_outlet[b] = up
+
+    # basins are numbered after any that they hold.
+    for b in range(n_basins - 1, -1, -1):
+        up = basin_parent[b]
+        if up != -1 and basin_lake[up] != -1:
+            basin_lake[b] = basin_lake[up]
+        elif basin_pit[b] < n_nodes:
+            basin_lake[b] = b
+        else:
+            basin_lake[b] = -1
+
+    return n_basins
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _find_lakes_of_pits(const DTYPE_INT_t [:] pits,
+                        const DTYPE_INT_t [:] starts,
+                        const DTYPE_INT_t [:] basin,
+                        const DTYPE_INT_t [:] basin_parent,
+                        const DTYPE_INT_t [:] basin_pit,
+                        DTYPE_INT_t [:] lake_of_pit):
+    """Find the lake that DepressionFinderAndRouter floods from each pit.
+
+    Parameters
+    ----------
+    pits : ndarray of int
+        Pit nodes.
+    starts : ndarray of int
+        Lowest node of the lake flooded from each pit, or -1 if the pit
+        does not start a lake.
+    basin, basin_parent, basin_pit :
+        As returned from _merge_depressions.
+    lake_of_pit : ndarray of int
+        Largest basin that is filled by flooding from each pit, or -1 if
+        none is. Modified in place.
+    """
+    cdef DTYPE_INT_t i, pit, b
+
+    for i in range(pits.shape[0]):
+        pit = pits[i]
+        b = -1 if starts[i] == -1 else basin[starts[i]]
+        # on a flat, the start can be in a basin flooded from an earlier pit.
+        while b != -1 and basin_pit[b] < pit:
+            b = basin_parent[b]
+        if b == -1 or basin_pit[b] != pit:
+            lake_of_pit[i] = -1
+            continue
+        while basin_parent[b] != -1 and basin_pit[basin_parent[b]] == pit:
+            b = basin_parent[b]
+        lake_of_pit[i] = b
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef DTYPE_FLOAT_t _depth_before(DTYPE_INT_t node, DTYPE_INT_t pit,
+                                 const DTYPE_FLOAT_t [:] elev,
+                                 const DTYPE_INT_t [:] basin,
+                                 const DTYPE_INT_t [:] basin_parent,
+                                 const DTYPE_INT_t [:] basin_pit,
+                                 const DTYPE_INT_t [:] basin_outlet,
+                                 DTYPE_INT_t [:] jump):
+    """Depth of water at node once every pit before pit has been flooded.
+
+    That is the depth in the largest basin around node whose pits all come
+    before pit. jump points each basin at such a basin around it for an
+    earlier pit; as pit only increases from one call to the next, those
+    basins can be skipped over.
+    """
+    cdef DTYPE_INT_t b = basin[node]
+    cdef DTYPE_INT_t top, up
+
+    if b == -1 or basin_pit[b] >= pit:
+        return 0.
+
+    top = b
+    while True:
+        while jump[top] != top:
+            top = jump[top]
+        up = basin_parent[top]
+        if up == -1 or basin_pit[up] >= pit:
+            break
+        top = up
+
+    while b != top:
+        up = jump[b] if jump[b] != b else basin_parent[b]
+        jump[b] = top
+        b = up
+
+    return elev[basin_outlet[top]] - elev[node]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _assign_outlet_receivers(const DTYPE_INT_t [:] outlets,
+                             const DTYPE_INT_t [:] codes,
+                             const DTYPE_FLOAT_t [:] elev,
+                             const DTYPE_INT8_t [:] status,
+                             const DTYPE_INT_t [:] lake_map,
+                             const DTYPE_INT_t [:] basin,
+                             const DTYPE_INT_t [:] basin_parent,
+                             const DTYPE_INT_t [:] basin_pit,
+                             const DTYPE_INT_t [:] basin_outlet,
+                             const DTYPE_INT_t [:, :] nbrs,
+                             const DTYPE_FLOAT_t [:, :] nbr_lengths,
+                             DTYPE_INT_t [:] receivers):
+    """Find a receiver, away from its lake, for the outlet of each lake.
+
+    As DepressionFinderAndRouter.assign_outlet_receiver: the steepest
+    downhill neighbor that is not in the lake and not closed, and whose
+    (water) surface is lower than the receiver found so far. The water
+    surface is that of the lakes that DepressionFinderAndRouter would have
+    flooded before this one. An outlet on a flat, with no lower neighbor,
+    drains to a neighbor at its own level, a boundary node if there is one.
+
+    Parameters
+    ----------
+    outlets : ndarray of int
+        Outlet node of each lake.
+    codes : ndarray of int
+        Code of each lake, in increasing order.
+    elev : ndarray of float
+        Elevation at each node.
+    status : ndarray of int8
+        Boundary status at each node.
+    lake_map : ndarray of int
+        Code of the lake at each node.
+    basin, basin_parent, basin_pit, basin_outlet :
+        As returned from _merge_depressions.
+    nbrs : ndarray of int, shape (n_nodes, n_neighbors)
+        Neighbors, orthogonal then diagonal, to which an outlet can drain,
+        -1 for none.
+    nbr_lengths : ndarray of float, shape (n_nodes, n_neighbors)
+        Length of the link to each of those neighbors.
+    receivers : ndarray of int
+        Receiver of each node. Modified in place.
+    """
+    cdef DTYPE_INT_t [:] jump = np.arange(basin_parent.shape[0],
+                                          dtype=DTYPE_INT)
+    cdef DTYPE_INT_t i, k, outlet, nbr, receiver
+    cdef DTYPE_FLOAT_t max_grad, grad, surface
+
+    for i in range(outlets.shape[0]):
+        outlet = outlets[i]
+        if status[outlet] != _CORE_NODE:
+            receivers[outlet] = outlet
+            continue
+
+        receiver = outlet
+        max_grad = 0.
+        for k in range(nbrs.shape[1]):
+            nbr = nbrs[outlet, k]
+            if (nbr == -1 or lake_map[nbr] == codes[i] or
+                    status[nbr] == _CLOSED_BOUNDARY):
+                continue
+            surface = elev[nbr] + _depth_before(nbr, codes[i], elev, basin,
+                                                basin_parent, basin_pit,
+                                                basin_outlet, jump)
+            if surface < elev[receiver]:
+                grad = (elev[outlet] - elev[nbr]) / nbr_lengths[outlet, k]
+                if grad > max_grad:
+                    max_grad = grad
+                    receiver = nbr
+
+        if receiver == outlet:
+            # on a flat, drain to a neighbor at the level of the outlet.
+            for k in range(nbrs.shape[1]):
+                nbr = nbrs[outlet, k]
+                if (nbr == -1 or lake_map[nbr] == codes[i] or
+                        status[nbr] == _CLOSED_BOUNDARY):
+                    continue
+                surface = elev[nbr] + _depth_before(
+                    nbr, codes[i], elev, basin, basin_parent, basin_pit,
+                    basin_outlet, jump)
+                if surface <= elev[outlet] and (
+                        receiver == outlet or
+                        status[receiver] == _CORE_NODE):
+                    receiver = nbr
+        if receiver == outlet:
+            raise AssertionError(
+                'failed to find receiver with ID: %r' % receiver)
+        receivers[outlet] = receiver
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _route_flow_across_lakes(const DTYPE_INT_t [:] outlets,
+                             const DTYPE_INT_t [:] codes,
+                             const DTYPE_INT_t [:] lake_offsets,
+                             const DTYPE_INT_t [:] lake_nodes,
+                             const DTYPE_FLOAT_t [:] elev,
+                             const DTYPE_INT_t [:] lake_map,
+                             const DTYPE_INT_t [:, :] active_nbrs,
+                             const DTYPE_INT_t [:, :] nbrs,
+                             const DTYPE_INT_t [:, :] links,
+                             const DTYPE_FLOAT_t [:, :] nbr_lengths,
+                             DTYPE_INT_t n_orthogonal,
+                             DTYPE_INT_t [:] receivers,
+                             DTYPE_INT_t [:] receiver_links,
+                             DTYPE_FLOAT_t [:] slopes):
+    """Route flow out of, and then across, each lake in turn.
+
+    As in DepressionFinderAndRouter._route_flow, an outlet that drains back
+    into its lake is first made to drain to its lowest active neighbor
+    outside of the lake. Each node in the lake then drains to the neighbor
+    from which it is first reached by a breadth-first search that starts at
+    the outlet, and each ring of the search looks at orthogonal neighbors
+    before diagonal ones.
+
+    Parameters
+    ----------
+    outlets : ndarray of int
+        Outlet node of each lake.
+    codes : ndarray of int
+        Code of each lake.
+    lake_offsets : ndarray of int
+        Index into lake_nodes of the first node of each lake, plus a final
+        entry for the total number of lake nodes.
+    lake_nodes : ndarray of int
+        Nodes of all the lakes, grouped by lake.
+    elev : ndarray of float
+        Elevation at each node.
+    lake_map : ndarray of int
+        Code of the lake at each node.
+    active_nbrs : ndarray of int, shape (n_nodes, n_orthogonal)
+        Active orthogonal neighbors of each node, -1 for none.
+    nbrs : ndarray of int, shape (n_nodes, n_neighbors)
+        Orthogonal, then diagonal, neighbors of each node, -1 for none.
+    links : ndarray of int, shape (n_nodes, n_neighbors)
+        Links to each of the neighbors.
+    nbr_lengths : ndarray of float, shape (n_nodes, n_neighbors)
+        Length of the link to each neighbor.
+    n_orthogonal : int
+        Number of the neighbors that are orthogonal.
+    receivers, receiver_links, slopes : ndarray
+        Receiver of each node, link to it and the (non-negative) slope along
+        it. Modified in place.
+    """
+    cdef DTYPE_INT_t n_nodes = elev.shape[0]
+    cdef DTYPE_INT_t n_nbrs = nbrs.shape[1]
+    cdef DTYPE_INT_t [:] ring = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t i, j, k, node, nbr, lowest
+    cdef DTYPE_INT_t ring_start, ring_end, next_end, first, last, sweep
+    cdef DTYPE_FLOAT_t slope
+
+    for i in range(outlets.shape[0]):
+        if lake_offsets[i] == lake_offsets[i + 1]:
+            continue
+
+        node = outlets[i]
+        if lake_map[receivers[node]] == codes[i]:
+            lowest = -1
+            for k in range(active_nbrs.shape[1]):
+                nbr = active_nbrs[node, k]
+                if nbr == -1 or lake_map[nbr] == codes[i]:
+                    continue
+                if lowest == -1 or elev[nbr] < elev[lowest]:
+                    lowest = nbr
+            if lowest == -1:
+                raise ValueError('outlet of lake has no neighbors outside of'
+                                 ' it')
+            receivers[node] = lowest
+
+        for j in range(lake_offsets[i], lake_offsets[i + 1]):
+            receivers[lake_nodes[j]] = -1
+
+        ring[0] = node
+        ring_start = 0
+        ring_end = 1
+        while ring_start < ring_end:
+            next_end = ring_end
+            for sweep in range(2):
+                if sweep == 0:
+                    first, last = 0, n_orthogonal
+                else:
+                    first, last = n_orthogonal, n_nbrs
+                for j in range(ring_start, ring_end):
+                    node = ring[j]
+                    for k in range(first, last):
+                        nbr = nbrs[node, k]
+                        if nbr == -1 or receivers[nbr] != -1:
+                            continue
+                        receivers[nbr] = node
+                        receiver_links[nbr] = links[node, k]
+                        slope = (elev[nbr] - elev[node]) / nbr_lengths[node, k]
+                        slopes[nbr] = slope if slope > 0. else 0.
+                        ring[next_end] = nbr
+                        next_end += 1
+            ring_start = ring_end
+            ring_end = next_end
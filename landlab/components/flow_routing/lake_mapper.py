@@ -859,6 +859,40 @@ class DepressionFinderAndRouter(Component):
                                             )[self._unique_pits]
 
 
+    def _locate_pits(self, pits):
+        """Set is_pit, number_of_pits and pit_node_ids from *pits*.
+
+        Parameters
+        ----------
+        pits : array or str or None
+            As for *map_depressions*.
+        """
+        if type(pits) == str:
+            try:
+                pits = self._grid.at_node[pits]
+                supplied_pits = np.where(pits)[0]
+                self.pit_node_ids = as_id_array(
+                    np.setdiff1d(supplied_pits, self._grid.boundary_nodes))
+                self.number_of_pits = self.pit_node_ids.size
+                self.is_pit.fill(False)
+                self.is_pit[self.pit_node_ids] = True
+            except FieldError:
+                self._find_pits()
+        elif pits is None:
+            self._find_pits()
+        else:  # hopefully an array or other sensible iterable
+            if len(pits) == self._grid.number_of_nodes:
+                supplied_pits = np.where(pits)[0]
+            else:  # it's an array of node ids
+                supplied_pits = pits
+            # remove any boundary nodes from the supplied pit list
+            self.pit_node_ids = as_id_array(
+                np.setdiff1d(supplied_pits, self._grid.boundary_nodes))
+
+            self.number_of_pits = self.pit_node_ids.size
+            self.is_pit.fill(False)
+            self.is_pit[self.pit_node_ids] = True
+
     def map_depressions(self, pits='flow__sink_flag', reroute_flow=True):
         """Map depressions/lakes in a topographic surface.
 
@@ -912,31 +946,7 @@ class DepressionFinderAndRouter(Component):
         self.depression_depth.fill(0.)
         self.depression_outlets = []  # reset these
         # Locate nodes with pits
-        if type(pits) == str:
-            try:
-                pits = self._grid.at_node[pits]
-                supplied_pits = np.where(pits)[0]
-                self.pit_node_ids = as_id_array(
-                    np.setdiff1d(supplied_pits, self._grid.boundary_nodes))
-                self.number_of_pits = self.pit_node_ids.size
-                self.is_pit.fill(False)
-                self.is_pit[self.pit_node_ids] = True
-            except FieldError:
-                self._find_pits()
-        elif pits is None:
-            self._find_pits()
-        else:  # hopefully an array or other sensible iterable
-            if len(pits) == self._grid.number_of_nodes:
-                supplied_pits = np.where(pits)[0]
-            else:  # it's an array of node ids
-                supplied_pits = pits
-            # remove any boundary nodes from the supplied pit list
-            self.pit_node_ids = as_id_array(
-                np.setdiff1d(supplied_pits, self._grid.boundary_nodes))
-
-            self.number_of_pits = self.pit_node_ids.size
-            self.is_pit.fill(False)
-            self.is_pit[self.pit_node_ids] = True
+        self._locate_pits(pits)
         # Set up "lake code" array
         self.flood_status.fill(_UNFLOODED)
         self.flood_status[self.pit_node_ids] = _PIT
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""Find and route flow across depressions with a single priority flood."""
+from __future__ import print_function
+
+import numpy as np
+
+from landlab import FIXED_VALUE_BOUNDARY
+from landlab.grid.base import BAD_INDEX_VALUE as LOCAL_BAD_INDEX_VALUE
+from .lake_mapper import (DepressionFinderAndRouter, _UNFLOODED, _PIT,
+                          _FLOODED)
+from .cfuncs import (_priority_flood, _find_pit_clusters,
+                     _merge_depressions, _find_lakes_of_pits,
+                     _assign_outlet_receivers, _route_flow_across_lakes)
+
+
+class PriorityFloodDepressionFinder(DepressionFinderAndRouter):
+
+    """Find depressions on a topographic surface with a priority flood.
+
+    This component is a drop-in replacement for DepressionFinderAndRouter.
+    DepressionFinderAndRouter floods a lake outward from each pit in turn,
+    looking again at every node in the lake each time the lake grows, and
+    floods again any lake that a later pit spills into. On a surface of
+    nested depressions this takes a time that grows with the square of the
+    number of nodes. Here, a single priority flood over the whole grid, from
+    its open boundaries, gives each node the level to which it fills. The
+    depressions are then put together, node by node in order of elevation,
+    into a tree of nested basins, from which come the lakes, their outlets
+    and the water surface that each outlet drains across. Mapping the
+    depressions of the whole grid takes O(N log N) time.
+
+    Lake outlets drain, and flow is routed across lakes, by the same rules
+    as DepressionFinderAndRouter, so on a surface without ties in elevation
+    the two components produce the same fields and properties, including
+    the rerouted flow receivers and drainage area, with one exception.
+    Where a node has fewer neighbors than the most that any node has (as
+    at the edge of a hex or radial grid), DepressionFinderAndRouter reads
+    the missing neighbor (-1) as the last node of the grid. Here, missing
+    neighbors are skipped. Where there are flats, DepressionFinderAndRouter
+    chooses between equally low nodes in the order in which it comes
+    across them, and the lakes and outlets found here can differ from its
+    choices.
+
+    Construction::
+
+        PriorityFloodDepressionFinder(grid, routing='D8')
+
+    Parameters
+    ----------
+    grid : RasterModelGrid
+        A landlab RasterModelGrid.
+    routing : {'D8', 'D4'} (optional)
+        If grid is a raster type, controls whether lake connectivity can
+        occur on diagonals ('D8', default), or only orthogonally ('D4').
+        Has no effect if grid is not a raster.
+
+    Examples
+    --------
+    Route flow across a depression in a sloped surface.
+
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import FlowRouter
+    >>> from landlab.components import PriorityFloodDepressionFinder
+    >>> mg = RasterModelGrid((7, 7), 0.5)
+    >>> z = mg.add_field('node', 'topographic__elevation', mg.node_x.copy())
+    >>> z += 0.01 * mg.node_y
+    >>> mg.at_node['topographic__elevation'].reshape(mg.shape)[2:5, 2:5] *= 0.1
+    >>> fr = FlowRouter(mg)
+    >>> fr.run_one_step()
+    >>> df = PriorityFloodDepressionFinder(mg)
+    >>> df.map_depressions()
+    >>> mg.at_node['flow__receiver_node'].reshape(mg.shape)
+    array([[ 0,  1,  2,  3,  4,  5,  6],
+           [ 7,  7, 16, 17, 18, 18, 13],
+           [14, 14,  8, 16, 17, 18, 20],
+           [21, 21, 16, 16, 24, 25, 27],
+           [28, 28, 23, 24, 24, 32, 34],
+           [35, 35, 30, 31, 32, 32, 41],
+           [42, 43, 44, 45, 46, 47, 48]])
+    >>> df.lake_map.reshape(mg.shape)  # doctest: +NORMALIZE_WHITESPACE
+    array([[-1, -1, -1, -1, -1, -1, -1],
+           [-1, -1, -1, -1, -1, -1, -1],
+           [-1, -1, 16, 16, 16, -1, -1],
+           [-1, -1, 16, 16, 16, -1, -1],
+           [-1, -1, 16, 16, 16, -1, -1],
+           [-1, -1, -1, -1, -1, -1, -1],
+           [-1, -1, -1, -1, -1, -1, -1]])
+    >>> df.lake_codes
+    array([16])
+    >>> df.lake_outlets
+    array([8])
+    >>> df.lake_areas
+    array([ 2.25])
+
+    It can also be used by the FlowAccumulator.
+
+    >>> from landlab.components import FlowAccumulator
+    >>> fa = FlowAccumulator(mg, flow_director='D8',
+    ...                      depression_finder='PriorityFloodDepressionFinder')
+    >>> fa.run_one_step()
+    >>> fa.depression_finder.lake_codes
+    array([16])
+    """
+
+    _name = 'PriorityFloodDepressionFinder'
+
+    def _initialize(self, input_stream=None):
+        """Initialize the component, as for DepressionFinderAndRouter."""
+        super(PriorityFloodDepressionFinder, self)._initialize(
+            input_stream=input_stream)
+        self._lake_codes = np.empty(0, dtype=int)
+        self._lake_outlet_nodes = np.empty(0, dtype=int)
+        self._lake_index = np.empty(self._grid.number_of_nodes, dtype=int)
+        self._lake_index.fill(-1)
+
+    def updated_boundary_conditions(self):
+        """
+            Call this if boundary conditions on the grid are updated after the
+            component is instantiated.
+        """
+        super(PriorityFloodDepressionFinder,
+              self).updated_boundary_conditions()
+        # copies, as the grid's arrays of neighbors are read-only
+        self._flood_nbrs = np.array(self._node_nbrs, dtype=int)
+        self._active_nbrs = np.array(self._grid.active_neighbors_at_node,
+                                     dtype=int)
+
+        # the neighbors used to route flow out of, and across, lakes
+        nbrs = self._grid.neighbors_at_node
+        links = self._grid.links_at_node
+        lengths = self._grid.length_of_link[links]
+        self._n_orthogonal_nbrs = nbrs.shape[1]
+        if self._D8:
+            diag_nbrs = self._grid._diagonal_neighbors_at_node
+            nbrs = np.hstack((nbrs, diag_nbrs))
+            links = np.hstack((links, self._grid._diagonal_links_at_node))
+            lengths = np.hstack((lengths, np.full(diag_nbrs.shape,
+                                                  self._diag_link_length)))
+        self._routing_nbrs = np.array(nbrs, dtype=int)
+        self._routing_links = np.array(links, dtype=int)
+        self._routing_lengths = np.array(lengths, dtype=float)
+
+    def map_depressions(self, pits='flow__sink_flag', reroute_flow=True):
+        """Map depressions/lakes in a topographic surface.
+
+        Parameters
+        ----------
+        pits : array or str or None, optional
+            If a field name, the boolean field containing True where pits.
+            If an array, either a boolean array of nodes of the pits, or an
+            array of pit node IDs. It does not matter whether or not open
+            boundary nodes are flagged as pits; they are never treated as such.
+            Default is 'flow__sink_flag', the pit field output from
+            'route_flow_dn'
+        reroute_flow : bool, optional
+            If True (default), and the component detects the output fields in
+            the grid produced by the route_flow_dn component, this component
+            will modify the existing flow fields to route the flow across the
+            lake surface(s).
+            Ensure you call this method *after* you have already routed flow
+            in each loop of your model.
+
+        Examples
+        --------
+        Test #1: 5x5 raster grid with a diagonal lake.
+
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import PriorityFloodDepressionFinder
+
+        >>> rg = RasterModelGrid(5, 5)
+        >>> z = rg.add_zeros('node', 'topographic__elevation')
+        >>> z[:] = np.array([100., 100.,  95., 100., 100.,
+        ...                  100., 101.,  92.,   1., 100.,
+        ...                  100., 101.,   2., 101., 100.,
+        ...                  100.,   3., 101., 101., 100.,
+        ...                   90.,  95., 100., 100., 100.])
+        >>> df = PriorityFloodDepressionFinder(rg)
+        >>> df.map_depressions(pits=None, reroute_flow=False)
+        >>> df.display_depression_map()  # doctest: +NORMALIZE_WHITESPACE
+        . . . . .
+        . . . ~ .
+        . . ~ . .
+        . ~ . . .
+        o . . . .
+        >>> df.depression_depth.reshape(rg.shape)
+        array([[  0.,   0.,   0.,   0.,   0.],
+               [  0.,   0.,   0.,  89.,   0.],
+               [  0.,   0.,  88.,   0.,   0.],
+               [  0.,  87.,   0.,   0.,   0.],
+               [  0.,   0.,   0.,   0.,   0.]])
+        """
+        if self._bc_set_code != self.grid.bc_set_code:
+            self.updated_boundary_conditions()
+            self._bc_set_code = self.grid.bc_set_code
+        self._lake_map.fill(LOCAL_BAD_INDEX_VALUE)
+        self.depression_outlet_map.fill(LOCAL_BAD_INDEX_VALUE)
+        self.depression_depth.fill(0.)
+        self._locate_pits(pits)
+        self.flood_status.fill(_UNFLOODED)
+        self.flood_status[self.pit_node_ids] = _PIT
+
+        reroute_flow = reroute_flow and ('flow__receiver_node' in
+                                         self._grid.at_node.keys())
+        if reroute_flow:
+            self.receivers = self._grid.at_node['flow__receiver_node']
+        self._flood_lakes(reroute_flow)
+
+        if reroute_flow:
+            self.sinks = self._grid.at_node['flow__sink_flag']
+            self.grads = self._grid.at_node['topographic__steepest_slope']
+            self._route_flow()
+            self._reaccumulate_flow()
+
+    def _flood_lakes(self, reroute_flow):
+        """Find every lake with one priority flood over the whole grid."""
+        elev = np.ascontiguousarray(self._elev, dtype=float)
+        status = self._grid.status_at_node
+        n_nodes = self._grid.number_of_nodes
+        pits = np.ascontiguousarray(self.pit_node_ids, dtype=int)
+
+        # lakes can only drain out of the grid through fixed value nodes.
+        seeds = np.flatnonzero(status == FIXED_VALUE_BOUNDARY)
+        fill = np.empty(n_nodes, dtype=float)
+        parent = np.empty(n_nodes, dtype=int)
+        order = np.empty(n_nodes, dtype=int)
+        n_reached = _priority_flood(elev, self._flood_nbrs, seeds, 0., fill,
+                                    parent, order)
+        if np.any(parent[pits] == -1):
+            raise AssertionError('failed to find lowest perim node')
+
+        # a node is in a depression if it was flooded from a node whose
+        # filled surface is at least as high as the node itself.
+        in_depression = (parent != -1) & (parent != np.arange(n_nodes))
+        in_depression[in_depression] = (
+            elev[in_depression] <= fill[parent[in_depression]])
+
+        # though not a node at the brim that drains to lower ground outside.
+        nbrs = self._flood_nbrs
+        drains_out = np.any((nbrs != -1) & (elev[nbrs] < elev[:, np.newaxis]) &
+                            (fill[nbrs] < fill[:, np.newaxis]), axis=1)
+        in_depression &= ~drains_out
+        by_elev = np.flatnonzero(in_depression)
+        by_elev = by_elev[np.argsort(elev[by_elev], kind='mergesort')]
+
+        # pits next to each other are flooded together, from the first.
+        pit_at_node = np.full(n_nodes, -1, dtype=int)
+        _find_pit_clusters(pits, self._flood_nbrs, pit_at_node)
+        starts = np.where(pit_at_node[pits] == pits, pits, -1)
+
+        # a pit can have a lower neighbor that flow is not routed to (such as
+        # a fixed gradient boundary node). Its lake floods that neighbor if
+        # the neighbor is a low point, or else drains to it.
+        nbrs = self._flood_nbrs[pits]
+        nbr_elev = np.where(nbrs == -1, np.inf, elev[nbrs])
+        lowest = nbrs[np.arange(pits.size), np.argmin(nbr_elev, axis=1)]
+        is_lone = (starts != -1) & (nbr_elev.min(axis=1) < elev[pits])
+        pit_at_node[pits[is_lone]] = -1
+        starts[is_lone] = -1
+        low_nbrs = self._flood_nbrs[lowest[is_lone]]
+        is_low_point = np.all(
+            np.where(low_nbrs == -1, np.inf, elev[low_nbrs]) >
+            elev[lowest[is_lone]][:, np.newaxis], axis=1)
+        is_low_point &= in_depression[lowest[is_lone]]
+        is_low_point &= pit_at_node[lowest[is_lone]] == -1
+        floods_nbr = np.flatnonzero(is_lone)[is_low_point]
+        _, first = np.unique(lowest[floods_nbr], return_index=True)
+        pit_at_node[lowest[floods_nbr[first]]] = pits[floods_nbr[first]]
+        starts[floods_nbr[first]] = lowest[floods_nbr[first]]
+
+        basin = np.empty(n_nodes, dtype=int)
+        basin_parent = np.empty(by_elev.size, dtype=int)
+        basin_pit = np.empty(by_elev.size, dtype=int)
+        basin_outlet = np.empty(by_elev.size, dtype=int)
+        basin_lake = np.empty(by_elev.size + 1, dtype=int)
+        n_basins = _merge_depressions(elev, self._flood_nbrs, fill, parent,
+                                      order, n_reached, by_elev, pit_at_node,
+                                      basin, basin_parent, basin_pit,
+                                      basin_outlet, basin_lake)
+        basin_parent = basin_parent[:n_basins]
+        basin_pit = basin_pit[:n_basins]
+        basin_outlet = basin_outlet[:n_basins]
+        basin_lake = basin_lake[:n_basins + 1]
+        basin_lake[-1] = -1
+
+        lake_of_pit = np.empty(pits.size, dtype=int)
+        _find_lakes_of_pits(pits, starts, basin, basin_parent, basin_pit,
+                            lake_of_pit)
+        flooded = lake_of_pit != -1
+        outlets = np.full(pits.size, LOCAL_BAD_INDEX_VALUE, dtype=int)
+        outlets[flooded] = basin_outlet[lake_of_pit[flooded]]
+        is_unique = np.zeros(pits.size, dtype=bool)
+        is_unique[flooded] = (basin_lake[lake_of_pit[flooded]] ==
+                              lake_of_pit[flooded])
+
+        lake_nodes = np.flatnonzero(basin_lake[basin] != -1)
+        lake = basin_lake[basin[lake_nodes]]
+        self._lake_map[lake_nodes] = basin_pit[lake]
+        self.depression_outlet_map[lake_nodes] = basin_outlet[lake]
+
+        # any other such pit is swallowed up by a lake next to it or, if
+        # there is none, is a lake of its own.
+        is_own_lake = np.zeros(pits.size, dtype=bool)
+        is_own_lake[is_lone] = basin_lake[basin[pits[is_lone]]] == -1
+        is_own_lake[floods_nbr] = False
+        nbr_lakes = np.where(nbrs == -1, LOCAL_BAD_INDEX_VALUE,
+                             self._lake_map[nbrs])
+        in_nbr_lake = nbrs[np.arange(pits.size), np.argmax(nbr_lakes, axis=1)]
+        is_swallowed = is_own_lake & (nbr_lakes.max(axis=1) !=
+                                      LOCAL_BAD_INDEX_VALUE)
+        swallowed = pits[is_swallowed]
+        self._lake_map[swallowed] = self._lake_map[in_nbr_lake[is_swallowed]]
+        self.depression_outlet_map[swallowed] = self.depression_outlet_map[
+            in_nbr_lake[is_swallowed]]
+        is_own_lake &= ~is_swallowed
+        was_lake = is_lone & (self._lake_map[pits] > pits)
+        was_lake[floods_nbr] = False
+        outlets[was_lake] = lowest[was_lake]
+        outlets[is_own_lake] = lowest[is_own_lake]
+        is_unique |= is_own_lake
+        self._lake_map[pits[is_own_lake]] = pits[is_own_lake]
+        self.depression_outlet_map[pits[is_own_lake]] = lowest[is_own_lake]
+        lake_nodes = np.flatnonzero(self._lake_map != LOCAL_BAD_INDEX_VALUE)
+
+        self.depression_outlets = outlets.tolist()
+        self._unique_pits = is_unique
+        self.unique_lake_outlets = outlets[is_unique]
+        self._lake_codes = pits[is_unique]
+        self._lake_outlet_nodes = self.unique_lake_outlets
+        self.depression_depth[lake_nodes] = (
+            elev[self.depression_outlet_map[lake_nodes]] - elev[lake_nodes])
+        self.flood_status[lake_nodes] = _FLOODED
+        self._lake_index.fill(-1)
+        self._lake_index[lake_nodes] = np.searchsorted(
+            self._lake_codes, self._lake_map[lake_nodes])
+
+        if reroute_flow:
+            _assign_outlet_receivers(
+                self._lake_outlet_nodes, self._lake_codes, elev, status,
+                self._lake_map, basin, basin_parent, basin_pit, basin_outlet,
+                self._routing_nbrs, self._routing_lengths, self.receivers)
+
+    def _route_flow(self):
+        """Route flow out of, and across, every lake."""
+        if 'flow__link_to_receiver_node' in self._grid.at_node:
+            receiver_links = self._grid.at_node['flow__link_to_receiver_node']
+            slopes = self.grads
+        else:
+            receiver_links = np.empty(self._grid.number_of_nodes, dtype=int)
+            slopes = np.empty(self._grid.number_of_nodes, dtype=float)
+
+        lake_nodes = np.argsort(self._lake_index, kind='mergesort')
+        lake_nodes = lake_nodes[np.count_nonzero(self._lake_index == -1):]
+        offsets = np.zeros(self._lake_codes.size + 1, dtype=int)
+        np.cumsum(np.bincount(self._lake_index[lake_nodes],
+                              minlength=self._lake_codes.size),
+                  out=offsets[1:])
+
+        _route_flow_across_lakes(
+            self._lake_outlet_nodes, self._lake_codes, offsets, lake_nodes,
+            np.ascontiguousarray(self._elev, dtype=float), self._lake_map,
+            self._active_nbrs, self._routing_nbrs, self._routing_links,
+            self._routing_lengths, self._n_orthogonal_nbrs, self.receivers,
+            receiver_links, slopes)
+
+        self.sinks[self.pit_node_ids] = False
+
+    @property
+    def lake_outlets(self):
+        """
+        Returns the *unique* outlets for each lake, in same order as the
+        return from lake_codes.
+        """
+        return self._lake_outlet_nodes
+
+    @property
+    def lake_codes(self):
+        """
+        Returns the *unique* code assigned to each unique lake. These are
+        the values used to map the lakes in the property "lake_map".
+        """
+        return self._lake_codes
+
+    @property
+    def number_of_lakes(self):
+        """
+        Return the number of individual lakes.
+        """
+        return self._lake_codes.size
+
+    @property
+    def lake_areas(self):
+        """
+        A nlakes-long array of the area of each lake. The order is the same as
+        that returned by *lake_codes*.
+        """
+        in_lake = self._lake_index != -1
+        return np.bincount(self._lake_index[in_lake],
+                           weights=self._grid.cell_area_at_node[in_lake],
+                           minlength=self.number_of_lakes)
+
+    @property
+    def lake_volumes(self):
+        """
+        A nlakes-long array of the volume of each lake. The order is the same
+        as that returned by *lake_codes*.
+        """
+        in_lake = self._lake_index != -1
+        col_vols = self._grid.cell_area_at_node * self.depression_depth
+        return np.bincount(self._lake_index[in_lake],
+                           weights=col_vols[in_lake],
+                           minlength=self.number_of_lakes)
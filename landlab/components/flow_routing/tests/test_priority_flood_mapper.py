@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+test_priority_flood_mapper:
+
+Check that PriorityFloodDepressionFinder maps and routes flow across lakes
+in the same way as DepressionFinderAndRouter.
+"""
+
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_true, assert_equal, assert_almost_equal
+
+from landlab import (RasterModelGrid, HexModelGrid, CLOSED_BOUNDARY,
+                     FIXED_VALUE_BOUNDARY)
+from landlab.components.flow_routing import (FlowRouter,
+                                             DepressionFinderAndRouter,
+                                             PriorityFloodDepressionFinder)
+from landlab.components import FlowAccumulator
+
+
+def _map_with(finder, z, shape, routing='D8', reroute_flow=True):
+    mg = RasterModelGrid(shape, 1.)
+    mg.add_field('node', 'topographic__elevation', z.copy())
+    fr = FlowRouter(mg, method=routing)
+    fr.run_one_step()
+    lf = finder(mg, routing=routing)
+    lf.map_depressions(reroute_flow=reroute_flow)
+    return mg, lf
+
+
+def _assert_same_lakes(lf1, lf2):
+    mg1, mg2 = lf1.grid, lf2.grid
+    assert_array_almost_equal(mg1.at_node['depression__depth'],
+                              mg2.at_node['depression__depth'])
+    assert_array_equal(mg1.at_node['depression__outlet_node'],
+                       mg2.at_node['depression__outlet_node'])
+    assert_array_equal(lf1.lake_map, lf2.lake_map)
+    assert_array_equal(lf1.lake_codes, lf2.lake_codes)
+    assert_array_equal(lf1.lake_outlets, lf2.lake_outlets)
+    assert_equal(lf1.number_of_lakes, lf2.number_of_lakes)
+    assert_array_almost_equal(lf1.lake_areas, lf2.lake_areas)
+    assert_array_almost_equal(lf1.lake_volumes, lf2.lake_volumes)
+
+
+def test_same_lakes_on_rough_surface():
+    """Test that the lakes on a noisy surface are the same."""
+    for routing in ('D8', 'D4'):
+        np.random.seed(7)
+        z = np.random.rand(30 * 40)
+        _, lf1 = _map_with(DepressionFinderAndRouter, z, (30, 40), routing,
+                           reroute_flow=False)
+        _, lf2 = _map_with(PriorityFloodDepressionFinder, z, (30, 40),
+                           routing, reroute_flow=False)
+        assert_true(lf2.number_of_lakes > 10)
+        _assert_same_lakes(lf1, lf2)
+
+
+def test_routing_with_three_pits():
+    """Test rerouting across several lakes, as in test_three_pits."""
+    mg = RasterModelGrid(10, 10, 1.)
+    z = mg.node_x.copy()
+    z[33] = 1.
+    z[43] = 1.
+    z[37] = 4.
+    z[74:76] = 1.
+
+    mg1, lf1 = _map_with(DepressionFinderAndRouter, z, (10, 10))
+    mg2, lf2 = _map_with(PriorityFloodDepressionFinder, z, (10, 10))
+
+    assert_array_equal(lf1.lake_map, lf2.lake_map)
+    assert_array_equal(lf2.lake_codes, [33, 37, 74])
+    assert_array_almost_equal(mg1.at_node['depression__depth'],
+                              mg2.at_node['depression__depth'])
+    assert_array_almost_equal(lf2.lake_volumes, [2., 2., 4.])
+
+    # no internal sinks now, and all the flow gets out
+    assert_array_equal(np.flatnonzero(mg2.at_node['flow__sink_flag']),
+                       mg2.boundary_nodes)
+    assert_almost_equal(
+        mg2.at_node['drainage_area'].reshape((10, 10))[1:-1, 1].sum(), 64.)
+
+
+def test_same_routing_on_rough_surface():
+    """Test that flow is rerouted the same way across lakes."""
+    np.random.seed(2)
+    z = np.random.rand(30 * 40)
+    for routing in ('D8', 'D4'):
+        mg1, lf1 = _map_with(DepressionFinderAndRouter, z, (30, 40), routing)
+        mg2, lf2 = _map_with(PriorityFloodDepressionFinder, z, (30, 40),
+                             routing)
+        _assert_same_lakes(lf1, lf2)
+
+        assert_array_equal(mg1.at_node['flow__receiver_node'],
+                           mg2.at_node['flow__receiver_node'])
+        assert_array_equal(mg1.at_node['drainage_area'],
+                           mg2.at_node['drainage_area'])
+        assert_array_equal(mg1.at_node['flow__link_to_receiver_node'],
+                           mg2.at_node['flow__link_to_receiver_node'])
+        assert_array_equal(mg1.at_node['flow__sink_flag'],
+                           mg2.at_node['flow__sink_flag'])
+        assert_array_almost_equal(mg1.at_node['topographic__steepest_slope'],
+                                  mg2.at_node['topographic__steepest_slope'])
+        assert_almost_equal(
+            mg2.at_node['drainage_area'][mg2.boundary_nodes].sum(),
+            mg2.cell_area_at_node.sum())
+
+
+def test_flat_lakes_have_same_depths():
+    """Test D8 and D4 filling of lakes with flat beds."""
+    z = np.arange(7 * 7) % 7 + 1.
+    lake_nodes = np.array([10, 16, 17, 18, 24, 32, 33, 38, 40])
+    z[lake_nodes] = 0.
+    for routing, n_lakes in (('D8', 1), ('D4', 3)):
+        mg1, lf1 = _map_with(DepressionFinderAndRouter, z, (7, 7), routing,
+                             reroute_flow=False)
+        mg2, lf2 = _map_with(PriorityFloodDepressionFinder, z, (7, 7),
+                             routing, reroute_flow=False)
+        assert_equal(lf2.number_of_lakes, n_lakes)
+        assert_array_equal(lf1.lake_codes, lf2.lake_codes)
+        assert_array_almost_equal(mg1.at_node['depression__depth'],
+                                  mg2.at_node['depression__depth'])
+        assert_array_almost_equal(lf1.lake_volumes, lf2.lake_volumes)
+
+
+def _random_grid(seed, flat=False):
+    """A small raster or hex grid with a random surface.
+
+    Unless *flat*, no two nodes are at the same elevation. On radial grids,
+    DepressionFinderAndRouter takes a missing neighbor (-1) to be the last
+    node of the grid, so they are not used here.
+    """
+    rng = np.random.RandomState(seed)
+    if seed % 2 == 0:
+        grid = RasterModelGrid(tuple(rng.randint(3, 20, size=2)), 1.)
+    else:
+        grid = HexModelGrid(rng.randint(3, 7), rng.randint(3, 10), 1.)
+
+    z = rng.rand(grid.number_of_nodes)
+    if flat:
+        z = np.round(z * 3.)
+    if rng.rand() < .5:
+        boundary = grid.boundary_nodes
+        grid.status_at_node[boundary[rng.rand(boundary.size) < .3]] = (
+            CLOSED_BOUNDARY)
+    grid.add_field('node', 'topographic__elevation', z)
+    return grid
+
+
+def test_same_as_depression_finder_on_random_grids():
+    """Test that both finders map and route flow the same on any grid."""
+    for seed in range(60):
+        for routing in ('D8', 'D4'):
+            grids = [_random_grid(seed), _random_grid(seed)]
+            if routing == 'D4' and not isinstance(grids[0], RasterModelGrid):
+                continue
+            finders = []
+            for grid, finder in zip(grids, (DepressionFinderAndRouter,
+                                            PriorityFloodDepressionFinder)):
+                if isinstance(grid, RasterModelGrid):
+                    FlowRouter(grid, method=routing).run_one_step()
+                else:
+                    FlowRouter(grid).run_one_step()
+                finders.append(finder(grid, routing=routing))
+                finders[-1].map_depressions()
+
+            for name in ('flow__receiver_node', 'drainage_area',
+                         'flow__link_to_receiver_node',
+                         'topographic__steepest_slope', 'flow__sink_flag',
+                         'depression__depth', 'depression__outlet_node',
+                         'flood_status_code'):
+                assert_array_equal(grids[0].at_node[name],
+                                   grids[1].at_node[name])
+            assert_array_equal(finders[0].lake_map, finders[1].lake_map)
+            assert_array_equal(finders[0].lake_codes, finders[1].lake_codes)
+            assert_array_equal(finders[0].lake_outlets,
+                               finders[1].lake_outlets)
+
+
+def test_flow_leaves_flat_grids():
+    """Test that, on surfaces with flats, all the flow still gets out."""
+    for seed in range(60):
+        for routing in ('D8', 'D4'):
+            grid = _random_grid(seed, flat=True)
+            if isinstance(grid, RasterModelGrid):
+                FlowRouter(grid, method=routing).run_one_step()
+            elif routing == 'D8':
+                FlowRouter(grid).run_one_step()
+            else:
+                continue
+            lf = PriorityFloodDepressionFinder(grid, routing=routing)
+            lf.map_depressions()
+
+            lakes = lf.lake_map[lf.lake_map != -1]
+            assert_true(np.all(np.in1d(lakes, lf.lake_codes)))
+            outlets = np.flatnonzero(grid.at_node['flow__receiver_node'] ==
+                                     grid.nodes.flat)
+            assert_true(np.all(np.in1d(outlets, grid.boundary_nodes)))
+            assert_almost_equal(
+                grid.at_node['drainage_area'][outlets].sum(),
+                grid.cell_area_at_node[grid.core_nodes].sum())
+
+
+def _staircase(n_pits):
+    """A row of pits, each held in by a higher sill than the one before.
+
+    Flooding from each pit in turn spills into every lake before it.
+    """
+    grid = RasterModelGrid((3, 2 * n_pits + 3), 1.)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    grid.status_at_node[2 * grid.number_of_node_columns - 1] = (
+        FIXED_VALUE_BOUNDARY)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    row = z.reshape(grid.shape)[1]
+    row[1:-1:2] = np.arange(1, n_pits + 2)
+    row[2:-1:2] = 1e-3 * np.arange(1, n_pits + 1)
+    row[-1] = 0.
+    return grid
+
+
+def test_same_on_nested_depressions():
+    """Test lakes that spill into one another, like a flight of stairs."""
+    for routing in ('D8', 'D4'):
+        grids = [_staircase(20), _staircase(20)]
+        finders = []
+        for grid, finder in zip(grids, (DepressionFinderAndRouter,
+                                        PriorityFloodDepressionFinder)):
+            FlowRouter(grid, method=routing).run_one_step()
+            finders.append(finder(grid, routing=routing))
+            finders[-1].map_depressions()
+
+        _assert_same_lakes(*finders)
+        assert_array_equal(grids[0].at_node['flow__receiver_node'],
+                           grids[1].at_node['flow__receiver_node'])
+        assert_array_equal(grids[0].at_node['drainage_area'],
+                           grids[1].at_node['drainage_area'])
+        assert_equal(finders[1].number_of_lakes, 1)
+        assert_equal(np.count_nonzero(finders[1].lake_map != -1), 40)
+
+
+def test_with_flow_accumulator():
+    """Test that the FlowAccumulator can use the priority flood."""
+    np.random.seed(3)
+    z = np.random.rand(20 * 20)
+    for depression_finder in ('PriorityFloodDepressionFinder',
+                              PriorityFloodDepressionFinder):
+        mg = RasterModelGrid((20, 20), 1.)
+        mg.add_field('node', 'topographic__elevation', z.copy())
+        fa = FlowAccumulator(mg, flow_director='D8',
+                             depression_finder=depression_finder)
+        fa.run_one_step()
+        assert_equal(fa.depression_finder._name,
+                     'PriorityFloodDepressionFinder')
+        assert_true(fa.depression_finder.number_of_lakes > 0)
+        # all the flow leaves the grid through its open boundaries
+        outlets = mg.at_node['flow__receiver_node'] == mg.nodes.flat
+        assert_array_equal(np.flatnonzero(outlets), mg.boundary_nodes)
+        assert_almost_equal(mg.at_node['drainage_area'][outlets].sum(),
+                            mg.cell_area_at_node.sum())
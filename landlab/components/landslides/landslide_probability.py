@@ -29,12 +29,38 @@ Last edit June 7, 2017
 # %% Import Libraries
 from landlab import Component
 from landlab.utils.decorators import use_file_name_or_kwds
+from landlab.utils.shared_memory import copy_to_shared_memory
 import numpy as np
 import scipy.constants
 from scipy import interpolate
 from statsmodels.distributions.empirical_distribution import ECDF
+from multiprocessing import Pool
 import copy
 
+
+_SAMPLES_PER_CHUNK = 2 ** 18
+
+
+def _sample_triangular(left, mode, right, uniform):
+    """Sample triangular distributions from uniform random numbers.
+
+    This is the same inverse transform that *numpy.random.triangular* uses,
+    so, given the same uniform random numbers, the samples are identical to
+    those drawn for one node at a time. *left*, *mode* and *right* are
+    broadcast against *uniform*.
+    """
+    if np.any(left > mode) or np.any(mode > right):
+        raise ValueError('triangular distribution requires left <= mode '
+                         '<= right')
+    base = right - left
+    left_base = mode - left
+    with np.errstate(divide='ignore', invalid='ignore'):
+        is_left = uniform <= left_base / base
+    offset = np.where(is_left, uniform * (left_base * base),
+                      (1. - uniform) * ((right - mode) * base))
+    np.sqrt(offset, out=offset)
+    return np.where(is_left, left + offset, right - offset)
+
 # %% Instantiate Object
 
 
@@ -113,6 +139,19 @@ class LandslideProbability(Component):
         other than the default value of zero, it will create different
         sequence. To create a certain sequence repititively, use the same
         value as input for seed.
+    chunk_size: int, optional
+        number of core nodes whose Monte Carlo samples are drawn and
+        evaluated together. By default, chunks are sized so that each
+        array of samples holds about a quarter of a million values.
+    n_workers: int, optional
+        number of worker processes that chunks of core nodes are divided
+        among (default=1, no worker processes). With workers, each chunk
+        is sampled with its own random number generator, seeded from the
+        sequence created by seed, so results are reproducible for a given
+        seed and chunk_size, whatever the number of workers (two or more).
+        A single process samples from the global random number generator,
+        as the loop over nodes does, so its results differ from those with
+        workers, although not statistically.
 
     Examples
     ----------
@@ -320,7 +359,7 @@ class LandslideProbability(Component):
                  groundwater__recharge_mean=None,
                  groundwater__recharge_standard_deviation=None,
                  groundwater__recharge_HSD_inputs=[],
-                 seed=0, **kwds):
+                 seed=0, chunk_size=None, n_workers=1, **kwds):
         """
         Parameters
         ----------
@@ -357,6 +396,13 @@ class LandslideProbability(Component):
             other than the default value of zero, it will create different
             sequence. To create a certain sequence repititively, use the same
             value as input for seed.
+        chunk_size: int, optional
+            number of core nodes whose Monte Carlo samples are drawn and
+            evaluated together (default is about 250,000 samples per
+            chunk).
+        n_workers: int, optional
+            number of worker processes to divide chunks of core nodes
+            among (default=1).
         """
         # Initialize seeded random number generation        
         self._seed_generator(seed)
@@ -365,6 +411,12 @@ class LandslideProbability(Component):
 
         # Store grid and parameters and do unit conversions
         self.n = int(number_of_iterations)
+        if chunk_size is None:
+            chunk_size = _SAMPLES_PER_CHUNK // self.n
+        self._chunk_size = max(int(chunk_size), 1)
+        self._n_workers = int(n_workers)
+        if self._n_workers < 1:
+            raise ValueError('n_workers must be at least 1')
         self._g = kwds.get('g', scipy.constants.g)
         self.groundwater__recharge_distribution = (
             groundwater__recharge_distribution)
@@ -545,8 +597,10 @@ class LandslideProbability(Component):
     def calculate_landslide_probability(self, **kwds):
         """Main method of Landslide Probability class.
 
-        Method creates arrays for output variables then loops through all
-        the core nodes to run the method 'calculate_factor_of_safety.'
+        Method creates arrays for output variables then runs the Monte
+        Carlo simulation for chunks of core nodes at a time (see
+        *_calculate_factor_of_safety_at_nodes*), so that the memory used
+        stays bounded however large the grid.
         Output parameters probability of failure, mean relative wetness,
         and probability of saturation are assigned as fields to nodes. 
         """
@@ -555,14 +609,19 @@ class LandslideProbability(Component):
                                              -9999.)
         self.prob_fail = np.full(self.grid.number_of_nodes, -9999.)
         self.prob_sat = np.full(self.grid.number_of_nodes, -9999.) 
-        # Run factor of safety Monte Carlo for all core nodes in domain
-        # i refers to each core node id
-        for i in self.grid.core_nodes:
-            self.calculate_factor_of_safety(i)
-            # Populate storage arrays with calculated values
-            self.mean_Relative_Wetness[i] = self._soil__mean_relative_wetness
-            self.prob_fail[i] = self._landslide__probability_of_failure
-            self.prob_sat[i] = self._soil__probability_of_saturation
+        # Run factor of safety Monte Carlo for all core nodes in domain,
+        # one chunk of core nodes at a time
+        core_nodes = self.grid.core_nodes
+        chunks = [core_nodes[start:start + self._chunk_size]
+                  for start in range(0, core_nodes.size, self._chunk_size)]
+        if self._n_workers > 1:
+            results = self._calculate_factor_of_safety_in_parallel(chunks)
+        else:
+            results = (self._calculate_factor_of_safety_at_nodes(nodes)
+                       for nodes in chunks)
+        for nodes, result in zip(chunks, results):
+            (self.mean_Relative_Wetness[nodes], self.prob_fail[nodes],
+             self.prob_sat[nodes]) = result
         # Values can't be negative
         self.mean_Relative_Wetness[
             self.mean_Relative_Wetness < 0.] = 0.
@@ -575,6 +634,163 @@ class LandslideProbability(Component):
         self.grid.at_node['soil__probability_of_saturation'] = self.prob_sat
 
 
+    def _calculate_factor_of_safety_in_parallel(self, chunks):
+        """Method to calculate factor of safety with worker processes.
+
+        Node values are copied once into shared memory, which the worker
+        processes read from, rather than being sent to them with each
+        chunk. Each chunk is sampled with a random number generator seeded
+        from the sequence created by *_seed_generator*.
+
+        Parameters
+        ----------
+        chunks: list of ndarray of int
+            IDs of core nodes in each chunk.
+
+        Returns
+        -------
+        list of tuple
+            Output of *_calculate_factor_of_safety_at_nodes* for each
+            chunk.
+        """
+        seeds = np.random.randint(0, 2 ** 31 - 1, size=len(chunks))
+
+        shared_at_node = dict(
+            (name, copy_to_shared_memory(self._nodal_values[name]))
+            for name in self._input_var_names)
+        shared_attrs = {}
+        if self.groundwater__recharge_distribution == 'lognormal_spatial':
+            shared_attrs['_recharge_mean'] = copy_to_shared_memory(
+                self._recharge_mean)
+            shared_attrs['_recharge_stdev'] = copy_to_shared_memory(
+                self._recharge_stdev)
+        state = dict((name, value) for name, value in self.__dict__.items()
+                     if name in _WORKER_ATTRS)
+
+        pool = Pool(processes=self._n_workers, initializer=_init_worker,
+                    initargs=(shared_at_node, shared_attrs, state))
+        try:
+            return pool.map(_calculate_factor_of_safety_in_worker,
+                            zip(chunks, seeds))
+        finally:
+            pool.terminate()
+            pool.join()
+
+
+    def _calculate_factor_of_safety_at_nodes(self, nodes, random=np.random):
+        """Method to calculate factor of safety for a chunk of nodes.
+
+        This is the array version of *calculate_factor_of_safety*. Samples
+        of each parameter are drawn for all of the nodes at once, as arrays
+        of shape (number of nodes, number of iterations), and the factor of
+        safety is evaluated with array operations.
+
+        Random numbers are drawn in the same order as when looping over
+        the nodes with *calculate_factor_of_safety* so that, for a given
+        seed, the results are the same. The exception is the
+        'lognormal_spatial' recharge, whose samples are drawn for the whole
+        chunk before those of the other parameters; results are then the
+        same statistically, and reproducible for a given seed and
+        *chunk_size*.
+
+        Parameters
+        ----------
+        nodes: ndarray of int
+            IDs of core nodes.
+        random: numpy.random.RandomState, optional
+            random number generator to sample with (default is the global
+            one, seeded by *_seed_generator*).
+
+        Returns
+        -------
+        tuple of ndarray
+            Mean relative wetness, probability of failure, and probability
+            of saturation at each node.
+        """
+        at_node = self._nodal_values
+
+        def _values_at_nodes(name):
+            # as in calculate_factor_of_safety, input values are single
+            # precision
+            return at_node[name][nodes].astype(np.float32)[:, np.newaxis]
+
+        a = _values_at_nodes('topographic__specific_contributing_area')
+        theta = _values_at_nodes('topographic__slope')
+        Tmode = _values_at_nodes('soil__transmissivity').astype(float)
+        Ksatmode = _values_at_nodes(
+            'soil__saturated_hydraulic_conductivity').astype(float)
+        Cmode = _values_at_nodes('soil__mode_total_cohesion').astype(float)
+        Cmin = _values_at_nodes('soil__minimum_total_cohesion').astype(float)
+        Cmax = _values_at_nodes('soil__maximum_total_cohesion').astype(float)
+        phi_mode = _values_at_nodes(
+            'soil__internal_friction_angle').astype(float)
+        rho = _values_at_nodes('soil__density')
+        hs_mode = _values_at_nodes('soil__thickness').astype(float)
+
+        # recharge distribution based on distribution type
+        if self.groundwater__recharge_distribution == 'data_driven_spatial':
+            Re = np.empty((nodes.size, self.n))
+            for row, i in enumerate(nodes):
+                self._calculate_HSD_recharge(i)
+                Re[row] = self._Re
+            Re /= 1000.  # mm->m
+        elif self.groundwater__recharge_distribution == 'lognormal_spatial':
+            recharge_mean = self._recharge_mean[nodes][:, np.newaxis]
+            recharge_stdev = self._recharge_stdev[nodes][:, np.newaxis]
+            mu_lognormal = np.log((recharge_mean**2)/np.sqrt(
+                recharge_stdev**2 + recharge_mean**2))
+            sigma_lognormal = np.sqrt(np.log((recharge_stdev**2)/(
+                recharge_mean**2)+1))
+            Re = random.lognormal(mu_lognormal, sigma_lognormal,
+                                  (nodes.size, self.n))
+            Re /= 1000. # Convert mm to m
+        else:
+            Re = self._Re
+
+        # one uniform random number per sample of cohesion, phi, soil
+        # thickness, and Ksat (or T), in the order they are drawn for
+        # each node by calculate_factor_of_safety
+        uniform = random.random_sample((nodes.size, 4, self.n))
+
+        # Cohesion
+        C = _sample_triangular(Cmin, Cmode, Cmax, uniform[:, 0])
+        # phi - internal angle of friction provided in degrees
+        phi = _sample_triangular(phi_mode - 0.18 * phi_mode, phi_mode,
+                                 phi_mode + 0.32 * phi_mode, uniform[:, 1])
+        # soil thickness
+        hs = _sample_triangular(hs_mode - 0.3 * hs_mode, hs_mode,
+                                hs_mode + 0.1 * hs_mode, uniform[:, 2])
+        hs[hs <= 0.] = 0.005
+        if self.Ksat_provided:
+            # Hydraulic conductivity (Ksat)
+            Ksat = _sample_triangular(Ksatmode - (0.3 * Ksatmode), Ksatmode,
+                                      Ksatmode + (0.1 * Ksatmode),
+                                      uniform[:, 3])
+            T = Ksat * hs
+        else:
+            # Transmissivity (T)
+            T = _sample_triangular(Tmode - (0.3 * Tmode), Tmode,
+                                   Tmode + (0.1 * Tmode), uniform[:, 3])
+
+        # calculate Factor of Safety for n number of times
+        sin_theta = np.sin(np.arctan(theta))
+        cos_theta = np.cos(np.arctan(theta))
+        C_dim = C / (hs * rho * self._g)  # dimensionless cohesion
+        rel_wetness = (Re / T) * (a / sin_theta)  # relative wetness
+        # probability: No. high RW values/total No. of values (n)
+        prob_sat = (rel_wetness >= 1.).sum(axis=1) / float(self.n)
+        # Maximum Rel_wetness = 1.0
+        np.minimum(rel_wetness, 1., out=rel_wetness)
+        mean_rel_wetness = rel_wetness.mean(axis=1)
+        # convert from degrees; 0.5 = water to soil density ratio
+        Y = np.tan(np.radians(phi)) * (1 - (rel_wetness * 0.5))
+        FS = (C_dim / sin_theta) + (cos_theta * (Y / sin_theta))
+        # probability: No. unstable values/total No. of values (n)
+        prob_fail = (FS <= 1.).sum(axis=1) / float(self.n)
+
+        return mean_rel_wetness, prob_fail, prob_sat
+
+
     def _seed_generator(self, seed=0):
         """Method to initiate random seed.
         
@@ -631,3 +847,34 @@ class LandslideProbability(Component):
             Re_adj = (Re_temp*fract_temp)
             store_Re = np.vstack((store_Re, np.array(Re_adj)))
         self._Re = np.sum(store_Re, 0)
+
+
+# attributes a worker process needs to calculate factor of safety, besides
+# the node values and spatial recharge, which are in shared memory
+_WORKER_ATTRS = ('n', '_g', 'groundwater__recharge_distribution',
+                 'Ksat_provided', '_Re', '_interpolated_HSD_dict',
+                 '_HSD_id_dict', '_fract_dict')
+
+_worker = None
+
+
+def _init_worker(shared_at_node, shared_attrs, state):
+    """Set up the LandslideProbability of a worker process.
+
+    The component has no grid; its node values are views of the shared
+    memory of the parent process.
+    """
+    global _worker
+    _worker = LandslideProbability.__new__(LandslideProbability)
+    _worker.__dict__.update(state)
+    _worker._nodal_values = dict(
+        (name, np.frombuffer(shared))
+        for name, shared in shared_at_node.items())
+    for name, shared in shared_attrs.items():
+        setattr(_worker, name, np.frombuffer(shared))
+
+
+def _calculate_factor_of_safety_in_worker(args):
+    nodes, seed = args
+    return _worker._calculate_factor_of_safety_at_nodes(
+        nodes, random=np.random.RandomState(seed))
@@ -247,6 +247,171 @@ def test_calculate_landslide_probability_lognormal_spatial_method():
         seed=7)
     ls_prob_lognormal_spatial.calculate_landslide_probability()
     np.testing.assert_almost_equal(
-        grid_3.at_node['landslide__probability_of_failure'][5], 0.4)
+        grid_3.at_node['landslide__probability_of_failure'][5], 0.2)
     np.testing.assert_almost_equal(
-        grid_3.at_node['landslide__probability_of_failure'][9], 0.29999999)
+        grid_3.at_node['landslide__probability_of_failure'][9], 0.2)
+
+
+def _setup_rough_grid(seed, shape=(12, 15)):
+    """Set up a grid with random soil and topographic inputs.
+    """
+    grid = RasterModelGrid(shape, spacing=10.)
+    gridnum = grid.number_of_nodes
+    np.random.seed(seed)
+    grid.at_node['topographic__slope'] = np.random.rand(gridnum)
+    scatter_dat = np.random.randint(1, 10, gridnum)
+    grid.at_node['topographic__specific_contributing_area'] = (
+        np.random.randint(30, 900, gridnum))
+    grid.at_node['soil__transmissivity'] = np.random.randint(5, 20, gridnum)
+    grid.at_node['soil__mode_total_cohesion'] = (
+        np.random.randint(30, 900, gridnum))
+    grid.at_node['soil__minimum_total_cohesion'] = (
+        grid.at_node['soil__mode_total_cohesion'] - scatter_dat)
+    grid.at_node['soil__maximum_total_cohesion'] = (
+        grid.at_node['soil__mode_total_cohesion'] + scatter_dat)
+    grid.at_node['soil__internal_friction_angle'] = (
+        np.random.randint(26, 37, gridnum))
+    grid.at_node['soil__thickness'] = np.random.randint(1, 10, gridnum)
+    grid.at_node['soil__density'] = 2000. * np.ones(gridnum)
+    return grid
+
+
+def _loop_over_core_nodes(ls_prob):
+    """Run calculate_factor_of_safety at one core node at a time.
+    """
+    out = np.zeros((3, ls_prob.grid.number_of_nodes))
+    for i in ls_prob.grid.core_nodes:
+        ls_prob.calculate_factor_of_safety(i)
+        out[:, i] = (ls_prob._soil__mean_relative_wetness,
+                     ls_prob._landslide__probability_of_failure,
+                     ls_prob._soil__probability_of_saturation)
+    return out
+
+
+_OUTPUT_NAMES = ('soil__mean_relative_wetness',
+                 'landslide__probability_of_failure',
+                 'soil__probability_of_saturation')
+
+
+def test_chunks_match_loop_over_nodes():
+    """Testing that sampling chunks of nodes gives the same results as
+    looping over the nodes, whatever the chunk size.
+    """
+    for kwds in ({'groundwater__recharge_distribution': 'uniform'},
+                 {'groundwater__recharge_distribution': 'lognormal',
+                  'groundwater__recharge_mean': 30.,
+                  'groundwater__recharge_standard_deviation': 0.25}):
+        grid = _setup_rough_grid(1)
+        expected = _loop_over_core_nodes(
+            LandslideProbability(grid, number_of_iterations=25, seed=3,
+                                 **kwds))
+        for chunk_size in (1, 7, None):
+            grid = _setup_rough_grid(1)
+            LandslideProbability(
+                grid, number_of_iterations=25, seed=3, chunk_size=chunk_size,
+                **kwds).calculate_landslide_probability()
+            for name, values in zip(_OUTPUT_NAMES, expected):
+                assert_array_almost_equal(
+                    grid.at_node[name][grid.core_nodes],
+                    values[grid.core_nodes])
+
+
+def test_chunks_match_loop_over_nodes_with_ksat():
+    """Testing chunks of nodes with transmissivity from Ksat.
+    """
+    grid = _setup_rough_grid(2)
+    grid.at_node['soil__saturated_hydraulic_conductivity'] = (
+        np.random.randint(2, 10, grid.number_of_nodes))
+    expected = _loop_over_core_nodes(
+        LandslideProbability(grid, number_of_iterations=25, seed=4))
+    LandslideProbability(grid, number_of_iterations=25, seed=4,
+                         chunk_size=10).calculate_landslide_probability()
+    for name, values in zip(_OUTPUT_NAMES, expected):
+        assert_array_almost_equal(grid.at_node[name][grid.core_nodes],
+                                  values[grid.core_nodes])
+
+
+def test_lognormal_spatial_chunks_match_statistically():
+    """Testing that chunks with 'lognormal_spatial' recharge give the
+    same probabilities as looping over the nodes, within sampling error.
+    """
+    grid = _setup_rough_grid(5)
+    recharge_mean = np.random.randint(20, 70, grid.number_of_nodes) * 1.
+    recharge_stdev = np.random.rand(grid.number_of_nodes) * 10.
+    kwds = {'number_of_iterations': 2000,
+            'groundwater__recharge_distribution': 'lognormal_spatial',
+            'groundwater__recharge_mean': recharge_mean,
+            'groundwater__recharge_standard_deviation': recharge_stdev}
+    expected = _loop_over_core_nodes(
+        LandslideProbability(grid, seed=5, **kwds))
+    LandslideProbability(grid, seed=5,
+                         **kwds).calculate_landslide_probability()
+    for name, values in zip(_OUTPUT_NAMES, expected):
+        actual = grid.at_node[name][grid.core_nodes]
+        assert_true(np.all(np.abs(actual - values[grid.core_nodes]) < 0.06))
+        assert_true(abs(actual.mean() - values[grid.core_nodes].mean()) <
+                    0.005)
+
+    # same seed, same results
+    prob_fail = grid.at_node['landslide__probability_of_failure'].copy()
+    LandslideProbability(grid, seed=5,
+                         **kwds).calculate_landslide_probability()
+    assert_array_almost_equal(
+        grid.at_node['landslide__probability_of_failure'], prob_fail)
+
+
+def test_bad_n_workers():
+    """Testing that n_workers must be at least one.
+    """
+    grid = _setup_rough_grid(1)
+    assert_raises(ValueError, LandslideProbability, grid, n_workers=0)
+
+
+def test_workers_are_reproducible():
+    """Testing that results with worker processes depend on the seed and
+    chunk size but not on the number of workers.
+    """
+    results = []
+    for n_workers in (2, 3, 2):
+        grid = _setup_rough_grid(1)
+        LandslideProbability(
+            grid, number_of_iterations=25, seed=3, chunk_size=20,
+            n_workers=n_workers).calculate_landslide_probability()
+        results.append([grid.at_node[name].copy() for name in _OUTPUT_NAMES])
+    assert_array_almost_equal(results[0], results[1])
+    assert_array_almost_equal(results[0], results[2])
+
+    grid = _setup_rough_grid(1)
+    LandslideProbability(
+        grid, number_of_iterations=25, seed=4, chunk_size=20,
+        n_workers=2).calculate_landslide_probability()
+    assert_true(np.any(grid.at_node['landslide__probability_of_failure'] !=
+                       results[0][1]))
+
+
+def test_workers_match_statistically():
+    """Testing that worker processes give the same probabilities as a
+    single process, within sampling error.
+    """
+    grid = _setup_rough_grid(6)
+    recharge_mean = np.random.randint(20, 70, grid.number_of_nodes) * 1.
+    recharge_stdev = np.random.rand(grid.number_of_nodes) * 10.
+    for kwds in ({'groundwater__recharge_distribution': 'uniform'},
+                 {'groundwater__recharge_distribution': 'lognormal_spatial',
+                  'groundwater__recharge_mean': recharge_mean,
+                  'groundwater__recharge_standard_deviation':
+                      recharge_stdev}):
+        results = []
+        for n_workers in (1, 2):
+            LandslideProbability(
+                grid, number_of_iterations=2000, seed=6, chunk_size=40,
+                n_workers=n_workers, **kwds).calculate_landslide_probability()
+            results.append([grid.at_node[name].copy()
+                            for name in _OUTPUT_NAMES])
+        for expected, actual in zip(*results):
+            assert_array_almost_equal(expected[grid.boundary_nodes],
+                                      actual[grid.boundary_nodes])
+            expected = expected[grid.core_nodes]
+            actual = actual[grid.core_nodes]
+            assert_true(np.all(np.abs(actual - expected) < 0.06))
+            assert_true(abs(actual.mean() - expected.mean()) < 0.005)
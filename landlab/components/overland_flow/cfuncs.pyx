@@ -0,0 +1,645 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.math cimport fabs, isnan, pow, sqrt
+
+
+DTYPE_INT = np.int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_INT8 = np.int8
+ctypedef np.int8_t DTYPE_INT8_t
+
+
+cdef double _SEVEN_OVER_THREE = 7.0 / 3.0
+cdef double _TEN_THIRDS = 10.0 / 3.0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void _calc_flow_depth_and_slope_at_links(
+        double[:] h_at_link, double[:] slope_at_link,
+        const double[:] h_at_node, const double[:] z_at_node,
+        const DTYPE_INT_t[:] node_at_link_tail,
+        const DTYPE_INT_t[:] node_at_link_head,
+        const double[:] length_of_link,
+        const DTYPE_INT_t[:] links) nogil:
+    """Depth of flowing water and water-surface gradient at links.
+
+    Per Bates et al., 2010, the depth of flowing water is the difference
+    between the highest water surface and the highest bed elevation of
+    the link's two nodes.
+    """
+    cdef double z_max
+    cdef double w_tail
+    cdef double w_head
+    cdef DTYPE_INT_t link
+    cdef DTYPE_INT_t tail
+    cdef DTYPE_INT_t head
+    cdef int i
+
+    for i in range(links.shape[0]):
+        link = links[i]
+        tail = node_at_link_tail[link]
+        head = node_at_link_head[link]
+
+        w_tail = h_at_node[tail] + z_at_node[tail]
+        w_head = h_at_node[head] + z_at_node[head]
+
+        z_max = z_at_node[tail]
+        if z_at_node[head] > z_max:
+            z_max = z_at_node[head]
+
+        if w_head > w_tail:
+            h_at_link[link] = w_head - z_max
+        else:
+            h_at_link[link] = w_tail - z_max
+        slope_at_link[link] = (w_head - w_tail) / length_of_link[link]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def update_discharge_at_links(double[:] q,
+                              double[:] q_new,
+                              double[:] h_at_link,
+                              double[:] slope_at_link,
+                              const double[:] h_at_node,
+                              const double[:] z_at_node,
+                              const DTYPE_INT_t[:] node_at_link_tail,
+                              const DTYPE_INT_t[:] node_at_link_head,
+                              const double[:] length_of_link,
+                              const DTYPE_INT_t[:] active_links,
+                              const DTYPE_INT_t[:] links,
+                              const DTYPE_INT_t[:] neighbor1_at_link,
+                              const DTYPE_INT_t[:] neighbor2_at_link,
+                              const DTYPE_INT_t[:] fixed_links,
+                              const DTYPE_INT_t[:] fixed_link_neighbors,
+                              const double[:] mannings_n,
+                              double theta, double g, double dt):
+    """Update water discharge at links for one time step.
+
+    Calculate the depth of flowing water and the water-surface gradient
+    at *active_links* and then discharge at *links* with the de Almeida
+    et al. (2012) scheme. All arrays are updated in place.
+
+    Parameters
+    ----------
+    q : ndarray of float
+        Water discharge at links.
+    q_new : ndarray of float
+        Work buffer at least as long as *links*.
+    h_at_link : ndarray of float
+        Depth of flowing water at links.
+    slope_at_link : ndarray of float
+        Water-surface gradient at links.
+    h_at_node, z_at_node : ndarray of float
+        Water depth and topographic elevation at nodes.
+    node_at_link_tail, node_at_link_head : ndarray of int
+        Nodes at either end of each link.
+    length_of_link : ndarray of float
+        Length of each link.
+    active_links : ndarray of int
+        Active links to calculate flow depth and gradient at.
+    links : ndarray of int
+        Links to calculate discharge at.
+    neighbor1_at_link, neighbor2_at_link : ndarray of int
+        The links on either side of each link that are parallel to it
+        (-1 if there is none).
+    fixed_links, fixed_link_neighbors : ndarray of int
+        Fixed links that take the discharge of their active neighbor.
+    mannings_n : ndarray of float
+        Manning's roughness coefficient at links.
+    theta : float
+        Weighting factor from de Almeida et al., 2012.
+    g : float
+        Acceleration due to gravity.
+    dt : float
+        Time step.
+    """
+    cdef double half_one_minus_theta = (1. - theta) / 2.
+    cdef double q_at_neighbors
+    cdef DTYPE_INT_t link
+    cdef DTYPE_INT_t neighbor
+    cdef int i
+
+    with nogil:
+        _calc_flow_depth_and_slope_at_links(
+            h_at_link, slope_at_link, h_at_node, z_at_node,
+            node_at_link_tail, node_at_link_head, length_of_link,
+            active_links)
+
+        for i in range(fixed_links.shape[0]):
+            q[fixed_links[i]] = q[fixed_link_neighbors[i]]
+
+        # new values go into a buffer so that every link sees its
+        # neighbors' old discharge
+        for i in range(links.shape[0]):
+            link = links[i]
+
+            q_at_neighbors = 0.
+            neighbor = neighbor1_at_link[link]
+            if neighbor >= 0:
+                q_at_neighbors = q[neighbor]
+            neighbor = neighbor2_at_link[link]
+            if neighbor >= 0:
+                q_at_neighbors = q_at_neighbors + q[neighbor]
+
+            q_new[i] = ((theta * q[link] +
+                         half_one_minus_theta * q_at_neighbors -
+                         g * h_at_link[link] * dt * slope_at_link[link]) /
+                        (1 + g * dt * (mannings_n[link] * mannings_n[link]) *
+                         fabs(q[link]) /
+                         pow(h_at_link[link], _SEVEN_OVER_THREE)))
+
+        for i in range(links.shape[0]):
+            q[links[i]] = q_new[i]
+
+        for i in range(fixed_links.shape[0]):
+            q[fixed_links[i]] = q[fixed_link_neighbors[i]]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def update_discharge_at_links_bates(double[:] q,
+                                    double[:] h_at_link,
+                                    double[:] slope_at_link,
+                                    const double[:] h_at_node,
+                                    const double[:] z_at_node,
+                                    const DTYPE_INT_t[:] node_at_link_tail,
+                                    const DTYPE_INT_t[:] node_at_link_head,
+                                    const double[:] length_of_link,
+                                    const DTYPE_INT_t[:] links,
+                                    double mannings_n_squared,
+                                    double g, double dt):
+    """Update water discharge at links with Eq. 11 of Bates et al., 2010.
+
+    Parameters
+    ----------
+    q : ndarray of float
+        Water discharge at links (updated in place).
+    h_at_link : ndarray of float
+        Work buffer for the depth of flowing water at links.
+    slope_at_link : ndarray of float
+        Work buffer for the water-surface gradient at links.
+    h_at_node, z_at_node : ndarray of float
+        Water depth and topographic elevation at nodes.
+    node_at_link_tail, node_at_link_head : ndarray of int
+        Nodes at either end of each link.
+    length_of_link : ndarray of float
+        Length of each link.
+    links : ndarray of int
+        Active links to calculate discharge at.
+    mannings_n_squared : float
+        Square of Manning's roughness coefficient.
+    g : float
+        Acceleration due to gravity.
+    dt : float
+        Time step.
+    """
+    cdef double h
+    cdef DTYPE_INT_t link
+    cdef int i
+
+    with nogil:
+        _calc_flow_depth_and_slope_at_links(
+            h_at_link, slope_at_link, h_at_node, z_at_node,
+            node_at_link_tail, node_at_link_head, length_of_link, links)
+
+        for i in range(links.shape[0]):
+            link = links[i]
+            h = h_at_link[link]
+            q[link] = ((q[link] - g * h * dt * slope_at_link[link]) /
+                       (1.0 + g * h * dt * mannings_n_squared *
+                        fabs(q[link]) / pow(h, _TEN_THIRDS)))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def limit_discharge_at_links(double[:] q,
+                             const double[:] h_at_link,
+                             const DTYPE_INT_t[:] links,
+                             double g, double dx, double dt):
+    """Limit discharge so that flow stays subcritical and stable.
+
+    Where the Froude number of the flow at a link exceeds one, discharge
+    is reduced to that of critical flow. Where the discharge moves more
+    than a quarter of the link's water in one time step, discharge is
+    reduced to move a fifth of it.
+
+    Parameters
+    ----------
+    q : ndarray of float
+        Water discharge at links (updated in place).
+    h_at_link : ndarray of float
+        Depth of flowing water at links.
+    links : ndarray of int
+        Links to limit discharge at.
+    g : float
+        Acceleration due to gravity.
+    dx : float
+        Node spacing.
+    dt : float
+        Time step.
+    """
+    cdef double froude
+    cdef double courant
+    cdef double h
+    cdef double q_at_link
+    cdef DTYPE_INT_t link
+    cdef int i
+
+    with nogil:
+        for i in range(links.shape[0]):
+            link = links[i]
+            q_at_link = q[link]
+            h = h_at_link[link]
+            froude = (q_at_link / h) / sqrt(g * h)
+            courant = q_at_link * dt / dx
+
+            if q_at_link > 0.:
+                if froude > 1.:
+                    q[link] = h * sqrt(g * h)
+                if courant > h / 4.:
+                    q[link] = h * dx / 5. / dt
+            elif q_at_link < 0.:
+                if fabs(froude) > 1.:
+                    q[link] = 0. - (h * sqrt(g * h))
+                if fabs(courant) > h / 4.:
+                    q[link] = 0. - (h * dx / 5. / dt)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def update_depth_at_nodes(double[:] h,
+                          double[:] dhdt,
+                          const double[:] q,
+                          const DTYPE_INT_t[:, :] links_at_node,
+                          const DTYPE_INT8_t[:, :] link_dirs_at_node,
+                          const double[:] width_of_face_at_link,
+                          const double[:] cell_area_at_node,
+                          const DTYPE_INT_t[:] core_nodes,
+                          const DTYPE_INT_t[:] nodes,
+                          double rainfall_intensity, double dt,
+                          double h_min, double h_floor, bint clip):
+    """Update water depth at core nodes for one time step.
+
+    The rate of change of water depth at core nodes is the rainfall
+    intensity less the divergence of discharge. If *clip* is ``True``,
+    depths at *nodes* that are less than *h_min* are then set to
+    *h_floor*.
+
+    Parameters
+    ----------
+    h : ndarray of float
+        Water depth at nodes (updated in place).
+    dhdt : ndarray of float
+        Rate of change of water depth at nodes (updated in place at core
+        nodes).
+    q : ndarray of float
+        Water discharge at links.
+    links_at_node : ndarray of int, shape (n_nodes, 4)
+        Links at each node.
+    link_dirs_at_node : ndarray of int8, shape (n_nodes, 4)
+        Direction of links at each node.
+    width_of_face_at_link : ndarray of float
+        Width of the face that crosses each link.
+    cell_area_at_node : ndarray of float
+        Area of the cell around each node.
+    core_nodes : ndarray of int
+        Core nodes to update.
+    nodes : ndarray of int
+        Nodes to clip and to find the maximum depth of.
+    rainfall_intensity : float
+        Rainfall intensity.
+    dt : float
+        Time step.
+    h_min, h_floor : float
+        Minimum water depth, and depth to set shallower water to.
+    clip : bool
+        Set depths less than *h_min* to *h_floor*.
+
+    Returns
+    -------
+    float
+        The maximum water depth at *nodes* (NaN if any depth is NaN, and
+        zero if there are no nodes).
+    """
+    cdef double net_flux
+    cdef double h_max
+    cdef DTYPE_INT_t node
+    cdef DTYPE_INT_t link
+    cdef int i
+    cdef int j
+
+    with nogil:
+        for i in range(core_nodes.shape[0]):
+            node = core_nodes[i]
+            net_flux = 0.
+            for j in range(links_at_node.shape[1]):
+                link = links_at_node[node, j]
+                if link >= 0:
+                    net_flux = net_flux - (q[link] *
+                                           width_of_face_at_link[link] *
+                                           link_dirs_at_node[node, j])
+            dhdt[node] = rainfall_intensity - net_flux / cell_area_at_node[node]
+            h[node] = h[node] + dhdt[node] * dt
+
+        if clip:
+            for i in range(nodes.shape[0]):
+                if h[nodes[i]] < h_min:
+                    h[nodes[i]] = h_floor
+
+        # like numpy's amax, the maximum is NaN if any depth is NaN
+        if nodes.shape[0] > 0:
+            h_max = h[nodes[0]]
+        else:
+            h_max = 0.
+        for i in range(1, nodes.shape[0]):
+            node = nodes[i]
+            if h[node] > h_max:
+                h_max = h[node]
+            elif isnan(h[node]):
+                h_max = h[node]
+                break
+
+    return h_max
+
+
+cdef class WetFront:
+
+    """Links and nodes near standing water.
+
+    Keep track of the wet nodes of a grid (nodes with water deeper than
+    *wet_depth*) and of the links that water can move along during the
+    next time step: the links that have a wet node at either end, grown by
+    one more link. Links that are no longer near water have their
+    discharge set to zero.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A landlab grid.
+    wet_depth : float
+        Water depth above which a node is wet.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components.overland_flow.cfuncs import WetFront
+    >>> grid = RasterModelGrid((4, 6))
+    >>> h = grid.zeros(at='node')
+    >>> q = grid.zeros(at='link')
+    >>> h[7] = 1.
+
+    >>> front = WetFront(grid, .1)
+    >>> front.update(h, q)
+    >>> front.wet_nodes
+    array([7])
+    >>> np.sort(front.links)
+    array([ 0,  1,  5,  6,  7, 11, 12, 13, 16, 17, 18, 22, 23, 28])
+    >>> np.sort(front.active_links)
+    array([ 6,  7, 11, 12, 13, 17, 18, 22, 23, 28])
+    >>> np.sort(front.core_nodes)
+    array([ 7,  8,  9, 13, 14])
+
+    As the water moves, so does the front. Links that are left behind stop
+    carrying water.
+
+    >>> q[front.links] = 1.
+    >>> h[7], h[8] = 0., 1.
+    >>> front.update(h, q, incremental=True)
+    >>> front.wet_nodes
+    array([8])
+    >>> np.sort(front.links)
+    array([ 1,  2,  6,  7,  8, 11, 12, 13, 14, 17, 18, 19, 23, 24, 29])
+    >>> np.flatnonzero(q)
+    array([ 1,  6,  7, 11, 12, 13, 17, 18, 23])
+    """
+
+    cdef const DTYPE_INT_t[:, :] _links_at_node
+    cdef const DTYPE_INT_t[:] _node_at_link_tail
+    cdef const DTYPE_INT_t[:] _node_at_link_head
+    cdef DTYPE_INT8_t[:] _node_is_core
+    cdef DTYPE_INT8_t[:] _link_is_active
+
+    cdef DTYPE_INT_t[:] _node_stamp
+    cdef DTYPE_INT_t[:] _halo_stamp
+    cdef DTYPE_INT_t[:] _link_stamp
+    cdef long _stamp
+
+    cdef np.ndarray _wet_nodes
+    cdef np.ndarray _halo
+    cdef np.ndarray _links
+    cdef np.ndarray _old_links
+    cdef np.ndarray _active_links
+    cdef np.ndarray _nodes
+    cdef np.ndarray _old_nodes
+    cdef np.ndarray _core_nodes
+    cdef long _n_wet_nodes
+    cdef long _n_links
+    cdef long _n_active_links
+    cdef long _n_nodes
+    cdef long _n_core_nodes
+
+    cdef public double wet_depth
+
+    def __init__(self, grid, wet_depth):
+        cdef long n_nodes = grid.number_of_nodes
+        cdef long n_links = grid.number_of_links
+
+        self.wet_depth = wet_depth
+
+        self._links_at_node = np.ascontiguousarray(grid.links_at_node,
+                                                   dtype=DTYPE_INT)
+        self._node_at_link_tail = np.ascontiguousarray(
+            grid.node_at_link_tail, dtype=DTYPE_INT)
+        self._node_at_link_head = np.ascontiguousarray(
+            grid.node_at_link_head, dtype=DTYPE_INT)
+
+        node_is_core = np.zeros(n_nodes, dtype=DTYPE_INT8)
+        node_is_core[grid.core_nodes] = 1
+        self._node_is_core = node_is_core
+        link_is_active = np.zeros(n_links, dtype=DTYPE_INT8)
+        link_is_active[grid.active_links] = 1
+        self._link_is_active = link_is_active
+
+        self._node_stamp = np.zeros(n_nodes, dtype=DTYPE_INT)
+        self._halo_stamp = np.zeros(n_nodes, dtype=DTYPE_INT)
+        self._link_stamp = np.zeros(n_links, dtype=DTYPE_INT)
+        self._stamp = 0
+
+        self._wet_nodes = np.empty(n_nodes, dtype=DTYPE_INT)
+        self._halo = np.empty(n_nodes, dtype=DTYPE_INT)
+        self._nodes = np.empty(n_nodes, dtype=DTYPE_INT)
+        self._old_nodes = np.empty(n_nodes, dtype=DTYPE_INT)
+        self._core_nodes = np.empty(n_nodes, dtype=DTYPE_INT)
+        self._links = np.empty(n_links, dtype=DTYPE_INT)
+        self._old_links = np.empty(n_links, dtype=DTYPE_INT)
+        self._active_links = np.empty(n_links, dtype=DTYPE_INT)
+        self._n_wet_nodes = 0
+        self._n_links = 0
+        self._n_active_links = 0
+        self._n_nodes = 0
+        self._n_core_nodes = 0
+
+    property wet_nodes:
+        """Nodes with water deeper than *wet_depth*."""
+        def __get__(self):
+            return self._wet_nodes[:self._n_wet_nodes]
+
+    property links:
+        """Links that water can move along."""
+        def __get__(self):
+            return self._links[:self._n_links]
+
+    property active_links:
+        """Active links that water can move along."""
+        def __get__(self):
+            return self._active_links[:self._n_active_links]
+
+    property nodes:
+        """Nodes at either end of the links that water can move along."""
+        def __get__(self):
+            return self._nodes[:self._n_nodes]
+
+    property core_nodes:
+        """Core nodes whose water depth can change."""
+        def __get__(self):
+            return self._core_nodes[:self._n_core_nodes]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def update(self, const double[:] h, double[:] q, bint incremental=False):
+        """Find the wet nodes and the links and nodes around them.
+
+        Parameters
+        ----------
+        h : ndarray of float
+            Water depth at nodes.
+        q : ndarray of float
+            Water discharge at links. Discharge is set to zero at links
+            that are no longer near water.
+        incremental : bool, optional
+            Only look for wet nodes among the nodes found by the last
+            update. Use this only if water depth has not changed anywhere
+            else since then.
+        """
+        cdef const DTYPE_INT_t[:, :] links_at_node = self._links_at_node
+        cdef const DTYPE_INT_t[:] node_at_link_tail = self._node_at_link_tail
+        cdef const DTYPE_INT_t[:] node_at_link_head = self._node_at_link_head
+        cdef DTYPE_INT8_t[:] node_is_core = self._node_is_core
+        cdef DTYPE_INT8_t[:] link_is_active = self._link_is_active
+        cdef DTYPE_INT_t[:] node_stamp = self._node_stamp
+        cdef DTYPE_INT_t[:] halo_stamp = self._halo_stamp
+        cdef DTYPE_INT_t[:] link_stamp = self._link_stamp
+        cdef double wet_depth = self.wet_depth
+        cdef long n_links_at_node = links_at_node.shape[1]
+        cdef long n_candidates
+        cdef long n_halo = 0
+        cdef long n_old_links = self._n_links
+        cdef long stamp
+        cdef long node
+        cdef long other
+        cdef long link
+        cdef long i
+        cdef long j
+        cdef int k
+        cdef DTYPE_INT_t[:] candidates
+        cdef DTYPE_INT_t[:] wet_nodes
+        cdef DTYPE_INT_t[:] halo
+        cdef DTYPE_INT_t[:] links
+        cdef DTYPE_INT_t[:] old_links
+        cdef DTYPE_INT_t[:] active_links
+        cdef DTYPE_INT_t[:] nodes
+        cdef DTYPE_INT_t[:] core_nodes
+
+        # the new links and nodes go where the old ones were, and the old
+        # ones are kept for reference
+        self._links, self._old_links = self._old_links, self._links
+        self._nodes, self._old_nodes = self._old_nodes, self._nodes
+
+        if incremental:
+            candidates = self._old_nodes
+            n_candidates = self._n_nodes
+        else:
+            candidates = np.arange(h.shape[0], dtype=DTYPE_INT)
+            n_candidates = h.shape[0]
+
+        wet_nodes = self._wet_nodes
+        halo = self._halo
+        links = self._links
+        old_links = self._old_links
+        active_links = self._active_links
+        nodes = self._nodes
+        core_nodes = self._core_nodes
+
+        self._stamp += 1
+        stamp = self._stamp
+        self._n_wet_nodes = 0
+        self._n_links = 0
+        self._n_active_links = 0
+        self._n_nodes = 0
+        self._n_core_nodes = 0
+
+        with nogil:
+            # wet nodes and their neighbors
+            for i in range(n_candidates):
+                node = candidates[i]
+                if h[node] > wet_depth:
+                    wet_nodes[self._n_wet_nodes] = node
+                    self._n_wet_nodes += 1
+                    if halo_stamp[node] != stamp:
+                        halo_stamp[node] = stamp
+                        halo[n_halo] = node
+                        n_halo += 1
+                    for j in range(n_links_at_node):
+                        link = links_at_node[node, j]
+                        if link < 0:
+                            continue
+                        other = node_at_link_tail[link]
+                        if other == node:
+                            other = node_at_link_head[link]
+                        if halo_stamp[other] != stamp:
+                            halo_stamp[other] = stamp
+                            halo[n_halo] = other
+                            n_halo += 1
+
+            # all links at those nodes, and the nodes at their ends
+            for i in range(n_halo):
+                node = halo[i]
+                for j in range(n_links_at_node):
+                    link = links_at_node[node, j]
+                    if link < 0 or link_stamp[link] == stamp:
+                        continue
+                    link_stamp[link] = stamp
+                    links[self._n_links] = link
+                    self._n_links += 1
+                    if link_is_active[link]:
+                        active_links[self._n_active_links] = link
+                        self._n_active_links += 1
+
+                    for k in range(2):
+                        if k == 0:
+                            other = node_at_link_tail[link]
+                        else:
+                            other = node_at_link_head[link]
+                        if node_stamp[other] != stamp:
+                            node_stamp[other] = stamp
+                            nodes[self._n_nodes] = other
+                            self._n_nodes += 1
+                            if node_is_core[other]:
+                                core_nodes[self._n_core_nodes] = other
+                                self._n_core_nodes += 1
+
+            # links that are no longer near water stop carrying it
+            for i in range(n_old_links):
+                link = old_links[i]
+                if link_stamp[link] != stamp:
+                    q[link] = 0.
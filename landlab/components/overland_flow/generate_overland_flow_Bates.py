@@ -14,6 +14,9 @@ from landlab import Component, ModelParameterDictionary
 import numpy as np
 import os
 
+from .cfuncs import (update_discharge_at_links_bates, update_depth_at_nodes,
+                     WetFront)
+
 
 class OverlandFlowBates(Component):
     u"""Simulate overland flow using Bates et al. (2010).
@@ -54,6 +57,15 @@ class OverlandFlowBates(Component):
     ten_thirds : float, optional
         Precalculated value of :math:`10 / 3` which is used in the
         implicit shallow water equation.
+    track_wet_front : bool, optional
+        Only update links and nodes near water. Discharge is only
+        calculated at links with a wet node at either end, grown by one more
+        link, and the time step is found from the water depths at the nodes
+        of those links. While it rains, water depth is updated at all core
+        nodes.
+    wet_depth : float, optional
+        Water depth above which a node is wet when tracking the wet front.
+        The default is ten times *h_init*.
 
     Examples
     --------
@@ -99,7 +111,7 @@ class OverlandFlowBates(Component):
 
     def __init__(self, grid, h_init=0.00001, alpha=0.7,
                  mannings_n=0.03, g=9.81, rainfall_intensity=0.0,
-                 **kwds):
+                 track_wet_front=False, wet_depth=None, **kwds):
 
         super(OverlandFlowBates, self).__init__(grid, **kwds)
 
@@ -111,6 +123,10 @@ class OverlandFlowBates(Component):
         self.mannings_n = mannings_n
         self.g = g
         self.rainfall_intensity = rainfall_intensity
+        self.track_wet_front = track_wet_front
+        if wet_depth is None:
+            wet_depth = 10. * h_init
+        self.wet_depth = wet_depth
 
         # Now setting up fields at the links...
         # For water discharge
@@ -137,6 +153,17 @@ class OverlandFlowBates(Component):
         # Assiging a class variable to the elevation field.
         self.z = self._grid.at_node['topographic__elevation']
 
+        # Work buffers and grid quantities for the compiled update functions.
+        self._h_at_link = grid.zeros(at='link')
+        self._slope_at_link = grid.zeros(at='link')
+        self._dhdt = grid.zeros(at='node')
+        self._width_of_face_at_link = grid.zeros(at='link')
+        self._width_of_face_at_link[grid.link_at_face] = grid.width_of_face
+        self._no_nodes = np.array([], dtype=int)
+
+        # The links and nodes near water, found when we first need them.
+        self._wet_front = None
+
     def calc_time_step(self):
 
         # Adaptive time stepper from Bates et al., 2010 and de Almeida et al.,
@@ -146,6 +173,15 @@ class OverlandFlowBates(Component):
 
         return self.dt
 
+    def _calc_time_step_near_water(self):
+        """Adaptive time step from the water depths near the wet front."""
+        depth = self.h[self._wet_front.nodes]
+        if depth.size == 0:
+            return self.calc_time_step()
+        self.dt = self.alpha * self._grid.dx / np.sqrt(self.g * np.amax(depth))
+
+        return self.dt
+
     def overland_flow(self, dt=None, **kwds):
         """
         For one time step, this generates 'overland flow' across a given grid
@@ -167,10 +203,21 @@ class OverlandFlowBates(Component):
             you.
         """
 
+        # Find the links and nodes near water, if we only update those
+        if self.track_wet_front:
+            if self._wet_front is None:
+                self._wet_front = WetFront(self._grid, self.wet_depth)
+            self._wet_front.wet_depth = self.wet_depth
+            self._wet_front.update(self.h, self._grid.at_link[
+                'surface_water__discharge'])
+
         # If no dt is provided, one will be calculated using
         # self.gear_time_step()
         if dt is None:
-            self.calc_time_step()
+            if self.track_wet_front:
+                self._calc_time_step_near_water()
+            else:
+                self.calc_time_step()
 
         # In case another component has added data to the fields, we just reset
         # our water depths, topographic elevations and water discharge
@@ -183,33 +230,33 @@ class OverlandFlowBates(Component):
         self.core_nodes = self._grid.core_nodes
         self.active_links = self._grid.active_links
 
+        if self.track_wet_front:
+            update_links = self._wet_front.active_links
+            if self.rainfall_intensity != 0.:
+                update_core_nodes = self.core_nodes
+            else:
+                update_core_nodes = self._wet_front.core_nodes
+        else:
+            update_links = self.active_links
+            update_core_nodes = self.core_nodes
+
         # Per Bates et al., 2010, this solution needs to find the difference
         # between the highest water surface in the two cells and the highest
-        # bed elevation
-        zmax = self._grid.map_max_of_link_nodes_to_link(self.z)
-        w = self.h + self.z
-        wmax = self._grid.map_max_of_link_nodes_to_link(w)
-        hflow = wmax[self._grid.active_links] - zmax[self._grid.active_links]
-
-        # Now we calculate the slope of the water surface elevation at active
-        # links
-        water_surface_slope = (
-            self._grid.calc_grad_at_link(w)[self._grid.active_links])
-
-        # Here we calculate discharge at all active links using Eq. 11 from
-        # Bates et al., 2010
-        self.q[self.active_links] = (
-            (self.q[self.active_links] -
-             self.g * hflow * self.dt * water_surface_slope) /
-            (1.0 + self.g * hflow * self.dt * self.mannings_n_squared *
-             abs(self.q[self.active_links]) / hflow ** self.ten_thirds))
+        # bed elevation. With this and the slope of the water surface we
+        # calculate discharge at active links using Eq. 11 from Bates et al.,
+        # 2010.
+        update_discharge_at_links_bates(
+            self.q, self._h_at_link, self._slope_at_link, self.h, self.z,
+            self._grid.node_at_link_tail, self._grid.node_at_link_head,
+            self._grid.length_of_link, update_links,
+            self.mannings_n_squared, self.g, self.dt)
 
         # Update our water depths
-        dhdt = (self.rainfall_intensity - self._grid.calc_flux_div_at_node(
-            self.q))
-
-        self.h[self.core_nodes] = (self.h[self.core_nodes] +
-                                   dhdt[self.core_nodes] * self.dt)
+        update_depth_at_nodes(
+            self.h, self._dhdt, self.q, self._grid.links_at_node,
+            self._grid.link_dirs_at_node, self._width_of_face_at_link,
+            self._grid.cell_area_at_node, update_core_nodes, self._no_nodes,
+            self.rainfall_intensity, self.dt, 0., 0., False)
 
         # And reset our field values with the newest water depth and discharge.
         self._grid.at_node['surface_water__depth'] = self.h
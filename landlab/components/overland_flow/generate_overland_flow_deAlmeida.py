@@ -91,6 +91,9 @@ import numpy as np
 from landlab.grid.structured_quad import links
 from landlab.utils.decorators import use_file_name_or_kwds
 
+from .cfuncs import (update_discharge_at_links, limit_discharge_at_links,
+                     update_depth_at_nodes, WetFront)
+
 
 _SEVEN_OVER_THREE = 7.0 / 3.0
 
@@ -126,6 +129,11 @@ class OverlandFlow(Component):
         Weighting factor from de Almeida et al., 2012.
     rainfall_intensity : float, optional
         Rainfall intensity.
+    track_wet_front : bool, optional
+        Only update links and nodes near water (see Notes).
+    wet_depth : float, optional
+        Water depth above which a node is wet when tracking the wet front.
+        The default is ten times *h_init*.
 
 
 
@@ -136,7 +144,21 @@ class OverlandFlow(Component):
 
         OverlandFlow(grid, default_fixed_links=False, h_init=0.00001,
                  alpha=0.7, mannings_n=0.03, g=9.81, theta=0.8,
-                 rainfall_intensity=0.0, steep_slopes=False, **kwds)
+                 rainfall_intensity=0.0, steep_slopes=False,
+                 track_wet_front=False, wet_depth=None, **kwds)
+
+    Notes
+    -----
+    Much of a grid is often dry. With *track_wet_front*, discharge is only
+    calculated at links with a wet node at either end, grown by one more
+    link, and water depth only changes at the nodes of those links. The
+    time step is also found from the water depths at those nodes only. The
+    links and nodes are found again after every time step, and links that
+    are no longer near water stop carrying it. The thin layer of water that
+    is below *wet_depth* is left where it is.
+
+    Because rain falls everywhere, the water depth at all core nodes is
+    updated while it rains. Discharge is still only calculated near water.
 
 """
     _name = 'OverlandFlow'
@@ -176,7 +198,8 @@ class OverlandFlow(Component):
     @use_file_name_or_kwds
     def __init__(self, grid, default_fixed_links=False, h_init=0.00001,
                  alpha=0.7, mannings_n=0.03, g=9.81, theta=0.8,
-                 rainfall_intensity=0.0, steep_slopes=False, **kwds):
+                 rainfall_intensity=0.0, steep_slopes=False,
+                 track_wet_front=False, wet_depth=None, **kwds):
         """Create a overland flow component.
 
         Parameters
@@ -197,6 +220,11 @@ class OverlandFlow(Component):
             Weighting factor from de Almeida et al., 2012.
         rainfall_intensity : float, optional
             Rainfall intensity.
+        track_wet_front : bool, optional
+            Only update links and nodes near water.
+        wet_depth : float, optional
+            Water depth above which a node is wet when tracking the wet
+            front. The default is ten times *h_init*.
         """
         super(OverlandFlow, self).__init__(grid, **kwds)
 
@@ -215,6 +243,10 @@ class OverlandFlow(Component):
         self.theta = theta
         self.rainfall_intensity = rainfall_intensity
         self.steep_slopes = steep_slopes
+        self.track_wet_front = track_wet_front
+        if wet_depth is None:
+            wet_depth = 10. * h_init
+        self.wet_depth = wet_depth
 
 
         # Now setting up fields at the links...
@@ -285,11 +317,15 @@ class OverlandFlow(Component):
         Adaptive time stepper from Bates et al., 2010 and de Almeida
         et al., 2012
         """
-        self.dt = (self.alpha * self._grid.dx / np.sqrt(self.g * np.amax(
-            self._grid.at_node['surface_water__depth'])))
+        self.dt = self._time_step_for_depth(
+            np.amax(self._grid.at_node['surface_water__depth']))
 
         return self.dt
 
+    def _time_step_for_depth(self, max_depth):
+        """Stable time step for a given maximum water depth."""
+        return self.alpha * self._grid.dx / np.sqrt(self.g * max_depth)
+
     def set_up_neighbor_arrays(self):
         """Create and initialize link neighbor arrays.
 
@@ -390,6 +426,37 @@ class OverlandFlow(Component):
         self.q_vertical = np.zeros(links.number_of_vertical_links(
             self.grid.shape))
 
+        # Fixed links (if we use them) take the discharge of their active
+        # neighbor.
+        if self.default_fixed_links is True:
+            self._fixed_links = self.grid.fixed_links
+            self._fixed_link_neighbors = self.active_neighbors
+        else:
+            self._fixed_links = np.array([], dtype=int)
+            self._fixed_link_neighbors = np.array([], dtype=int)
+
+        # The parallel neighbors of every link, for the compiled update
+        # functions.
+        self._neighbor1_at_link = np.empty(self.grid.number_of_links,
+                                           dtype=int)
+        self._neighbor1_at_link[self.horizontal_ids] = self.west_neighbors
+        self._neighbor1_at_link[self.vertical_ids] = self.north_neighbors
+        self._neighbor2_at_link = np.empty(self.grid.number_of_links,
+                                           dtype=int)
+        self._neighbor2_at_link[self.horizontal_ids] = self.east_neighbors
+        self._neighbor2_at_link[self.vertical_ids] = self.south_neighbors
+
+        # Work buffer and grid quantities for the compiled update functions.
+        self._q_new = np.empty(self.grid.number_of_links)
+        self._all_links = np.arange(self.grid.number_of_links)
+        self._all_nodes = np.arange(self.grid.number_of_nodes)
+        self._width_of_face_at_link = np.zeros(self.grid.number_of_links)
+        self._width_of_face_at_link[self.grid.link_at_face] = (
+            self.grid.width_of_face)
+
+        # The links and nodes near water, if we only update those.
+        self._wet_front = WetFront(self.grid, self.wet_depth)
+
         # Once the neighbor arrays are set up, we change the flag to True!
         self.neighbor_flag = True
 
@@ -405,12 +472,46 @@ class OverlandFlow(Component):
         Outputs water depth, discharge and shear stress values through time at
         every point in the input grid.
         """
+        # First, we check and see if the neighbor arrays have been
+        # initialized
+        if self.neighbor_flag is False:
+            self.set_up_neighbor_arrays()
+
+        # In case another component has added data to the fields, we just
+        # reset our water depths, topographic elevations and water
+        # discharge variables to the fields.
+        self.h = self.grid['node']['surface_water__depth']
+        self.z = self.grid['node']['topographic__elevation']
+        self.q = self.grid['link']['surface_water__discharge']
+        self.h_links = self.grid['link']['surface_water__depth']
+        self.water_surface_slope = self.grid['link']['water_surface__gradient']
+
+        # Here we identify the core nodes and active links for later use.
+        self.core_nodes = self.grid.core_nodes
+        self.active_links = self.grid.active_links
+
+        # Manning's n can be a single value or a value for every link
+        mannings_n = np.broadcast_to(np.asarray(self.mannings_n, dtype=float),
+                                     (self.grid.number_of_links, ))
+
+        # The compiled functions update the fields in place and return the
+        # new maximum water depth, which sets the next time step.
+        max_depth = np.amax(self.h)
+
+        # Links to calculate discharge at, and nodes to update. If we track
+        # the wet front, these are found again after each time step.
+        wet_front = self._wet_front
+        if self.track_wet_front:
+            wet_front.wet_depth = self.wet_depth
+            wet_front.update(self.h, self.q)
+        raining = self.rainfall_intensity != 0.
+
         # DH adds a loop to enable an imposed tstep while maintaining stability
         local_elapsed_time = 0.
         if dt is None:
             dt = np.inf  # to allow the loop to begin
         while local_elapsed_time < dt:
-            dt_local = self.calc_time_step()
+            dt_local = self._time_step_for_depth(max_depth)
             # Can really get into trouble if nothing happens but we still run:
             if not dt_local < np.inf:
                 break
@@ -418,221 +519,67 @@ class OverlandFlow(Component):
                 dt_local = dt - local_elapsed_time
             self.dt = dt_local
 
-            # First, we check and see if the neighbor arrays have been
-            # initialized
-            if self.neighbor_flag is False:
-                self.set_up_neighbor_arrays()
-
-            # In case another component has added data to the fields, we just
-            # reset our water depths, topographic elevations and water
-            # discharge variables to the fields.
-            self.h = self.grid['node']['surface_water__depth']
-            self.z = self.grid['node']['topographic__elevation']
-            self.q = self.grid['link']['surface_water__discharge']
-            self.h_links = self.grid['link']['surface_water__depth']
-         
-            # Here we identify the core nodes and active links for later use.
-            self.core_nodes = self.grid.core_nodes
-            self.active_links = self.grid.active_links
+            if self.track_wet_front:
+                update_links = wet_front.links
+                update_active_links = wet_front.active_links
+                if raining:
+                    update_core_nodes = self.core_nodes
+                    update_nodes = self._all_nodes
+                else:
+                    update_core_nodes = wet_front.core_nodes
+                    update_nodes = wet_front.nodes
+            else:
+                update_links = self._all_links
+                update_active_links = self.active_links
+                update_core_nodes = self.core_nodes
+                update_nodes = self._all_nodes
 
             # Per Bates et al., 2010, this solution needs to find difference
             # between the highest water surface in the two cells and the
-            # highest bed elevation
-            zmax = self._grid.map_max_of_link_nodes_to_link(self.z)
-            w = self.h + self.z
-            wmax = self._grid.map_max_of_link_nodes_to_link(w)
-            hflow = wmax[self._grid.active_links] - zmax[
-                self._grid.active_links]
-
-            # Insert this water depth into an array of water depths at the
-            # links.
-            self.h_links[self.active_links] = hflow
-
-            # Now we calculate the slope of the water surface elevation at
-            # active links
-            self.water_surface__gradient = (
-                self.grid.calc_grad_at_link(w)[self.grid.active_links])
-
-            # And insert these values into an array of all links
-            self.water_surface_slope[self.active_links
-                                      ] = self.water_surface__gradient
-            # If the user chooses to set boundary links to the neighbor value,
-            # we set the discharge array to have the boundary links set to
-            # their neighbor value
-            if self.default_fixed_links is True:
-                self.q[self.grid.fixed_links] = self.q[self.active_neighbors]
-
-            # Now we can calculate discharge. To handle links with neighbors
-            # that do not exist, we will do a fancy indexing trick. Non-
-            # existent links or inactive links have an index of '-1', which in
-            # Python, looks to the end of a list or array. To accommodate these
-            # '-1' indices, we will simply insert an value of 0.0 discharge (in
-            # units of L^2/T) to the end of the discharge array.
-            self.q = np.append(self.q, [0])
-            
-            horiz = self.horizontal_ids
-            vert = self.vertical_ids
-            # Now we calculate discharge in the horizontal direction
-            try:
-                self.q[horiz] = ((
-                    self.theta * self.q[horiz] + (1. - self.theta) / 2. *
-                    (self.q[self.west_neighbors] + self.q[self.east_neighbors]) -
-                    self.g * self.h_links[horiz] * self.dt *
-                    self.water_surface_slope[horiz]) / (1 + self.g * self.dt 
-                    * self.mannings_n ** 2. * abs(self.q[horiz]) / 
-                    self.h_links[horiz] ** _SEVEN_OVER_THREE))
-    
-                # ... and in the vertical direction
-                self.q[vert] = ((
-                    self.theta * self.q[vert] + (1 - self.theta) / 2. *
-                    (self.q[self.north_neighbors] + self.q[self.south_neighbors]) -
-                    self.g * self.h_links[vert] * self.dt *
-                    self.water_surface_slope[vert]) / (1 + self.g * self.dt * 
-                    self.mannings_n ** 2. * abs(self.q[vert]) / 
-                    self.h_links[vert] ** _SEVEN_OVER_THREE))
-                
-            except ValueError:
-                self.mannings_n = self.grid['link']['mannings_n']
-                # if manning's n in a field
-                # calc discharge in horizontal
-                self.q[horiz] = ((
-                    self.theta * self.q[horiz] + (1. - self.theta) / 2. *
-                    (self.q[self.west_neighbors] + self.q[self.east_neighbors]) -
-                    self.g * self.h_links[horiz] * self.dt *
-                    self.water_surface_slope[horiz]) / (1 + self.g * self.dt 
-                    * self.mannings_n[horiz]** 2. * abs(self.q[horiz]) / 
-                    self.h_links[horiz] ** _SEVEN_OVER_THREE))
-    
-                # ... and in the vertical direction
-                self.q[vert] = ((
-                    self.theta * self.q[vert] + (1 - self.theta) / 2. *
-                    (self.q[self.north_neighbors] + self.q[self.south_neighbors]) -
-                    self.g * self.h_links[vert] * self.dt *
-                    self.water_surface_slope[self.vertical_ids]) / (1 + self.g 
-                    * self.dt * self.mannings_n[vert] ** 2. * abs(self.q[vert])
-                    / self.h_links[vert] ** _SEVEN_OVER_THREE))
-
-            # Now to return the array to its original length (length of number
-            # of all links), we delete the extra 0.0 value from the end of the
-            # array.
-            self.q = np.delete(self.q, len(self.q) - 1)
-
-            # Updating the discharge array to have the boundary links set to
-            # their neighbor
-            if self.default_fixed_links is True:
-                self.q[self.grid.fixed_links] = self.q[self.active_neighbors]
+            # highest bed elevation. With this water depth and the water
+            # surface slope at active links we then calculate discharge in
+            # the horizontal and vertical directions. Links without a
+            # neighbor see zero discharge there. If the user chooses to set
+            # boundary links to the neighbor value, fixed links take the
+            # discharge of their active neighbor.
+            update_discharge_at_links(
+                self.q, self._q_new, self.h_links, self.water_surface_slope,
+                self.h, self.z, self.grid.node_at_link_tail,
+                self.grid.node_at_link_head, self.grid.length_of_link,
+                update_active_links, update_links, self._neighbor1_at_link,
+                self._neighbor2_at_link, self._fixed_links,
+                self._fixed_link_neighbors, mannings_n, self.theta, self.g,
+                self.dt)
 
             if self.steep_slopes is True:
-                # To prevent water from draining too fast for our time steps...
-                # Our Froude number.
-                Fr = 1.0
-                # Our two limiting factors, the froude number and courant
-                # number.
-                # Looking a calculated q to be compared to our Fr number.
-                calculated_q = (self.q / self.h_links) / np.sqrt(self.g *
-                                                                 self.h_links)
-
-                # Looking at our calculated q and comparing it to Courant no.,
-                q_courant = self.q * self.dt / self.grid.dx
-
-                # Water depth split equally between four links..
-                water_div_4 = self.h_links / 4.
-
-                # IDs where water discharge is positive...
-                (positive_q, ) = np.where(self.q > 0)
-
-                # ... and negative.
-                (negative_q, ) = np.where(self.q < 0)
-
-                # Where does our calculated q exceed the Froude number? If q
-                # does exceed the Froude number, we are getting supercritical
-                # flow and discharge needs to be reduced to maintain stability.
-                (Froude_logical, ) = np.where((calculated_q) > Fr)
-                (Froude_abs_logical, ) = np.where(abs(calculated_q) > Fr)
-
-                # Where does our calculated q exceed the Courant number and
-                # water depth divided amongst 4 links? If the calculated q
-                # exceeds the Courant number and is greater than the water
-                # depth divided by 4 links, we reduce discharge to maintain
-                # stability.
-                (water_logical, ) = np.where(q_courant > water_div_4)
-                (water_abs_logical, ) = np.where(abs(q_courant) > water_div_4)
-
-                # Where are these conditions met? For positive and negative q,
-                # there are specific rules to reduce q. This step finds where
-                # the discharge values are positive or negative and where
-                # discharge exceeds the Froude or Courant number.
-                self.if_statement_1 = np.intersect1d(positive_q,
-                                                     Froude_logical)
-                self.if_statement_2 = np.intersect1d(negative_q,
-                                                     Froude_abs_logical)
-                self.if_statement_3 = np.intersect1d(positive_q, water_logical)
-                self.if_statement_4 = np.intersect1d(negative_q,
-                                                     water_abs_logical)
-
-                # Rules 1 and 2 reduce discharge by the Froude number.
-                self.q[self.if_statement_1] = (
-                    self.h_links[self.if_statement_1] *
-                    (np.sqrt(self.g * self.h_links[self.if_statement_1]) * Fr))
-
-                self.q[self.if_statement_2] = (
-                    0. - (self.h_links[self.if_statement_2] *
-                          np.sqrt(self.g * self.h_links[self.if_statement_2]) *
-                          Fr))
-
-                # Rules 3 and 4 reduce discharge by the Courant number.
-                self.q[self.if_statement_3] = (((
-                    self.h_links[self.if_statement_3] * self.grid.dx) / 5.) /
-                    self.dt)
-
-                self.q[self.if_statement_4] = (0. - (self.h_links[
-                    self.if_statement_4] * self.grid.dx / 5.) / self.dt)
+                # To prevent water from draining too fast for our time steps,
+                # reduce discharge where it exceeds the Froude number or the
+                # Courant number (discharge greater than the water depth
+                # divided amongst 4 links).
+                limit_discharge_at_links(self.q, self.h_links, update_links,
+                                         self.g, self.grid.dx, self.dt)
 
             # Once stability has been restored, we calculate the change in
             # water depths on all core nodes by finding the difference between
             # inputs (rainfall) and the inputs/outputs (flux divergence of
-            # discharge)
-            self.dhdt = (self.rainfall_intensity -
-                         self.grid.calc_flux_div_at_node(self.q))
-
-            # Updating our water depths...
-            self.h[self.core_nodes] = (self.h[self.core_nodes] +
-                                       self.dhdt[self.core_nodes] * self.dt)
-
+            # discharge), and update the water depths.
+            #
             # To prevent divide by zero errors, a minimum threshold water depth
             # must be maintained. To reduce mass imbalances, this is set to
             # find locations where water depth is smaller than h_init (default
             # is 0.001) and the new value is self.h_init * 10^-3. This was set
             # as it showed the smallest amount of mass creation in the grid
             # during testing.
-            if self.steep_slopes is True:
-                self.h[self.h < self.h_init] = self.h_init * 10.0 ** -3
-
-            # And reset our field values with the newest water depth and
-            # discharge.
-            self.grid.at_node['surface_water__depth'] = self.h
-            self.grid.at_link['surface_water__discharge'] = self.q
-#
-#
-#            self.helper_q = self.grid.map_upwind_node_link_max_to_node(self.q)
-#            self.helper_s = self.grid.map_upwind_node_link_max_to_node(
-#                                                    self.water_surface_slope)
-#            
-#            self.helper_q = self.grid.map_max_of_link_nodes_to_link(self.helper_q)
-#            self.helper_s = self.grid.map_max_of_link_nodes_to_link(self.helper_s)
-#
-#            self.grid['link']['surface_water__discharge'][
-#                     self.active_links_at_open_bdy] = self.helper_q[
-#                     self.active_links_at_open_bdy]
-#
-#            self.grid['link']['water_surface__gradient'][
-#                self.active_links_at_open_bdy] = self.helper_s[
-#                self.active_links_at_open_bdy]
-            ## Update nodes near boundary locations - nodes adjacent to
-            ## boundaries may have discharge and water surface slopes
-            ## artifically reduced due to boundary effects. This step removes
-            ## those errors. 
-            
+            max_depth = update_depth_at_nodes(
+                self.h, self.dhdt, self.q, self.grid.links_at_node,
+                self.grid.link_dirs_at_node, self._width_of_face_at_link,
+                self.grid.cell_area_at_node, update_core_nodes, update_nodes,
+                self.rainfall_intensity, self.dt, self.h_init,
+                self.h_init * 10.0 ** -3, self.steep_slopes is True)
+
+            if self.track_wet_front:
+                wet_front.update(self.h, self.q, incremental=not raining)
+
             if dt is np.inf:
                 break
             local_elapsed_time += self.dt
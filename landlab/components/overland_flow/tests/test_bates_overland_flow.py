@@ -103,4 +103,24 @@ def test_Bates_analytical():
     hBates = bates.h.reshape(grid.shape)
     hBates = hBates[1][1:]
     hBates = np.append(hBates, [0])
-    np.testing.assert_almost_equal(h_analytical, hBates, decimal=1)
\ No newline at end of file
+    np.testing.assert_almost_equal(h_analytical, hBates, decimal=1)
+
+def test_Bates_wet_front_matches_full_grid():
+    from landlab import RasterModelGrid
+
+    def run(track_wet_front):
+        grid = RasterModelGrid((30, 30), spacing=10.)
+        grid.add_zeros('node', 'topographic__elevation')
+        grid.add_zeros('node', 'surface_water__depth')
+        grid.at_node['surface_water__depth'][grid.nodes[14:16, 14:16]] = 0.1
+        bates = OverlandFlowBates(grid, track_wet_front=track_wet_front)
+        bates.dt = 0.5
+        for _ in range(100):
+            bates.overland_flow(dt=bates.dt)
+        return bates
+
+    full = run(False)
+    front = run(True)
+    assert_true(front._wet_front.wet_nodes.size > 4)
+    assert_true(front._wet_front.links.size < front.grid.number_of_links / 2)
+    np.testing.assert_allclose(front.h, full.h, rtol=0., atol=1e-5)
@@ -163,3 +163,87 @@ def test_deAlm_analytical_imposed_dt_long():
     hdeAlm = hdeAlm[1][1:]
     hdeAlm = np.append(hdeAlm, [0])
     np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def _setup_tilted_grid():
+    from landlab import RasterModelGrid
+    grid = RasterModelGrid((10, 12), spacing=10.)
+    grid.add_zeros('node', 'surface_water__depth')
+    grid.add_field('node', 'topographic__elevation', 0.01 * grid.node_y)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    grid.at_node['surface_water__depth'][grid.core_nodes] = 0.2
+    return grid
+
+
+def test_deAlm_updates_fields_in_place():
+    grid = _setup_tilted_grid()
+    deAlm = OverlandFlow(grid, steep_slopes=True, rainfall_intensity=1e-5)
+    h = grid.at_node['surface_water__depth']
+    q = grid.at_link['surface_water__discharge']
+    deAlm.run_one_step(dt=100.)
+
+    assert_true(grid.at_node['surface_water__depth'] is h)
+    assert_true(grid.at_link['surface_water__discharge'] is q)
+    assert_true(deAlm.h is h)
+    assert_true(deAlm.q is q)
+    assert_true(np.all(q[grid.vertical_links] <= 0.))
+    assert_true(np.any(q < 0.))
+
+
+def test_deAlm_mannings_n_field():
+    grid1 = _setup_tilted_grid()
+    deAlm1 = OverlandFlow(grid1, mannings_n=0.02)
+    deAlm1.run_one_step(dt=100.)
+
+    grid2 = _setup_tilted_grid()
+    grid2.add_field('link', 'mannings_n', np.full(grid2.number_of_links, .02))
+    deAlm2 = OverlandFlow(grid2, mannings_n='mannings_n')
+    deAlm2.run_one_step(dt=100.)
+
+    np.testing.assert_array_equal(grid1.at_node['surface_water__depth'],
+                                  grid2.at_node['surface_water__depth'])
+    np.testing.assert_array_equal(grid1.at_link['surface_water__discharge'],
+                                  grid2.at_link['surface_water__discharge'])
+
+
+def _run_dam_break(track_wet_front):
+    from landlab import RasterModelGrid
+    grid = RasterModelGrid((40, 40), spacing=10.)
+    grid.add_zeros('node', 'topographic__elevation')
+    h = grid.add_zeros('node', 'surface_water__depth')
+    h[grid.nodes[17:23, 17:23]] = 0.5
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    deAlm = OverlandFlow(grid, steep_slopes=True,
+                         track_wet_front=track_wet_front)
+    for _ in range(5):
+        deAlm.run_one_step(dt=60.)
+    return deAlm
+
+
+def test_deAlm_wet_front_matches_full_grid():
+    full = _run_dam_break(False)
+    front = _run_dam_break(True)
+    h_full = full.grid.at_node['surface_water__depth']
+    h_front = front.grid.at_node['surface_water__depth']
+
+    # the water has spread, but not over the whole grid
+    wet_nodes = front._wet_front.wet_nodes
+    assert_true(wet_nodes.size > 36)
+    assert_true(wet_nodes.size < front.grid.number_of_core_nodes / 2)
+
+    # the only difference is the thin layer of water at dry nodes
+    np.testing.assert_allclose(h_front, h_full, rtol=0., atol=1e-4)
+    np.testing.assert_array_equal(h_front[wet_nodes] > front.wet_depth, True)
+
+
+def test_deAlm_wet_front_conserves_mass():
+    deAlm = _run_dam_break(True)
+    h = deAlm.grid.at_node['surface_water__depth']
+    initial_volume = (36 * 0.5 + deAlm.grid.number_of_nodes * deAlm.h_init)
+    np.testing.assert_almost_equal(h.sum(), initial_volume, decimal=8)
+
+    # links away from water carry none
+    q = deAlm.grid.at_link['surface_water__discharge']
+    away = np.ones(deAlm.grid.number_of_links, dtype=bool)
+    away[deAlm._wet_front.links] = False
+    assert_true(np.all(q[away] == 0.))
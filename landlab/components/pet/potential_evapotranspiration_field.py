@@ -232,6 +232,15 @@ class PotentialEvapotranspiration(Component):
 
         self._cell_values = self.grid['cell']
 
+    @property
+    def pet_value(self):
+        """Potential evapotranspiration of a flat surface (mm/d).
+
+        Value calculated by the last call to update, before it is scaled
+        by the ratio of incident radiation to that of a flat surface.
+        """
+        return self._PET_value
+
     def update(self, current_time=None, const_potential_evapotranspiration=12.,
                Tmin=0., Tmax=1., Tavg=0.5, obs_radiation=350., **kwds):
         """Update fields with current conditions.
@@ -364,19 +364,13 @@ class VegCA(Component):
 
 def count(Arr, value):
     Res = np.zeros(Arr.shape[0], dtype=int)
-    x, y = Arr.shape
-    for i in range(0, x):
-        for j in range(0, y):
-            if Arr[i][j] == value:
-                Res[i] += 1
+    for j in range(Arr.shape[1]):
+        Res += Arr[:, j] == value
     return Res
 
 
 def WS_PFT(VegType, PlantType, WS):
     Phi = np.zeros(WS.shape[0])
-    x, y = WS.shape
-    for i in range(0, x):
-        for j in range(0, y):
-            if VegType[i][j] == PlantType:
-                Phi[i] += WS[i][j]
+    for j in range(WS.shape[1]):
+        Phi += np.where(VegType[:, j] == PlantType, WS[:, j], 0.)
     return Phi
@@ -387,3 +387,59 @@ def test_D4_filling():
                               hole1)
     assert_array_almost_equal(mg.at_node['topographic__elevation'][lake2],
                               hole2)
+
+
+def test_bad_method():
+    """
+    Tests that only the lake mapper and the priority flood are understood.
+    """
+    mg = RasterModelGrid(5, 5, 1.)
+    mg.add_zeros('node', 'topographic__elevation')
+    assert_raises(ValueError, SinkFiller, mg, method='bucket')
+
+
+@with_setup(setup_dans_grid5)
+def test_priority_flood_filling():
+    """
+    Tests the priority flood fills flat to the same surface as the lake
+    mapper, with both D8 and D4 routing.
+    """
+    for routing in ('D8', 'D4'):
+        mg.at_node['topographic__elevation'][:] = z
+        SinkFiller(mg, routing=routing).fill_pits()
+        lake_mapper_z = mg.at_node['topographic__elevation'].copy()
+
+        mg.at_node['topographic__elevation'][:] = z
+        hf = SinkFiller(mg, routing=routing, method='priority_flood')
+        hf.fill_pits()
+        assert_array_equal(mg.at_node['topographic__elevation'],
+                           lake_mapper_z)
+        assert_array_equal(mg.at_node['sediment_fill__depth'],
+                           lake_mapper_z - z)
+
+
+def test_priority_flood_rough_surface():
+    """
+    Tests the priority flood on a surface covered in pits, with and without
+    a slope on the filled surface.
+    """
+    for routing in ('D8', 'D4'):
+        mg = RasterModelGrid(20, 30, 1.)
+        np.random.seed(11)
+        z_init = np.random.rand(mg.number_of_nodes)
+        z = mg.add_field('node', 'topographic__elevation', z_init.copy())
+        SinkFiller(mg, routing=routing).fill_pits()
+        lake_mapper_z = z.copy()
+
+        z[:] = z_init
+        SinkFiller(mg, routing=routing, method='priority_flood').fill_pits()
+        assert_array_equal(z, lake_mapper_z)
+
+        z[:] = z_init
+        SinkFiller(mg, routing=routing, method='priority_flood',
+                   apply_slope=True).fill_pits()
+        assert_true(np.all(z >= lake_mapper_z))
+        assert_array_almost_equal(z, lake_mapper_z, decimal=3)
+        fr = FlowRouter(mg, method=routing)
+        fr.route_flow()
+        assert_equal(mg.at_node['flow__sink_flag'][mg.core_nodes].sum(), 0)
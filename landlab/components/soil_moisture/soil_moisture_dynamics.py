@@ -452,133 +452,107 @@ class SoilMoisture(Component):
         # else:
         #     self._fr = (self._vegcover[0]*LAIl/LAIt)
         self._fr[self._fr > 1.] = 1.
-        self._Sini = np.zeros(self._SO.shape)
-        self._ETmax = np.zeros(self._SO.shape)
-
-        for cell in range(0, self.grid.number_of_cells):
-            P = P_[cell]
-            # print cell
-            s = self._SO[cell]
-            fbare = self._fbare
-            ZR = self._zr[cell]
-            pc = self._soil_pc[cell]
-            fc = self._soil_fc[cell]
-            scc = self._soil_sc[cell]
-            wp = self._soil_wp[cell]
-            hgw = self._soil_hgw[cell]
-            beta = self._soil_beta[cell]
-            if self._vegtype[cell] == 0:   # 0 - GRASS
-                sc = scc*self._fr[cell]+(1-self._fr[cell])*fc
-            else:
-                sc = scc
-
-            Inf_cap = (self._soil_Ib[cell]*(1-self._vegcover[cell]) +
-                       self._soil_Iv[cell]*self._vegcover[cell])
-            # Infiltration capacity
-            Int_cap = min(self._vegcover[cell]*self._interception_cap[cell],
-                          P)
-            # Interception capacity
-            Peff = max(P-Int_cap, 0.)         # Effective precipitation depth
-            mu = (Inf_cap/1000.0)/(pc*ZR*(np.exp(beta*(1.-fc))-1.))
-            Ep = max((self._PET[cell]*self._fr[cell] +
-                     fbare*self._PET[cell]*(1.-self._fr[cell])) -
-                     Int_cap, 0.0001)  # mm/d
-            self._ETmax[cell] = Ep
-            nu = ((Ep / 24.) / 1000.) / (pc*ZR)   # Loss function parameter
-            nuw = ((self._soil_Ew/24.)/1000.)/(pc*ZR)
-            # Loss function parameter
-            sini = self._SO[cell] + ((Peff+self._runon)/(pc*ZR*1000.))
-
-            if sini > 1.:
-                self._runoff[cell] = (sini-1.)*pc*ZR*1000.
-                # print 'Runoff =', self._runoff
-                sini = 1.
-            else:
-                self._runoff[cell] = 0.
-
-            if sini >= fc:
-                tfc = (1./(beta*(mu-nu)))*(beta*(fc-sini) + np.log((
-                       nu-mu+mu*np.exp(beta*(sini-fc)))/nu))
-                tsc = ((fc-sc)/nu)+tfc
-                twp = ((sc-wp)/(nu-nuw))*np.log(nu/nuw)+tsc
-
-                if Tb < tfc:
-                    s = abs(sini-(1./beta)*np.log(((nu-mu+mu *
-                            np.exp(beta*(sini-fc)))*np.exp(beta*(nu-mu)*Tb) -
-                            mu*np.exp(beta*(sini-fc)))/(nu-mu)))
-
-                    self._D[cell] = ((pc*ZR*1000.)*(sini-s))-(Tb*(Ep/24.))
-                    self._ETA[cell] = (Tb*(Ep/24.))
-
-                elif Tb >= tfc and Tb < tsc:
-                    s = fc-(nu*(Tb-tfc))
-                    self._D[cell] = ((pc*ZR*1000.)*(sini-fc))-((tfc)*(Ep/24.))
-                    self._ETA[cell] = (Tb*(Ep/24.))
-
-                elif Tb >= tsc and Tb < twp:
-                    s = (wp+(sc-wp)*((nu/(nu-nuw))*np.exp((-1)*((nu-nuw) /
-                         (sc-wp))*(Tb-tsc))-(nuw/(nu-nuw))))
-                    self._D[cell] = ((pc*ZR*1000.)*(sini-fc))-(tfc*Ep/24.)
-                    self._ETA[cell] = (1000.*ZR*pc*(sini-s))-self._D[cell]
-
-                else:
-                    s = (hgw+(wp-hgw)*np.exp((-1)*(nuw/(wp-hgw)) *
-                         max(Tb-twp, 0.)))
-                    self._D[cell] = ((pc*ZR*1000.)*(sini-fc))-(tfc*Ep/24.)
-                    self._ETA[cell] = (1000.*ZR*pc*(sini-s))-self._D[cell]
-
-            elif sini < fc and sini >= sc:
-                tfc = 0.
-                tsc = (sini-sc)/nu
-                twp = ((sc-wp)/(nu-nuw))*np.log(nu/nuw)+tsc
-
-                if Tb < tsc:
-                    s = sini - nu*Tb
-                    self._D[cell] = 0.
-                    self._ETA[cell] = 1000.*ZR*pc*(sini-s)
-
-                elif Tb >= tsc and Tb < twp:
-                    s = (wp+(sc-wp)*((nu/(nu-nuw))*np.exp((-1) *
-                         ((nu-nuw)/(sc-wp))*(Tb-tsc))-(nuw/(nu-nuw))))
-                    self._D[cell] = 0
-                    self._ETA[cell] = (1000.*ZR*pc*(sini-s))
-
-                else:
-                    s = hgw+(wp-hgw)*np.exp((-1)*(nuw/(wp-hgw))*(Tb-twp))
-                    self._D[cell] = 0.
-                    self._ETA[cell] = (1000.*ZR*pc*(sini-s))
-
-            elif sini < sc and sini >= wp:
-                tfc = 0
-                tsc = 0
-                twp = (((sc-wp)/(nu-nuw))*np.log(1+(nu-nuw)*(sini-wp) /
-                       (nuw*(sc-wp))))
-
-                if Tb < twp:
-                    s = (wp+((sc-wp)/(nu-nuw))*((np.exp((-1)*((nu-nuw) /
-                         (sc-wp))*Tb))*(nuw+((nu-nuw)/(sc-wp))*(sini-wp))-nuw))
-                    self._D[cell] = 0.
-                    self._ETA[cell] = (1000.*ZR*pc*(sini-s))
-
-                else:
-                    s = hgw+(wp-hgw)*np.exp((-1)*(nuw/(wp-hgw))*(Tb-twp))
-                    self._D[cell] = 0.
-                    self._ETA[cell] = (1000.*ZR*pc*(sini-s))
-
-            else:
-                tfc = 0.
-                tsc = 0.
-                twp = 0.
-
-                s = hgw+(sini-hgw)*np.exp((-1)*(nuw/(wp-hgw))*Tb)
-                self._D[cell] = 0.
-                self._ETA[cell] = (1000.*ZR*pc*(sini-s))
-
-            self._water_stress[cell] = min(((max(((sc - (s+sini)/2.) /
-                                           (sc - wp)), 0.))**4.), 1.0)
-            self._S[cell] = s
-            self._SO[cell] = s
-            self._Sini[cell] = sini
+
+        fr = self._fr
+        vc = self._vegcover
+        ZR = self._zr
+        pc = self._soil_pc
+        fc = self._soil_fc
+        wp = self._soil_wp
+        hgw = self._soil_hgw
+        beta = self._soil_beta
+        # 0 - GRASS
+        sc = np.where(self._vegtype == 0,
+                      self._soil_sc*fr+(1-fr)*fc, self._soil_sc)
+
+        # Infiltration capacity
+        Inf_cap = self._soil_Ib*(1-vc) + self._soil_Iv*vc
+        # Interception capacity
+        Int_cap = np.minimum(vc*self._interception_cap, P_)
+        Peff = np.maximum(P_-Int_cap, 0.)  # Effective precipitation depth
+        mu = (Inf_cap/1000.0)/(pc*ZR*(np.exp(beta*(1.-fc))-1.))
+        Ep = np.maximum((self._PET*fr + self._fbare*self._PET*(1.-fr)) -
+                        Int_cap, 0.0001)  # mm/d
+        self._ETmax = Ep
+        nu = ((Ep / 24.) / 1000.) / (pc*ZR)   # Loss function parameter
+        nuw = ((self._soil_Ew/24.)/1000.)/(pc*ZR)
+        # Loss function parameter
+        sini = self._SO + ((Peff+self._runon)/(pc*ZR*1000.))
+
+        saturated = sini > 1.
+        self._runoff[:] = np.where(saturated, (sini-1.)*pc*ZR*1000., 0.)
+        sini[saturated] = 1.
+
+        # Cells are split by their initial saturation (above field
+        # capacity, above the stomatal closure point, above the wilting
+        # point, or below it) and then by the stage of the drying curve
+        # they reach within the inter-storm period. Every expression is
+        # evaluated over all cells and picked with these masks, so the
+        # ones that do not apply to a cell may overflow or produce nans.
+        above_fc = sini >= fc
+        above_sc = ~above_fc & (sini < fc) & (sini >= sc)
+        above_wp = ~above_fc & ~above_sc & (sini < sc) & (sini >= wp)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            tfc = np.where(above_fc, (1./(beta*(mu-nu)))*(
+                beta*(fc-sini) + np.log((
+                    nu-mu+mu*np.exp(beta*(sini-fc)))/nu)), 0.)
+            tsc = np.select([above_fc, above_sc],
+                            [((fc-sc)/nu)+tfc, (sini-sc)/nu], 0.)
+            twp = np.where(above_wp, (((sc-wp)/(nu-nuw))*np.log(
+                1+(nu-nuw)*(sini-wp)/(nuw*(sc-wp)))),
+                ((sc-wp)/(nu-nuw))*np.log(nu/nuw)+tsc)
+
+            drainage = above_fc & (Tb < tfc)
+            fc_drying = above_fc & ~drainage & (Tb >= tfc) & (Tb < tsc)
+            sc_drying = above_sc & (Tb < tsc)
+            stomatal = (
+                (above_fc & ~drainage & ~fc_drying &
+                 (Tb >= tsc) & (Tb < twp)) |
+                (above_sc & ~sc_drying & (Tb >= tsc) & (Tb < twp)))
+            wp_drying = above_wp & (Tb < twp)
+            hygroscopic = (
+                (above_fc | above_sc | above_wp) & ~drainage & ~fc_drying &
+                ~sc_drying & ~stomatal & ~wp_drying)
+
+            s = np.select([
+                drainage,
+                fc_drying,
+                sc_drying,
+                stomatal,
+                wp_drying,
+                hygroscopic,
+            ], [
+                np.abs(sini-(1./beta)*np.log(((nu-mu+mu *
+                       np.exp(beta*(sini-fc)))*np.exp(beta*(nu-mu)*Tb) -
+                       mu*np.exp(beta*(sini-fc)))/(nu-mu))),
+                fc-(nu*(Tb-tfc)),
+                sini - nu*Tb,
+                (wp+(sc-wp)*((nu/(nu-nuw))*np.exp((-1)*((nu-nuw) /
+                 (sc-wp))*(Tb-tsc))-(nuw/(nu-nuw)))),
+                (wp+((sc-wp)/(nu-nuw))*((np.exp((-1)*((nu-nuw) /
+                 (sc-wp))*Tb))*(nuw+((nu-nuw)/(sc-wp))*(sini-wp))-nuw)),
+                (hgw+(wp-hgw)*np.exp((-1)*(nuw/(wp-hgw)) *
+                 np.maximum(Tb-twp, 0.))),
+            ], hgw+(sini-hgw)*np.exp((-1)*(nuw/(wp-hgw))*Tb))
+
+            self._D[:] = np.select([
+                drainage,
+                fc_drying,
+                above_fc,
+            ], [
+                ((pc*ZR*1000.)*(sini-s))-(Tb*(Ep/24.)),
+                ((pc*ZR*1000.)*(sini-fc))-((tfc)*(Ep/24.)),
+                ((pc*ZR*1000.)*(sini-fc))-(tfc*Ep/24.),
+            ], 0.)
+            self._ETA[:] = np.where(drainage | fc_drying, Tb*(Ep/24.),
+                                    (1000.*ZR*pc*(sini-s))-self._D)
+
+            self._water_stress[:] = np.minimum(np.maximum(
+                (sc - (s+sini)/2.) / (sc - wp), 0.)**4., 1.0)
+        self._S[:] = s
+        self._SO[:] = s
+        self._Sini = sini
 
         current_time += (Tb+Tr)/(24.*365.25)
         return current_time
@@ -119,4 +119,38 @@ def test_field_initialized_to_zero():
         assert_array_almost_equal(field, np.zeros(SM.grid.number_of_nodes))
     for name in SM.grid['cell']:
         field = SM.grid['cell'][name]
-        assert_array_almost_equal(field, np.zeros(SM.grid.number_of_cells))
\ No newline at end of file
+        assert_array_almost_equal(field, np.zeros(SM.grid.number_of_cells))
+
+
+def test_update_all_vegetation_types():
+    grid = RasterModelGrid((4, 5), spacing=10.)
+    grid['cell']['vegetation__plant_functional_type'] = np.arange(6)
+    sm = SoilMoisture(grid)
+    grid['cell']['surface__potential_evapotranspiration_rate'] = [
+        3.5, 4., 2., 5., 6., 1.]
+    grid['cell']['soil_moisture__initial_saturation_fraction'] = [
+        .2, .05, .5, .3, .8, .12]
+    grid['cell']['vegetation__live_leaf_area_index'] = [
+        1., 2., .5, 0., 3., 1.5]
+    grid['cell']['vegetation__cover_fraction'] = [.5, .8, .1, 0., 1., .3]
+    grid['cell']['rainfall__daily_depth'] = [10., 0., 80., 100., 30., 0.]
+
+    current_time = sm.update(0., Tb=24.)
+
+    assert_array_almost_equal(
+        grid['cell']['soil_moisture__saturation_fraction'],
+        [0.266014, 0.050769, 0.636124, 0.643985, 0.692713, 0.119929])
+    assert_array_almost_equal(
+        grid['cell']['soil_moisture__initial_saturation_fraction'],
+        grid['cell']['soil_moisture__saturation_fraction'])
+    assert_array_almost_equal(
+        grid['cell']['soil_moisture__root_zone_leakage'],
+        [0., 0., 2.431536, 19.46299, 47.066617, 0.], decimal=5)
+    assert_array_almost_equal(
+        grid['cell']['surface__evapotranspiration'],
+        [0.984201, -0.165381, 1.275, 3.5, 4.5, 0.039929])
+    assert_array_almost_equal(grid['cell']['surface__runoff'],
+                              [0., 0., 0., 54.85, 0., 0.])
+    assert_array_almost_equal(grid['cell']['vegetation__water_stress'],
+                              [0.130161, 1., 0., 0., 0., 1.])
+    assert_array_almost_equal(current_time, 24. / (24. * 365.25))
@@ -408,71 +408,57 @@ class Vegetation(Component):
         else:
             PETthreshold = self._ETthresholddown
 
-        for cell in range(0, self.grid.number_of_cells):
-
-            WUE = self._WUE[cell]
-            LAImax = self._LAI_max[cell]
-            cb = self._cb[cell]
-            cd = self._cd[cell]
-            ksg = self._ksg[cell]
-            kdd = self._kdd[cell]
-            kws = self._kws[cell]
-            # ETdmax = self._ETdmax[cell]
-            LAIlive = min(cb*self._Blive_ini[cell], LAImax)
-            LAIdead = min(cd * self._Bdead_ini[cell], (LAImax -
-                          LAIlive))
-            NPP = max((ActualET[cell]/(Tb+Tr)) *
-                      WUE*24.*self._w*1000, 0.001)
-
-            if self._vegtype[cell] == 0:
-                if PET30_[cell] > PETthreshold:
-                                # Growing Season
-                    Bmax = (LAImax - LAIdead)/cb
-                    Yconst = (1/((1/Bmax)+(((kws*Water_stress[cell]) +
-                              ksg)/NPP)))
-                    Blive = ((self._Blive_ini[cell] - Yconst) *
-                             np.exp(-(NPP/Yconst) * ((Tb+Tr)/24.)) + Yconst)
-                    Bdead = ((self._Bdead_ini[cell] + (Blive - max(Blive *
-                             np.exp(-1 * ksg * Tb/24.), 0.00001))) *
-                             np.exp(-1 * kdd *
-                             min(PET[cell]/self._Tdmax, 1.) * Tb/24.))
-                else:                                 # Senescense
-                    Blive = max(self._Blive_ini[cell] * np.exp((-2) * ksg *
-                                Tb/24.), 1)
-                    Bdead = max((self._Bdead_ini[cell]+(self._Blive_ini[cell] -
-                                (max(self._Blive_ini[cell]*np.exp((-2) *
-                                 ksg*Tb/24.), 0.000001)))*np.exp((-1)*kdd *
-                                 min(PET[cell]/self._Tdmax, 1.) * Tb/24.), 0.))
-
-            elif self._vegtype[cell] == 3:
-                Blive = 0.
-                Bdead = 0.
-
-            else:
-                Bmax = LAImax/cb
-                Yconst = (1./((1./Bmax)+(((kws*Water_stress[cell]) +
-                          ksg)/NPP)))
-                Blive = ((self._Blive_ini[cell] - Yconst) *
-                         np.exp(-(NPP/Yconst) * ((Tb+Tr)/24.)) + Yconst)
-                Bdead = ((self._Bdead_ini[cell] + (Blive - max(Blive *
-                         np.exp(-ksg * Tb/24.), 0.00001))) *
-                         np.exp(-kdd * min(PET[cell]/self._Tdmax, 1.) *
-                         Tb/24.))
-
-            LAIlive = min(cb * (Blive + self._Blive_ini[cell])/2., LAImax)
-            LAIdead = min(cd * (Bdead + self._Bdead_ini[cell])/2.,
-                          (LAImax - LAIlive))
-            if self._vegtype[cell] == 0:
-                Vt = 1. - np.exp(-0.75 * (LAIlive + LAIdead))
-            else:
-                # Vt = 1 - np.exp(-0.75 * LAIlive)
-                Vt = 1.
-
-            self._LAIlive[cell] = LAIlive
-            self._LAIdead[cell] = LAIdead
-            self._VegCov[cell] = Vt
-            self._Blive[cell] = Blive
-            self._Bdead[cell] = Bdead
+        WUE = self._WUE
+        LAImax = self._LAI_max
+        cb = self._cb
+        cd = self._cd
+        ksg = self._ksg
+        kdd = self._kdd
+        kws = self._kws
+        Blive_ini = self._Blive_ini
+        Bdead_ini = self._Bdead_ini
+        grass = self._vegtype == 0
+        bare = self._vegtype == 3
+
+        LAIlive = np.minimum(cb*Blive_ini, LAImax)
+        LAIdead = np.minimum(cd * Bdead_ini, (LAImax - LAIlive))
+        NPP = np.maximum((ActualET/(Tb+Tr)) * WUE*24.*self._w*1000, 0.001)
+
+        # Growing season (all year round for plants other than grass)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            Bmax = np.where(grass, (LAImax - LAIdead)/cb, LAImax/cb)
+            Yconst = (1./((1./Bmax)+(((kws*Water_stress) + ksg)/NPP)))
+            Blive = ((Blive_ini - Yconst) *
+                     np.exp(-(NPP/Yconst) * ((Tb+Tr)/24.)) + Yconst)
+            Bdead = ((Bdead_ini + (Blive - np.maximum(Blive *
+                     np.exp(-ksg * Tb/24.), 0.00001))) *
+                     np.exp(-kdd * np.minimum(PET/self._Tdmax, 1.) * Tb/24.))
+
+        # Senescense
+        dormant = grass & ~(PET30_ > PETthreshold)
+        Blive_dormant = Blive_ini[dormant]
+        ksg_dormant = ksg[dormant]
+        Blive[dormant] = np.maximum(Blive_dormant * np.exp((-2) * ksg_dormant *
+                                    Tb/24.), 1)
+        Bdead[dormant] = np.maximum((Bdead_ini[dormant] + (Blive_dormant -
+                                    (np.maximum(Blive_dormant*np.exp((-2) *
+                                     ksg_dormant*Tb/24.), 0.000001))) *
+                                     np.exp((-1)*kdd[dormant] *
+                                     np.minimum(PET[dormant]/self._Tdmax, 1.) *
+                                     Tb/24.)), 0.)
+
+        Blive[bare] = 0.
+        Bdead[bare] = 0.
+
+        LAIlive = np.minimum(cb * (Blive + Blive_ini)/2., LAImax)
+        LAIdead = np.minimum(cd * (Bdead + Bdead_ini)/2., (LAImax - LAIlive))
+
+        self._LAIlive[:] = LAIlive
+        self._LAIdead[:] = LAIdead
+        self._VegCov[:] = np.where(
+            grass, 1. - np.exp(-0.75 * (LAIlive + LAIdead)), 1.)
+        self._Blive[:] = Blive
+        self._Bdead[:] = Bdead
 
         self._Blive_ini = self._Blive
         self._Bdead_ini = self._Bdead
@@ -1,3 +1,12 @@
-from .model_parameter_loader import load_params
+import sys
+
 
 __all__ = ['load_params', ]
+
+if sys.version_info < (3, 7):
+    from .model_parameter_loader import load_params
+else:
+    from .lazy import lazy_import
+
+    __getattr__, __dir__ = lazy_import(
+        __name__, {'load_params': '.model_parameter_loader'})
@@ -0,0 +1,93 @@
+"""Load the attributes of a package when they are first used.
+
+Packages such as :mod:`landlab` and :mod:`landlab.components` gather names
+from many modules, some of which are slow to import (matplotlib, scipy,
+compiled extensions). Rather than importing all of them when the package
+is imported, a package lists where each of its names is defined and
+:func:`lazy_import` gives it a module-level ``__getattr__`` (PEP 562) that
+imports the defining module the first time one of its names is used.
+
+Module ``__getattr__`` is new in Python 3.7. On older versions of Python
+packages don't call :func:`lazy_import` but import all of their names,
+in order, as they did before.
+"""
+import importlib
+import sys
+
+
+def lazy_import(package, attrs, submodules=()):
+    """Set up lazy loading of the attributes of a package.
+
+    Parameters
+    ----------
+    package : str
+        Name of the package (usually ``__name__``).
+    attrs : dict
+        Maps attribute names to the name of the module that defines them,
+        which may be relative to *package*. In place of a module name, a
+        function may be given that is called with the loader as its only
+        argument and returns the value of the attribute.
+    submodules : iterable of str, optional
+        Names of submodules that are imported when used as attributes.
+
+    Returns
+    -------
+    tuple of function
+        The ``__getattr__`` and ``__dir__`` functions of the package.
+
+    Examples
+    --------
+    >>> import sys, types
+    >>> from landlab.core.lazy import lazy_import
+
+    >>> package = types.ModuleType('lazy_package')
+    >>> sys.modules['lazy_package'] = package
+    >>> getattr_, dir_ = lazy_import(
+    ...     'lazy_package',
+    ...     {'load_params': 'landlab.core.model_parameter_loader',
+    ...      'load': lambda load: load('load_params')})
+
+    >>> getattr_('load_params') # doctest: +ELLIPSIS
+    <function load_params at ...>
+    >>> package.load_params is getattr_('load_params')
+    True
+    >>> getattr_('load') is package.load_params
+    True
+    >>> 'load' in dir_()
+    True
+    >>> getattr_('not_a_name')
+    Traceback (most recent call last):
+    ...
+    AttributeError: module 'lazy_package' has no attribute 'not_a_name'
+    >>> del sys.modules['lazy_package']
+    """
+    module = sys.modules[package]
+    submodules = frozenset(submodules)
+
+    def __getattr__(name):
+        try:
+            return module.__dict__[name]
+        except KeyError:
+            pass
+
+        if name in attrs:
+            source = attrs[name]
+            if callable(source):
+                value = source(__getattr__)
+            else:
+                value = getattr(importlib.import_module(source, package),
+                                name)
+        elif name in submodules:
+            value = importlib.import_module('.' + name, package)
+        else:
+            raise AttributeError(
+                'module {package!r} has no attribute {name!r}'.format(
+                    package=package, name=name))
+
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attrs) | submodules)
+
+    return __getattr__, __dir__
@@ -24,6 +24,7 @@ from __future__ import print_function
 
 import os
 import re
+import sys
 
 import numpy as np
 
@@ -298,12 +299,11 @@ def add_module_functions_to_class(cls, module, pattern=None):
     pattern : str, optional
         Only get functions whose name match a regular expression.
     """
-    import inspect
     import imp
     import os
-    
-    caller = inspect.stack()[1]
-    path = os.path.join(os.path.dirname(caller[1]), os.path.dirname(module))
+
+    caller = sys._getframe(1).f_code.co_filename
+    path = os.path.join(os.path.dirname(caller), os.path.dirname(module))
 
     (module, _) = os.path.splitext(os.path.basename(module))
 
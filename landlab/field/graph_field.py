@@ -1,5 +1,4 @@
 import numpy as np
-import xarray as xr
 
 import six
 
@@ -148,11 +147,17 @@ class FieldDataset(dict):
     needed. The setitem method is also overriden so that when arrays
     are added they are stored reshaped in the landlab style. That
     is shaped as `(n_elements, values_per_element)`.
+
+    Value arrays are held as numpy arrays, so getting a field is a
+    dictionary lookup. The xarray.Dataset is only built from them when
+    the `dataset` attribute is used.
     """
 
     def __init__(self, *args, **kwds):
         self._name, self._size = args[0], args[1]
-        self._ds = xr.Dataset()
+        self._ds = None
+        self._dims = {}
+        self._attrs = {}
         self._units = {}
 
     @property
@@ -165,11 +170,16 @@ class FieldDataset(dict):
 
     @property
     def dataset(self):
+        import xarray as xr
+
+        if self._ds is None:
+            self._ds = xr.Dataset(dict(
+                (name, xr.Variable(self._dims[name],
+                                   dict.__getitem__(self, name),
+                                   attrs=self._attrs[name]))
+                for name in self))
         return self._ds
 
-    def keys(self):
-        return self._ds.variables
-
     def set_value(self, name, value_array, attrs=None):
         attrs = attrs or {}
         attrs.setdefault('units', '?')
@@ -179,9 +189,8 @@ class FieldDataset(dict):
         if not self._size:
             self._size = value_array.size
 
-        if name in self._ds and self._ds[name].values is value_array:
-            self._ds[name].values.shape = shape_for_storage(value_array,
-                                                            self.size)
+        if name in self and dict.__getitem__(self, name) is value_array:
+            value_array.shape = shape_for_storage(value_array, self.size)
             return
 
         value_array = reshape_for_storage(value_array, self._size)
@@ -196,17 +205,16 @@ class FieldDataset(dict):
             if value_array.ndim > 1:
                 dims += (name + '_per_' + self._name, )
 
-        if name in self._ds:
-            self._ds = self._ds.drop(name)
-
-        self._ds.update({name: xr.DataArray(value_array, dims=dims,
-                                            attrs=attrs)})
+        dict.__setitem__(self, name, value_array)
+        self._dims[name] = dims
+        self._attrs[name] = attrs
         self._units[name] = attrs['units']
+        self._ds = None
 
     def __getitem__(self, name):
         if isinstance(name, six.string_types):
             try:
-                return self._ds[name].values
+                return dict.__getitem__(self, name)
             except KeyError:
                 raise FieldError(name)
         else:
@@ -215,14 +223,18 @@ class FieldDataset(dict):
     def __setitem__(self, name, value_array):
         self.set_value(name, value_array)
 
-    def __contains__(self, name):
-        return name in self._ds
+    def __delitem__(self, name):
+        dict.__delitem__(self, name)
+        del self._dims[name]
+        del self._attrs[name]
+        del self._units[name]
+        self._ds = None
 
     def __str__(self):
-        return str(self._ds)
+        return str(self.dataset)
 
     # def __repr__(self):
-    #     return repr(self._ds)
+    #     return repr(self.dataset)
 
     def __len__(self):
         return self._size
@@ -600,7 +612,7 @@ class GraphFields(object):
 
         LLCATS: FIELDINF
         """
-        return self[group]._ds[field].attrs['units']
+        return self[group].units[field]
 
     def empty(self, *args, **kwds):
         """Uninitialized array whose size is that of the field.
@@ -866,7 +878,7 @@ class GraphFields(object):
             ds = getattr(self, 'at_' + loc)
         except AttributeError:
             raise KeyError(loc)
-        ds._ds = ds._ds.drop(name)
+        del ds[name]
 
     def add_empty(self, *args, **kwds):
         """Create and add an uninitialized array of values to the field.
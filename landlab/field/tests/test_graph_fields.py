@@ -238,3 +238,18 @@ def test_nd_field():
     assert_raises(ValueError, fields.add_field, 'newestest_value', np.ones((13)), at='node')
 
     
+
+
+def test_dataset():
+    """Test that the dataset is built from the field arrays."""
+    fields = ModelDataFields()
+    fields.new_field_location('node', 12)
+    z = fields.add_ones('z', at='node')
+    fields.add_field('vel', np.zeros((12, 2)), at='node')
+
+    assert_is(fields.at_node.dataset['z'].values, z)
+    assert_set_equal(set(fields.at_node.dataset.data_vars), set(['z', 'vel']))
+    assert_true(fields.at_node.dataset['vel'].dims == ('node', 'vel_per_node'))
+
+    fields.delete_field('node', 'z')
+    assert_set_equal(set(fields.at_node.dataset.data_vars), set(['vel']))
@@ -4,7 +4,6 @@ This class should not be used directly. Instead, it should be used as a base
 class when defining other types of graphs.
 """
 import numpy as np
-import xarray as xr
 
 from ..core.utils import as_id_array
 from ..utils.decorators import store_result_in_grid, read_only_array
@@ -21,30 +20,26 @@ def _sort_dual_graph(graph):
     sorted_dual = reindex_by_xy(graph._dual)
     sorted = reindex_by_xy(graph)
 
-    node_at_cell = graph.ds['node_at_cell'].values
+    node_at_cell = graph.node_at_cell
     node_at_cell[:] = node_at_cell[sorted_dual[2]]
     remap_graph_element(graph.node_at_cell,
                         as_id_array(np.argsort(sorted[0])))
 
 
-def update_node_at_cell(ugrid, node_at_cell):
-    node_at_cell = xr.DataArray(
-        data=as_id_array(node_at_cell),
-        dims=('cell', ),
+def update_node_at_cell(graph, node_at_cell):
+    graph._add_variable(
+        'node_at_cell', as_id_array(node_at_cell), dims=('cell', ),
         attrs={'cf_role': 'cell_node_connectivity',
                'long_name': 'nodes centered at cells',
                'start_index': 0})
-    ugrid.update({'node_at_cell': node_at_cell})
 
 
-def update_nodes_at_face(ugrid, nodes_at_face):
-    nodes_at_face = xr.DataArray(
-        data=as_id_array(nodes_at_face),
-        dims=('face', 'Two'),
+def update_nodes_at_face(graph, nodes_at_face):
+    graph._add_variable(
+        'nodes_at_face', as_id_array(nodes_at_face), dims=('face', 'Two'),
         attrs={'cf_role': 'face_node_connectivity',
                'long_name': 'nodes on either side of a face',
                'start_index': 0})
-    ugrid.update({'nodes_at_face': nodes_at_face})
 
 
 class DualGraph(Graph):
@@ -53,8 +48,8 @@ class DualGraph(Graph):
         node_at_cell = kwds.pop('node_at_cell', None)
         nodes_at_face = kwds.pop('nodes_at_face', None)
 
-        update_node_at_cell(self.ds, node_at_cell)
-        update_nodes_at_face(self.ds, nodes_at_face)
+        update_node_at_cell(self, node_at_cell)
+        update_nodes_at_face(self, nodes_at_face)
 
         rename = {
             'mesh': 'dual',
@@ -67,7 +62,13 @@ class DualGraph(Graph):
             'links_at_patch': 'faces_at_cell',
             'max_patch_links': 'max_cell_faces',
         }
-        self._ds = xr.merge([self._ds, self._dual.ds.rename(rename)])
+        dual = self._dual
+        self._coords.update(rename.get(name, name) for name in dual._coords)
+        for name in dual._data:
+            self._add_variable(
+                rename.get(name, name), dual._data[name],
+                dims=[rename.get(dim, dim) for dim in dual._dims[name]],
+                attrs=dual._attrs[name])
 
         self._origin = (0., 0.)
 
@@ -108,11 +109,11 @@ class DualGraph(Graph):
 
     @property
     def node_at_cell(self):
-        return self.ds['node_at_cell'].values
+        return self._data['node_at_cell']
 
     @property
     def nodes_at_face(self):
-        return self.ds['nodes_at_face'].values
+        return self._data['nodes_at_face']
 
     @property
     def cell_at_node(self):
@@ -141,7 +141,7 @@ class Graph(object):
             patches = kwds.get('patches', None)
             mesh = ugrid_from_unstructured(node_y_and_x, links=links,
                                            patches=patches)
-        self._ds = mesh
+        self._load_dataset(mesh)
 
         self._frozen = False
         self.freeze()
@@ -168,24 +168,71 @@ class Graph(object):
 
     def freeze(self):
         """Freeze the graph by making arrays read-only."""
-        for var in self.ds:
-            self.ds[var].values.flags.writeable = False
+        for name in self._data_vars():
+            self._data[name].flags.writeable = False
         self._frozen = True
 
     def thaw(self):
         """Thaw the graph by making arrays writable."""
-        for var in self.ds:
-            self.ds[var].values.flags.writeable = True
+        for name in self._data_vars():
+            self._data[name].flags.writeable = True
         self._frozen = False
 
+    def _load_dataset(self, ds):
+        """Take the variables of a ugrid Dataset as the graph's arrays."""
+        self._data, self._dims, self._attrs = {}, {}, {}
+        self._sizes = {}
+        self._coords = set(ds.coords)
+        for name in ds.variables:
+            var = ds.variables[name]
+            self._set_variable(name, var.values, var.dims, var.attrs)
+        self._ds = None
+
+    def _data_vars(self):
+        return [name for name in self._data if name not in self._coords]
+
+    def _set_variable(self, name, var, dims, attrs):
+        self._data[name] = var
+        self._dims[name] = tuple(dims)
+        self._attrs[name] = dict(attrs or {})
+        self._sizes.update(zip(self._dims[name], var.shape))
+
     def _add_variable(self, name, var, dims=None, attrs=None):
-        kwds = dict(data=var, dims=dims, attrs=attrs)
-        self.ds.update({name: xr.DataArray(**kwds)})
+        var = np.asarray(var)
+        if dims is None:
+            dims = (name, ) if var.ndim else ()
+        self._set_variable(name, var, dims, attrs)
+        self._ds = None
         if self._frozen:
             self.freeze()
 
+    def _drop_variable(self, name):
+        for store in (self._data, self._dims, self._attrs):
+            del store[name]
+        self._coords.discard(name)
+        self._sizes = {}
+        for name in self._data:
+            self._sizes.update(zip(self._dims[name], self._data[name].shape))
+        self._ds = None
+
+    def _has_variable(self, name):
+        return name in self._data
+
     @property
     def ds(self):
+        """The graph as an xarray Dataset.
+
+        The graph keeps its variables as numpy arrays. The Dataset is
+        only built, from those same arrays, when it is first asked for.
+        """
+        if self._ds is None:
+            variables = dict(
+                (name, xr.Variable(self._dims[name], self._data[name],
+                                   attrs=self._attrs[name]))
+                for name in self._data)
+            self._ds = xr.Dataset(
+                dict((name, variables[name]) for name in self._data_vars()),
+                coords=dict((name, variables[name]) for name in self._coords))
         return self._ds
 
     def to_dict(self):
@@ -289,7 +336,7 @@ class Graph(object):
         >>> graph.x_of_node
         array([ 0.,  1.,  2.,  0.,  1.,  2.])
         """
-        return self.ds['x_of_node'].values
+        return self._data['x_of_node']
 
     @property
     def y_of_node(self):
@@ -303,7 +350,7 @@ class Graph(object):
         >>> graph.y_of_node
         array([ 0.,  0.,  0.,  1.,  1.,  1.])
         """
-        return self.ds['y_of_node'].values
+        return self._data['y_of_node']
 
     @property
     def nodes(self):
@@ -317,7 +364,7 @@ class Graph(object):
         >>> graph.nodes
         array([0, 1, 2, 3, 4, 5])
         """
-        return self.ds['node'].values
+        return self._data['node']
 
     @property
     @store_result_in_grid()
@@ -337,7 +384,7 @@ class Graph(object):
         >>> graph.number_of_nodes == 6
         True
         """
-        return self.ds.dims['node']
+        return self._sizes['node']
 
     @property
     def nodes_at_link(self):
@@ -360,7 +407,7 @@ class Graph(object):
                [3, 6], [4, 7], [5, 8],
                [6, 7], [7, 8]])
         """
-        return self.ds['nodes_at_link'].values
+        return self._data['nodes_at_link']
 
     @property
     def node_at_link_tail(self):
@@ -417,10 +464,7 @@ class Graph(object):
         >>> graph.number_of_links == 12
         True
         """
-        try:
-            return self.ds.dims['link']
-        except KeyError:
-            return 0
+        return self._sizes.get('link', 0)
 
     @property
     def links_at_patch(self):
@@ -441,7 +485,7 @@ class Graph(object):
         array([[3, 5, 2, 0],
                [4, 6, 3, 1]])
         """
-        return self.ds['links_at_patch'].values
+        return self._data['links_at_patch']
 
     @property
     # @store_result_in_grid()
@@ -511,17 +555,6 @@ class Graph(object):
                [ 0, -1], [ 1, -1]])
         """
         return reverse_one_to_many(self.links_at_patch, min_counts=2)
-        try:
-            return self.ds['patches_at_link'].values
-        except KeyError:
-            patches_at_link = xr.DataArray(
-                data=reverse_one_to_many(self.links_at_patch, min_counts=2),
-                dims=('link', 'Two'),
-                attrs={'cf_role': 'edge_node_connectivity',
-                       'long_name': 'patches on either side of a link',
-                       'start_index': 0})
-            self.ds.update({'patches_at_link': patches_at_link})
-            return self.ds['patches_at_link'].values
 
     @property
     def number_of_patches(self):
@@ -541,10 +574,7 @@ class Graph(object):
         >>> graph.number_of_patches == 2
         True
         """
-        try:
-            return self.ds.dims['patch']
-        except KeyError:
-            return 0
+        return self._sizes.get('patch', 0)
 
     @property
     def links_at_node(self):
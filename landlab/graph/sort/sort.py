@@ -147,8 +147,8 @@ def reorder_links_at_patch(graph):
     # reverse_element_order(graph._links_at_patch, negative_areas)
 
     # graph._nodes_at_patch = get_nodes_at_patch(graph)
-    if 'nodes_at_patch' in graph._ds:
-        graph._ds = graph._ds.drop('nodes_at_patch')
+    if graph._has_variable('nodes_at_patch'):
+        graph._drop_variable('nodes_at_patch')
 
     if np.any(get_area_of_patch(graph) < 0.):
         raise ValueError((graph.links_at_patch,
@@ -172,13 +172,13 @@ def reorient_link_dirs(graph):
 def reindex_by_xy(graph):
     sorted_nodes = reindex_nodes_by_xy(graph)
     # if hasattr(graph, '_nodes_at_link'):
-    if 'nodes_at_link' in graph.ds:
+    if graph._has_variable('nodes_at_link'):
         sorted_links = reindex_links_by_xy(graph)
     else:
         sorted_links = None
 
     # if hasattr(graph, '_links_at_patch'):
-    if 'links_at_patch' in graph.ds:
+    if graph._has_variable('links_at_patch'):
         sorted_patches = reindex_patches_by_xy(graph)
     else:
         sorted_patches = None
@@ -201,8 +201,8 @@ def reindex_patches_by_xy(graph):
     graph.links_at_patch[:] = graph.links_at_patch[sorted_patches, :]
     # graph._links_at_patch[:] = graph._links_at_patch[sorted_patches, :]
 
-    if 'nodes_at_patch' in graph._ds:
-        graph._ds = graph.ds.drop('nodes_at_patch')
+    if graph._has_variable('nodes_at_patch'):
+        graph._drop_variable('nodes_at_patch')
     # del graph.__dict__['_nodes_at_patch']
 
     # if hasattr(graph, '_node_at_cell'):
@@ -223,7 +223,7 @@ def reindex_links_by_xy(graph):
     graph.nodes_at_link[:] = graph.nodes_at_link[sorted_links, :]
 
     # if hasattr(graph, '_links_at_patch'):
-    if 'links_at_patch' in graph.ds:
+    if graph._has_variable('links_at_patch'):
         remap_graph_element_ignore(graph.links_at_patch.reshape((-1, )),
                                    as_id_array(np.argsort(sorted_links)), -1)
 
@@ -241,11 +241,11 @@ def reindex_nodes_by_xy(graph):
     graph.y_of_node[:] = graph.y_of_node[sorted_nodes]
     graph.x_of_node[:] = graph.x_of_node[sorted_nodes]
 
-    if 'nodes_at_link' in graph.ds:
+    if graph._has_variable('nodes_at_link'):
         remap_graph_element(graph.nodes_at_link.reshape((-1, )),
                             as_id_array(np.argsort(sorted_nodes)))
 
-    if 'nodes_at_patch' in graph.ds:
+    if graph._has_variable('nodes_at_patch'):
         remap_graph_element(graph.nodes_at_patch.reshape((-1, )),
                             as_id_array(np.argsort(sorted_nodes)))
 
@@ -1,4 +1,6 @@
+import numpy as np
 from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_equal, assert_true, assert_false
 
 from landlab.graph import Graph
 
@@ -106,3 +108,26 @@ def test_nodes_at_patch_ccw():
                   patches=LINKS_AT_PATCH)
 
     assert_array_equal(graph.nodes_at_patch, [[4, 3, 0, 1], [5, 4, 1, 2]])
+
+
+def test_dataset_shares_arrays():
+    """Test that the dataset is built from the graph's arrays."""
+    graph = Graph((NODE_Y, NODE_X), links=NODES_AT_LINK,
+                  patches=LINKS_AT_PATCH)
+
+    assert_true(graph._ds is None)
+    assert_true(graph.ds['x_of_node'].values is graph.x_of_node)
+    assert_true(graph.ds['links_at_patch'].values is graph.links_at_patch)
+    assert_array_equal(graph.ds['nodes_at_link'], graph.nodes_at_link)
+    assert_equal(graph.ds.dims['link'], graph.number_of_links)
+
+
+def test_add_variable_rebuilds_dataset():
+    """Test that adding a variable updates the dataset."""
+    graph = Graph((NODE_Y, NODE_X), links=NODES_AT_LINK)
+    assert_false('patch' in graph.ds.dims)
+
+    graph._add_variable('area_of_node', np.ones(6), dims=('node', ))
+
+    assert_array_equal(graph.ds['area_of_node'], np.ones(6))
+    assert_false(graph._data['area_of_node'].flags.writeable)
@@ -95,6 +95,38 @@ LINK_STATUS_FLAGS_LIST = [
 ]
 LINK_STATUS_FLAGS = set(LINK_STATUS_FLAGS_LIST)
 
+# Arrays derived from node status that incremental updates drop rather
+# than update.
+_DROPPED_BC_ARRAYS = (
+    '_active_faces', '_core_cells', '_activelink_fromnode',
+    '_activelink_tonode', '_node_active_inlink_matrix',
+    '_node_active_outlink_matrix', '_node_active_inlink_matrix2',
+    '_node_active_outlink_matrix2', '_node_numactiveinlink',
+    '_node_numactiveoutlink',
+)
+
+# Arrays derived from node status that incremental updates update in place.
+# Until a grid has all of them, node status changes rebuild everything.
+_UPDATED_BC_ARRAYS = (
+    '_status_at_link', '_active_links', '_fixed_links', '_core_nodes',
+    '_boundary_nodes', '_active_link_dirs_at_node',
+)
+
+# Grid attributes that are set from node status. With
+# ModelGrid._DEBUG_CHECK_BC_UPDATES set, incremental updates check these.
+_BC_ARRAYS = (
+    '_status_at_link', '_active_links', '_fixed_links',
+    '_activelink_fromnode', '_activelink_tonode', '_core_nodes',
+    '_core_cells', '_boundary_nodes', '_active_faces',
+    '_active_link_dirs_at_node', '_patches_present_mask',
+    '_number_of_patches_present_at_node', '_patches_present_link_mask',
+    '_number_of_patches_present_at_link',
+)
+
+# When the status of more than this fraction of nodes changes, the whole
+# grid is updated rather than just the elements that touch those nodes.
+_MAX_FRACTION_UPDATED = .05
+
 
 def _sort_points_into_quadrants(x, y, nodes):
     """Divide x, y points into quadrants.
@@ -140,6 +172,68 @@ def _sort_points_into_quadrants(x, y, nodes):
     return (east_nodes, north_nodes, west_nodes, south_nodes)
 
 
+def _update_sorted_ids(ids, old, new):
+    """Replace some of the ids in a sorted array of ids.
+
+    Parameters
+    ----------
+    ids : ndarray of int
+        Sorted, unique ids.
+    old : ndarray of int
+        Sorted, unique ids to remove from *ids*, if they are there.
+    new : ndarray of int
+        Sorted ids to add to *ids*. These must be among the *old* ids.
+
+    Returns
+    -------
+    ndarray of int
+        The updated ids.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.grid.base import _update_sorted_ids
+    >>> _update_sorted_ids(np.array([1, 3, 5, 7]), np.array([2, 3, 4, 9]),
+    ...                    np.array([2, 4]))
+    array([1, 2, 4, 5, 7])
+    """
+    at = numpy.searchsorted(ids, old)
+    found = at < len(ids)
+    found[found] = ids[at[found]] == old[found]
+    if numpy.array_equal(old[found], new):
+        return ids
+
+    ids = numpy.delete(ids, at[found])
+    return as_id_array(numpy.insert(ids, numpy.searchsorted(ids, new), new))
+
+
+def _set_up_when_used(name, setup):
+    """Get a property for a grid attribute that is set up when next used.
+
+    Incremental updates of node status drop some of the arrays that are
+    derived from it. Once dropped, an array is set up again by the grid
+    method *setup* the next time it is used.
+
+    Parameters
+    ----------
+    name : str
+        Name of the attribute.
+    setup : str
+        Name of the grid method that sets the attribute.
+    """
+    def _get(grid):
+        try:
+            return grid.__dict__[name]
+        except KeyError:
+            getattr(grid, setup)()
+            return grid.__dict__[name]
+
+    def _set(grid, value):
+        grid.__dict__[name] = value
+
+    return property(_get, _set)
+
+
 def _default_axis_names(n_dims):
     """Name of each axis.
 
@@ -336,6 +430,11 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
     # Debugging flags (if True, activates some output statements)
     _DEBUG_VERBOSE = False
     _DEBUG_TRACK_METHODS = False
+    # If True, check incremental updates of boundary conditions against a
+    # rebuild of the whole grid (slow)
+    _DEBUG_CHECK_BC_UPDATES = False
+    # Attributes set from node status that these checks compare
+    _BC_ARRAYS = _BC_ARRAYS
 
     at_node = {}  # : Values defined at nodes
     at_link = {}  # : Values defined at links
@@ -349,6 +448,32 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
     # : Nodes on the other end of links pointing out of a node.
     _node_outlink_matrix = numpy.array([], dtype=numpy.int32)
 
+    # Arrays derived from node status that incremental updates of node
+    # status drop, to be set up again when next used.
+    _active_faces = _set_up_when_used('_active_faces',
+                                      '_create_active_faces')
+    _core_cells = _set_up_when_used('_core_cells', '_create_core_cells')
+    _activelink_fromnode = _set_up_when_used('_activelink_fromnode',
+                                             '_create_active_link_nodes')
+    _activelink_tonode = _set_up_when_used('_activelink_tonode',
+                                           '_create_active_link_nodes')
+    _node_active_inlink_matrix = _set_up_when_used(
+        '_node_active_inlink_matrix',
+        '_setup_active_inlink_and_outlink_matrices')
+    _node_active_outlink_matrix = _set_up_when_used(
+        '_node_active_outlink_matrix',
+        '_setup_active_inlink_and_outlink_matrices')
+    _node_active_inlink_matrix2 = _set_up_when_used(
+        '_node_active_inlink_matrix2',
+        '_setup_active_inlink_and_outlink_matrices')
+    _node_active_outlink_matrix2 = _set_up_when_used(
+        '_node_active_outlink_matrix2',
+        '_setup_active_inlink_and_outlink_matrices')
+    _node_numactiveinlink = _set_up_when_used(
+        '_node_numactiveinlink', '_setup_active_inlink_and_outlink_matrices')
+    _node_numactiveoutlink = _set_up_when_used(
+        '_node_numactiveoutlink', '_setup_active_inlink_and_outlink_matrices')
+
     def __init__(self, **kwds):
         super(ModelGrid, self).__init__()
 
@@ -359,6 +484,7 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         self._link_length = None
         self._all_node_distances_map = None
         self._all_node_azimuths_map = None
+        self._node_tree = None
         self._node_unit_vector_sum_x = None
         self._node_unit_vector_sum_y = None
         self._link_unit_vec_x = None
@@ -463,7 +589,8 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
             return self._setup_nodes()
 
     @property
-    @override_array_setitem_and_reset('_update_links_nodes_cells_to_new_BCs')
+    @override_array_setitem_and_reset('_update_links_nodes_cells_to_new_BCs',
+                                      pass_ids=True)
     def status_at_node(self):
         """Get array of the boundary status for each node.
 
@@ -2606,17 +2733,8 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
 
         Call whenever boundary conditions are updated on the grid.
         """
-        from landlab import RasterModelGrid, VoronoiDelaunayGrid
-        node_status_at_patch = self.status_at_node[self.nodes_at_patch]
-        if isinstance(self, RasterModelGrid):
-            max_nodes_at_patch = 4
-        elif isinstance(self, VoronoiDelaunayGrid):
-            max_nodes_at_patch = 3
-        else:
-            max_nodes_at_patch = (self.nodes_at_patch > -1).sum(axis=1)
-        any_node_at_patch_closed = (node_status_at_patch ==
-                                    CLOSED_BOUNDARY).sum(axis=1) > (
-                                        max_nodes_at_patch - 3)
+        any_node_at_patch_closed = self._calc_patch_is_absent(
+            numpy.arange(self.number_of_patches))
         absent_patches = any_node_at_patch_closed[self.patches_at_node]
         bad_patches = numpy.logical_or(absent_patches,
                                        self.patches_at_node == -1)
@@ -2632,6 +2750,61 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         self._number_of_patches_present_at_link = numpy.sum(
             self._patches_present_link_mask, axis=1)
 
+    def _update_patch_status(self, nodes):
+        """Update patches present at the nodes and links of some patches.
+
+        Parameters
+        ----------
+        nodes : ndarray of int
+            Nodes whose status has changed.
+        """
+        patches = numpy.unique(self.patches_at_node[nodes])
+        patches = patches[patches >= 0]
+
+        nodes = numpy.unique(self.nodes_at_patch[patches])
+        nodes = nodes[nodes >= 0]
+        patches_at_node = self.patches_at_node[nodes]
+        present = ~(self._calc_patch_is_absent(patches_at_node) |
+                    (patches_at_node == -1))
+        self._patches_present_mask[nodes] = present
+        self._number_of_patches_present_at_node[nodes] = numpy.sum(
+            present, axis=1)
+
+        links = numpy.unique(self.links_at_patch[patches])
+        links = links[links >= 0]
+        patches_at_link = self.patches_at_link[links]
+        present = ~(self._calc_patch_is_absent(patches_at_link) |
+                    (patches_at_link == -1))
+        self._patches_present_link_mask[links] = present
+        self._number_of_patches_present_at_link[links] = numpy.sum(
+            present, axis=1)
+
+    def _calc_patch_is_absent(self, patches):
+        """Find patches that are missing because of closed nodes.
+
+        Parameters
+        ----------
+        patches : ndarray of int
+            Patch ids.
+
+        Returns
+        -------
+        ndarray of bool
+            ``True`` for patches that are absent, of the same shape as
+            *patches*.
+        """
+        from landlab import RasterModelGrid, VoronoiDelaunayGrid
+        nodes_at_patch = self.nodes_at_patch[patches]
+        node_status_at_patch = self._node_status[nodes_at_patch]
+        if isinstance(self, RasterModelGrid):
+            max_nodes_at_patch = 4
+        elif isinstance(self, VoronoiDelaunayGrid):
+            max_nodes_at_patch = 3
+        else:
+            max_nodes_at_patch = (nodes_at_patch > -1).sum(axis=-1)
+        return (node_status_at_patch == CLOSED_BOUNDARY).sum(axis=-1) > (
+            max_nodes_at_patch - 3)
+
     def calc_hillshade_at_node(self, alt=45., az=315., slp=None, asp=None,
                                unit='degrees', elevs='topographic__elevation'):
         """Get array of hillshade.
@@ -3159,13 +3332,77 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         if self._DEBUG_TRACK_METHODS:
             six.print_('ModelGrid._reset_link_status_list')
 
+        status_at_link = self._calc_status_at_link()
         try:
-            already_fixed = self._status_at_link == FIXED_LINK
+            self._status_at_link[:] = status_at_link
         except AttributeError:
-            already_fixed = numpy.zeros(self.number_of_links, dtype=bool)
+            self._status_at_link = status_at_link
 
-        fromnode_status = self._node_status[self.node_at_link_tail]
-        tonode_status = self._node_status[self.node_at_link_head]
+        (self._active_links, ) = numpy.where(
+            self._status_at_link == ACTIVE_LINK)
+        (self._fixed_links, ) = numpy.where(
+            self._status_at_link == FIXED_LINK)
+        self._active_links = as_id_array(self._active_links)
+        self._fixed_links = as_id_array(self._fixed_links)
+
+        self._create_active_link_nodes()
+
+        # Set up active inlink and outlink matrices
+        self._setup_active_inlink_and_outlink_matrices()
+        #self._create_links_and_link_dirs_at_node()
+
+    def _create_active_link_nodes(self):
+        """Set up the tail and head nodes of active links."""
+        self._activelink_fromnode = self.node_at_link_tail[self.active_links]
+        self._activelink_tonode = self.node_at_link_head[self.active_links]
+
+    def _update_link_status_list(self, links):
+        """Update the statuses of some links.
+
+        Only the given links, and the lists of active and fixed links, are
+        updated.
+
+        Parameters
+        ----------
+        links : ndarray of int
+            Sorted ids of links whose nodes have changed status.
+        """
+        status_at_link = self._calc_status_at_link(links)
+        self._status_at_link[links] = status_at_link
+
+        self._active_links = _update_sorted_ids(
+            self._active_links, links, links[status_at_link == ACTIVE_LINK])
+        self._fixed_links = _update_sorted_ids(
+            self._fixed_links, links, links[status_at_link == FIXED_LINK])
+
+
+    def _calc_status_at_link(self, links=None):
+        """Find the status of links from the status of their nodes.
+
+        See :meth:`_reset_link_status_list` for the rules that set the status
+        of a link.
+
+        Parameters
+        ----------
+        links : ndarray of int, optional
+            Links to find the status of. The default is all links.
+
+        Returns
+        -------
+        ndarray of int
+            Status of each link.
+        """
+        if links is None:
+            links = slice(None)
+
+        try:
+            already_fixed = self._status_at_link[links] == FIXED_LINK
+        except AttributeError:
+            already_fixed = numpy.zeros(self.number_of_links,
+                                        dtype=bool)[links]
+
+        fromnode_status = self._node_status[self.node_at_link_tail[links]]
+        tonode_status = self._node_status[self.node_at_link_head[links]]
 
         if not numpy.all((fromnode_status[already_fixed] ==
                           FIXED_GRADIENT_BOUNDARY) |
@@ -3216,28 +3453,12 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         # adjust an individual fixed_link back to fixed value. We'll allow it:
         fixed_links[fixed_link_fixed_val] = False
 
-        try:
-            self._status_at_link.fill(INACTIVE_LINK)
-        except AttributeError:
-            self._status_at_link = numpy.empty(self.number_of_links, dtype=int)
-            self._status_at_link.fill(INACTIVE_LINK)
-
-        self._status_at_link[active_links] = ACTIVE_LINK
-
-        self._status_at_link[fixed_links] = FIXED_LINK
-
-        active_links = self._status_at_link == ACTIVE_LINK  # now it's correct
-        (self._active_links, ) = numpy.where(active_links)
-        (self._fixed_links, ) = numpy.where(fixed_links)
-        self._active_links = as_id_array(self._active_links)
-        self._fixed_links = as_id_array(self._fixed_links)
-
-        self._activelink_fromnode = self.node_at_link_tail[active_links]
-        self._activelink_tonode = self.node_at_link_head[active_links]
+        status_at_link = numpy.empty(len(fromnode_status), dtype=int)
+        status_at_link.fill(INACTIVE_LINK)
+        status_at_link[active_links] = ACTIVE_LINK
+        status_at_link[fixed_links] = FIXED_LINK
 
-        # Set up active inlink and outlink matrices
-        self._setup_active_inlink_and_outlink_matrices()
-        #self._create_links_and_link_dirs_at_node()
+        return status_at_link
 
     def _reset_lists_of_nodes_cells(self):
         """Create of reset lists of nodes and cells based on their status.
@@ -3266,54 +3487,164 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         self._boundary_nodes = as_id_array(
             numpy.where(self._node_status != CORE_NODE)[0])
 
-    def _update_links_nodes_cells_to_new_BCs(self):
+    def _create_core_cells(self):
+        """Set up the list of core cells."""
+        self._core_cells = self.cell_at_node[self.core_nodes]
+
+    def _update_lists_of_nodes_cells(self, nodes):
+        """Update lists of nodes and cells for nodes that changed status.
+
+        Parameters
+        ----------
+        nodes : ndarray of int
+            Sorted ids of nodes whose status has changed.
+        """
+        status_at_node = self._node_status[nodes]
+        self._core_nodes = _update_sorted_ids(
+            self._core_nodes, nodes, nodes[status_at_node == CORE_NODE])
+        # a new grid can list its boundary nodes in any order.
+        self._boundary_nodes = _update_sorted_ids(
+            numpy.sort(self._boundary_nodes), nodes,
+            nodes[status_at_node != CORE_NODE])
+
+    def _update_links_nodes_cells_to_new_BCs(self, nodes=None):
         """Update grid element connectivity, status.
 
         This method updates all of the various lists and attributes governed
         by node status (e.g., core nodes, active links, etc) when you change
         node statuses. Call it if your method or driver makes changes to the
         boundary conditions of nodes in the grid.
+
+        If the nodes whose statuses have changed are given, only the links,
+        faces and patches that touch them are updated, rather than
+        everything. Set *_DEBUG_CHECK_BC_UPDATES* to check these updates
+        against a rebuild of the whole grid.
+
+        Parameters
+        ----------
+        nodes : array_like of int, optional
+            Nodes whose status has changed. If not given, all of the grid's
+            elements are updated.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid, CLOSED_BOUNDARY
+        >>> grid = RasterModelGrid((4, 5))
+        >>> grid.active_links # doctest: +NORMALIZE_WHITESPACE
+        array([ 5,  6,  7,  9, 10, 11, 12, 14, 15, 16, 18, 19, 20, 21, 23, 24,
+               25])
+        >>> grid._node_status[12] = CLOSED_BOUNDARY
+        >>> grid._update_links_nodes_cells_to_new_BCs([12])
+        >>> grid.active_links
+        array([ 5,  6,  7,  9, 10, 11, 12, 14, 16, 18, 21, 23, 25])
+        >>> grid.core_nodes
+        array([ 6,  7,  8, 11, 13])
         """
-        self._reset_link_status_list()
-        self._reset_lists_of_nodes_cells()
-        self._create_active_faces()
+        if nodes is not None:
+            nodes = numpy.unique(as_id_array(nodes))
+
+        if (nodes is None or
+                len(nodes) > _MAX_FRACTION_UPDATED * self.number_of_nodes or
+                not all(hasattr(self, name) for name in _UPDATED_BC_ARRAYS)):
+            self._reset_links_nodes_cells_to_new_BCs()
+        else:
+            self._update_links_nodes_cells_at_nodes(nodes)
+            if self._DEBUG_CHECK_BC_UPDATES:
+                self._check_bc_update()
 
-        self._active_link_dirs_at_node[:] = self._link_dirs_at_node[:]
-        inactive_links = (self.status_at_link[self.links_at_node] ==
-                          INACTIVE_LINK)
-        inactive_links[self.link_dirs_at_node == 0] = False
-        self._active_link_dirs_at_node[inactive_links] = 0
-        
         try:
             if self.diagonal_list_created:
                 self.diagonal_list_created = False
         except AttributeError:
             pass
-        
+
         try:
             if self.neighbor_list_created:
                 self.neighbor_list_created = False
         except AttributeError:
             pass
-        
+
         try:
             self._fixed_grad_links_created
         except AttributeError:
             pass
         else:
-            self._gradient_boundary_node_links()
+            self._create_fixed_gradient_boundary_node_links()
             self._create_fixed_gradient_boundary_node_anchor_node()
-        
+
+        try:
+            self.bc_set_code += 1
+        except AttributeError:
+            self.bc_set_code = 0
+
+    def _reset_links_nodes_cells_to_new_BCs(self):
+        """Rebuild the status of all links, nodes, faces and patches."""
+        self._reset_link_status_list()
+        self._reset_lists_of_nodes_cells()
+        self._create_active_faces()
+
+        self._active_link_dirs_at_node[:] = self._link_dirs_at_node[:]
+        inactive_links = (self.status_at_link[self.links_at_node] ==
+                          INACTIVE_LINK)
+        inactive_links[self.link_dirs_at_node == 0] = False
+        self._active_link_dirs_at_node[inactive_links] = 0
+
         try:
             if self._patches_created:
                 self._reset_patch_status()
         except AttributeError:
             pass
-        
+
+    def _update_links_nodes_cells_at_nodes(self, nodes):
+        """Update the links, nodes, faces and patches that touch nodes.
+
+        Parameters
+        ----------
+        nodes : ndarray of int
+            Sorted ids of nodes whose status has changed.
+        """
+        links = numpy.unique(self.links_at_node[nodes])
+        links = links[links >= 0]
+
+        self._update_link_status_list(links)
+        self._update_lists_of_nodes_cells(nodes)
+        for name in _DROPPED_BC_ARRAYS:
+            self.__dict__.pop(name, None)
+
+        nodes_at_links = numpy.union1d(self.node_at_link_tail[links],
+                                       self.node_at_link_head[links])
+        link_dirs = self._link_dirs_at_node[nodes_at_links]
+        inactive_links = (self.status_at_link[
+            self.links_at_node[nodes_at_links]] == INACTIVE_LINK)
+        link_dirs[inactive_links] = 0
+        self._active_link_dirs_at_node[nodes_at_links] = link_dirs
+
         try:
-            self.bc_set_code += 1
+            if self._patches_created:
+                self._update_patch_status(nodes)
         except AttributeError:
-            self.bc_set_code = 0
+            pass
+
+    def _check_bc_update(self):
+        """Check the grid against a rebuild of everything set by node status.
+
+        Raises
+        ------
+        AssertionError
+            If an incremental update doesn't match the rebuild.
+        """
+        updated = dict((name, numpy.array(getattr(self, name)))
+                       for name in self._BC_ARRAYS if hasattr(self, name))
+
+        self._reset_links_nodes_cells_to_new_BCs()
+
+        mismatched = [name for name in sorted(updated)
+                      if not numpy.array_equal(updated[name],
+                                               getattr(self, name))]
+        if mismatched:
+            raise AssertionError(
+                'incremental update of boundary conditions does not match '
+                'rebuild: {names}'.format(names=', '.join(mismatched)))
 
     @deprecated(use='set_nodata_nodes_to_closed', version='0.2')
     def set_nodata_nodes_to_inactive(self, node_data, nodata_value):
@@ -3407,11 +3738,11 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         """
         # Find locations where value equals the NODATA code and set these nodes
         # as inactive boundaries.
-        nodata_locations = numpy.nonzero(node_data == nodata_value)
+        nodata_locations = numpy.flatnonzero(node_data == nodata_value)
         self._node_status[nodata_locations] = CLOSED_BOUNDARY
 
         # Recreate the list of active cell IDs
-        self._update_links_nodes_cells_to_new_BCs()
+        self._update_links_nodes_cells_to_new_BCs(nodata_locations)
 
     def set_nodata_nodes_to_fixed_gradient(self, node_data, nodata_value):
         """Make no-data nodes fixed gradient boundaries.
@@ -3495,11 +3826,11 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         """
         # Find locations where value equals the NODATA code and set these nodes
         # as inactive boundaries.
-        nodata_locations = numpy.nonzero(node_data == nodata_value)
+        nodata_locations = numpy.flatnonzero(node_data == nodata_value)
         self._node_status[nodata_locations] = FIXED_GRADIENT_BOUNDARY
 
         # Recreate the list of active cell IDs
-        self._update_links_nodes_cells_to_new_BCs()
+        self._update_links_nodes_cells_to_new_BCs(nodata_locations)
 
     @deprecated(use='map_max_of_link_nodes_to_link', version=1.0)
     def max_of_link_end_node_values(self, node_data):
@@ -4442,6 +4773,13 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
     def all_node_distances_map(self):
         """Get distances from every node to every other node.
 
+        .. note::
+
+            The map is a dense ``number_of_nodes`` by ``number_of_nodes``
+            array. For anything but small grids, find the nodes around a
+            node with :meth:`calc_distances_azimuths_of_nodes_within_radius`
+            instead.
+
         Examples
         --------
         >>> from landlab import RasterModelGrid
@@ -4474,6 +4812,13 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
     def all_node_azimuths_map(self):
         """Get azimuths from every node to every other node.
 
+        .. note::
+
+            The map is a dense ``number_of_nodes`` by ``number_of_nodes``
+            array. For anything but small grids, find the nodes around a
+            node with :meth:`calc_distances_azimuths_of_nodes_within_radius`
+            instead.
+
         Examples
         --------
         >>> import numpy as np
@@ -4548,6 +4893,144 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
 
         return self._all_node_distances_map, self._all_node_azimuths_map
 
+    @property
+    def _node_spatial_index(self):
+        """A k-d tree of node coordinates.
+
+        The tree is built the first time it is used and kept until the
+        coordinates of the nodes change. Its size grows linearly with the
+        number of nodes.
+        """
+        if self._node_tree is None:
+            from scipy.spatial import cKDTree
+            self._node_tree = cKDTree(
+                numpy.column_stack((self.node_x, self.node_y)))
+        return self._node_tree
+
+    def find_nodes_within_radius(self, coord, radius):
+        """Get nodes within a distance of a point.
+
+        Parameters
+        ----------
+        coord : tuple of float
+            Coordinates of point as (x, y).
+        radius : float
+            Distance from the point.
+
+        Returns
+        -------
+        ndarray of int
+            Sorted IDs of nodes that are no farther than *radius* from the
+            point.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5))
+        >>> grid.find_nodes_within_radius((2., 1.), 1.)
+        array([ 2,  6,  7,  8, 12])
+        >>> grid.find_nodes_within_radius((2., 1.), 1.5)
+        array([ 1,  2,  3,  6,  7,  8, 11, 12, 13])
+        >>> grid.find_nodes_within_radius((20., 1.), 1.).size
+        0
+
+        LLCATS: NINF MEAS SUBSET
+        """
+        if len(coord) != 2:
+            raise ValueError('coordinate must iterable of length 2')
+
+        nodes = self._node_spatial_index.query_ball_point(coord, radius)
+        return numpy.sort(as_id_array(numpy.array(nodes, dtype=int)))
+
+    def find_nearest_nodes(self, coord, k=1):
+        """Get the nodes nearest to a point.
+
+        Parameters
+        ----------
+        coord : tuple of float
+            Coordinates of point as (x, y).
+        k : int, optional
+            Number of nodes to find.
+
+        Returns
+        -------
+        ndarray of int
+            IDs of the *k* nodes nearest to the point, ordered from nearest
+            to farthest.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5))
+        >>> grid.find_nearest_nodes((2.2, 1.1))
+        array([7])
+        >>> grid.find_nearest_nodes((2.2, 1.1), k=3)
+        array([ 7,  8, 12])
+
+        LLCATS: NINF MEAS SUBSET
+        """
+        if len(coord) != 2:
+            raise ValueError('coordinate must iterable of length 2')
+        if k < 1 or k > self.number_of_nodes:
+            raise ValueError('k must be between 1 and the number of nodes')
+
+        _, nodes = self._node_spatial_index.query(coord, k=k)
+        return as_id_array(numpy.array(nodes, dtype=int).reshape((-1, )))
+
+    def calc_distances_azimuths_of_nodes_within_radius(self, node, radius):
+        """Get distances and azimuths from a node to the nodes around it.
+
+        This gives the same values as the rows of
+        :attr:`all_node_distances_map` and :attr:`all_node_azimuths_map`,
+        but only for the nodes within *radius* of *node*, and without
+        building the maps.
+
+        .. note::
+
+            Angles are returned in radians but measured clockwise from
+            north.
+
+        Parameters
+        ----------
+        node : int
+            ID of the node to measure from.
+        radius : float
+            Distance from the node.
+
+        Returns
+        -------
+        tuple of ndarray
+            Sorted IDs of the nodes within *radius* of *node*, other than
+            *node* itself, and their distances and azimuths from *node*.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5))
+        >>> (nodes, dist, azim) = (
+        ...     grid.calc_distances_azimuths_of_nodes_within_radius(7, 1.5))
+        >>> nodes
+        array([ 1,  2,  3,  6,  8, 11, 12, 13])
+        >>> dist
+        array([ 1.41421356,  1.        ,  1.41421356,  1.        ,  1.        ,
+                1.41421356,  1.        ,  1.41421356])
+        >>> azim * 180. / np.pi
+        array([ 225.,  180.,  135.,  270.,   90.,  315.,    0.,   45.])
+
+        LLCATS: NINF MEAS
+        """
+        x, y = self.node_x[node], self.node_y[node]
+        nodes = self.find_nodes_within_radius((x, y), radius)
+        nodes = nodes[nodes != node % self.number_of_nodes]
+
+        dx = self.node_x[nodes] - x
+        dy = self.node_y[nodes] - y
+        azimuths = numpy.arctan2(dx, dy)
+        azimuths[azimuths < 0.] += 2. * numpy.pi
+
+        return nodes, numpy.sqrt(dx * dx + dy * dy), azimuths
+
     def _sort_links_by_midpoint(self):
         """Sort links in order first by midpoint x coordinate, then y.
 
@@ -4599,6 +5082,7 @@ class ModelGrid(ModelDataFieldsMixIn, EventLayersMixIn):
         """
         self._node_x += origin[0]
         self._node_y += origin[1]
+        self._node_tree = None
 
 
 add_module_functions_to_class(ModelGrid, 'mappers.py', pattern='map_*')
@@ -55,6 +55,53 @@ def create_patches_at_element(
         out[i, :num_elements_here] = patches_with_element
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def flood_fill_from_node(np.ndarray[DTYPE_INT_t, ndim=2] neighbors_at_node,
+                         np.ndarray[np.uint8_t, ndim=1] is_open,
+                         DTYPE_INT_t start,
+                         np.ndarray[np.uint8_t, ndim=1] out):
+    """Mark the nodes connected to a node through open nodes.
+
+    A breadth-first search that visits each node, and each of its
+    neighbors, at most once.
+
+    Parameters
+    ----------
+    neighbors_at_node : 2d array of ints, num_nodes x max_neighbors
+        Neighbors of each node. Negative values are missing neighbors.
+    is_open : 1d array of uint8
+        Nonzero for nodes that the fill may pass through.
+    start : int
+        Node to start the fill from. It is always marked, whether or not
+        it is open.
+    out : 1d array of uint8
+        Nodes reached from *start* are set to 1; others are left unchanged,
+        so *out* should start as zeros.
+    """
+    cdef int n_nodes = neighbors_at_node.shape[0]
+    cdef int n_neighbors = neighbors_at_node.shape[1]
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] queue = np.empty(n_nodes,
+                                                          dtype=DTYPE)
+    cdef int head = 0
+    cdef int tail = 1
+    cdef int node
+    cdef int neighbor
+    cdef int i
+
+    queue[0] = start
+    out[start] = 1
+    while head < tail:
+        node = queue[head]
+        head += 1
+        for i in range(n_neighbors):
+            neighbor = neighbors_at_node[node, i]
+            if neighbor >= 0 and is_open[neighbor] and not out[neighbor]:
+                out[neighbor] = 1
+                queue[tail] = neighbor
+                tail += 1
+
+
 @cython.boundscheck(False)
 def create_links_at_patch(np.ndarray[DTYPE_INT_t, ndim=2] nodes_at_patch,
                           np.ndarray[DTYPE_INT_t, ndim=2] links_at_node,
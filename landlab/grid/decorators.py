@@ -17,6 +17,43 @@ import numpy as np
 from ..core.utils import as_id_array
 
 
+def _ids_of_index(ind, size):
+    """Get the ids of the elements of a 1D array selected by an index.
+
+    Parameters
+    ----------
+    ind : int, slice or array_like
+        Index into an array.
+    size : int
+        Number of elements in the array.
+
+    Returns
+    -------
+    ndarray of int
+        Ids of the selected elements.
+
+    Examples
+    --------
+    >>> from landlab.grid.decorators import _ids_of_index
+    >>> _ids_of_index(-1, 5)
+    array([4])
+    >>> _ids_of_index(slice(1, None, 2), 5)
+    array([1, 3])
+    >>> _ids_of_index([True, False, False, True, False], 5)
+    array([0, 3])
+    """
+    if isinstance(ind, slice):
+        return np.arange(*ind.indices(size))
+
+    ind = np.asarray(ind)
+    if ind.dtype == bool:
+        return np.flatnonzero(ind)
+    elif np.issubdtype(ind.dtype, np.integer):
+        return as_id_array(ind.reshape((-1, )) % size)
+    else:
+        return np.arange(size)[ind].reshape((-1, ))
+
+
 class override_array_setitem_and_reset(object):
 
     """Decorator that calls a grid method after setting array values.
@@ -32,9 +69,12 @@ class override_array_setitem_and_reset(object):
     reset : str
         The name of the grid method to call after setting values. The
         corresponding method must take no arguments.
+    pass_ids : bool, optional
+        If ``True``, the grid method is called with the ids of the array
+        elements that were set as its only argument.
     """
 
-    def __init__(self, reset):
+    def __init__(self, reset, pass_ids=False):
         """Initialize the decorator with an argument.
 
         Parameters
@@ -42,8 +82,12 @@ class override_array_setitem_and_reset(object):
         reset : str
             The name of the grid method to call after setting values. The
             corresponding method must take no arguments.
+        pass_ids : bool, optional
+            If ``True``, the grid method is called with the ids of the array
+            elements that were set as its only argument.
         """
         self._reset = reset
+        self._pass_ids = pass_ids
 
     def __call__(self, func):
         """Get a wrapped version of the method.
@@ -59,6 +103,14 @@ class override_array_setitem_and_reset(object):
             The wrapped function.
         """
         reset = self._reset
+        pass_ids = self._pass_ids
+
+        def _reset_grid(grid, ind, size):
+            """Call the reset method, with ids of elements if wanted."""
+            if pass_ids:
+                getattr(grid, reset)(_ids_of_index(ind, size))
+            else:
+                getattr(grid, reset)()
 
         def _wrapped(grid):
             """Embed a grid into a numpy array and override set methods."""
@@ -79,17 +131,17 @@ class override_array_setitem_and_reset(object):
                 def itemset(self, ind, value):
                     """Set value of array, then call reset function."""
                     np.ndarray.itemset(self, ind, value)
-                    getattr(self.grid, reset)()
+                    _reset_grid(self.grid, ind, self.size)
 
                 def __setitem__(self, ind, value):
                     """Set value of array, then call reset function."""
                     np.ndarray.__setitem__(self, ind, value)
-                    getattr(self.grid, reset)()
+                    _reset_grid(self.grid, ind, self.size)
 
                 def __setslice__(self, start, stop, value):
                     """Set values of array, then call reset function."""
                     np.ndarray.__setslice__(self, start, stop, value)
-                    getattr(self.grid, reset)()
+                    _reset_grid(self.grid, slice(start, stop), self.size)
 
             return array(func(grid))
 
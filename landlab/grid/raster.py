@@ -16,7 +16,7 @@ from landlab.testing.decorators import track_this_method
 from landlab.utils import structured_grid as sgrid
 from landlab.utils import count_repeated_values
 
-from .base import ModelGrid
+from .base import ModelGrid, _update_sorted_ids
 from .base import (CORE_NODE, FIXED_VALUE_BOUNDARY,
                    FIXED_GRADIENT_BOUNDARY, LOOPED_BOUNDARY,
                    CLOSED_BOUNDARY, FIXED_LINK, BAD_INDEX_VALUE, ACTIVE_LINK,
@@ -37,38 +37,31 @@ from . import gradients
 
 @deprecated(use='grid.node_has_boundary_neighbor', version='0.2')
 def _node_has_boundary_neighbor(mg, id, method='d8'):
-    """Test if a node is next to a boundary.
+    """Test if nodes are next to a boundary.
 
-    Test if one of the neighbors of node *id* is a boundary node.
+    Test if one of the neighbors of each node in *id* is a boundary node.
 
     Parameters
     ----------
     mg : ModelGrid
         Source grid
-    node_id : int
-        ID of node to test.
+    node_id : int or array_like of int
+        IDs of nodes to test.
     method: string, optional
         default is d8 neighbor, other method is 'd4'
 
     Returns
     -------
-    boolean
-        ``True`` if node has a neighbor on the boundary, ``False`` otherwise.
+    ndarray of bool
+        ``True`` where a node has a neighbor on the boundary, ``False``
+        otherwise.
     """
-    for neighbor in mg.active_neighbors_at_node[id]:
-        try:
-            if mg.status_at_node[neighbor] != CORE_NODE:
-                return True
-        except IndexError:
-            return True
+    id = np.asarray(id)
+    neighbors = mg.active_neighbors_at_node[id]
     if method == 'd8':
-        for neighbor in mg._get_diagonal_list(id):
-            try:
-                if mg.status_at_node[neighbor] != CORE_NODE:
-                    return True
-            except IndexError:
-                return True
-    return False
+        neighbors = np.concatenate((neighbors, mg._get_diagonal_list(id)),
+                                   axis=-1)
+    return np.any(mg.status_at_node[neighbors] != CORE_NODE, axis=-1)
 
 
 def _make_arg_into_array(arg):
@@ -110,10 +103,6 @@ def _make_arg_into_array(arg):
     return ids
 
 
-_node_has_boundary_neighbor = np.vectorize(_node_has_boundary_neighbor,
-                                           excluded=['mg'])
-
-
 class RasterModelGridPlotter(object):
 
     """MixIn that provides plotting functionality.
@@ -336,6 +325,13 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
     or set it up such that one can create a zero-node grid.
     """
 
+    _BC_ARRAYS = ModelGrid._BC_ARRAYS + (
+        '_diag_active_links', '_diag_fixed_links', '_diag_inactive_links',
+        '_diag_activelink_fromnode', '_diag_activelink_tonode',
+        '_all__d8_active_links', '_all__d8_inactive_links',
+        '_diag__active_link_dirs_at_node',
+    )
+
     def __init__(self, *args, **kwds):
         """Create a 2D grid with equal spacing.
 
@@ -407,7 +403,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         self._node_status = np.empty(num_rows * num_cols, dtype=np.int8)
         
         # Set number of nodes, and initialize if caller has given dimensions
-        self._initialize(num_rows, num_cols, dx)
+        self._initialize(num_rows, num_cols, (state_dict.get('dy', dx), dx))
                                                  
         super(RasterModelGrid, self).__init__()
                                                  
@@ -1395,13 +1391,18 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
 
         LLCATS: NINF PINF CONN
         """
-        self._patches_created = True
-        base = np.arange(self.number_of_patches)
-        bottom_left_corner = base + base // (self._ncols - 1)
-        return np.column_stack((bottom_left_corner + self._ncols + 1,
-                                bottom_left_corner + self._ncols,
-                                bottom_left_corner,
-                                bottom_left_corner + 1))
+        try:
+            return self._nodes_at_patch
+        except AttributeError:
+            self._patches_created = True
+            base = np.arange(self.number_of_patches)
+            bottom_left_corner = base + base // (self._ncols - 1)
+            self._nodes_at_patch = as_id_array(
+                np.column_stack((bottom_left_corner + self._ncols + 1,
+                                 bottom_left_corner + self._ncols,
+                                 bottom_left_corner,
+                                 bottom_left_corner + 1)))
+            return self._nodes_at_patch
 
     @property
     @return_readonly_id_array
@@ -1421,13 +1422,18 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
 
         LLCATS: PINF LINF CONN
         """
-        self._patches_created = True
-        base = np.arange(self.number_of_patches)
-        bottom_edge = base + (base // (self._ncols - 1)) * self._ncols
-        return np.column_stack((bottom_edge + self._ncols,
-                                bottom_edge + 2 * self._ncols - 1,
-                                bottom_edge + self._ncols - 1,
-                                bottom_edge))
+        try:
+            return self._links_at_patch
+        except AttributeError:
+            self._patches_created = True
+            base = np.arange(self.number_of_patches)
+            bottom_edge = base + (base // (self._ncols - 1)) * self._ncols
+            self._links_at_patch = as_id_array(
+                np.column_stack((bottom_edge + self._ncols,
+                                 bottom_edge + 2 * self._ncols - 1,
+                                 bottom_edge + self._ncols - 1,
+                                 bottom_edge)))
+            return self._links_at_patch
 
     @property
     @return_readonly_id_array
@@ -1646,27 +1652,13 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         """
         assert(self._diagonal_links_created), 'Diagonal links not created'
 
-        self._diag_activelink_fromnode = []
-        self._diag_activelink_tonode = []
+        (is_active, is_fixed) = self._calc_diag_link_status(
+            np.arange(len(self._diag_link_fromnode)))
 
-        diag_fromnode_status = self.status_at_node[self._diag_link_fromnode]
-        diag_tonode_status = self.status_at_node[self._diag_link_tonode]
-
-        diag_active_links = (((diag_fromnode_status == CORE_NODE) & ~
-                              (diag_tonode_status == CLOSED_BOUNDARY)) |
-                             ((diag_tonode_status == CORE_NODE) & ~
-                              (diag_fromnode_status == CLOSED_BOUNDARY)))
-
-        (_diag_active_links, ) = np.where(diag_active_links)
+        (_diag_active_links, ) = np.where(is_active)
         _diag_active_links = as_id_array(_diag_active_links)
 
-        diag_fixed_links = ((((diag_fromnode_status ==
-                               FIXED_GRADIENT_BOUNDARY) &
-                              (diag_tonode_status == CORE_NODE)) |
-                             ((diag_tonode_status == FIXED_GRADIENT_BOUNDARY) &
-                              (diag_fromnode_status == CORE_NODE))))
-
-        (_diag_fixed_links, ) = np.where(diag_fixed_links)
+        (_diag_fixed_links, ) = np.where(is_fixed)
         _diag_fixed_links = as_id_array(_diag_fixed_links)
 
         self._diag_activelink_fromnode = self._diag_link_fromnode[
@@ -1674,7 +1666,7 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         self._diag_activelink_tonode = self._diag_link_tonode[
             _diag_active_links]
         self._diag_active_links = _diag_active_links + self.number_of_links
-        self._diag_fixed_links = diag_fixed_links + self.number_of_links
+        self._diag_fixed_links = _diag_fixed_links + self.number_of_links
 
         self._diag_inactive_links = np.setdiff1d(np.arange(
             self.number_of_links, self._number_of_d8_links),
@@ -1688,6 +1680,88 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         self._all__d8_inactive_links = np.concatenate(
             (normal_inactive, self._diag_inactive_links))
 
+    def _calc_diag_link_status(self, diags):
+        """Find whether diagonal links are active or fixed.
+
+        Parameters
+        ----------
+        diags : ndarray of int
+            Diagonal links, numbered from zero.
+
+        Returns
+        -------
+        (is_active, is_fixed) : tuple of ndarray of bool
+            Whether each diagonal is active, and whether it is fixed.
+        """
+        diag_fromnode_status = self._node_status[
+            self._diag_link_fromnode[diags]]
+        diag_tonode_status = self._node_status[self._diag_link_tonode[diags]]
+
+        is_active = (((diag_fromnode_status == CORE_NODE) &
+                      ~ (diag_tonode_status == CLOSED_BOUNDARY)) |
+                     ((diag_tonode_status == CORE_NODE) &
+                      ~ (diag_fromnode_status == CLOSED_BOUNDARY)))
+
+        is_fixed = (((diag_fromnode_status == FIXED_GRADIENT_BOUNDARY) &
+                     (diag_tonode_status == CORE_NODE)) |
+                    ((diag_tonode_status == FIXED_GRADIENT_BOUNDARY) &
+                     (diag_fromnode_status == CORE_NODE)))
+
+        return is_active, is_fixed
+
+    def _update_diagonal_link_status(self, nodes, links):
+        """Update the diagonal links at some nodes.
+
+        Parameters
+        ----------
+        nodes : ndarray of int
+            Sorted ids of nodes whose status has changed.
+        links : ndarray of int
+            Sorted ids of the (orthogonal) links at those nodes.
+        """
+        diags = np.unique(self._diag_links_at_node[nodes])
+        diags = diags[diags >= 0]
+        (is_active, is_fixed) = self._calc_diag_link_status(
+            diags - self.number_of_links)
+        is_inactive = ~ (is_active | is_fixed)
+
+        self._diag_active_links = _update_sorted_ids(
+            self._diag_active_links, diags, diags[is_active])
+        self._diag_fixed_links = _update_sorted_ids(
+            self._diag_fixed_links, diags, diags[is_fixed])
+        self._diag_inactive_links = _update_sorted_ids(
+            self._diag_inactive_links, diags, diags[is_inactive])
+
+        active = self._diag_active_links - self.number_of_links
+        self._diag_activelink_fromnode = self._diag_link_fromnode[active]
+        self._diag_activelink_tonode = self._diag_link_tonode[active]
+
+        # Diagonal ids follow the orthogonal ones so, like the lists of
+        # diagonals, these lists are sorted.
+        status_at_link = self._status_at_link[links]
+        changed = np.concatenate((links, diags))
+        self._all__d8_active_links = _update_sorted_ids(
+            self._all__d8_active_links, changed,
+            np.concatenate((links[status_at_link == ACTIVE_LINK],
+                            diags[is_active])))
+        self._all__d8_inactive_links = _update_sorted_ids(
+            self._all__d8_inactive_links, changed,
+            np.concatenate((links[status_at_link == INACTIVE_LINK],
+                            diags[is_inactive])))
+
+        nodes_at_diags = np.union1d(
+            self._diag_link_fromnode[diags - self.number_of_links],
+            self._diag_link_tonode[diags - self.number_of_links])
+        diags_at_node = self._diag_links_at_node[nodes_at_diags]
+        at = np.searchsorted(self._diag_active_links, diags_at_node)
+        is_active_at_node = at < len(self._diag_active_links)
+        is_active_at_node[is_active_at_node] = (
+            self._diag_active_links[at[is_active_at_node]] ==
+            diags_at_node[is_active_at_node])
+        link_dirs = self._diag__link_dirs_at_node[nodes_at_diags]
+        link_dirs[~ is_active_at_node] = 0
+        self._diag__active_link_dirs_at_node[nodes_at_diags] = link_dirs
+
     def _reset_diagonal_link_statuses(self):
         """Rest the statuses of diagonal links.
 
@@ -1779,6 +1853,20 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
             self._reset_list_of_active_diagonal_links()
             self._reset_diag_active_link_dirs()
 
+    def _update_link_status_list(self, links):
+        """Update the status of some links, and of the diagonals at them.
+
+        Parameters
+        ----------
+        links : ndarray of int
+            Sorted ids of links whose nodes have changed status.
+        """
+        super(RasterModelGrid, self)._update_link_status_list(links)
+        if self._diagonal_links_created:
+            nodes = np.union1d(self.node_at_link_tail[links],
+                               self.node_at_link_head[links])
+            self._update_diagonal_link_status(nodes, links)
+
     def _create_link_unit_vectors(self):
         """Make arrays to store the unit vectors associated with each link.
 
@@ -2832,7 +2920,8 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         else:
             self._node_status[left_edge] = FIXED_VALUE_BOUNDARY
 
-        self._update_links_nodes_cells_to_new_BCs()
+        self._update_links_nodes_cells_to_new_BCs(np.concatenate(
+            (bottom_edge, right_edge, top_edge, left_edge)))
 
     def set_closed_boundaries_at_grid_edges(self, right_is_closed,
                                             top_is_closed,
@@ -2938,7 +3027,8 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         if left_is_closed:
             self._node_status[left_edge] = CLOSED_BOUNDARY
 
-        self._update_links_nodes_cells_to_new_BCs()
+        self._update_links_nodes_cells_to_new_BCs(np.concatenate(
+            (bottom_edge, right_edge, top_edge, left_edge)))
 
     def set_fixed_value_boundaries_at_grid_edges(
             self, right_is_fixed_val, top_is_fixed_val, left_is_fixed_val,
@@ -3053,7 +3143,8 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         if left_is_fixed_val:
             self._node_status[left_edge] = FIXED_VALUE_BOUNDARY
 
-        self._update_links_nodes_cells_to_new_BCs()
+        self._update_links_nodes_cells_to_new_BCs(np.concatenate(
+            (bottom_edge, right_edge, top_edge, left_edge)))
 
         # save some internal data to speed updating:
         self.fixed_value_node_properties = {}
@@ -4897,73 +4988,29 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         # values that are not on the perimeter.
         self.set_nodata_nodes_to_closed(node_data, nodata_value)
 
-        # need to find values that are not no_data
-
-        #locs is a list that contains locations where
-        #node data is not equal to the nodata value
-        locs = np.where(node_data != nodata_value)
-        if len(locs) < 1:
+        is_data = node_data != nodata_value
+        if not np.any(is_data):
             raise ValueError('All data values are no_data values')
 
-        # now find minimum of the data values
-        min_val = np.min(node_data[locs])
-
-        # now find where minimum values are
-        min_locs = np.where(node_data == min_val)[0]
-
-        
-        # check all the locations with the minimum value to see if one
-        # is adjacent to a boundary location.  If so, that will be the
-        # watershed outlet.  If none of these points qualify, then
-        # increase the minimum value and check again.  Keep checking
-        # until a point next to the boundary is found.
-        # NG I think the only way this would become an infinite loop
-        # is if there are no interior nodes.  Should be checking for
-        # this above.
-        not_found = True
-        while not_found:
-            # now check the min locations to see if any are next to
-            # a boundary node
-            local_not_found = True
-            next_to_boundary=[]
-            
-            # check all nodes rather than selecting the first node that meets
-            # the criteria
-            for i in range(len(min_locs)):
-                next_to_boundary.append(self.has_boundary_neighbor(min_locs[i]))
-            
-            # if any of those nodes were adjacent to the boundary, check 
-            #that  there is only one. If only one, set as outlet loc, else,
-            # raise a value error
-            if any(next_to_boundary):
-                local_not_found = False
-                if sum(next_to_boundary)>1:
-                    potential_locs = min_locs[np.where(np.asarray(next_to_boundary))[0]]
-                    raise ValueError(('Grid has two potential outlet nodes.'
-                                      'They have the following node IDs: \n'+str(potential_locs)+
-                                     '\nUse the method set_watershed_boundary_condition_outlet_id '
-                                     'to explicitly select one of these '
-                                     'IDs as the outlet node.'
-                                     ))
-                else:
-                    outlet_loc = min_locs[np.where(next_to_boundary)[0][0]]
-
-            # checked all of the min vals, (so done with inner while)
-            # and none of the min values were outlet candidates
-            if local_not_found:
-                # need to find the next largest minimum value
-                # first find the locations of all values greater
-                # than the old minimum
-                # not done with outer while
-                locs = np.where((node_data > min_val) &
-                                (node_data != nodata_value))
-                # now find new minimum of these values
-                min_val = np.min(node_data[locs])
-                min_locs = np.where(node_data == min_val)[0]
-            else:
-                # if locally found, it is also globally found
-                # so done with outer while
-                not_found = False
+        # The outlet is the node with the smallest data value of those that
+        # are next to a boundary node. Check all of the nodes with that
+        # value rather than selecting the first one.
+        candidates = np.flatnonzero(is_data)
+        candidates = candidates[self.node_has_boundary_neighbor(candidates)]
+        if len(candidates) == 0:
+            raise ValueError('No data nodes are next to a boundary node')
+
+        min_val = np.min(node_data[candidates])
+        potential_locs = candidates[node_data[candidates] == min_val]
+        if len(potential_locs) > 1:
+            raise ValueError(('Grid has two potential outlet nodes.'
+                              'They have the following node IDs: \n' +
+                              str(potential_locs) +
+                              '\nUse the method '
+                              'set_watershed_boundary_condition_outlet_id '
+                              'to explicitly select one of these '
+                              'IDs as the outlet node.'))
+        outlet_loc = potential_locs[0]
 
         # set outlet boundary condition
         self.status_at_node[outlet_loc] = FIXED_VALUE_BOUNDARY
@@ -5034,9 +5081,9 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         >>> mg2.set_watershed_boundary_condition(z2)
         >>> mg2.status_at_node.reshape(mg2.shape)
         array([[4, 4, 4, 4, 4, 4],
-              [4, 0, 0, 4, 0, 4],
-              [4, 0, 1, 4, 4, 4],
-              [4, 4, 4, 4, 4, 4]], dtype=int8)
+               [4, 0, 0, 4, 0, 4],
+               [4, 0, 1, 4, 4, 4],
+               [4, 4, 4, 4, 4, 4]], dtype=int8)
         >>> mg2.set_open_nodes_disconnected_from_watershed_to_closed(z2)
         >>> np.allclose(mg1.status_at_node, mg2.status_at_node)
         True
@@ -5082,42 +5129,24 @@ class RasterModelGrid(ModelGrid, RasterModelGridPlotter):
         if adjacency_method != 'D8':
             assert(adjacency_method=='D4'), "Method must be either 'D8'(default) or 'D4'"
 
-        # begin main code portion.
-        # initialize list of core nodes and new nodes
-        connected_nodes=list(outlet_id)
-        newNodes=connected_nodes
-
-        # keep track of the number of nodes added in the previous itteration.
-        numAdded=len(newNodes)
-
-        # continue running until no new nodes are added.
-        while numAdded>0:
-
-            # find all potential new nodes by filtering the nodes connected to
-            # the most recent set of new nodes based on their status.
-            connected_orthogonal_nodes = self.neighbors_at_node[newNodes]
-            potentialNewNodes=list(connected_orthogonal_nodes[self.status_at_node[connected_orthogonal_nodes]!=CLOSED_BOUNDARY])
+        from .cfuncs import flood_fill_from_node
 
-            # if method is D8 (default), add the diagonal nodes.
-            if adjacency_method=='D8':
-                connected_diagonal_nodes = self._diagonal_neighbors_at_node[newNodes]
-                potentialNewNodes.extend(connected_diagonal_nodes[self.status_at_node[connected_diagonal_nodes]!=CLOSED_BOUNDARY])
-
-            # filter new nodes further based on if they are already present in
-            # the connected node list
-            newNodes=list(set(potentialNewNodes) - set(connected_nodes))
-            connected_nodes.extend(newNodes)
-
-            # update number added, when this is zero, the loop will end
-            numAdded=len(newNodes)
-
-        # create an array that identifies the nodes that should be closed
-        # of closed boundary nodes
-        not_connected=np.array((0*self.status_at_node)+1)
-        not_connected[np.array(connected_nodes)]=0
+        # mark the nodes that can be reached from the outlet through nodes
+        # that are not closed.
+        if adjacency_method == 'D8':
+            neighbors = np.hstack((self.neighbors_at_node,
+                                   self._diagonal_neighbors_at_node))
+        else:
+            neighbors = self.neighbors_at_node
+        is_connected = np.zeros(self.number_of_nodes, dtype=np.uint8)
+        flood_fill_from_node(
+            np.asarray(neighbors, dtype=int),
+            (self.status_at_node != CLOSED_BOUNDARY).view(np.uint8),
+            int(outlet_id[0]), is_connected)
 
         #identify those nodes that should be closed, but are not yet closed.
-        is_not_connected_to_outlet=(self.status_at_node!=CLOSED_BOUNDARY)&(not_connected==1)
+        is_not_connected_to_outlet = (
+            (self.status_at_node != CLOSED_BOUNDARY) & (is_connected == 0))
 
         # modify the node_data array to set those that are disconnected
         # to the no data value.
@@ -0,0 +1,67 @@
+import numpy as np
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+from nose.tools import assert_is, assert_is_not, assert_raises
+
+from landlab import RasterModelGrid, HexModelGrid, VoronoiDelaunayGrid
+
+
+def _grids():
+    np.random.seed(0)
+    yield RasterModelGrid((6, 7), spacing=(2., 3.))
+    yield HexModelGrid(6, 7)
+    yield VoronoiDelaunayGrid(np.random.rand(50) * 10.,
+                              np.random.rand(50) * 10.)
+
+
+def test_within_radius_matches_maps():
+    for grid in _grids():
+        distances = grid.all_node_distances_map
+        azimuths = grid.all_node_azimuths_map
+        for node in range(grid.number_of_nodes):
+            nodes, dist, azim = (
+                grid.calc_distances_azimuths_of_nodes_within_radius(node,
+                                                                    3.5))
+            expected = np.flatnonzero(distances[node] <= 3.5)
+            expected = expected[expected != node]
+
+            assert_array_equal(nodes, expected)
+            assert_array_almost_equal(dist, distances[node, expected])
+            assert_array_almost_equal(azim, azimuths[node, expected])
+
+
+def test_nearest_nodes_matches_distances():
+    for grid in _grids():
+        point = (4.1, 3.3)
+        dist = grid.calc_distances_of_nodes_to_point(point)
+
+        assert_array_equal(grid.find_nearest_nodes(point, k=5),
+                           np.argsort(dist)[:5])
+        assert_array_equal(grid.find_nearest_nodes(point),
+                           [np.argmin(dist)])
+
+
+def test_nearest_nodes_bad_k():
+    grid = RasterModelGrid((3, 4))
+    assert_raises(ValueError, grid.find_nearest_nodes, (1., 1.), k=0)
+    assert_raises(ValueError, grid.find_nearest_nodes, (1., 1.), k=13)
+
+
+def test_index_is_cached():
+    grid = RasterModelGrid((3, 4))
+    tree = grid._node_spatial_index
+    grid.at_node['topographic__elevation'] = np.arange(12.)
+    grid.status_at_node[5] = 4
+
+    assert_is(grid._node_spatial_index, tree)
+
+
+def test_index_reset_with_new_origin():
+    grid = RasterModelGrid((3, 4))
+    tree = grid._node_spatial_index
+    assert_array_equal(grid.find_nodes_within_radius((1., 1.), .5), [5])
+
+    grid.move_origin((10., 20.))
+
+    assert_is_not(grid._node_spatial_index, tree)
+    assert_array_equal(grid.find_nodes_within_radius((11., 21.), .5), [5])
+    assert_array_equal(grid.find_nodes_within_radius((1., 1.), .5), [])
@@ -1,9 +1,10 @@
 import numpy as np
 from numpy.testing import assert_array_equal
-from nose.tools import with_setup, assert_true, assert_equal, assert_not_equal
+from nose.tools import (with_setup, assert_true, assert_equal,
+                        assert_not_equal, assert_raises)
 
 from landlab import FIXED_GRADIENT_BOUNDARY, CLOSED_BOUNDARY, INACTIVE_LINK, \
-    FIXED_LINK
+    FIXED_LINK, CORE_NODE, FIXED_VALUE_BOUNDARY
 from landlab import RasterModelGrid
 
 
@@ -67,3 +68,63 @@ def test_bc_set_code_init():
 def test_bc_set_code_change():
     rmg.status_at_node[rmg.nodes_at_bottom_edge] = CLOSED_BOUNDARY
     assert_not_equal(rmg.bc_set_code, 0)
+
+
+def _toggle_random_nodes(grid, n_updates=100, seed=0):
+    """Change the status of a few nodes at a time."""
+    rng = np.random.RandomState(seed)
+    for _ in range(n_updates):
+        nodes = rng.randint(0, grid.number_of_nodes, rng.randint(1, 4))
+        grid.status_at_node[nodes] = rng.choice(
+            [CORE_NODE, CORE_NODE, FIXED_VALUE_BOUNDARY, CLOSED_BOUNDARY])
+
+
+def test_incremental_update_matches_rebuild():
+    grid = RasterModelGrid((20, 25))
+    grid.patches_at_link
+    grid._DEBUG_CHECK_BC_UPDATES = True
+    _toggle_random_nodes(grid)
+
+    updated = grid.active_links.copy(), grid.core_nodes.copy()
+    grid._update_links_nodes_cells_to_new_BCs()
+    assert_array_equal(grid.active_links, updated[0])
+    assert_array_equal(grid.core_nodes, updated[1])
+
+
+def test_incremental_update_of_diagonals():
+    grid = RasterModelGrid((20, 25))
+    grid._create_diag_links_at_node()
+    grid._DEBUG_CHECK_BC_UPDATES = True
+    _toggle_random_nodes(grid)
+
+    grid.status_at_node[grid.nodes_at_left_edge[3:6]] = (
+        FIXED_GRADIENT_BOUNDARY)
+    grid.fixed_gradient_boundary_node_anchor_node
+    _toggle_random_nodes(grid, n_updates=20, seed=1)
+
+
+def test_incremental_update_with_fixed_gradient():
+    grid = RasterModelGrid((20, 25))
+    grid._DEBUG_CHECK_BC_UPDATES = True
+    grid.status_at_node[grid.nodes_at_left_edge] = FIXED_GRADIENT_BOUNDARY
+    grid.fixed_gradient_boundary_node_anchor_node
+    _toggle_random_nodes(grid, n_updates=20)
+
+
+def test_incremental_update_bad_update():
+    grid = RasterModelGrid((20, 25))
+    grid._DEBUG_CHECK_BC_UPDATES = True
+    grid._node_status[[7, 8]] = CLOSED_BOUNDARY
+    assert_raises(AssertionError, grid._update_links_nodes_cells_to_new_BCs,
+                  [7])
+
+
+@with_setup(setup_grid)
+def test_active_link_nodes_after_update():
+    rmg.status_at_node[7] = CLOSED_BOUNDARY
+    assert_array_equal(rmg._activelink_fromnode,
+                       rmg.node_at_link_tail[rmg.active_links])
+    assert_array_equal(rmg._activelink_tonode,
+                       rmg.node_at_link_head[rmg.active_links])
+    assert_array_equal(rmg.active_faces, rmg.face_at_link[rmg.active_links])
+    assert_array_equal(rmg.core_cells, rmg.cell_at_node[rmg.core_nodes])
@@ -0,0 +1,107 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from nose.tools import assert_equal, assert_raises, assert_true
+
+from landlab import RasterModelGrid, CLOSED_BOUNDARY, FIXED_VALUE_BOUNDARY
+
+
+def _random_watershed(shape, seed=0, nodata_value=-9999.):
+    """Random elevations with scattered patches of nodata."""
+    np.random.seed(seed)
+    z = np.random.rand(shape[0] * shape[1])
+    z[np.random.rand(z.size) < .3] = nodata_value
+    return z
+
+
+def _find_outlet_by_search(grid, z, nodata_value=-9999.):
+    """Outlet found by checking data values in increasing order."""
+    for value in np.unique(z[z != nodata_value]):
+        nodes = np.flatnonzero(z == value)
+        for node in nodes:
+            if grid.node_has_boundary_neighbor(int(node)):
+                return node
+
+
+def _connected_by_search(grid, outlet, adjacency_method):
+    """Nodes connected to the outlet, found by growing a set of nodes."""
+    connected = set([outlet])
+    new_nodes = [outlet]
+    while new_nodes:
+        neighbors = grid.neighbors_at_node[new_nodes].ravel()
+        if adjacency_method == 'D8':
+            neighbors = np.concatenate(
+                (neighbors,
+                 grid._diagonal_neighbors_at_node[new_nodes].ravel()))
+        neighbors = neighbors[
+            (neighbors >= 0) &
+            (grid.status_at_node[neighbors] != CLOSED_BOUNDARY)]
+        new_nodes = list(set(neighbors) - connected)
+        connected.update(new_nodes)
+    return np.array(sorted(connected))
+
+
+def test_outlet_matches_search():
+    for seed in range(10):
+        z = _random_watershed((20, 30), seed=seed)
+        grid = RasterModelGrid((20, 30))
+        outlet = grid.set_watershed_boundary_condition(
+            z, return_outlet_id=True)
+
+        assert_equal(outlet[0], _find_outlet_by_search(grid, z))
+        assert_equal(grid.status_at_node[outlet[0]], FIXED_VALUE_BOUNDARY)
+        assert_equal(np.count_nonzero(
+            grid.status_at_node == FIXED_VALUE_BOUNDARY), 1)
+
+
+def test_outlet_with_ties():
+    grid = RasterModelGrid((4, 4))
+    z = np.array([-9999., -9999., -9999., -9999.,
+                  -9999., 1., 1., -9999.,
+                  -9999., 2., 3., -9999.,
+                  -9999., -9999., -9999., -9999.])
+    assert_raises(ValueError, grid.set_watershed_boundary_condition, z)
+
+
+def test_outlet_all_nodata():
+    grid = RasterModelGrid((4, 4))
+    z = np.full(16, -9999.)
+    assert_raises(ValueError, grid.set_watershed_boundary_condition, z)
+
+
+def test_remove_disconnected_matches_search():
+    for adjacency_method in ('D8', 'D4'):
+        for seed in range(10):
+            z = _random_watershed((20, 30), seed=seed)
+            grid = RasterModelGrid((20, 30))
+            outlet = grid.set_watershed_boundary_condition(
+                z, return_outlet_id=True)
+            connected = _connected_by_search(grid, outlet[0],
+                                             adjacency_method)
+
+            grid.set_open_nodes_disconnected_from_watershed_to_closed(
+                z, outlet_id=outlet, adjacency_method=adjacency_method)
+
+            assert_array_equal(
+                np.flatnonzero(grid.status_at_node != CLOSED_BOUNDARY),
+                connected)
+            assert_true(np.all(z[connected] != -9999.))
+
+
+def test_remove_disconnected_d4_and_d8():
+    z = np.array([-9999., -9999., -9999., -9999., -9999.,
+                  -9999., 5., -9999., 3., -9999.,
+                  -9999., -9999., 4., -9999., -9999.,
+                  -9999., -9999., 1., -9999., -9999.,
+                  -9999., -9999., -9999., -9999., -9999.])
+
+    grid = RasterModelGrid((5, 5))
+    grid.set_watershed_boundary_condition(z.copy(), remove_disconnected=True,
+                                          adjacency_method='D8')
+    assert_array_equal(np.flatnonzero(grid.status_at_node != CLOSED_BOUNDARY),
+                       [6, 8, 12, 17])
+
+    grid = RasterModelGrid((5, 5))
+    grid.set_watershed_boundary_condition(z.copy(), remove_disconnected=True,
+                                          adjacency_method='D4')
+    assert_array_equal(np.flatnonzero(grid.status_at_node != CLOSED_BOUNDARY),
+                       [12, 17])
@@ -428,8 +428,10 @@ class VoronoiDelaunayGrid(ModelGrid):
         # points. We include these in our set of boundary nodes.
         convex_hull_nodes = np.array(list(set(hull.simplices.flatten())))
         coplanar_nodes = hull.coplanar[:, 0]
-        boundary_nodes = as_id_array(np.concatenate(
-            (convex_hull_nodes, coplanar_nodes)))
+        boundary_nodes = np.concatenate((convex_hull_nodes, coplanar_nodes))
+        # A node can be listed twice; drop repeats but keep the order.
+        _, first = np.unique(boundary_nodes, return_index=True)
+        boundary_nodes = as_id_array(boundary_nodes[np.sort(first)])
 
         # Now we'll create the "node_status" array, which contains the code
         # indicating whether the node is interior and active (=0) or a
@@ -833,9 +835,8 @@ class VoronoiDelaunayGrid(ModelGrid):
     def save(self, path, clobber=False):
         """Save a grid and fields.
 
-        This method uses cPickle to save a Voronoi grid as a cPickle file.
-        At the time of coding, this is the only convenient output format
-        for Voronoi grids, but support for netCDF is likely coming.
+        This method saves a Voronoi grid in Landlab's native format: a
+        directory of raw binary arrays and a JSON header.
 
         All fields will be saved, along with the grid.
 
@@ -847,10 +848,6 @@ class VoronoiDelaunayGrid(ModelGrid):
         :py:func:`~landlab.io.native_landlab.load_grid` can be used to
         load these files.
 
-        Caution: Pickling can be slow, and can produce very large files.
-        Caution 2: Future updates to Landlab could potentially render old
-        saves unloadable.
-
         Parameters
         ----------
         path : str
@@ -861,29 +858,22 @@ class VoronoiDelaunayGrid(ModelGrid):
         Examples
         --------
         >>> from landlab import VoronoiDelaunayGrid
+        >>> from landlab.testing.tools import cdtemp
         >>> import numpy as np
         >>> import os
         >>> x = np.random.rand(20)
         >>> y = np.random.rand(20)
         >>> vmg = VoronoiDelaunayGrid(x,y)
-        >>> vmg.save('./mytestsave.grid')
-        >>> os.remove('mytestsave.grid') #to remove traces of this test
+        >>> with cdtemp() as _:
+        ...     vmg.save('./mytestsave.grid')
+        ...     os.path.isdir('mytestsave.grid')
+        True
 
         LLCATS: GINF
         """
-        import os
-        from six.moves import cPickle
-
-        if os.path.exists(path) and not clobber:
-            raise ValueError('file exists')
-
-        (base, ext) = os.path.splitext(path)
-        if ext != '.grid':
-            ext = ext + '.grid'
-        path = base + ext
+        from landlab.io.native_landlab import save_grid
 
-        with open(path, 'wb') as fp:
-            cPickle.dump(self, fp)
+        save_grid(self, path, clobber=clobber)
 
 
 if __name__ == '__main__':
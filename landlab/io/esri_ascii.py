@@ -14,6 +14,8 @@ ESRI ASCII functions
 
 import os
 import re
+import warnings
+
 import six
 
 import numpy as np
@@ -36,6 +38,9 @@ _HEADER_VALUE_TESTS = {
     'nodata_value': (float, lambda x: True),
 }
 
+#: Number of characters of data read or written at a time.
+_BLOCK_SIZE = 2 ** 22
+
 
 class Error(Exception):
 
@@ -304,22 +309,183 @@ def read_asc_header(asc_file):
     return header
 
 
-def _read_asc_data(asc_file):
+def _parse_asc_values(text):
+    """Parse whitespace-separated values into an array of doubles."""
+    if text.isspace():
+        return np.empty(0, dtype=float)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=float, sep=' ')
+        except DeprecationWarning:
+            raise ValueError('unable to parse data values')
+
+
+def _asc_data_blocks(asc_file, block_size=None):
+    """Iterate over blocks of text of an ESRI ASCII data section.
+
+    Blocks of *block_size* (by default, _BLOCK_SIZE) characters are read
+    from the file and split at their last whitespace so that no value is
+    broken across blocks.
+
+    Yields
+    ------
+    str
+        Text of whole data values.
+    """
+    if block_size is None:
+        block_size = _BLOCK_SIZE
+
+    tail = ''
+    while True:
+        block = asc_file.read(block_size)
+        if not isinstance(block, str):
+            block = block.decode()
+        if len(block) == 0:
+            break
+
+        block = tail + block
+        end = max(block.rfind(char) for char in ' \n\t\r') + 1
+        (block, tail) = (block[:end], block[end:])
+        if len(block) > 0:
+            yield block
+    if len(tail) > 0:
+        yield tail
+
+
+def _read_asc_data(asc_file, out, block_size=None):
     """Read gridded data from an ESRI ASCII data file.
 
+    The data are parsed a block at a time straight into *out* so that,
+    apart from *out*, memory use does not grow with the size of the file.
+
     Parameters
     ----------
     asc_file : file-like
         File-like object of the data file pointing to the start of the data.
+    out : ndarray
+        Array of the rows and columns of the data to read into, possibly
+        a non-contiguous view (to, for example, flip its rows).
+    block_size : int, optional
+        Number of characters to read at a time. If not given, use
+        _BLOCK_SIZE.
+
+    Raises
+    ------
+    DataSizeError
+        The file does not contain as many values as *out*.
 
     .. note::
         First row of the data is at the top of the raster grid, the second
         row is the second from the top, and so on.
     """
-    return np.loadtxt(asc_file)
+    n_read = 0
+    for block in _asc_data_blocks(asc_file, block_size=block_size):
+        values = _parse_asc_values(block)
+        if n_read + values.size > out.size:
+            raise DataSizeError(n_read + values.size, out.size)
+        out.flat[n_read:n_read + values.size] = values
+        n_read += values.size
+
+    if n_read != out.size:
+        raise DataSizeError(n_read, out.size)
+
+    return out
+
+
+def _read_asc_window(asc_file, shape, window, out):
+    """Read a rectangle of gridded data from an ESRI ASCII data file.
+
+    Only the lines of the rows of the window are parsed, and reading stops
+    after the last of them, so each row of the data must be on its own
+    line, as written by :func:`write_esri_ascii`.
+
+    Parameters
+    ----------
+    asc_file : file-like
+        File-like object of the data file pointing to the start of the data.
+    shape : tuple of int
+        Number of rows and columns of the data.
+    window : tuple of tuple of int
+        Rows and columns of the window as
+        ``((top_row, bottom_row), (first_col, last_col))``, counted from
+        the top of the data, with stops that are not included.
+    out : ndarray
+        Array of the rows and columns of the window to read into.
+
+    Raises
+    ------
+    DataSizeError
+        A row in the file does not have the right number of values.
+    """
+    (rows, cols) = window
+
+    row = 0
+    while row < rows[1]:
+        line = asc_file.readline()
+        if len(line) == 0:
+            raise DataSizeError(row * shape[1], shape[0] * shape[1])
+        if line.isspace():
+            continue
+
+        if row >= rows[0]:
+            values = _parse_asc_values(line)
+            if values.size != shape[1]:
+                raise DataSizeError(values.size, shape[1])
+            out[row - rows[0]] = values[cols[0]:cols[1]]
+        row += 1
+
+    return out
+
+
+def _window_of_data(window, shape):
+    """Rows and columns of a window into data.
+
+    Parameters
+    ----------
+    window : tuple of tuple of int, or None
+        Rows and columns of the window as
+        ``((start_row, stop_row), (start_col, stop_col))`` with rows
+        counted from the bottom of the data, as grid rows are. If ``None``,
+        the window is all of the data.
+    shape : tuple of int
+        Number of rows and columns of the data.
+
+    Returns
+    -------
+    tuple of tuple of int
+        Rows and columns of the window with rows counted from the top of the
+        data, as they appear in a file.
+
+    Examples
+    --------
+    >>> from landlab.io.esri_ascii import _window_of_data
+    >>> _window_of_data(None, (4, 3))
+    ((0, 4), (0, 3))
+    >>> _window_of_data(((1, 3), (0, 2)), (4, 3))
+    ((1, 3), (0, 2))
+    >>> _window_of_data(((0, 1), (1, 3)), (4, 3))
+    ((3, 4), (1, 3))
+    >>> _window_of_data(((0, 5), (1, 3)), (4, 3))
+    Traceback (most recent call last):
+    ...
+    ValueError: window is outside of the data
+    """
+    if window is None:
+        return ((0, shape[0]), (0, shape[1]))
 
+    ((row_start, row_stop), (col_start, col_stop)) = window
+    if not (0 <= row_start < row_stop <= shape[0] and
+            0 <= col_start < col_stop <= shape[1]):
+        raise ValueError('window is outside of the data')
 
-def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
+    return ((shape[0] - row_stop, shape[0] - row_start),
+            (col_start, col_stop))
+
+
+def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0,
+                    window=None):
     """Read :py:class:`~landlab.RasterModelGrid` from an ESRI ASCII file.
 
     Read data from *asc_file*, an ESRI_ ASCII file, into a
@@ -332,6 +498,12 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
     array of doubles with that has been reshaped to have the number of rows
     and columns given in the header.
 
+    The data are parsed a block at a time into the array that is returned,
+    so large files can be read without holding more than one copy of the
+    data in memory. To read part of a file, give the rows and columns to
+    read as *window*. Rows of the file before the window are skipped
+    without being parsed and the rest of the file is not read.
+
     .. _ESRI: http://resources.esri.com/help/9.3/arcgisengine/java/GP_ToolRef/spatial_analyst_tools/esri_ascii_raster_format.htm
 
     Parameters
@@ -346,6 +518,12 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
         Adds data to an existing *grid* instead of creating a new one.
     halo : integer, optional
         Adds outer border of depth halo to the *grid*. 
+    window : tuple of tuple of int, optional
+        Read only the rectangle of data given as
+        ``((start_row, stop_row), (start_col, stop_col))``. Rows are counted
+        from the bottom of the data, as the rows of a grid are, and stops
+        are not included. Each row of the data must be on its own line of
+        the file. A *halo* is added around the window.
 
     Returns
     -------
@@ -388,69 +566,57 @@ def read_esri_ascii(asc_file, grid=None, reshape=False, name=None, halo=0):
     >>> #  -9999, 3., 4., 5., -9999,
     >>> #  -9999, 0., 1., 2. -9999,
     >>> #  -9999, -9999, -9999, -9999, -9999, -9999]
+    >>> (grid, data) = read_esri_ascii('fop', window=((1, 4), (0, 3))) # doctest: +SKIP
+    >>> #grid has the top 3 rows of the file, so data is
+    >>> # [6., 7., 8., 3., 4., 5., 0., 1., 2.]
     """
     from ..grid import RasterModelGrid
 
     if isinstance(asc_file, six.string_types):
-        file_name = asc_file
-        with open(file_name, 'r') as asc_file:
-            header = read_asc_header(asc_file)
-            data = _read_asc_data(asc_file)
-    else:
-        header = read_asc_header(asc_file)
-        data = _read_asc_data(asc_file)
-    
+        with open(asc_file, 'r') as asc_file:
+            return read_esri_ascii(asc_file, grid=grid, reshape=reshape,
+                                   name=name, halo=halo, window=window)
+
+    header = read_asc_header(asc_file)
+    data_shape = (header['nrows'], header['ncols'])
+    (rows, cols) = _window_of_data(window, data_shape)
+
     #There is no reason for halo to be negative.
     #Assume that if a negative value is given it should be 0.
-    if halo <= 0:
-        shape = (header['nrows'], header['ncols'])
-        if data.size != shape[0] * shape[1]:
-            raise DataSizeError(shape[0] * shape[1], data.size)
-    else:
-        shape = (header['nrows'] + 2 * halo, header['ncols'] + 2 * halo)
-        #check to see if a nodata_value was given.  If not, assign -9999.
-        if 'nodata_value' in header.keys():
-            nodata_value = header['nodata_value']
-        else:
-            header['nodata_value'] = -9999.
-            nodata_value = header['nodata_value']
-        if data.size != (shape[0] - 2 * halo) * (shape[1] - 2 * halo):
-            raise DataSizeError(shape[0] * shape[1], data.size)
-    spacing = (header['cellsize'], header['cellsize'])
-    #origin = (header['xllcorner'], header['yllcorner'])   
-    
-    data = np.flipud(data)
+    halo = max(halo, 0)
+    shape = (rows[1] - rows[0] + 2 * halo, cols[1] - cols[0] + 2 * halo)
 
-    #REMEMBER, shape contains the size with halo in place
-    #header contains the shape of the original data
-    #Add halo below
-    if halo > 0:
-        helper_row = np.ones(shape[1]) * nodata_value
-        #for the first halo row(s), add num cols worth of nodata vals to data
-        for i in range(0, halo):
-            data = np.insert(data,0,helper_row)
-        #then for header['nrows'] add halo number nodata vals, header['ncols'] 
-        #of data, then halo number of nodata vals
-        helper_row_ends = np.ones(halo) * nodata_value
-        for i in range(halo, header['nrows']+halo):
-            #this adds at the beginning of the row
-            data = np.insert(data,i * shape[1],helper_row_ends)
-            #this adds at the end of the row
-            data = np.insert(data,(i + 1) * shape[1] - halo,helper_row_ends)
-        #for the last halo row(s), add num cols worth of nodata vals to data
-        for i in range(header['nrows']+halo,shape[0]):
-            data = np.insert(data,data.size,helper_row)
-        
-    if not reshape:
-        data = data.flatten()
-        
     if grid is not None:
         if (grid.number_of_node_rows != shape[0]) or \
         (grid.number_of_node_columns != shape[1]):
             raise MismatchGridDataSizeError(shape[0] * shape[1], \
             grid.number_of_node_rows * grid.number_of_node_columns )
 
+    #REMEMBER, shape contains the size with halo in place
+    #header contains the shape of the original data
+    data = np.empty(shape, dtype=float)
+    if halo > 0:
+        #check to see if a nodata_value was given.  If not, assign -9999.
+        nodata_value = header.setdefault('nodata_value', -9999.)
+        data[:halo] = nodata_value
+        data[-halo:] = nodata_value
+        data[:, :halo] = nodata_value
+        data[:, -halo:] = nodata_value
+
+    #the first row of the file is the top row of the grid so fill the
+    #rows of the grid from the top down.
+    rows_of_file = data[halo:shape[0] - halo, halo:shape[1] - halo][::-1]
+    if window is None:
+        _read_asc_data(asc_file, out=rows_of_file)
+    else:
+        _read_asc_window(asc_file, data_shape, (rows, cols),
+                         out=rows_of_file)
+
+    if not reshape:
+        data = data.reshape((-1, ))
+
     if grid is None:
+        spacing = (header['cellsize'], header['cellsize'])
         grid = RasterModelGrid(shape, spacing=spacing)
     if name:
         grid.add_field('node', name, data)
@@ -530,7 +696,44 @@ def write_esri_ascii(path, fields, names=None, clobber=False):
         header_lines = ['%s %s' % (key, str(val))
                         for key, val in list(header.items())]
         data = fields.at_node[name].reshape(header['nrows'], header['ncols'])
-        np.savetxt(path, np.flipud(data), header=os.linesep.join(header_lines),
-                   comments='')
+        with open(path, 'w') as asc_file:
+            asc_file.write(os.linesep.join(header_lines) + '\n')
+            _write_asc_data(asc_file, data)
 
     return paths
+
+
+def _write_asc_data(asc_file, data, fmt='%.18e'):
+    """Write gridded data to an ESRI ASCII data file.
+
+    Rows are written a block at a time, top row first, with each row of
+    the data on its own line.
+
+    Parameters
+    ----------
+    asc_file : file-like
+        File-like object of the data file pointing to the start of the data.
+    data : ndarray
+        Rows and columns of data, with the bottom row first.
+    fmt : str, optional
+        Format of each value.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from six import StringIO
+    >>> from landlab.io.esri_ascii import _write_asc_data
+    >>> asc_file = StringIO()
+    >>> _write_asc_data(asc_file, np.arange(6.).reshape((2, 3)), fmt='%g')
+    >>> print(asc_file.getvalue().strip())
+    3 4 5
+    0 1 2
+    """
+    (n_rows, n_cols) = data.shape
+    rows_per_block = max(_BLOCK_SIZE // (n_cols * (len(fmt % 0.) + 1)), 1)
+    row_fmt = ' '.join([fmt] * n_cols) + '\n'
+
+    rows_of_file = data[::-1]
+    for start in range(0, n_rows, rows_per_block):
+        block = rows_of_file[start:start + rows_per_block]
+        asc_file.write((row_fmt * len(block)) % tuple(block.ravel().tolist()))
@@ -1,5 +1,26 @@
 #! /usr/bin/env python
-"""Read data from a pickled Landlab grid file into a RasterModelGrid.
+"""Read and write Landlab grids in Landlab's "native" format.
+
+A grid is saved as a directory that holds a JSON header, ``grid.json``,
+and a raw binary file for each array of the grid: the status of its
+nodes, the coordinates of its nodes (for Voronoi grids) and its fields.
+The header describes the grid (its type and the parameters that rebuild
+it) and, for each array, the file that holds it, its data type and its
+shape.
+
+Arrays are written as they are held in memory, so they can be mapped back
+into memory with :class:`numpy.memmap`. Loading a grid is quick no matter
+how large its fields are; values are read from disk as they are used.
+
+A grid that is saved again to the directory it was last saved to (or
+loaded from) need only rewrite the fields that have changed, which makes
+it cheap to checkpoint a long run every few time steps. Fields that have
+been added, removed or replaced are noticed on their own but values that
+are changed in place are not, so the caller names the fields whose values
+have changed (see :func:`save_grid`).
+
+Grids saved with earlier versions of Landlab as pickle files can still be
+read with :func:`load_grid`.
 
 Read Landlab native
 +++++++++++++++++++
@@ -11,23 +32,301 @@ Read Landlab native
     ~landlab.io.native_landlab.save_grid
 """
 
+import json
 import os
+import re
+import uuid
+import weakref
+
+import numpy as np
 from six.moves import cPickle
+
 from landlab import ModelGrid
 
 
-def save_grid(grid, path, clobber=False):
+#: Version of the layout of a native grid directory.
+_FORMAT_VERSION = 1
+
+#: Name of the header file within a native grid directory.
+_HEADER_FILE = 'grid.json'
+
+
+def _grid_path(path):
+    """Path to a saved grid, with a '.grid' suffix.
+
+    Examples
+    --------
+    >>> from landlab.io.native_landlab import _grid_path
+    >>> _grid_path('saved.grid')
+    'saved.grid'
+    >>> _grid_path('saved')
+    'saved.grid'
+    >>> _grid_path('saved.nc')
+    'saved.nc.grid'
+    """
+    (base, ext) = os.path.splitext(path)
+    if ext != '.grid':
+        ext = ext + '.grid'
+    return base + ext
+
+
+def _replace(src, dst):
+    """Rename a file, replacing *dst* if it exists."""
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+#: Arrays of each grid as last saved to, or loaded from, a native grid
+#: directory. For each grid, the directories (by absolute path) with the id
+#: of their save and a weak reference to each array that was saved.
+_SAVES = weakref.WeakKeyDictionary()
+
+
+def _remember_save(grid, path, save_id, arrays):
+    """Remember the arrays of a grid as saved to, or loaded from, *path*."""
+    saves = _SAVES.setdefault(grid, {})
+    saves[os.path.abspath(path)] = (
+        save_id, dict((key, weakref.ref(array))
+                      for key, array in arrays.items()))
+
+
+def _saved_arrays(grid, path, save_id):
+    """Arrays of a grid that hold the values of the save at *path*.
+
+    Returns
+    -------
+    dict
+        Weak references to arrays (by name), or an empty dict if the grid
+        wasn't last saved to, or loaded from, the save with id *save_id*.
+    """
+    try:
+        (last_id, arrays) = _SAVES[grid][os.path.abspath(path)]
+    except KeyError:
+        return {}
+    if last_id != save_id:
+        return {}
+    return arrays
+
+
+def _file_name(key, taken):
+    """Name of the file for the array with name *key*.
+
+    Examples
+    --------
+    >>> from landlab.io.native_landlab import _file_name
+    >>> _file_name('at_node:topographic__elevation', set())
+    'at_node-topographic__elevation.bin'
+    >>> _file_name('at_node:a/b', set(['at_node-a_b.bin']))
+    'at_node-a_b-1.bin'
+    """
+    base = re.sub(r'[^\w.-]', '_', key.replace(':', '-'))
+    name = base + '.bin'
+    count = 0
+    while name in taken:
+        count += 1
+        name = '{base}-{count}.bin'.format(base=base, count=count)
+    return name
+
+
+def _to_json(value):
+    """Convert numpy scalars and arrays in a header for JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError('{value!r} is not JSON serializable'.format(value=value))
+
+
+def _grid_state(grid):
+    """Parameters, arrays and fields that describe a grid.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A Landlab grid.
+
+    Returns
+    -------
+    tuple of dict
+        Parameters needed to rebuild the grid, arrays of the grid (by name)
+        and the units of each field (by group and then name). The arrays of
+        fields are named ``at_<group>:<name>``.
+    """
+    from landlab import (RasterModelGrid, HexModelGrid, RadialModelGrid,
+                         VoronoiDelaunayGrid)
+
+    arrays = {}
+    if type(grid) is RasterModelGrid:
+        params = grid.__getstate__()
+        params.pop('_groups')
+        params.pop('status_at_node')
+        params['origin'] = (grid.node_x[0], grid.node_y[0])
+    elif type(grid) is HexModelGrid:
+        x, y = grid.node_x, grid.node_y
+        if grid.orientation == 'horizontal':
+            base_num_rows = grid._nrows
+            base_num_cols = np.count_nonzero(np.isclose(y, y.min()))
+        else:
+            base_num_cols = grid._ncols
+            base_num_rows = np.count_nonzero(np.isclose(x, x.min()))
+        params = {
+            'type': 'HexModelGrid',
+            'base_num_rows': base_num_rows,
+            'base_num_cols': base_num_cols,
+            'dx': grid._dx,
+            'orientation': grid.orientation,
+            'shape': 'rect' if hasattr(grid, '_shape') else 'hex',
+            'origin': (x[0], y[0]),
+        }
+    elif type(grid) is RadialModelGrid:
+        params = {
+            'type': 'RadialModelGrid',
+            'num_shells': grid.number_of_shells,
+            'dr': grid.spacing_of_shells,
+            'origin': (grid.node_x[0], grid.node_y[0]),
+        }
+    elif type(grid) is VoronoiDelaunayGrid:
+        params = {'type': 'VoronoiDelaunayGrid'}
+        arrays['x_of_node'] = grid.node_x
+        arrays['y_of_node'] = grid.node_y
+    else:
+        raise TypeError('unable to save a {type}'.format(
+            type=type(grid).__name__))
+
+    arrays['status_at_node'] = grid.status_at_node
+
+    units = {}
+    for group in grid._groups:
+        units[group] = {}
+        for name in grid._groups[group].keys():
+            array = np.asanyarray(grid.field_values(group, name))
+            if array.dtype.hasobject:
+                raise ValueError('unable to save field {name} of objects'
+                                 .format(name=name))
+            arrays['at_{group}:{name}'.format(group=group, name=name)] = array
+            units[group][name] = grid.field_units(group, name)
+
+    return params, arrays, units
+
+
+def _grid_from_state(params, arrays, units):
+    """Rebuild a grid from its parameters, arrays and fields.
+
+    Parameters
+    ----------
+    params : dict
+        Parameters of the grid, as from :func:`_grid_state`.
+    arrays : dict
+        Arrays of the grid by name.
+    units : dict
+        Units of the fields of the grid by group and then name.
+
+    Returns
+    -------
+    ModelGrid
+        The rebuilt grid.
+    """
+    from landlab import (RasterModelGrid, HexModelGrid, RadialModelGrid,
+                         VoronoiDelaunayGrid)
+
+    groups = {}
+    for group in units:
+        groups[group] = {}
+        for name in units[group]:
+            groups[group][name] = {
+                'value_array': arrays['at_{group}:{name}'.format(
+                    group=group, name=name)],
+                'units': units[group][name],
+            }
+
+    if params['type'] == 'RasterModelGrid':
+        state = dict(params, status_at_node=arrays['status_at_node'],
+                     _groups=groups)
+        grid = RasterModelGrid.__new__(RasterModelGrid)
+        grid.__setstate__(state)
+    else:
+        if params['type'] == 'HexModelGrid':
+            grid = HexModelGrid(params['base_num_rows'],
+                                params['base_num_cols'], params['dx'],
+                                orientation=params['orientation'],
+                                shape=params['shape'])
+        elif params['type'] == 'RadialModelGrid':
+            grid = RadialModelGrid(num_shells=params['num_shells'],
+                                   dr=params['dr'])
+        elif params['type'] == 'VoronoiDelaunayGrid':
+            grid = VoronoiDelaunayGrid(arrays['x_of_node'],
+                                       arrays['y_of_node'])
+        else:
+            raise ValueError('unknown grid type {type}'.format(
+                type=params['type']))
+
+        grid._node_status[:] = arrays['status_at_node']
+        grid._update_links_nodes_cells_to_new_BCs()
+        for group in groups:
+            for name, field in groups[group].items():
+                grid.add_field(group, name, field['value_array'],
+                               units=field['units'])
+
+    if 'origin' in params:
+        offset = (params['origin'][0] - grid.node_x[0],
+                  params['origin'][1] - grid.node_y[0])
+        if offset != (0., 0.):
+            grid.move_origin(offset)
+
+    return grid
+
+
+def _read_header(path):
+    """Read the header of a native grid directory."""
+    with open(os.path.join(path, _HEADER_FILE), 'r') as fp:
+        return json.load(fp)
+
+
+def _write_array(array, path):
+    """Write an array as raw binary, replacing any existing file.
+
+    The array is first written to a new file that then replaces *path* so
+    that arrays mapped from an existing file are left untouched.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fp:
+        np.ascontiguousarray(array).tofile(fp)
+    _replace(tmp_path, path)
+
+
+def _read_array(path, dtype, shape, mmap_mode):
+    """Read a raw binary array, mapping it into memory if possible."""
+    dtype = np.dtype(dtype)
+    shape = tuple(shape)
+    if mmap_mode is None or len(shape) == 0 or 0 in shape:
+        return np.fromfile(path, dtype=dtype).reshape(shape)
+    else:
+        return np.memmap(path, dtype=dtype, mode=mmap_mode, shape=shape)
+
+
+def save_grid(grid, path, clobber=False, changed=None):
     """Save a grid and fields to a Landlab "native" format.
 
-    This method uses cPickle to save a grid as a cPickle file.
-    All fields will be saved, along with the grid.
+    The grid is saved as a directory that holds a JSON header and a raw
+    binary file for each of the grid's arrays (its node status, node
+    coordinates for Voronoi grids, and its fields). All fields will be
+    saved, along with the grid.
 
     The recommended suffix for the save file is '.grid'. This will
     be added to your save if you don't include it.
 
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
+    If the grid was last saved to, or loaded from, *path*, pass the names
+    of the fields whose values have changed since as *changed* to rewrite
+    only those fields (and any fields that have since been added or
+    replaced). The values of fields are changed in place, so a field that
+    is left out of *changed* is saved as it was, whatever its values. By
+    default, all fields are rewritten. Arrays are written to new files that
+    then replace the old ones, so a grid loaded from *path* may be saved
+    back to it.
 
     Parameters
     ----------
@@ -37,65 +336,156 @@ def save_grid(grid, path, clobber=False):
         Path to output file, either without suffix, or '.grid'
     clobber : bool (default False)
         Set to True to allow overwrites of existing files
+    changed : iterable of str, optional
+        Names of the fields whose values have changed since the grid was
+        last saved to, or loaded from, *path*. A name matches fields of that
+        name in every group.
 
     Examples
     --------
+    >>> import os
+    >>> import numpy as np
     >>> from landlab import RasterModelGrid
     >>> from landlab.io.native_landlab import save_grid
-    >>> import os
-    >>> grid_out = RasterModelGrid(4,5,2.)
-    >>> save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
-    >>> os.remove('testsavedgrid.grid') #to remove traces of this test
+    >>> from landlab.testing.tools import cdtemp
+    >>> grid_out = RasterModelGrid((4, 5), 2.)
+    >>> z = grid_out.add_field('node', 'topographic__elevation',
+    ...                        np.arange(20.), units='m')
+    >>> with cdtemp() as _:
+    ...     save_grid(grid_out, 'testsavedgrid.grid')
+    ...     sorted(os.listdir('testsavedgrid.grid'))
+    ['at_node-topographic__elevation.bin', 'grid.json', 'status_at_node.bin']
     """
+    path = _grid_path(path)
+
     if os.path.exists(path) and not clobber:
         raise ValueError('file exists')
 
     # test it's a grid
     assert issubclass(type(grid), ModelGrid)
 
-    (base, ext) = os.path.splitext(path)
-    if ext != '.grid':
-        ext = ext + '.grid'
-    path = base + ext
+    params, arrays, units = _grid_state(grid)
+
+    previous, saved = {}, {}
+    if os.path.isdir(path):
+        if not os.path.isfile(os.path.join(path, _HEADER_FILE)):
+            raise ValueError('{path}: directory is not a saved grid'.format(
+                path=path))
+        header = _read_header(path)
+        previous = header['arrays']
+        saved = _saved_arrays(grid, path, header.get('id'))
+    elif os.path.exists(path):
+        os.remove(path)
+    if not os.path.isdir(path):
+        os.mkdir(path)
+
+    if changed is not None:
+        changed = set(changed)
+
+    taken = set(info['file'] for info in previous.values())
+    header_arrays = {}
+    for key in sorted(arrays):
+        array = arrays[key]
+        info = {
+            'dtype': array.dtype.str,
+            'shape': array.shape,
+        }
+
+        old = previous.get(key)
+        if old is not None:
+            info['file'] = old['file']
+        else:
+            info['file'] = _file_name(key, taken)
+            taken.add(info['file'])
+
+        if ':' in key:
+            is_dirty = changed is None or key.split(':', 1)[1] in changed
+        else:
+            is_dirty = True
+        if (is_dirty or key not in saved or saved[key]() is not array or
+                [old['dtype'], old['shape']] !=
+                [info['dtype'], list(info['shape'])] or
+                not os.path.isfile(os.path.join(path, info['file']))):
+            _write_array(array, os.path.join(path, info['file']))
 
-    with open(path, 'wb') as file_like:
-        cPickle.dump(grid, file_like)
+        header_arrays[key] = info
 
+    header = {
+        'format': 'landlab',
+        'version': _FORMAT_VERSION,
+        'id': uuid.uuid4().hex,
+        'grid': params,
+        'arrays': header_arrays,
+        'units': units,
+    }
+    tmp_path = os.path.join(path, _HEADER_FILE + '.tmp')
+    with open(tmp_path, 'w') as fp:
+        json.dump(header, fp, default=_to_json, indent=2, sort_keys=True)
+    _replace(tmp_path, os.path.join(path, _HEADER_FILE))
+    _remember_save(grid, path, header['id'], arrays)
 
-def load_grid(path):
+    for key in set(previous) - set(header_arrays):
+        try:
+            os.remove(os.path.join(path, previous[key]['file']))
+        except OSError:
+            pass
+
+
+def load_grid(path, mmap_mode='c'):
     """Load a grid and its fields from a Landlab "native" format.
 
-    This method uses cPickle to load a saved grid.
-    It assumes you saved using vmg.save() or save_grid, i.e., that the
-    pickle file is a .grid file.
+    The arrays of the grid are mapped into memory with
+    :class:`numpy.memmap` rather than read, so that the grid loads
+    quickly and the values of fields are only read from disk as they are
+    used. By default, the arrays are mapped copy-on-write: the fields of
+    the grid can be changed without changing the saved grid.
 
-    Caution: Pickling can be slow, and can produce very large files.
-    Caution 2: Future updates to Landlab could potentially render old
-    saves unloadable.
+    Grids saved as pickle files by earlier versions of Landlab can also
+    be loaded.
 
     Parameters
     ----------
     path : str
         Path to output file, either without suffix, or '.grid'
+    mmap_mode : {'c', 'r', 'r+', None}, optional
+        Mode used to map arrays into memory (see :class:`numpy.memmap`). If
+        ``None``, read the arrays into memory.
 
     Examples
     --------
     >>> from landlab import VoronoiDelaunayGrid
     >>> from landlab.io.native_landlab import load_grid, save_grid
+    >>> from landlab.testing.tools import cdtemp
     >>> import numpy as np
-    >>> import os
     >>> x = np.random.rand(20)
     >>> y = np.random.rand(20)
     >>> grid_out = VoronoiDelaunayGrid(x, y)
-    >>> save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
-    >>> grid_in = load_grid('testsavedgrid.grid')
-    >>> os.remove('testsavedgrid.grid') #to remove traces of this test
+    >>> with cdtemp() as _:
+    ...     save_grid(grid_out, 'testsavedgrid.grid', clobber=True)
+    ...     grid_in = load_grid('testsavedgrid.grid')
+    >>> np.all(grid_in.node_x == grid_out.node_x)
+    True
     """
-    (base, ext) = os.path.splitext(path)
-    if ext != '.grid':
-        ext = ext + '.grid'
-    path = base + ext
-    with open(path, 'rb') as file_like:
-        loaded_grid = cPickle.load(file_like)
-    assert issubclass(type(loaded_grid), ModelGrid)
-    return loaded_grid
+    path = _grid_path(path)
+
+    if os.path.isfile(path):
+        with open(path, 'rb') as file_like:
+            loaded_grid = cPickle.load(file_like)
+        assert issubclass(type(loaded_grid), ModelGrid)
+        return loaded_grid
+
+    header = _read_header(path)
+    if header.get('format') != 'landlab' or (
+            header.get('version', 0) > _FORMAT_VERSION):
+        raise ValueError('{path}: not a Landlab grid that can be read'.format(
+            path=path))
+
+    arrays = {}
+    for key, info in header['arrays'].items():
+        arrays[key] = _read_array(os.path.join(path, info['file']),
+                                  info['dtype'], info['shape'], mmap_mode)
+
+    grid = _grid_from_state(header['grid'], arrays, header['units'])
+    _remember_save(grid, path, header.get('id'), _grid_state(grid)[1])
+
+    return grid
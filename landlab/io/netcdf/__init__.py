@@ -3,6 +3,8 @@ import os
 from .read import read_netcdf
 from .write import write_netcdf
 from .write import write_raster_netcdf
+from .time_series import NetcdfTimeSeriesWriter
+from ._lock import NETCDF_LOCK
 
 from .errors import NotRasterGridError
 
@@ -20,6 +22,7 @@ NETCDF4_EXAMPLE_FILE = os.path.join(os.path.dirname(__file__), 'tests', 'data',
 NETCDF3_64BIT_EXAMPLE_FILE = os.path.join(os.path.dirname(__file__), 'tests',
                                           'data', 'test-netcdf3-64bit.nc')
 
-__all__ = ('read_netcdf', 'write_netcdf', 'NotRasterGridError',
+__all__ = ('read_netcdf', 'write_netcdf', 'NetcdfTimeSeriesWriter',
+           'NotRasterGridError', 'NETCDF_LOCK',
            'WITH_NETCDF4', 'NETCDF4_EXAMPLE_FILE',
            'NETCDF3_64BIT_EXAMPLE_FILE')
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+"""Serialize calls into the netCDF library.
+
+The netCDF-C and HDF5 libraries that netCDF4 wraps are not thread-safe,
+even for different files. Every call into them from landlab, including
+those of a :class:`~landlab.io.netcdf.time_series.NetcdfTimeSeriesWriter`
+that writes from a background thread, is made while holding
+:data:`NETCDF_LOCK`.
+"""
+import threading
+from functools import wraps
+
+
+#: Lock held around calls into the netCDF library. It is re-entrant so that
+#: functions that hold it may call one another.
+NETCDF_LOCK = threading.RLock()
+
+
+def with_netcdf_lock(func):
+    """Decorate a function so that it runs while holding the netCDF lock."""
+    @wraps(func)
+    def _wrapped(*args, **kwds):
+        with NETCDF_LOCK:
+            return func(*args, **kwds)
+    return _wrapped
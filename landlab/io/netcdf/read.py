@@ -10,6 +10,8 @@ Read netcdf
     ~landlab.io.netcdf.read.read_netcdf
 """
 
+import os
+
 try:
     import netCDF4 as nc4
 except ImportError:
@@ -19,11 +21,13 @@ except ImportError:
 from scipy.io import netcdf as nc
 
 import numpy as np
+import six
 
 from landlab.io.netcdf.errors import NotRasterGridError
 from landlab.io.netcdf._constants import (_AXIS_DIMENSION_NAMES,
                                           _AXIS_COORDINATE_NAMES,
                                           _COORDINATE_NAMES)
+from landlab.io.netcdf._lock import with_netcdf_lock
 
 
 def _length_of_axis_dimension(root, axis_name):
@@ -69,26 +73,78 @@ def _read_netcdf_grid_shape(root):
     return tuple(shape)
 
 
-def _read_netcdf_coordinate_values(root):
-    """Get arrays of coordinates for grid points.
+def _read_netcdf_window(window, shape):
+    """Slices of the rows and columns of a window into a grid.
+
+    Parameters
+    ----------
+    window : tuple of tuple of int, or None
+        Rows and columns of the window as
+        ``((start_row, stop_row), (start_col, stop_col))``. If ``None``,
+        the window is the entire grid.
+    shape : tuple of int
+        Number of rows and columns of the grid.
+
+    Returns
+    -------
+    tuple of slice
+        Rows and columns of the window.
+
+    Examples
+    --------
+    >>> from landlab.io.netcdf.read import _read_netcdf_window
+    >>> _read_netcdf_window(None, (4, 3))
+    (slice(0, 4, None), slice(0, 3, None))
+    >>> _read_netcdf_window(((1, 3), (0, 2)), (4, 3))
+    (slice(1, 3, None), slice(0, 2, None))
+    >>> _read_netcdf_window(((0, 5), (1, 3)), (4, 3))
+    Traceback (most recent call last):
+    ...
+    ValueError: window is outside of the grid
+    """
+    if window is None:
+        return (slice(0, shape[0]), slice(0, shape[1]))
+
+    ((row_start, row_stop), (col_start, col_stop)) = window
+    if not (0 <= row_start < row_stop <= shape[0] and
+            0 <= col_start < col_stop <= shape[1]):
+        raise ValueError('window is outside of the grid')
+
+    return (slice(row_start, row_stop), slice(col_start, col_stop))
+
+
+def _read_netcdf_coordinate_values(root, rows, cols):
+    """Get node coordinates within a window of a structured grid.
+
+    Coordinates are either given for every node, as variables with
+    dimensions *(nj, ni)*, or, for rasters, for every row and column, as
+    variables with dimensions *(nj, )* and *(ni, )*.
 
     Parameters
     ----------
     root : netcdf_file
         A NetCDF file.
+    rows, cols : slice
+        Rows and columns of the window.
 
     Returns
     -------
-    tuple of ndarray
-        Node coordinates for each dimension.
+    (y, x) : tuple of ndarray
+        Node coordinates with the shape of the window.
     """
-    values = []
-    for coordinate_name in _AXIS_COORDINATE_NAMES:
-        try:
-            values.append(root.variables[coordinate_name][:].copy())
-        except KeyError:
-            pass
-    return tuple(values)
+    n_dims = (len(root.variables['y'].dimensions),
+              len(root.variables['x'].dimensions))
+
+    if n_dims == (2, 2):
+        return (np.array(root.variables['y'][rows, cols]),
+                np.array(root.variables['x'][rows, cols]))
+    elif n_dims == (1, 1):
+        return tuple(np.meshgrid(np.array(root.variables['y'][rows]),
+                                 np.array(root.variables['x'][cols]),
+                                 indexing='ij'))
+    else:
+        raise ValueError('x and y dimensions must both either be 2D '
+                         '(nj, ni) or 1D (ni,) and (nj).')
 
 
 def _read_netcdf_coordinate_units(root):
@@ -113,78 +169,132 @@ def _read_netcdf_coordinate_units(root):
     return tuple(units)
 
 
-def _read_netcdf_structured_grid(root):
-    """Get node coordinates for a structured grid.
+def _read_netcdf_structured_data(root, names=None, time=-1,
+                                 rows=slice(None), cols=slice(None),
+                                 mmap_mode=None):
+    """Get data values within a window of a structured grid.
 
     Parameters
     ----------
     root : netcdf_file
         A NetCDF file.
+    names : iterable of str, optional
+        Names of the variables to read. If not given, read all variables
+        defined at the grid nodes.
+    time : int, optional
+        Index of the time slice to read from variables that have a time
+        dimension.
+    rows, cols : slice, optional
+        Rows and columns of the window.
+    mmap_mode : {None, 'c', 'r'}, optional
+        Memory-map the values of netcdf3 files with this mode, if they
+        are contiguous in the file, otherwise read them into memory.
 
     Returns
     -------
-    tuple of ndarray
-        Node coordinates for each dimension reshaped to match the shape
-        of the grid.
+    dict
+        Data values, flattened to have one value per node of the window.
+        Keys are the variable names as read from the NetCDF file.
     """
-    shape = _read_netcdf_grid_shape(root)
-    coordinates = _read_netcdf_coordinate_values(root)
-    units = _read_netcdf_coordinate_units(root)
+    if names is None:
+        names = [name for name in root.variables
+                 if name not in _COORDINATE_NAMES and
+                 root.variables[name].dimensions[-2:] == ('nj', 'ni')]
+    else:
+        missing = set(names) - set(root.variables)
+        if missing:
+            raise ValueError(
+                'variables not found in file ({names})'.format(
+                    names=', '.join(sorted(missing))))
 
-    for coordinate in coordinates:
-        coordinate.shape = shape
+    mapped = None
+    fields = dict()
+    for name in names:
+        index = _read_netcdf_index(root, name, time, rows, cols)
+        if isinstance(root, nc.netcdf_file):
+            values = root.variables[name].data[index]
+            offset = None
+            if mmap_mode is not None and values.flags.c_contiguous:
+                offset = _netcdf3_offset(root, values)
+            if offset is not None:
+                if mapped is None:
+                    mapped = np.memmap(root.filename, dtype=np.uint8,
+                                       mode=mmap_mode)
+                fields[name] = np.ndarray(values.shape, dtype=values.dtype,
+                                          buffer=mapped, offset=offset)
+            else:
+                fields[name] = np.array(values)
+            del values
+        else:
+            fields[name] = np.asarray(root.variables[name][index])
+        fields[name].shape = (fields[name].size, )
+
+    return fields
 
-    return coordinates
 
-def _read_netcdf_raster_structured_grid(root):
-    """Get node coordinates for a structured grid written as a raster.
+def _read_netcdf_index(root, name, time, rows, cols):
+    """Index of the values of a variable within a window and time slice.
 
     Parameters
     ----------
     root : netcdf_file
         A NetCDF file.
+    name : str
+        Name of a variable defined at grid nodes.
+    time : int
+        Index of the time slice, if the variable has a time dimension.
+    rows, cols : slice
+        Rows and columns of the window.
 
     Returns
     -------
-    tuple of ndarray
-        Node coordinates for each dimension reshaped to match the shape
-        of the grid.
+    tuple
+        Index into the values of the variable.
     """
-    shape = _read_netcdf_grid_shape(root)
-    coordinates = _read_netcdf_coordinate_values(root)
-    units = _read_netcdf_coordinate_units(root)
-    
-    if len(coordinates) != 2:
-        assert ValueError('Rasters must have only two spatial coordinate dimensions')
+    dimensions = root.variables[name].dimensions
+    if dimensions[-2:] != ('nj', 'ni'):
+        raise ValueError(
+            '{name}: values are not defined at nodes'.format(name=name))
+
+    if dimensions[0] == 'nt':
+        n_times = root.variables[name].shape[0]
+        if not - n_times <= time < n_times:
+            raise ValueError(
+                '{name}: time index out of range'.format(name=name))
+        return (time, rows, cols)
     else:
-        coordinates = np.meshgrid(coordinates[0], coordinates[1], indexing='ij')
-        
-    for coordinate in coordinates:
-        coordinate.shape = shape
+        return (rows, cols)
 
-    return coordinates
 
+def _netcdf3_offset(root, values):
+    """Find where values of a netcdf3 file that is open with *mmap* start.
 
-def _read_netcdf_structured_data(root):
-    """Get data values for a structured grid.
+    The values of netcdf3 files opened with ``mmap=True`` are read-only
+    views of an array that holds the whole file. Find that array, the
+    last of the arrays that *values* is a view of, and the offset of
+    *values* from its start.
 
     Parameters
     ----------
     root : netcdf_file
-        A NetCDF file.
+        A NetCDF file opened with ``mmap=True``.
+    values : ndarray
+        Contiguous values of a variable of *root*.
 
     Returns
     -------
-    dict
-        Data values, reshaped to match that of the grid. Keys are the
-        variable names as read from the NetCDF file.
+    int or None
+        Offset of the values in the file, in bytes, or ``None`` if they
+        aren't a view of the whole file.
     """
-    fields = dict()
-    for (name, var) in root.variables.items():
-        if name not in _COORDINATE_NAMES:
-            fields[name] = var[:].copy()
-            fields[name].shape = (fields[name].size, )
-    return fields
+    whole_file = values
+    while isinstance(whole_file.base, np.ndarray):
+        whole_file = whole_file.base
+    if (whole_file is values or
+            whole_file.nbytes != os.path.getsize(root.filename)):
+        return None
+
+    return np.byte_bounds(values)[0] - np.byte_bounds(whole_file)[0]
 
 
 def _get_raster_spacing(coords):
@@ -214,7 +324,9 @@ def _get_raster_spacing(coords):
     return spacing[0]
 
 
-def read_netcdf(nc_file, just_grid=False):
+@with_netcdf_lock
+def read_netcdf(nc_file, just_grid=False, names=None, time=-1, window=None,
+                mmap_mode=None):
     """Create a :class:`~.RasterModelGrid` from a netcdf file.
 
     Create a new :class:`~.RasterModelGrid` from the netcdf file, *nc_file*.
@@ -222,12 +334,39 @@ def read_netcdf(nc_file, just_grid=False):
     To create a new grid without any associated data from the netcdf file,
     set the *just_grid* keyword to ``True``.
 
+    Only the values that are asked for are read: the variables given as
+    *names*, at one time slice, within a *window* of the grid. With
+    *mmap_mode*, the values of netcdf3 files are not read at all, but are
+    memory-mapped from the file so that they are read only as they are
+    used. Values that are not contiguous in the file, such as those of a
+    window narrower than the grid, and the values of netcdf4 files are
+    always read into memory.
+
+    Mapped values depend on the file for as long as the grid uses them.
+    If the file is truncated, using them kills the process with a bus
+    error and, on Windows, the file can't be deleted.
+
     Parameters
     ----------
     nc_file : str
         Name of a netcdf file.
     just_grid : boolean, optional
         Create a new grid but don't add value data.
+    names : str or iterable of str, optional
+        Names of the variables to add as fields. If not given, add all
+        variables defined at the grid nodes.
+    time : int, optional
+        Index of the time slice to read from variables that have a time
+        dimension. The default is the last time slice.
+    window : tuple of tuple of int, optional
+        Read only the rectangle of nodes given as
+        ``((start_row, stop_row), (start_col, stop_col))``. Rows are counted
+        from the bottom of the grid and stops are not included.
+    mmap_mode : {None, 'c', 'r'}, optional
+        Mode used to memory-map the values of netcdf3 files (see
+        :class:`numpy.memmap`). Use ``'c'`` (copy-on-write) so that
+        changing the values leaves the file untouched. If ``None``, the
+        default, read the values into memory.
 
     Returns
     -------
@@ -267,38 +406,42 @@ def read_netcdf(nc_file, just_grid=False):
     True
     >>> grid.dy, grid.dx
     (1.0, 1.0)
+
+    Read the lower three rows of the grid.
+
+    >>> grid = read_netcdf(NETCDF4_EXAMPLE_FILE, window=((0, 3), (0, 3)))
+    >>> grid.shape == (3, 3)
+    True
+    >>> grid.at_node['surface__elevation']
+    array([ 0.,  1.,  2.,  3.,  4.,  5.,  6.,  7.,  8.])
     """
     from landlab import RasterModelGrid
 
+    if isinstance(names, six.string_types):
+        names = (names, )
+
     try:
-        root = nc.netcdf_file(nc_file, 'r', version=2)
+        root = nc.netcdf_file(nc_file, 'r', version=2, mmap=True)
     except TypeError:
         root = nc4.Dataset(nc_file, 'r', format='NETCDF4')
+        root.set_auto_mask(False)
 
     try:
-        node_coords = _read_netcdf_structured_grid(root)
-    except ValueError:
-        if ((len(root.variables['x'].dimensions) == 1) and 
-            (len(root.variables['y'].dimensions) ==1)):
-            
-            node_coords = _read_netcdf_raster_structured_grid(root)
-        else:
-            assert ValueError('x and y dimensions must both either be 2D '
-                              '(nj, ni) or 1D (ni,) and (nj).')
-            
-    assert len(node_coords) == 2
-
-    spacing = _get_raster_spacing(node_coords)
-
-    shape = node_coords[0].shape
-
-    grid = RasterModelGrid(shape, spacing=spacing)
-
-    if not just_grid:
-        fields = _read_netcdf_structured_data(root)
-        for (name, values) in fields.items():
-            grid.add_field('node', name, values)
-
-    root.close()
+        (rows, cols) = _read_netcdf_window(window,
+                                           _read_netcdf_grid_shape(root))
+        node_coords = _read_netcdf_coordinate_values(root, rows, cols)
+
+        spacing = _get_raster_spacing(node_coords)
+
+        grid = RasterModelGrid(node_coords[0].shape, spacing=spacing)
+
+        if not just_grid:
+            fields = _read_netcdf_structured_data(
+                root, names=names, time=time, rows=rows, cols=cols,
+                mmap_mode=mmap_mode)
+            for (name, values) in fields.items():
+                grid.add_field('node', name, values)
+    finally:
+        root.close()
 
     return grid
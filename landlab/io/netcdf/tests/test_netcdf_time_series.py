@@ -0,0 +1,175 @@
+#! /usr/bin/env python
+"""Unit tests for landlab.io.netcdf.time_series module."""
+
+import time
+
+import numpy as np
+from nose.tools import assert_equal, assert_true, assert_raises
+from nose import SkipTest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.io.netcdf import NetcdfTimeSeriesWriter, WITH_NETCDF4
+from landlab.testing.tools import cdtemp
+
+try:
+    import netCDF4 as nc
+except ImportError:
+    pass
+
+
+def _write_time_series(path, grid, n_times, **kwds):
+    """Write a time series while changing the elevations."""
+    z = grid.at_node['topographic__elevation']
+    expected = []
+    with NetcdfTimeSeriesWriter(path, grid, **kwds) as writer:
+        for time in range(n_times):
+            z[:] = np.arange(grid.number_of_nodes) + time
+            expected.append(z.reshape(grid.shape).copy())
+            writer.write(time=time * .5)
+    return np.array(expected)
+
+
+def test_time_series():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    for background in (True, False):
+        for format in ('NETCDF4', 'NETCDF3_64BIT'):
+            grid = RasterModelGrid((4, 5))
+            grid.add_zeros('node', 'topographic__elevation')
+            with cdtemp() as _:
+                expected = _write_time_series('test.nc', grid, 23,
+                                              buffer_size=5, format=format,
+                                              background=background)
+                root = nc.Dataset('test.nc')
+                assert_array_equal(root.variables['t'][:],
+                                   np.arange(23) * .5)
+                assert_array_equal(
+                    root.variables['topographic__elevation'][:], expected)
+                assert_array_equal(root.variables['x'][:],
+                                   grid.node_x.reshape(grid.shape))
+                root.close()
+
+
+def test_compression_and_chunking():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    with cdtemp() as _:
+        expected = _write_time_series('test.nc', grid, 7, zlib=True,
+                                      complevel=6, chunksizes=(2, 2, 5))
+        root = nc.Dataset('test.nc')
+        var = root.variables['topographic__elevation']
+        assert_equal(var.chunking(), [2, 2, 5])
+        assert_true(var.filters()['zlib'])
+        assert_equal(var.filters()['complevel'], 6)
+        assert_array_equal(var[:], expected)
+        root.close()
+
+
+def test_compression_requires_netcdf4():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    with cdtemp() as _:
+        assert_raises(ValueError, NetcdfTimeSeriesWriter, 'test.nc', grid,
+                      format='NETCDF3_64BIT', zlib=True)
+        assert_raises(ValueError, NetcdfTimeSeriesWriter, 'test.nc', grid,
+                      chunksizes=(4, 5))
+        assert_raises(ValueError, NetcdfTimeSeriesWriter, 'test.nc', grid,
+                      buffer_size=0)
+
+
+def test_append():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    grid = RasterModelGrid((4, 5))
+    z = grid.add_zeros('node', 'topographic__elevation')
+    with cdtemp() as _:
+        with NetcdfTimeSeriesWriter('test.nc', grid) as writer:
+            writer.write()
+            writer.write()
+        z += 1.
+        with NetcdfTimeSeriesWriter('test.nc', grid, append=True) as writer:
+            assert_equal(writer.number_of_times, 2)
+            writer.write()
+
+        root = nc.Dataset('test.nc')
+        assert_array_equal(root.variables['t'][:], [0., 1., 2.])
+        assert_array_equal(
+            root.variables['topographic__elevation'][:, 0, 0], [0., 0., 1.])
+        root.close()
+
+
+def test_write_at_cells():
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('cell', 'air__temperature', np.arange(6.))
+    with cdtemp() as _:
+        with NetcdfTimeSeriesWriter('test.nc', grid, at='cell',
+                                    buffer_size=2) as writer:
+            for _ in range(3):
+                writer.write()
+                grid.at_cell['air__temperature'] *= 2.
+
+        root = nc.Dataset('test.nc')
+        assert_array_equal(root.variables['air__temperature'][:],
+                           [np.arange(6.).reshape((2, 3)) * 2 ** n
+                            for n in range(3)])
+        root.close()
+
+
+def test_write_after_close():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    with cdtemp() as _:
+        writer = NetcdfTimeSeriesWriter('test.nc', grid)
+        writer.close()
+        writer.close()
+        assert_raises(ValueError, writer.write)
+
+
+def test_background_error_is_raised():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+    with cdtemp() as _:
+        writer = NetcdfTimeSeriesWriter('test.nc', grid, buffer_size=1)
+
+        def fail(buffer):
+            raise IOError('disk is full')
+        writer._write_buffer = fail
+
+        writer.write()
+        assert_raises(IOError, writer.close)
+
+
+def test_failed_write_is_permanent():
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros('node', 'topographic__elevation')
+
+    def fail(buffer):
+        raise IOError('disk is full')
+
+    for background in (True, False):
+        written = []
+        with cdtemp() as _:
+            writer = NetcdfTimeSeriesWriter('test.nc', grid, buffer_size=1,
+                                            background=background)
+            writer._write_buffer = fail
+            if background:
+                writer.write()
+                while writer._error is None:
+                    time.sleep(.01)
+            else:
+                assert_raises(IOError, writer.write)
+
+            writer._write_buffer = written.append
+            assert_raises(IOError, writer.write)
+            assert_raises(IOError, writer.flush)
+            assert_raises(IOError, writer.close)
+            assert_equal(written, [])
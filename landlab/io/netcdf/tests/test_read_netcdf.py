@@ -2,10 +2,16 @@
 """Unit tests for landlab.io.netcdf module."""
 
 import os
-from nose.tools import assert_equal
+
+import numpy as np
+from nose.tools import assert_equal, assert_true, assert_false, assert_raises
 from nose.plugins.skip import SkipTest
+from numpy.testing import assert_array_equal
 
-from landlab.io.netcdf import read_netcdf, WITH_NETCDF4
+from landlab import RasterModelGrid
+from landlab.io.netcdf import (read_netcdf, NetcdfTimeSeriesWriter,
+                               WITH_NETCDF4)
+from landlab.testing.tools import cdtemp
 
 
 _TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
@@ -24,3 +30,98 @@ def test_read_netcdf4():
 
     grid = read_netcdf(os.path.join(_TEST_DATA_DIR, 'test-netcdf4.nc'))
     assert_equal(grid.shape, (4, 3))
+
+
+def _write_time_series(path, format):
+    """Write five time slices of two fields of a 6 by 5 grid."""
+    grid = RasterModelGrid((6, 5), spacing=2.)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    h = grid.add_zeros('node', 'water__depth')
+    with NetcdfTimeSeriesWriter(path, grid, format=format) as writer:
+        for time in range(5):
+            z[:] = np.arange(30.) + 100. * time
+            h[:] = - z
+            writer.write()
+
+
+def test_read_time_slice():
+    """Test read_netcdf of one time slice of each field."""
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    for format in ('NETCDF3_64BIT', 'NETCDF4'):
+        with cdtemp() as _:
+            _write_time_series('test.nc', format)
+
+            grid = read_netcdf('test.nc')
+            assert_equal(grid.shape, (6, 5))
+            assert_equal(grid.dx, 2.)
+            assert_array_equal(grid.at_node['topographic__elevation'],
+                               np.arange(30.) + 400.)
+            assert_array_equal(grid.at_node['water__depth'],
+                               - (np.arange(30.) + 400.))
+
+            grid = read_netcdf('test.nc', time=1)
+            assert_array_equal(grid.at_node['topographic__elevation'],
+                               np.arange(30.) + 100.)
+            assert_array_equal(grid.at_node['water__depth'],
+                               - (np.arange(30.) + 100.))
+
+            assert_raises(ValueError, read_netcdf, 'test.nc', time=5)
+
+
+def test_read_names():
+    """Test read_netcdf of just some fields."""
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    with cdtemp() as _:
+        _write_time_series('test.nc', 'NETCDF3_64BIT')
+
+        grid = read_netcdf('test.nc', names='water__depth')
+        assert_equal(list(grid.at_node.keys()), ['water__depth'])
+
+        assert_raises(ValueError, read_netcdf, 'test.nc',
+                      names=['water__depth', 'not_a_field'])
+
+
+def test_read_window():
+    """Test read_netcdf of a window of the grid."""
+    if not WITH_NETCDF4:
+        raise SkipTest('netCDF4 package not installed')
+
+    expected = (np.arange(30.) + 400.).reshape((6, 5))
+    for format in ('NETCDF3_64BIT', 'NETCDF4'):
+        with cdtemp() as _:
+            _write_time_series('test.nc', format)
+
+            for window in (((1, 5), (1, 4)), ((2, 5), (0, 5))):
+                grid = read_netcdf('test.nc', window=window)
+                rows, cols = slice(*window[0]), slice(*window[1])
+                assert_equal(grid.shape, expected[rows, cols].shape)
+                assert_array_equal(grid.at_node['topographic__elevation'],
+                                   expected[rows, cols].flat)
+
+            assert_raises(ValueError, read_netcdf, 'test.nc',
+                          window=((0, 7), (0, 5)))
+
+
+def test_read_netcdf3_is_mapped():
+    """Test that values of netcdf3 files can be mapped copy-on-write."""
+    with cdtemp() as _:
+        _write_time_series('test.nc', 'NETCDF3_64BIT')
+
+        grid = read_netcdf('test.nc', mmap_mode='c')
+        z = grid.at_node['topographic__elevation']
+        assert_true(isinstance(z.base, np.memmap))
+        assert_array_equal(z, read_netcdf('test.nc').at_node[
+            'topographic__elevation'])
+
+        z[0] = -1.
+        assert_equal(
+            read_netcdf('test.nc').at_node['topographic__elevation'][0],
+            400.)
+
+        grid = read_netcdf('test.nc')
+        assert_false(isinstance(
+            grid.at_node['topographic__elevation'].base, np.memmap))
@@ -0,0 +1,362 @@
+#! /usr/bin/env python
+"""Write a time series of landlab fields to a NetCDF file.
+
+Write netcdf time series
+++++++++++++++++++++++++
+
+.. autosummary::
+    :toctree: generated/
+
+    ~landlab.io.netcdf.time_series.NetcdfTimeSeriesWriter
+"""
+
+import os
+import sys
+import threading
+import warnings
+
+import numpy as np
+import six
+from six.moves import queue
+
+try:
+    import netCDF4 as nc4
+except ImportError:
+    warnings.warn('Unable to import netCDF4.', ImportWarning)
+
+from landlab.io.netcdf._constants import _NP_TO_NC_TYPE
+from landlab.io.netcdf._lock import NETCDF_LOCK
+from landlab.io.netcdf.write import (_VALID_NETCDF_FORMATS,
+                                     _guess_at_location,
+                                     _get_dimension_names,
+                                     _set_netcdf_attributes,
+                                     _set_netcdf_structured_dimensions,
+                                     _set_netcdf_cell_structured_dimensions,
+                                     _add_spatial_variables,
+                                     _add_cell_spatial_variables)
+
+
+class _TimeSliceBuffer(object):
+
+    """Time slices of field values waiting to be written."""
+
+    def __init__(self, n_slices, fields):
+        self.times = np.empty(n_slices, dtype=float)
+        self.values = dict()
+        for (name, (dtype, shape)) in fields.items():
+            self.values[name] = np.empty((n_slices, ) + shape, dtype=dtype)
+        self.start = 0
+        self.size = 0
+
+    def is_full(self):
+        return self.size == len(self.times)
+
+
+class NetcdfTimeSeriesWriter(object):
+
+    """Write a time series of landlab fields to a NetCDF file.
+
+    :func:`~landlab.io.netcdf.write.write_netcdf` opens, describes and
+    closes its file for every time slice it writes. A
+    :class:`NetcdfTimeSeriesWriter` instead keeps its file open, defines the
+    grid only once, and holds *buffer_size* time slices in memory before
+    writing them in a single operation. Unless *background* is ``False``,
+    slices are written by a separate thread so that a model loop does not
+    wait on the disk. Two buffers are used in turn: :meth:`write` only
+    blocks if both are waiting to be written. The netCDF library is not
+    thread-safe, so the thread holds a lock, shared with all of the
+    netCDF functions of landlab, while it writes. Other threads that call
+    netCDF4 directly while a writer is open must hold
+    :data:`landlab.io.netcdf.NETCDF_LOCK` too.
+
+    If writing time slices fails, the writer fails for good: that write
+    and every later one raises the error.
+
+    The file has the same layout as one written by
+    :func:`~landlab.io.netcdf.write.write_netcdf` with an unlimited time
+    dimension, ``nt``, and a time variable, ``t``.
+
+    Parameters
+    ----------
+    path : str
+        Path to output file.
+    fields : field-like
+        Landlab field object that holds a grid and associated values.
+    names : iterable of str, optional
+        Names of the fields to include in the netcdf file. If not provided,
+        write all fields.
+    at : {'node', 'cell'}, optional
+        The location where values are defined.
+    attrs : dict, optional
+        Attributes to add to netcdf file.
+    format : {'NETCDF4', 'NETCDF4_CLASSIC', 'NETCDF3_64BIT', 'NETCDF3_CLASSIC'}
+        Format of output netcdf file.
+    append : boolean, optional
+        Append time slices to an existing file, otherwise clobber the file.
+    buffer_size : int, optional
+        Number of time slices to hold in memory before writing them.
+    chunksizes : tuple of int, optional
+        Chunk shape (including the time dimension) of the field variables of
+        NETCDF4 files. The default is one time slice per chunk.
+    zlib : boolean, optional
+        Compress the field variables of NETCDF4 files.
+    complevel : int, optional
+        Compression level, from 1 to 9, used if *zlib* is ``True``.
+    shuffle : boolean, optional
+        Apply the HDF5 shuffle filter before compressing.
+    time_units : str, optional
+        Units of time values.
+    reference : str, optional
+        Reference time.
+    background : boolean, optional
+        Write time slices from a separate thread.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.netcdf import NetcdfTimeSeriesWriter
+    >>> from landlab.testing.tools import cdtemp
+
+    >>> rmg = RasterModelGrid(4, 3)
+    >>> z = rmg.add_zeros('node', 'topographic__elevation')
+
+    Write ten time slices that are held in memory five at a time.
+
+    >>> with cdtemp() as _:
+    ...     with NetcdfTimeSeriesWriter('test.nc', rmg, buffer_size=5,
+    ...                                 zlib=True) as writer:
+    ...         for time in range(10):
+    ...             z += 1.
+    ...             writer.write(time=time * 100.)
+    ...     import netCDF4
+    ...     root = netCDF4.Dataset('test.nc')
+    ...     root.variables['t'][:].tolist()
+    ...     root.variables['topographic__elevation'][:, 2, 1].tolist()
+    ...     root.close()
+    [0.0, 100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0, 800.0, 900.0]
+    [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+    """
+
+    def __init__(self, path, fields, names=None, at=None, attrs=None,
+                 format='NETCDF4', append=False, buffer_size=10,
+                 chunksizes=None, zlib=False, complevel=4, shuffle=True,
+                 time_units='days', reference='00:00:00 UTC',
+                 background=True):
+        if format not in _VALID_NETCDF_FORMATS:
+            raise ValueError('format not understood')
+        if at not in (None, 'cell', 'node'):
+            raise ValueError('value location not understood')
+        if buffer_size < 1:
+            raise ValueError('buffer size must be at least 1')
+        if format.startswith('NETCDF3') and (zlib or chunksizes):
+            raise ValueError('chunking and compression require NETCDF4')
+
+        if isinstance(names, six.string_types):
+            names = (names, )
+
+        at = at or _guess_at_location(fields, names) or 'node'
+        names = tuple(names or fields[at].keys())
+
+        if not set(fields[at].keys()).issuperset(names):
+            raise ValueError(
+                'values must be on either cells or nodes, not both')
+
+        if at == 'node':
+            shape = tuple(fields.shape)
+        else:
+            shape = tuple(dim - 2 for dim in fields.shape)
+
+        if chunksizes is None:
+            chunksizes = (1, ) + shape
+        elif len(chunksizes) != len(shape) + 1:
+            raise ValueError('chunk shape must include the time dimension')
+
+        self._fields = fields
+        self._at = at
+        self._names = names
+        self._shape = shape
+
+        with NETCDF_LOCK:
+            self._root = self._open(path, format, append, attrs or {})
+            self._define(time_units, reference, zlib=zlib,
+                         complevel=complevel, shuffle=shuffle,
+                         chunksizes=chunksizes)
+            self._n_times = len(self._root.dimensions['nt'])
+
+        buffered = dict()
+        for name in names:
+            buffered[name] = (fields[at][name].dtype, shape)
+
+        self._free = queue.Queue()
+        for _ in range(2):
+            self._free.put(_TimeSliceBuffer(buffer_size, buffered))
+        self._buffer = None
+        self._error = None
+        self._closed = False
+
+        if background:
+            self._pending = queue.Queue()
+            self._thread = threading.Thread(target=self._write_pending)
+            self._thread.daemon = True
+            self._thread.start()
+        else:
+            self._thread = None
+
+    @property
+    def names(self):
+        """Names of the fields that are written."""
+        return self._names
+
+    @property
+    def number_of_times(self):
+        """Number of time slices written or buffered, so far."""
+        return self._n_times
+
+    def _open(self, path, format, append, attrs):
+        """Open the file and set its attributes."""
+        if os.path.isfile(path) and append:
+            mode = 'a'
+        else:
+            mode = 'w'
+
+        root = nc4.Dataset(path, mode, format=format)
+        _set_netcdf_attributes(root, attrs)
+
+        return root
+
+    def _define(self, time_units, reference, **kwds):
+        """Add the dimensions and variables of the time series."""
+        root, fields = self._root, self._fields
+
+        if self._at == 'node':
+            _set_netcdf_structured_dimensions(root, fields.shape)
+            _add_spatial_variables(root, fields)
+        else:
+            _set_netcdf_cell_structured_dimensions(root, fields.shape)
+            _add_cell_spatial_variables(root, fields)
+
+        if not root.data_model.startswith('NETCDF4'):
+            kwds = dict()
+
+        if 't' not in root.variables:
+            time_var = root.createVariable('t', 'f8', ('nt', ))
+            time_var.units = ' '.join([time_units, 'since', reference])
+            time_var.long_name = 'time'
+
+        dims = ['nt'] + _get_dimension_names(self._shape)
+        for name in self._names:
+            values = fields[self._at][name]
+            if name not in root.variables:
+                var = root.createVariable(
+                    name, _NP_TO_NC_TYPE[str(values.dtype)], dims, **kwds)
+                var.units = fields[self._at].units[name] or '?'
+                var.long_name = name
+
+    def _write_buffer(self, buffer):
+        """Write buffered time slices to the file."""
+        (start, stop) = (buffer.start, buffer.start + buffer.size)
+
+        with NETCDF_LOCK:
+            self._root.variables['t'][start:stop] = buffer.times[:buffer.size]
+            for (name, values) in buffer.values.items():
+                self._root.variables[name][start:stop] = values[:buffer.size]
+
+    def _write_pending(self):
+        """Write buffers, as they are filled, until told to stop."""
+        while True:
+            buffer = self._pending.get()
+            if buffer is None:
+                break
+            try:
+                if self._error is None:
+                    self._write_buffer(buffer)
+            except Exception:
+                self._error = sys.exc_info()
+            finally:
+                self._free.put(buffer)
+
+    def _raise_if_failed(self):
+        """Raise, in the calling thread, the error of a failed write.
+
+        The error is kept, rather than cleared, so that every later call
+        raises it too. Slices written after a failed write would leave
+        a gap in the file.
+        """
+        if self._error is not None:
+            six.reraise(*self._error)
+
+    def write(self, time=None):
+        """Add the current field values as a new time slice.
+
+        Parameters
+        ----------
+        time : float, optional
+            Time of the slice. If not given, use the index of the slice.
+        """
+        self._raise_if_failed()
+        if self._closed:
+            raise ValueError('writer is closed')
+
+        if self._buffer is None:
+            self._buffer = self._free.get()
+            self._buffer.start = self._n_times
+            self._buffer.size = 0
+
+        buffer = self._buffer
+        if time is None:
+            time = self._n_times
+        buffer.times[buffer.size] = time
+        for (name, values) in buffer.values.items():
+            values[buffer.size].flat = self._fields[self._at][name]
+        buffer.size += 1
+        self._n_times += 1
+
+        if buffer.is_full():
+            self.flush()
+
+    def flush(self):
+        """Send buffered time slices to be written.
+
+        If writing in the background, return without waiting for the
+        slices to be written.
+        """
+        self._raise_if_failed()
+
+        buffer, self._buffer = self._buffer, None
+        if buffer is None or buffer.size == 0:
+            if buffer is not None:
+                self._free.put(buffer)
+        elif self._thread is None:
+            try:
+                self._write_buffer(buffer)
+            except Exception:
+                self._error = sys.exc_info()
+                raise
+            finally:
+                self._free.put(buffer)
+        else:
+            self._pending.put(buffer)
+
+    def close(self):
+        """Write any buffered time slices and close the file."""
+        if self._closed:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            if self._thread is not None:
+                self._pending.put(None)
+                self._thread.join()
+            with NETCDF_LOCK:
+                self._root.close()
+
+        self._raise_if_failed()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
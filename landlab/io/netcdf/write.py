@@ -27,6 +27,7 @@ from scipy.io import netcdf as nc
 from landlab.io.netcdf._constants import (_AXIS_DIMENSION_NAMES,
                                           _AXIS_COORDINATE_NAMES,
                                           _NP_TO_NC_TYPE)
+from landlab.io.netcdf._lock import with_netcdf_lock
 
 
 def _set_netcdf_attributes(root, attrs):
@@ -203,7 +204,8 @@ def _set_netcdf_cell_structured_dimensions(root, shape):
         if name not in dims:
             root.createDimension(name, dim_size - 2)
 
-    root.createDimension('nv', 4)
+    if 'nv' not in dims:
+        root.createDimension('nv', 4)
 
 
 def _set_netcdf_structured_dimensions(root, shape):
@@ -532,6 +534,7 @@ def _guess_at_location(fields, names):
     return at
 
 
+@with_netcdf_lock
 def write_netcdf(path, fields, attrs=None, append=False,
                  format='NETCDF3_64BIT', names=None, at=None):
     """Write landlab fields to netcdf.
@@ -540,6 +543,10 @@ def write_netcdf(path, fields, attrs=None, append=False,
     If the *append* keyword argument in True, append the data to an existing
     file, if it exists. Otherwise, clobber an existing files.
 
+    To write many time slices of a model run, use a
+    :class:`~landlab.io.netcdf.time_series.NetcdfTimeSeriesWriter`, which
+    keeps its file open between slices.
+
     Parameters
     ----------
     path : str
@@ -638,6 +645,7 @@ def write_netcdf(path, fields, attrs=None, append=False,
     root.close()
 
 
+@with_netcdf_lock
 def write_raster_netcdf(path, fields, attrs=None, append=False,
                         format='NETCDF4', names=None, at=None):
     
@@ -324,5 +324,94 @@ def test_halo_keyword_no_nodata_value():
                                  -9999., -9999., -9999., -9999., -9999.]))
 
 
+
+def test_read_data_in_blocks():
+    from landlab.io.esri_ascii import _read_asc_data
+
+    values = np.arange(40.).reshape((5, 8)) * 1.25
+    text = '\n'.join(' '.join(repr(v) for v in row) for row in values)
+    for block_size in (1, 3, 7, 64, 10000):
+        out = np.empty((5, 8))
+        _read_asc_data(StringIO(text), out=out[::-1], block_size=block_size)
+        assert_array_equal(out, values[::-1])
+
+
+def test_read_bad_value():
+    asc_file = StringIO(
+        """
+nrows         2
+ncols         2
+xllcorner     1.
+yllcorner     2.
+cellsize      10.
+1. 2.
+3. x
+        """)
+    assert_raises(ValueError, read_esri_ascii, asc_file)
+
+
+def test_4x3_too_many_values():
+    asc_file = StringIO(
+        """
+nrows         4
+ncols         3
+xllcorner     1.
+yllcorner     2.
+cellsize      10.
+1. 2. 3. 4. 5. 6. 7. 8. 9. 10. 11. 12. 13.
+        """)
+    assert_raises(DataSizeError, read_esri_ascii, asc_file)
+
+
+def test_window_keyword():
+    (grid, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR, '4_x_3.asc'),
+                                    window=((1, 4), (0, 3)))
+
+    assert_equal(grid.shape, (3, 3))
+    assert_array_equal(field, [6., 7., 8., 3., 4., 5., 0., 1., 2.])
+
+
+def test_window_of_all_data():
+    (_, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR, '4_x_3.asc'))
+    (_, window) = read_esri_ascii(os.path.join(_TEST_DATA_DIR, '4_x_3.asc'),
+                                  window=((0, 4), (0, 3)))
+    assert_array_equal(window, field)
+
+
+def test_window_with_halo():
+    (grid, field) = read_esri_ascii(os.path.join(_TEST_DATA_DIR, '4_x_3.asc'),
+                                    window=((0, 1), (0, 2)), halo=1,
+                                    reshape=True, name='elevation')
+
+    assert_equal(grid.shape, (3, 4))
+    assert_array_equal(field, [[-9999., -9999., -9999., -9999.],
+                               [-9999., 9., 10., -9999.],
+                               [-9999., -9999., -9999., -9999.]])
+    assert_array_equal(grid.at_node['elevation'], field.flat)
+
+
+def test_window_outside_of_data():
+    assert_raises(ValueError, read_esri_ascii,
+                  os.path.join(_TEST_DATA_DIR, '4_x_3.asc'),
+                  window=((2, 5), (0, 3)))
+    assert_raises(ValueError, read_esri_ascii,
+                  os.path.join(_TEST_DATA_DIR, '4_x_3.asc'),
+                  window=((1, 1), (0, 3)))
+
+
+def test_window_with_wrapped_rows():
+    asc_file = StringIO(
+        """
+nrows         4
+ncols         3
+xllcorner     1.
+yllcorner     2.
+cellsize      10.
+1. 2. 3. 4. 5. 6. 7. 8. 9. 10. 11. 12.
+        """)
+    assert_raises(DataSizeError, read_esri_ascii, asc_file,
+                  window=((0, 2), (0, 3)))
+
+
 if __name__ == '__main__':
     unittest.main()
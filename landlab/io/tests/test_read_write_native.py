@@ -1,10 +1,16 @@
 #! /usr/bin/env python
-from landlab import RasterModelGrid
+from landlab import (RasterModelGrid, HexModelGrid, RadialModelGrid,
+                     VoronoiDelaunayGrid, CLOSED_BOUNDARY)
 from landlab.components import FlowAccumulator
 import pickle 
-from nose.tools import assert_equal
+from nose.tools import (assert_equal, assert_not_equal, assert_true,
+                        assert_false, assert_raises, assert_is_instance)
+import numpy as np
+from numpy.testing import assert_array_equal
 import os
+import shutil
 from landlab.io.native_landlab import save_grid, load_grid
+from landlab.testing.tools import cdtemp
 
 def compare_dictionaries(dict_1, dict_2, dict_1_name, dict_2_name, path=""):
     """Compare two dictionaries recursively to find non mathcing elements
@@ -101,4 +107,173 @@ def test_save():
     a = compare_dictionaries(mg1.__dict__,mg2.__dict__,'m1','m2')
     assert_equal(a, '')
     
-    os.remove('testsavedgrid.grid')
\ No newline at end of file
+    shutil.rmtree('testsavedgrid.grid')
+
+
+def _grids():
+    yield RasterModelGrid((4, 5), spacing=(2., 3.))
+    yield HexModelGrid(4, 3, 2., orientation='vertical')
+    yield HexModelGrid(3, 4, 2., shape='rect')
+    yield RadialModelGrid(num_shells=2, dr=1.5)
+    yield VoronoiDelaunayGrid(np.random.rand(20), np.random.rand(20))
+
+
+def test_save_load_native():
+    for grid in _grids():
+        grid.move_origin((10., 20.))
+        grid.add_field('node', 'topographic__elevation',
+                       np.arange(grid.number_of_nodes, dtype=float),
+                       units='m')
+        grid.add_ones('link', 'flux', dtype=int)
+        grid.status_at_node[grid.core_nodes[0]] = CLOSED_BOUNDARY
+
+        with cdtemp() as _:
+            save_grid(grid, 'saved.grid')
+            loaded = load_grid('saved.grid')
+
+            assert_is_instance(loaded, type(grid))
+            assert_array_equal(loaded.node_x, grid.node_x)
+            assert_array_equal(loaded.node_y, grid.node_y)
+            assert_array_equal(loaded.status_at_node, grid.status_at_node)
+            assert_array_equal(loaded.status_at_link, grid.status_at_link)
+            assert_array_equal(loaded.at_node['topographic__elevation'],
+                               grid.at_node['topographic__elevation'])
+            assert_equal(loaded.field_units('node', 'topographic__elevation'),
+                         'm')
+            assert_array_equal(loaded.at_link['flux'], grid.at_link['flux'])
+            assert_equal(loaded.at_link['flux'].dtype, int)
+
+
+def test_load_native_is_mapped():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+
+    with cdtemp() as _:
+        save_grid(grid, 'saved.grid')
+        loaded = load_grid('saved.grid')
+        z = loaded.at_node['topographic__elevation']
+        assert_true(isinstance(z.base, np.memmap))
+
+        z[0] = 100.
+        z_saved = load_grid('saved.grid').at_node['topographic__elevation']
+        assert_equal(z_saved[0], 0.)
+
+        in_memory = load_grid('saved.grid', mmap_mode=None)
+        assert_false(isinstance(
+            in_memory.at_node['topographic__elevation'].base, np.memmap))
+
+
+def test_incremental_save():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+    grid.add_field('node', 'soil__depth', np.ones(20))
+    grid.add_field('node', 'water__depth', np.zeros(20))
+
+    with cdtemp() as _:
+        save_grid(grid, 'saved.grid')
+        stats = dict((name, os.stat(os.path.join('saved.grid', name)).st_ino)
+                     for name in os.listdir('saved.grid'))
+
+        grid.at_node['topographic__elevation'][0] = 10.
+        grid.at_node.pop('water__depth')
+        save_grid(grid, 'saved.grid', clobber=True,
+                  changed=['topographic__elevation'])
+
+        files = set(os.listdir('saved.grid'))
+        assert_true('at_node-water__depth.bin' not in files)
+        assert_equal(
+            os.stat('saved.grid/at_node-soil__depth.bin').st_ino,
+            stats['at_node-soil__depth.bin'])
+        assert_not_equal(
+            os.stat('saved.grid/at_node-topographic__elevation.bin').st_ino,
+            stats['at_node-topographic__elevation.bin'])
+
+        loaded = load_grid('saved.grid')
+        assert_equal(loaded.at_node['topographic__elevation'][0], 10.)
+        assert_true('water__depth' not in loaded.at_node)
+
+
+def test_incremental_save_of_replaced_field():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+    grid.add_field('node', 'soil__depth', np.ones(20))
+
+    with cdtemp() as _:
+        save_grid(grid, 'saved.grid')
+        grid.add_field('node', 'soil__depth', np.full(20, 2.),
+                       noclobber=False)
+        save_grid(grid, 'saved.grid', clobber=True, changed=[])
+
+        assert_array_equal(load_grid('saved.grid').at_node['soil__depth'],
+                           np.full(20, 2.))
+
+
+def test_incremental_save_of_other_grid():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+    other = RasterModelGrid((4, 5))
+    other.add_zeros('node', 'topographic__elevation')
+
+    with cdtemp() as _:
+        save_grid(grid, 'saved.grid')
+        save_grid(other, 'saved.grid', clobber=True)
+        save_grid(grid, 'saved.grid', clobber=True, changed=[])
+
+        assert_array_equal(
+            load_grid('saved.grid').at_node['topographic__elevation'],
+            np.arange(20.))
+
+
+def test_save_loaded_grid_in_place():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+
+    with cdtemp() as _:
+        save_grid(grid, 'saved.grid')
+        loaded = load_grid('saved.grid')
+        loaded.at_node['topographic__elevation'] += 1.
+        save_grid(loaded, 'saved.grid', clobber=True)
+
+        assert_array_equal(
+            load_grid('saved.grid').at_node['topographic__elevation'],
+            np.arange(20.) + 1.)
+
+
+def test_save_no_clobber():
+    grid = RasterModelGrid((4, 5))
+    with cdtemp() as _:
+        save_grid(grid, 'saved.grid')
+        assert_raises(ValueError, save_grid, grid, 'saved.grid')
+
+
+def test_save_does_not_clobber_other_directory():
+    grid = RasterModelGrid((4, 5))
+    with cdtemp() as _:
+        os.mkdir('saved.grid')
+        with open(os.path.join('saved.grid', 'notes.txt'), 'w') as fp:
+            fp.write('keep me')
+        assert_raises(ValueError, save_grid, grid, 'saved.grid',
+                      clobber=True)
+        assert_equal(os.listdir('saved.grid'), ['notes.txt'])
+
+
+def test_save_unknown_grid_type():
+    class MyGrid(VoronoiDelaunayGrid):
+        pass
+
+    grid = MyGrid(np.random.rand(20), np.random.rand(20))
+    with cdtemp() as _:
+        assert_raises(TypeError, save_grid, grid, 'saved.grid')
+
+
+def test_load_pickled_grid():
+    grid = RasterModelGrid((4, 5))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+
+    with cdtemp() as _:
+        with open('saved.grid', 'wb') as fp:
+            pickle.dump(grid, fp)
+        loaded = load_grid('saved.grid')
+
+    assert_array_equal(loaded.at_node['topographic__elevation'],
+                       np.arange(20.))
@@ -2,7 +2,7 @@
 import os
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 from nose.tools import assert_true, assert_equal, assert_raises
 try:
     from nose.tools import assert_list_equal
@@ -110,3 +110,24 @@ def test_write_then_read():
     assert_array_almost_equal(grid.node_x, new_grid.node_x)
     assert_array_almost_equal(grid.node_y, new_grid.node_y)
     assert_array_almost_equal(field, grid.at_node['air__temperature'])
+
+
+def test_write_then_read_in_blocks():
+    from landlab.io import esri_ascii
+
+    grid = RasterModelGrid((9, 7), spacing=(2., 2.))
+    grid.add_field('node', 'air__temperature',
+                   np.random.rand(grid.number_of_nodes))
+
+    block_size, esri_ascii._BLOCK_SIZE = esri_ascii._BLOCK_SIZE, 64
+    try:
+        with cdtemp() as _:
+            write_esri_ascii('test.asc', grid)
+            with open('test.asc', 'r') as fp:
+                lines = fp.readlines()
+            (_, field) = read_esri_ascii('test.asc')
+    finally:
+        esri_ascii._BLOCK_SIZE = block_size
+
+    assert_equal(len(lines), 5 + 9)
+    assert_array_equal(field, grid.at_node['air__temperature'])
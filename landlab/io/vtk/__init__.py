@@ -0,0 +1,7 @@
+from .vti import VtkUniformRectilinearWriter
+from .vtu import VtkUnstructuredWriter
+from .pvd import VtkTimeSeriesWriter
+
+
+__all__ = ['VtkUniformRectilinearWriter', 'VtkUnstructuredWriter',
+           'VtkTimeSeriesWriter']
@@ -1,6 +1,8 @@
 #!/bin/env python
 
 import base64
+import zlib
+
 import numpy as np
 
 
@@ -11,7 +13,7 @@ class EncoderError(Exception):
 class UnknownEncoderError(EncoderError):
 
     def __init__(self, name):
-        self._name
+        self._name = name
 
     def __str__(self):
         return '%s: Unknown encoder' % self._name
@@ -36,10 +38,10 @@ class RawEncoder(object):
 
     def encode(self, array):
         try:
-            as_str = array.tostring()
+            as_str = array.tobytes()
         except AttributeError:
-            as_str = np.array(array).tostring()
-        block_size = np.array(len(as_str), dtype=np.int32).tostring()
+            as_str = np.array(array).tobytes()
+        block_size = np.array(len(as_str), dtype=np.int32).tobytes()
         return block_size + as_str
 
 
@@ -47,21 +49,75 @@ class Base64Encoder(object):
 
     def encode(self, array):
         try:
-            as_str = array.tostring()
+            as_str = array.tobytes()
         except AttributeError:
-            as_str = np.array(array).tostring()
-        as_str = base64.b64encode(as_str)
+            as_str = np.array(array).tobytes()
         block_size = base64.b64encode(np.array(len(as_str),
-                                               dtype=np.int32).tostring())
-        return block_size + as_str
+                                               dtype=np.int32).tobytes())
+        return block_size + base64.b64encode(as_str)
 
     def decode(self, array):
         pass
 
 
+class ZlibEncoder(object):
+
+    """Compress values as blocks, as does VTK's vtkZLibDataCompressor.
+
+    The encoded values begin with a header of unsigned 32-bit integers: the
+    number of blocks, the size of a block, the size of the last block and
+    then the compressed size of each block. The compressed blocks follow.
+    Files that contain values encoded this way must name the compressor
+    with the *compressor* attribute of their root element.
+
+    Parameters
+    ----------
+    level : int, optional
+        Compression level, from 1 to 9.
+    block_size : int, optional
+        Number of bytes to compress at a time.
+
+    Examples
+    --------
+    >>> import zlib
+    >>> import numpy as np
+    >>> from landlab.io.vtk.encoders import ZlibEncoder
+    >>> encoder = ZlibEncoder(block_size=16)
+    >>> encoded = encoder.encode(np.arange(5, dtype=np.int32))
+    >>> header = np.frombuffer(encoded[:20], dtype=np.uint32)
+    >>> header[:3]
+    array([ 2, 16,  4], dtype=uint32)
+    >>> blocks = encoded[20:]
+    >>> block = zlib.decompress(blocks[:header[3]])
+    >>> np.frombuffer(block, dtype=np.int32)
+    array([0, 1, 2, 3], dtype=int32)
+    """
+
+    def __init__(self, level=6, block_size=2 ** 15):
+        self._level = level
+        self._block_size = block_size
+
+    def encode(self, array):
+        as_str = np.ascontiguousarray(array).tobytes()
+        block_size = self._block_size
+
+        blocks = [zlib.compress(as_str[start:start + block_size],
+                                self._level)
+                  for start in range(0, len(as_str), block_size)]
+        if len(as_str) % block_size == 0 and len(as_str) > 0:
+            last_block_size = block_size
+        else:
+            last_block_size = len(as_str) % block_size
+
+        header = np.array([len(blocks), block_size, last_block_size] +
+                          [len(block) for block in blocks], dtype=np.uint32)
+        return header.tobytes() + b''.join(blocks)
+
+
 _ENCODERS = {
     'ascii': AsciiEncoder(),
-    'raw': RawEncoder(), 'base64': Base64Encoder()
+    'raw': RawEncoder(), 'base64': Base64Encoder(),
+    'zlib': ZlibEncoder(),
 }
 
 
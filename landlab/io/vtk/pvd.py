@@ -0,0 +1,124 @@
+#! /bin/env python
+"""Write a time series of landlab fields as a ParaView data collection."""
+
+import os
+import xml.dom.minidom
+
+from landlab.io.vtk.vti import VtkUniformRectilinearWriter
+from landlab.io.vtk.vtu import VtkUnstructuredWriter
+from landlab.io.vtk.vtkxml import VtkElement, VtkRootElement
+
+
+class VtkTimeSeriesWriter(object):
+
+    """Write a time series of landlab fields as a ParaView data collection.
+
+    Each call to :meth:`write` writes the current fields of a grid to a new
+    VTK file (ImageData for rasters, otherwise an UnstructuredGrid) and
+    adds it, with its time, to a collection file (*.pvd*) that ParaView
+    opens as an animation. The collection file is rewritten after every
+    frame so that it can be opened while a model is still running.
+
+    The frames are named after the collection file with a frame number
+    (*series_0000.vti*, *series_0001.vti*, ...) and are written next to it.
+
+    Values are appended to each frame as zlib-compressed binary, by
+    default. Values that don't change from frame to frame, such as the
+    coordinates and cells of a grid that doesn't move, are encoded only
+    once and then reused for every frame. The geometry of a raster is
+    given by the origin and spacing of the image, alone.
+
+    Parameters
+    ----------
+    path : str
+        Path to the collection file. A *.pvd* suffix is added if it's
+        missing.
+    fields : field-like
+        Landlab field object that holds a grid and associated values.
+    format : {'appended', 'base64', 'ascii'}, optional
+        Write values inline, as ascii or base64, or append them to the end
+        of each file.
+    encoding : {'zlib', 'raw', 'base64'}, optional
+        Encoding of appended values.
+
+    Examples
+    --------
+    >>> import os
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.vtk.pvd import VtkTimeSeriesWriter
+    >>> from landlab.testing.tools import cdtemp
+
+    >>> grid = RasterModelGrid((3, 4))
+    >>> z = grid.add_zeros('node', 'topographic__elevation')
+    >>> with cdtemp() as _:
+    ...     series = VtkTimeSeriesWriter('series', grid)
+    ...     for time in (0., 10., 20.):
+    ...         z += 1.
+    ...         series.write(time=time)
+    ...     sorted(os.listdir('.'))
+    ['series.pvd', 'series_0000.vti', 'series_0001.vti', 'series_0002.vti']
+    """
+
+    def __init__(self, path, fields, format='appended', encoding='zlib'):
+        from landlab import RasterModelGrid
+
+        (base, ext) = os.path.splitext(path)
+        if ext != '.pvd':
+            base = path
+        self._path = base + '.pvd'
+        (self._dir, self._prefix) = os.path.split(base)
+
+        if isinstance(fields, RasterModelGrid):
+            self._writer = VtkUniformRectilinearWriter(format=format,
+                                                       encoding=encoding)
+            self._suffix = '.vti'
+        else:
+            self._writer = VtkUnstructuredWriter(format=format,
+                                                 encoding=encoding)
+            self._suffix = '.vtu'
+
+        self._fields = fields
+        self._frames = []
+
+    @property
+    def path(self):
+        """Path to the collection file."""
+        return self._path
+
+    @property
+    def number_of_frames(self):
+        """Number of frames written, so far."""
+        return len(self._frames)
+
+    def write(self, time=None):
+        """Write the current field values as a new frame.
+
+        Parameters
+        ----------
+        time : float, optional
+            Time of the frame. If not given, use the frame number.
+        """
+        if time is None:
+            time = len(self._frames)
+
+        frame = '%s_%04d%s' % (self._prefix, len(self._frames), self._suffix)
+        self._writer.write(os.path.join(self._dir, frame), self._fields)
+
+        self._frames.append((time, frame))
+        self._write_collection()
+
+    def _write_collection(self):
+        """Write the collection file that lists the frames."""
+        collection = VtkElement('Collection')
+        for (time, frame) in self._frames:
+            collection.appendChild(VtkElement('DataSet', timestep=time,
+                                              group='', part=0, file=frame))
+
+        root = VtkRootElement('Collection')
+        root.appendChild(collection)
+
+        doc = xml.dom.minidom.Document()
+        doc.appendChild(root)
+        with open(self._path, 'w') as pvd_file:
+            pvd_file.write(doc.toprettyxml())
+        doc.unlink()
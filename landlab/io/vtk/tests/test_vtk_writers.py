@@ -0,0 +1,163 @@
+#! /usr/bin/env python
+"""Unit tests for landlab.io.vtk writers."""
+
+import os
+import re
+import zlib
+
+import numpy as np
+from nose.tools import assert_equal, assert_is, assert_is_not, assert_raises
+from numpy.testing import assert_array_equal, assert_array_almost_equal
+
+from landlab import RasterModelGrid, HexModelGrid
+from landlab.io.vtk import (VtkUniformRectilinearWriter, VtkUnstructuredWriter,
+                            VtkTimeSeriesWriter)
+from landlab.io.vtk.encoders import ZlibEncoder
+from landlab.io.vtk.vtktypes import VTK_TO_NUMPY_TYPE
+from landlab.io.vtk.writer import InvalidEncodingError, InvalidFormatError
+from landlab.testing.tools import cdtemp
+
+
+def _decompress(data):
+    """Decode values encoded as by vtkZLibDataCompressor."""
+    n_blocks = np.frombuffer(data[:4], dtype=np.uint32)[0]
+    header = np.frombuffer(data[:4 * (3 + n_blocks)], dtype=np.uint32)
+    blocks = []
+    start = 4 * (3 + n_blocks)
+    for size in header[3:]:
+        blocks.append(zlib.decompress(data[start:start + size]))
+        start += size
+    return b''.join(blocks)
+
+
+def _read_appended_arrays(path):
+    """Read the appended, binary data arrays of a VTK file."""
+    with open(path, 'rb') as vtk_file:
+        contents = vtk_file.read()
+    (head, data) = contents.split(b'<AppendedData', 1)
+    data = data[data.index(b'_') + 1:]
+    head = head.decode()
+
+    arrays = dict()
+    for attrs in re.findall(r'<DataArray ([^>]*)/>', head):
+        attrs = dict(re.findall(r'(\w+)="([^"]*)"', attrs))
+        offset = int(attrs['offset'])
+        if 'vtkZLibDataCompressor' in head:
+            values = _decompress(data[offset:])
+        else:
+            size = np.frombuffer(data[offset:offset + 4], dtype=np.int32)[0]
+            values = data[offset + 4:offset + 4 + size]
+        arrays[attrs['Name']] = np.frombuffer(
+            values, dtype=VTK_TO_NUMPY_TYPE[attrs['type']])
+    return arrays
+
+
+def test_zlib_encoder():
+    values = np.arange(1000.)
+    for block_size in (8, 100, 8000, 2 ** 15):
+        encoded = ZlibEncoder(block_size=block_size).encode(values)
+        assert_array_equal(np.frombuffer(_decompress(encoded)), values)
+
+    encoded = ZlibEncoder().encode(np.array([], dtype=float))
+    assert_array_equal(np.frombuffer(encoded, dtype=np.uint32),
+                       [0, 2 ** 15, 0])
+
+
+def test_image_data_appended():
+    grid = RasterModelGrid((4, 5), spacing=(2., 3.))
+    grid.add_field('node', 'topographic__elevation', np.arange(20.))
+    grid.add_field('patch', 'patch__id', np.arange(12, dtype=np.int32))
+
+    for encoding in ('raw', 'zlib'):
+        writer = VtkUniformRectilinearWriter(format='appended',
+                                             encoding=encoding)
+        with cdtemp() as _:
+            writer.write('grid.vti', grid)
+            arrays = _read_appended_arrays('grid.vti')
+
+        assert_array_equal(arrays['topographic__elevation'], np.arange(20.))
+        assert_array_equal(arrays['patch__id'], np.arange(12))
+
+
+def test_unstructured_appended():
+    grid = HexModelGrid(4, 5)
+    grid.add_field('node', 'topographic__elevation',
+                   np.arange(grid.number_of_nodes, dtype=float))
+
+    for encoding in ('raw', 'zlib'):
+        writer = VtkUnstructuredWriter(format='appended', encoding=encoding)
+        with cdtemp() as _:
+            writer.write('grid.vtu', grid)
+            arrays = _read_appended_arrays('grid.vtu')
+
+        xyz = arrays['Coordinates'].reshape((-1, 3))
+        assert_array_almost_equal(xyz[:, 0], grid.node_x)
+        assert_array_almost_equal(xyz[:, 1], grid.node_y)
+        assert_array_equal(arrays['connectivity'],
+                           grid.nodes_at_patch.flat)
+        assert_array_equal(arrays['offsets'],
+                           3 * np.arange(1, grid.number_of_patches + 1))
+        assert_array_equal(arrays['types'], 5)
+        assert_array_equal(arrays['topographic__elevation'],
+                           grid.at_node['topographic__elevation'])
+
+
+def test_unchanged_values_encoded_once():
+    grid = HexModelGrid(4, 5)
+    z = grid.add_zeros('node', 'topographic__elevation')
+    writer = VtkUnstructuredWriter(format='appended', encoding='zlib')
+
+    with cdtemp() as _:
+        writer.write('grid.vtu', grid)
+        points = writer._cache[('Points', 'Coordinates')][1]
+        elevation = writer._cache[('PointData',
+                                   'topographic__elevation')][1]
+
+        z += 1.
+        writer.write('grid.vtu', grid)
+        assert_is(writer._cache[('Points', 'Coordinates')][1], points)
+        assert_is_not(
+            writer._cache[('PointData', 'topographic__elevation')][1],
+            elevation)
+
+        grid.move_origin((10., 10.))
+        writer.write('grid.vtu', grid)
+        assert_is_not(writer._cache[('Points', 'Coordinates')][1], points)
+        assert_array_almost_equal(
+            _read_appended_arrays('grid.vtu')['Coordinates'][::3],
+            grid.node_x)
+
+
+def test_time_series():
+    grid = RasterModelGrid((4, 5))
+    z = grid.add_zeros('node', 'topographic__elevation')
+
+    with cdtemp() as _:
+        os.mkdir('out')
+        series = VtkTimeSeriesWriter(os.path.join('out', 'run.pvd'), grid)
+        for time in (0., 1.5, 3.):
+            z[:] = time
+            series.write(time=time)
+
+        assert_equal(series.number_of_frames, 3)
+        with open(series.path, 'r') as pvd_file:
+            datasets = re.findall(r'<DataSet ([^>]*)/>', pvd_file.read())
+        datasets = [dict(re.findall(r'(\w+)="([^"]*)"', attrs))
+                    for attrs in datasets]
+
+        assert_equal([float(dataset['timestep']) for dataset in datasets],
+                     [0., 1.5, 3.])
+        for (n, dataset) in enumerate(datasets):
+            assert_equal(dataset['file'], 'run_%04d.vti' % n)
+            arrays = _read_appended_arrays(
+                os.path.join('out', dataset['file']))
+            assert_array_equal(arrays['topographic__elevation'],
+                               float(dataset['timestep']))
+
+
+def test_invalid_format_and_encoding():
+    assert_raises(InvalidFormatError, VtkUnstructuredWriter, format='raw')
+    assert_raises(InvalidEncodingError, VtkUnstructuredWriter,
+                  format='appended', encoding='ascii')
+    assert_raises(InvalidEncodingError, VtkUnstructuredWriter,
+                  encoding='lzma')
@@ -3,18 +3,42 @@
 from landlab.io.vtk.writer import VtkWriter
 from landlab.io.vtk.vtktypes import VtkUniformRectilinear
 from landlab.io.vtk.vtkxml import (VtkRootElement, VtkGridElement,
-                                   VtkPieceElement, VtkCoordinatesElement,
-                                   VtkPointDataElement, VtkCellDataElement,
-                                   VtkExtent)
+                                   VtkPieceElement, VtkPointDataElement,
+                                   VtkCellDataElement, VtkExtent, VtkOrigin,
+                                   VtkSpacing)
 
 
 class VtkUniformRectilinearWriter(VtkWriter):
+
+    """Write the fields of a raster grid as VTK ImageData (.vti).
+
+    Nodes are the points of the image and patches are its cells. The
+    geometry of the grid is given entirely by the extent, origin and
+    spacing of the image.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.io.vtk.vti import VtkUniformRectilinearWriter
+    >>> from landlab.testing.tools import cdtemp
+
+    >>> grid = RasterModelGrid((3, 4))
+    >>> z = grid.add_zeros('node', 'topographic__elevation')
+    >>> writer = VtkUniformRectilinearWriter(format='appended',
+    ...                                      encoding='zlib')
+    >>> with cdtemp() as _:
+    ...     writer.write('grid.vti', grid)
+    """
+
     _vtk_grid_type = VtkUniformRectilinear
 
     def construct_field_elements(self, field):
         extent = VtkExtent(field.shape[::-1])
-        origin = VtkOrigin(field.origin[::-1], field.spacing[::-1])
-        spacing = VtkSpacing(field.spacing[::-1])
+        origin = VtkOrigin((field.node_x[0], field.node_y[0]))
+        spacing = VtkSpacing((field.dx, field.dy))
+
+        kwds = dict(append=self.data, encoding=self.encoding,
+                    cache=self._cache)
 
         element = {
             'VTKFile':
@@ -25,11 +49,9 @@ class VtkUniformRectilinearWriter(VtkWriter):
             'Piece':
                 VtkPieceElement(Extent=extent),
             'PointData':
-                VtkPointDataElement(field.at_node, append=self.data,
-                                    encoding=self.encoding),
+                VtkPointDataElement(field.at_node, **kwds),
             'CellData':
-                VtkCellDataElement(field.at_cell, append=data,
-                                   encoding=encoding),
+                VtkCellDataElement(field.at_patch, **kwds),
         }
 
         return element
@@ -1,6 +1,7 @@
 #! /bin/env python
 
-from landlab.io.vtk.encoders import AsciiEncoder, RawEncoder, Base64Encoder
+from landlab.io.vtk.encoders import (AsciiEncoder, RawEncoder, Base64Encoder,
+                                     ZlibEncoder)
 
 
 class VtkEndian(object):
@@ -66,25 +67,40 @@ SYS_TO_VTK_ENDIAN = {
 }
 
 
+VtkInt8 = VtkType('Int8', 1)
 VtkUInt8 = VtkType('UInt8', 1)
+VtkInt16 = VtkType('Int16', 2)
+VtkUInt16 = VtkType('UInt16', 2)
 VtkInt32 = VtkType('Int32', 4)
+VtkUInt32 = VtkType('UInt32', 4)
 VtkInt64 = VtkType('Int64', 8)
+VtkUInt64 = VtkType('UInt64', 8)
 VtkFloat32 = VtkType('Float32', 4)
 VtkFloat64 = VtkType('Float64', 8)
 
 
 NUMPY_TO_VTK_TYPE = {
+    'int8': VtkInt8,
     'uint8': VtkUInt8,
+    'int16': VtkInt16,
+    'uint16': VtkUInt16,
     'int32': VtkInt32,
+    'uint32': VtkUInt32,
     'int64': VtkInt64,
+    'uint64': VtkUInt64,
     'float32': VtkFloat32,
     'float64': VtkFloat64,
 }
 
 VTK_TO_NUMPY_TYPE = {
+    'Int8': 'int8',
     'UInt8': 'uint8',
+    'Int16': 'int16',
+    'UInt16': 'uint16',
     'Int32': 'int32',
+    'UInt32': 'uint32',
     'Int64': 'int64',
+    'UInt64': 'uint64',
     'Float32': 'float32',
     'Float64': 'float64',
 }
@@ -115,4 +131,5 @@ ENCODERS = {
     'ascii': AsciiEncoder(),
     'raw': RawEncoder(),
     'base64': Base64Encoder(),
+    'zlib': ZlibEncoder(),
 }
@@ -1,5 +1,6 @@
 #! /bin/env python
 
+import hashlib
 import sys
 from six.moves import range
 
@@ -34,25 +35,25 @@ class VtkExtent(object):
 
 class VtkOrigin(object):
 
-    def __init__(self, origin, spacing):
-        assert(len(spacing) <= 3)
-        assert(len(spacing) == len(origin))
+    def __init__(self, origin):
+        assert(len(origin) <= 3)
 
-        self._spacing = spacing
-        self._cell_origin = []
-        for (dx, x0) in zip(spacing, origin):
-            self._cell_origin.append(x0 - dx * .5)
+        self._origin = origin
+
+        self._padded_origin = []
+        for x0 in origin:
+            self._padded_origin.append(x0)
 
         for _ in range(3 - len(origin)):
-            self._cell_origin.append(0.)
+            self._padded_origin.append(0.)
 
-        self._origin_str = ' '.join(['%f' % x for x in self._cell_origin])
+        self._origin_str = ' '.join(['%f' % x for x in self._padded_origin])
 
     def __str__(self):
         return self._origin_str
 
     def __repr__(self):
-        return 'VtkOrigin(%s, %s)' % (self._cell_origin, self._spacing)
+        return 'VtkOrigin(%s)' % (self._origin, )
 
 
 class VtkSpacing(object):
@@ -83,6 +84,7 @@ class VtkElement(xml.dom.minidom.Element):
 
     def __init__(self, name, **kwargs):
         xml.dom.minidom.Element.__init__(self, str(name), namespaceURI='VTK')
+        self.ownerDocument = None
         self.setAttributes(**kwargs)
 
     def setAttributes(self, **kwargs):
@@ -108,7 +110,8 @@ class VtkElement(xml.dom.minidom.Element):
 class VtkTextElement(xml.dom.minidom.Text):
 
     def __init__(self, text):
-        self.replaceWholeText(text)
+        xml.dom.minidom.Text.__init__(self)
+        self.data = text
 
 
 class VtkDataArrayElement(VtkElement):
@@ -126,10 +129,18 @@ class VtkDataElement(VtkElement):
     def __init__(self, name, **kwargs):
         VtkElement.__init__(self, name)
 
-    def addData(self, data, name, append=None, encoding='ascii', **kwargs):
-        data_string = encode(data, encoding=encoding)
+    def addData(self, data, name, append=None, encoding='ascii', cache=None,
+                **kwargs):
+        data = np.asarray(data)
+        if data.dtype == bool:
+            data = data.astype(np.uint8)
+        elif not data.dtype.isnative:
+            data = data.astype(data.dtype.newbyteorder('='))
+
+        data_string = _encode_with_cache(data, encoding, cache,
+                                         (self.tagName, name))
         data_array = VtkDataArrayElement(
-            data_string, Name=name, type=NUMPY_TO_VTK_TYPE[str(data.dtype)],
+            data_string, Name=name, type=NUMPY_TO_VTK_TYPE[data.dtype.name],
             **kwargs)
         self.appendChild(data_array)
 
@@ -138,16 +149,59 @@ class VtkDataElement(VtkElement):
                                      format='appended')
             append.addData(data_string)
         else:
-            data_array.setAttributes(format=self.format)
+            if encoding == 'ascii':
+                data_array.setAttributes(format=self.format)
+            else:
+                data_array.setAttributes(format='binary')
+            if isinstance(data_string, bytes):
+                data_string = data_string.decode('ascii')
             data_array.addData(data_string)
 
 
+def _encode_with_cache(data, encoding, cache, key):
+    """Encode an array, reusing an earlier encoding of the same values.
+
+    Parameters
+    ----------
+    data : ndarray
+        Values to encode.
+    encoding : str
+        Name of the encoder.
+    cache : dict or None
+        Values encoded by earlier calls. If ``None``, don't cache.
+    key : hashable
+        Key of the values in *cache*.
+
+    Returns
+    -------
+    str or bytes
+        The encoded values.
+    """
+    if cache is None:
+        return encode(data, encoding=encoding)
+
+    data = np.ascontiguousarray(data)
+    checksum = (encoding, data.dtype.str, data.shape,
+                hashlib.sha1(data).hexdigest())
+    try:
+        (cached_checksum, data_string) = cache[key]
+    except KeyError:
+        cached_checksum = None
+
+    if cached_checksum != checksum:
+        data_string = encode(data, encoding=encoding)
+        cache[key] = (checksum, data_string)
+
+    return data_string
+
+
 class VtkRootElement(VtkElement):
 
-    def __init__(self, type):
+    def __init__(self, type, **kwargs):
         VtkElement.__init__(self, 'VTKFile', type=type,
                             version='0.1',
-                            byte_order=str(SYS_TO_VTK_ENDIAN[sys.byteorder]))
+                            byte_order=str(SYS_TO_VTK_ENDIAN[sys.byteorder]),
+                            **kwargs)
 
 
 class VtkGridElement(VtkElement):
@@ -164,15 +218,38 @@ class VtkPieceElement(VtkElement):
 
 class VtkAppendedDataElement(VtkElement):
 
+    """Encoded data arrays that follow the XML of a VTK file.
+
+    Raw (or compressed) binary data are not valid XML text, so the data are
+    kept as a list of byte strings, outside of the document, and written by
+    :meth:`write` after the rest of the file.
+    """
+
     def __init__(self, data, **kwargs):
         VtkElement.__init__(self, 'AppendedData', **kwargs)
-        self.appendChild(VtkTextElement('_' + data))
+        self._blocks = []
+        self._length = 0
+        if data:
+            self.addData(data)
 
     def addData(self, data):
-        self.firstChild.appendData(data)
+        if not isinstance(data, bytes):
+            data = data.encode('ascii')
+        self._blocks.append(data)
+        self._length += len(data)
 
     def offset(self):
-        return self.firstChild.length - 1
+        return self._length
+
+    def write(self, stream, indent=''):
+        """Write the element to a binary stream."""
+        attrs = ' '.join(['%s="%s"' % item
+                          for item in sorted(self.getAttributes().items())])
+        stream.write(('%s<AppendedData %s>\n%s  _' % (indent, attrs,
+                                                       indent)).encode())
+        for block in self._blocks:
+            stream.write(block)
+        stream.write(('\n%s</AppendedData>\n' % indent).encode())
 
 
 class VtkPointsElement(VtkDataElement):
@@ -0,0 +1,98 @@
+#! /bin/env python
+
+import numpy as np
+
+from landlab.io.vtk.writer import VtkWriter
+from landlab.io.vtk.vtktypes import (VtkUnstructured, VtkTriangle, VtkQuad,
+                                     VtkPolygon)
+from landlab.io.vtk.vtkxml import (VtkRootElement, VtkGridElement,
+                                   VtkPieceElement, VtkPointsElement,
+                                   VtkCellsElement, VtkPointDataElement,
+                                   VtkCellDataElement)
+
+
+def _patch_cells(nodes_at_patch):
+    """Connectivity, offsets and types of VTK cells made from patches.
+
+    Parameters
+    ----------
+    nodes_at_patch : ndarray of int, shape (n_patches, max_nodes)
+        Nodes of each patch, padded with -1.
+
+    Returns
+    -------
+    (connectivity, offsets, types) : tuple of ndarray
+        Nodes of all of the cells, one after the other, the index into
+        *connectivity* of the end of each cell, and the VTK type of each
+        cell.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.io.vtk.vtu import _patch_cells
+    >>> (connectivity, offsets, types) = _patch_cells(
+    ...     np.array([[4, 3, 0, 1], [2, 5, 1, -1]]))
+    >>> connectivity
+    array([4, 3, 0, 1, 2, 5, 1])
+    >>> offsets
+    array([4, 7])
+    >>> types
+    array([9, 5], dtype=uint8)
+    """
+    is_node = nodes_at_patch >= 0
+    n_nodes = is_node.sum(axis=1)
+
+    types = np.full(len(nodes_at_patch), int(VtkPolygon), dtype=np.uint8)
+    types[n_nodes == 3] = int(VtkTriangle)
+    types[n_nodes == 4] = int(VtkQuad)
+
+    return (nodes_at_patch[is_node], np.cumsum(n_nodes), types)
+
+
+class VtkUnstructuredWriter(VtkWriter):
+
+    """Write the fields of any grid as a VTK UnstructuredGrid (.vtu).
+
+    Nodes are the points of the unstructured grid and patches are its
+    cells.
+
+    Examples
+    --------
+    >>> from landlab import HexModelGrid
+    >>> from landlab.io.vtk.vtu import VtkUnstructuredWriter
+    >>> from landlab.testing.tools import cdtemp
+
+    >>> grid = HexModelGrid(3, 3)
+    >>> z = grid.add_zeros('node', 'topographic__elevation')
+    >>> writer = VtkUnstructuredWriter(format='appended', encoding='raw')
+    >>> with cdtemp() as _:
+    ...     writer.write('grid.vtu', grid)
+    """
+
+    _vtk_grid_type = VtkUnstructured
+
+    def construct_field_elements(self, field):
+        (connectivity, offsets, types) = _patch_cells(field.nodes_at_patch)
+
+        kwds = dict(append=self.data, encoding=self.encoding,
+                    cache=self._cache)
+
+        element = {
+            'VTKFile':
+                VtkRootElement(VtkUnstructured),
+            'Grid':
+                VtkGridElement(VtkUnstructured),
+            'Piece':
+                VtkPieceElement(NumberOfPoints=field.number_of_nodes,
+                                NumberOfCells=field.number_of_patches),
+            'Points':
+                VtkPointsElement((field.node_x, field.node_y), **kwds),
+            'Cells':
+                VtkCellsElement(connectivity, offsets, types, **kwds),
+            'PointData':
+                VtkPointDataElement(field.at_node, **kwds),
+            'CellData':
+                VtkCellDataElement(field.at_patch, **kwds),
+        }
+
+        return element
@@ -2,9 +2,12 @@
 import os
 import xml.dom.minidom
 
+from landlab.io.vtk.vtkxml import VtkAppendedDataElement
 
-_VALID_ENCODINGS = set(['ascii', 'base64', 'raw'])
-_VALID_FORMATS = set(['ascii', 'base64', 'raw', 'appended'])
+
+_VALID_ENCODINGS = set(['ascii', 'base64', 'raw', 'zlib'])
+_VALID_FORMATS = set(['ascii', 'base64', 'appended'])
+_APPENDED_ENCODINGS = set(['base64', 'raw', 'zlib'])
 _VTK_POSSIBLE_PIECE_SECTIONS = [
     'Points', 'Coordinates', 'PointData', 'Cells', 'CellData',
 ]
@@ -40,31 +43,39 @@ def assemble_vtk_document(element):
     for section in _VTK_POSSIBLE_PIECE_SECTIONS:
         try:
             piece.appendChild(element[section])
-        except (KeyError, EmptyElementError):
+        except KeyError:
             pass
     grid.appendChild(piece)
     root.appendChild(grid)
 
-    try:
-        root.appendChild(element['AppendedData'])
-    except KeyError:
-        pass
-
     return root
 
 
-def assert_format_is_valid(format_string):
+def assert_format_is_valid(format):
     if format not in _VALID_FORMATS:
         raise InvalidFormatError(format)
 
 
-def assert_encoding_is_valid(encoding_string):
+def assert_encoding_is_valid(encoding):
     if encoding not in _VALID_ENCODINGS:
         raise InvalidEncodingError(encoding)
 
 
 class VtkWriter(xml.dom.minidom.Document):
 
+    """Write the fields of a grid to a VTK XML file.
+
+    Values are either written inline, as ascii text or base64-encoded binary
+    (*format* is 'ascii' or 'base64'), or are appended to the end of the file
+    (*format* is 'appended') as base64, raw binary or zlib-compressed binary
+    (*encoding* is 'base64', 'raw' or 'zlib'). Appended binary values are
+    much faster to write and read, and much smaller, than ascii text.
+
+    Encoded values are kept from one :meth:`write` to the next so that
+    values that haven't changed, such as the coordinates and connectivity of
+    a grid that doesn't move, are encoded only once.
+    """
+
     def __init__(self, **kwds):
         self._format = kwds.pop('format', 'ascii')
         self._encoding = kwds.pop('encoding', 'ascii')
@@ -72,13 +83,15 @@ class VtkWriter(xml.dom.minidom.Document):
         assert_format_is_valid(self.format)
         assert_encoding_is_valid(self.encoding)
 
-        if format == 'ascii':
-            encoding = 'ascii'
+        if self.format == 'ascii':
+            self._encoding = 'ascii'
+        elif self.format == 'base64':
+            self._encoding = 'base64'
+        elif self.encoding not in _APPENDED_ENCODINGS:
+            raise InvalidEncodingError(self.encoding)
 
-        if self.format == 'appended':
-            self._data = VtkAppendedDataElement('', encoding=self.encoding)
-        else:
-            self._data = None
+        self._data = None
+        self._cache = dict()
 
         xml.dom.minidom.Document.__init__(self)
 
@@ -94,22 +107,42 @@ class VtkWriter(xml.dom.minidom.Document):
     def data(self):
         return self._data
 
+    def _new_data_element(self):
+        """Start the appended data of a new file."""
+        if self.format == 'appended':
+            if self.encoding == 'base64':
+                encoding = 'base64'
+            else:
+                encoding = 'raw'
+            self._data = VtkAppendedDataElement('', encoding=encoding)
+        else:
+            self._data = None
+
     def construct_field_elements(self, field):
         raise NotImplementedError()
 
     def write(self, path, field):
         self.unlink()
-        elements = self.construct_field_elements(field)
+        self._new_data_element()
 
-        if self.data is not None:
-            element['AppendedData'] = self.data
+        elements = self.construct_field_elements(field)
+        if self.encoding == 'zlib':
+            elements['VTKFile'].setAttributes(
+                compressor='vtkZLibDataCompressor')
 
         self.appendChild(assemble_vtk_document(elements))
         self.to_xml(path)
 
     def to_xml(self, path):
-        with open(path, 'w') as xml_file:
-            xml_file.write(self.toprettyxml())
+        if self.data is None:
+            with open(path, 'w') as xml_file:
+                xml_file.write(self.toprettyxml())
+        else:
+            (head, tail) = self.toprettyxml().rsplit('</VTKFile>', 1)
+            with open(path, 'wb') as xml_file:
+                xml_file.write(head.encode())
+                self.data.write(xml_file, indent='\t')
+                xml_file.write(('</VTKFile>' + tail).encode())
 
 
 def assemble_vtk_elements(element):
@@ -140,7 +173,7 @@ class VTKDatabase(VtkWriter):
 
         try:
             next_file = '%s_%04d%s' % (root, self._count, ext)
-        except NameError:
+        except AttributeError:
             self._count = 0
             next_file = '%s_%04d%s' % (root, self._count, ext)
 
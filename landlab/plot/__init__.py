@@ -1,3 +1,22 @@
-from landlab.plot.imshow import (imshow_grid, imshow_node_grid,
-                                 imshow_cell_grid, imshow_grid_at_node)
-from landlab.plot.channel_profile import analyze_channel_network_and_plot
+import sys
+
+
+if sys.version_info < (3, 7):
+    from landlab.plot.imshow import (imshow_grid, imshow_node_grid,
+                                     imshow_cell_grid, imshow_grid_at_node)
+    from landlab.plot.channel_profile import analyze_channel_network_and_plot
+else:
+    from ..core.lazy import lazy_import
+
+    __all__ = ['imshow_grid', 'imshow_node_grid', 'imshow_cell_grid',
+               'imshow_grid_at_node', 'analyze_channel_network_and_plot']
+
+    __getattr__, __dir__ = lazy_import(
+        __name__,
+        {'imshow_grid': '.imshow',
+         'imshow_node_grid': '.imshow',
+         'imshow_cell_grid': '.imshow',
+         'imshow_grid_at_node': '.imshow',
+         'analyze_channel_network_and_plot': '.channel_profile'},
+        submodules=('channel_profile', 'colors', 'drainage_plot',
+                    'event_handler', 'graph', 'imshow', 'video_out'))
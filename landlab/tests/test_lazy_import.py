@@ -0,0 +1,65 @@
+"""
+Unit tests for lazy loading of the landlab and landlab.components names.
+"""
+import os
+import subprocess
+import sys
+
+from nose import SkipTest
+from nose.tools import assert_equal, assert_true
+
+import landlab
+
+
+def _modules_after(statement):
+    """Names of the modules imported by a statement in a new interpreter."""
+    if sys.version_info < (3, 7):
+        raise SkipTest('module __getattr__ needs Python 3.7')
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [os.path.dirname(os.path.dirname(landlab.__file__))] +
+        env.get('PYTHONPATH', '').split(os.pathsep))
+    out = subprocess.check_output(
+        [sys.executable, '-c',
+         statement + '; import sys; print(" ".join(sys.modules))'],
+        env=env)
+    return set(out.decode().split())
+
+
+def test_import_landlab_is_light():
+    modules = _modules_after('import landlab')
+    for name in ('matplotlib', 'xarray', 'scipy', 'landlab.grid',
+                 'landlab.plot', 'landlab.testing'):
+        assert_true(name not in modules, msg=name)
+
+
+def test_import_components_is_light():
+    modules = _modules_after('import landlab.components')
+    assert_equal(
+        [name for name in modules if name.startswith('landlab.components.')],
+        [])
+
+
+def test_import_one_component():
+    modules = _modules_after('from landlab.components import LinearDiffuser')
+    assert_true('landlab.components.diffusion' in modules)
+    assert_true('landlab.components.flow_routing' not in modules)
+
+
+def test_public_names():
+    if sys.version_info < (3, 7):
+        raise SkipTest('module __getattr__ needs Python 3.7')
+
+    from landlab import components, plot
+
+    for module in (landlab, components, plot):
+        for name in module.__all__:
+            assert_true(hasattr(module, name), msg=name)
+            assert_true(name in dir(module), msg=name)
+
+    assert_equal([cls.__name__ for cls in components.COMPONENTS],
+                 components.__all__)
+    assert_true(landlab.RasterModelGrid is
+                landlab.grid.raster.RasterModelGrid)
+    assert_true(landlab.imshow_grid is plot.imshow.imshow_grid)
@@ -0,0 +1,38 @@
+#! /usr/bin/env python
+"""Share arrays of values with worker processes."""
+
+from multiprocessing import RawArray
+
+import numpy as np
+
+
+def copy_to_shared_memory(values):
+    """Copy an array of values into a block of shared memory.
+
+    Values are copied, flattened, into a block of memory that is inherited
+    by, or can be passed to, the processes of a *multiprocessing.Pool*.
+    Processes view the block as an array with *numpy.frombuffer*, without
+    copying it again.
+
+    Parameters
+    ----------
+    values : array_like of float
+        Values to copy.
+
+    Returns
+    -------
+    multiprocessing.RawArray
+        Shared block of doubles that holds the values.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.utils.shared_memory import copy_to_shared_memory
+    >>> shared = copy_to_shared_memory(np.arange(6.).reshape((2, 3)))
+    >>> np.frombuffer(shared).tolist()
+    [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    """
+    values = np.asarray(values)
+    shared = RawArray('d', values.size)
+    np.frombuffer(shared)[:] = values.flat
+    return shared
@@ -20,6 +20,8 @@ ext_modules = [
               ['landlab/components/flexure/cfuncs.pyx']),
     Extension('landlab.components.flow_accum.cfuncs',
               ['landlab/components/flow_accum/cfuncs.pyx']),
+    Extension('landlab.components.flow_routing.cfuncs',
+              ['landlab/components/flow_routing/cfuncs.pyx']),
     Extension('landlab.components.flow_director.cfuncs',
               ['landlab/components/flow_director/cfuncs.pyx']),
     Extension('landlab.components.stream_power.cfuncs',
@@ -30,6 +32,8 @@ ext_modules = [
               ['landlab/components/drainage_density/cfuncs.pyx']),
     Extension('landlab.components.erosion_deposition.cfuncs',
               ['landlab/components/erosion_deposition/cfuncs.pyx']),
+    Extension('landlab.components.overland_flow.cfuncs',
+              ['landlab/components/overland_flow/cfuncs.pyx']),
     Extension('landlab.utils.ext.jaggedarray',
               ['landlab/utils/ext/jaggedarray.pyx']),
     Extension('landlab.graph.structured_quad.ext.at_node',
@@ -138,7 +142,7 @@ setup(name='landlab',
                         'xarray',
                        ],
       #                  'Cython>=0.22'],
-      setup_requires=['cython'],
+      setup_requires=['cython>=0.28'],
       classifiers=[
           'Intended Audience :: Science/Research',
           'License :: OSI Approved :: MIT License',